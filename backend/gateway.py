@@ -1,4 +1,10 @@
 # backend/gateway.py
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+
 import httpx
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
@@ -6,12 +12,115 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/axiom", tags=["AXIOM-FLAME"])
-
 # Use localhost for development, Docker service name for production
 AXIOM_BASE = "http://127.0.0.1:8087"  # Local development
 # AXIOM_BASE = "http://axiom-flame:5000"  # Docker production
 
+# Shared connection pool limits and short-lived response caching
+AXIOM_TIMEOUT = float(os.getenv("AXIOM_TIMEOUT", "30"))
+AXIOM_MAX_CONNECTIONS = int(os.getenv("AXIOM_MAX_CONNECTIONS", "100"))
+AXIOM_MAX_KEEPALIVE = int(os.getenv("AXIOM_MAX_KEEPALIVE", "20"))
+AXIOM_KEEPALIVE_EXPIRY = float(os.getenv("AXIOM_KEEPALIVE_EXPIRY", "30"))
+AXIOM_LEDGER_CACHE_TTL = float(os.getenv("AXIOM_LEDGER_CACHE_TTL", "2"))
+AXIOM_HEALTH_CACHE_TTL = float(os.getenv("AXIOM_HEALTH_CACHE_TTL", "5"))
+
+
+class AxiomClient:
+    """Keep-alive connection pool shared by every AXIOM FLAME route
+
+    Concurrent identical GETs are coalesced into one upstream request, and a
+    GET made with ``cache_ttl`` reuses its last successful response for that
+    many seconds. The upstream call runs as its own task, so a caller that
+    disconnects does not cancel it for the others waiting on it.
+    """
+
+    MAX_CACHED_RESPONSES = 256
+
+    def __init__(self, base_url: str, timeout: float = 30, max_connections: int = 100,
+                 max_keepalive: int = 20, keepalive_expiry: float = 30,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._cache: Dict[str, Tuple[float, httpx.Response]] = {}
+        self.stats = {"upstream_requests": 0, "coalesced": 0, "cache_hits": 0}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client, opened on first use if the lifespan has not run"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self.transport
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._cache.clear()
+
+    async def post(self, path: str, json: Optional[dict] = None) -> httpx.Response:
+        self.stats["upstream_requests"] += 1
+        return await self.client.post(path, json=json)
+
+    async def get(self, path: str, cache_ttl: float = 0, timeout: Optional[float] = None) -> httpx.Response:
+        if cache_ttl:
+            cached = self._cache.get(path)
+            if cached is not None and cached[0] > time.monotonic():
+                self.stats["cache_hits"] += 1
+                return cached[1]
+
+        task = self._inflight.get(path)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(path, cache_ttl, timeout))
+            self._inflight[path] = task
+            task.add_done_callback(lambda _: self._inflight.pop(path, None))
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    async def _fetch(self, path: str, cache_ttl: float, timeout: Optional[float]) -> httpx.Response:
+        self.stats["upstream_requests"] += 1
+        response = await self.client.get(path, timeout=timeout or self.timeout)
+
+        if cache_ttl and response.status_code < 400:
+            if len(self._cache) >= self.MAX_CACHED_RESPONSES:
+                now = time.monotonic()
+                self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+            self._cache[path] = (time.monotonic() + cache_ttl, response)
+        return response
+
+
+axiom_client = AxiomClient(
+    AXIOM_BASE,
+    timeout=AXIOM_TIMEOUT,
+    max_connections=AXIOM_MAX_CONNECTIONS,
+    max_keepalive=AXIOM_MAX_KEEPALIVE,
+    keepalive_expiry=AXIOM_KEEPALIVE_EXPIRY
+)
+
+
+@asynccontextmanager
+async def gateway_lifespan(app):
+    """Open the AXIOM FLAME pool at startup and close it at shutdown"""
+    axiom_client.client  # opens the pool
+    yield
+    await axiom_client.aclose()
+
+
+router = APIRouter(prefix="/axiom", tags=["AXIOM-FLAME"], lifespan=gateway_lifespan)
+
 class AxiomRequest(BaseModel):
     command: str
     payload: dict | None = None
@@ -33,8 +142,7 @@ class CeremonialRequest(BaseModel):
 async def execute(req: AxiomRequest):
     """Execute generic AXIOM FLAME command"""
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(f"{AXIOM_BASE}/api/{req.command}", json=req.payload or {})
+        response = await axiom_client.post(f"/api/{req.command}", json=req.payload or {})
         
         if response.status_code >= 400:
             logger.error(f"AXIOM FLAME error: {response.status_code} - {response.text}")
@@ -69,8 +177,7 @@ async def ceremonial_reason(req: CeremonialRequest):
             "reasoning": req.reasoning
         }
         
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(f"{AXIOM_BASE}/api/reason", json=payload)
+        response = await axiom_client.post("/api/reason", json=payload)
         
         if response.status_code >= 400:
             logger.error(f"AXIOM FLAME reasoning error: {response.status_code} - {response.text}")
@@ -90,8 +197,7 @@ async def ceremonial_reason(req: CeremonialRequest):
 async def replay_ceremony(dispatch_id: str):
     """Replay a ceremonial dispatch"""
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(f"{AXIOM_BASE}/api/replay/{dispatch_id}")
+        response = await axiom_client.get(f"/api/replay/{dispatch_id}")
         
         if response.status_code >= 400:
             raise HTTPException(status_code=response.status_code, detail=response.text)
@@ -108,8 +214,7 @@ async def replay_ceremony(dispatch_id: str):
 async def audit_ceremony(dispatch_id: str):
     """Audit a ceremonial dispatch"""
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(f"{AXIOM_BASE}/api/audit/{dispatch_id}")
+        response = await axiom_client.get(f"/api/audit/{dispatch_id}")
         
         if response.status_code >= 400:
             raise HTTPException(status_code=response.status_code, detail=response.text)
@@ -126,8 +231,7 @@ async def audit_ceremony(dispatch_id: str):
 async def list_ledger():
     """List all ceremonial ledger entries"""
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(f"{AXIOM_BASE}/api/ledger")
+        response = await axiom_client.get("/api/ledger", cache_ttl=AXIOM_LEDGER_CACHE_TTL)
         
         if response.status_code >= 400:
             raise HTTPException(status_code=response.status_code, detail=response.text)
@@ -144,8 +248,7 @@ async def list_ledger():
 async def gateway_health():
     """Check gateway and AXIOM FLAME health"""
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(f"{AXIOM_BASE}/health")
+        response = await axiom_client.get("/health", cache_ttl=AXIOM_HEALTH_CACHE_TTL, timeout=10)
         
         axiom_healthy = response.status_code == 200
         
@@ -1364,11 +1364,15 @@ from pydantic import BaseModel, Field
 Outreach Engagement Service for Dominion Protocols
 Implements endpoints and models for outreach preparation, contact, engagement, conversion, overflow allocation, capability statement, pitch deck, email templates, grant procurement calendar, outreach cadence, and overflow testimony.
 """
-from fastapi import APIRouter, HTTPException
+import json
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from datetime import datetime
 
+from .outreach_store import get_outreach_store
+
 router = APIRouter(prefix="/api/outreach", tags=["Outreach Engagement"])
 
 # --- Models ---
@@ -1500,19 +1504,34 @@ overflow_testimony = OverflowTestimony(
     resilience=["company_recovery", "renewal_not_repair"]
 )
 
-outreach_preparations: List[OutreachPreparation] = []
-contacts: List[Contact] = []
-engagements: List[Engagement] = []
-conversions: List[Conversion] = []
-overflow_allocations: List[OverflowAllocation] = []
 email_templates: List[EmailTemplate] = [
     EmailTemplate(type="agencies", subject="stewardship_proposal", body="covenantal_governance"),
     EmailTemplate(type="franchises", subject="strengthening_franchise", body="transparent_governance"),
     EmailTemplate(type="at_risk_companies", subject="covenant_of_resilience", body="renewal_and_trust"),
 ]
 
-# Immutable log (append-only)
-immutable_log: List[dict] = []
+# Records and the immutable log (append-only, hash-chained) are persisted by
+# the outreach store; list endpoints stream them as NDJSON.
+MAX_PAGE_SIZE = 1000
+
+
+def _stream_ndjson(rows: Iterable[dict], next_cursor: Optional[int] = None) -> StreamingResponse:
+    headers = {"X-Next-Cursor": str(next_cursor)} if next_cursor is not None else None
+    lines = (json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+    return StreamingResponse(lines, media_type="application/x-ndjson", headers=headers)
+
+
+def _list_records(kind: str, cursor: Optional[int], limit: Optional[int], since: Optional[datetime],
+                  until: Optional[datetime], record_type: Optional[str]) -> StreamingResponse:
+    """Stream one kind of record; with ``limit``, one page plus its X-Next-Cursor"""
+    records = get_outreach_store().iter_records(
+        kind, after=cursor, limit=limit, since=since, until=until, record_type=record_type
+    )
+    if limit is None:
+        return _stream_ndjson(record for _, record in records)
+    page = list(records)
+    next_cursor = page[-1][0] if len(page) == limit else None
+    return _stream_ndjson((record for _, record in page), next_cursor)
 
 # --- Endpoints ---
 @router.get("/capability_statement", response_model=CapabilityStatement)
@@ -1544,58 +1563,84 @@ def get_email_template(template_type: str):
 
 @router.post("/preparation", response_model=OutreachPreparation)
 def create_preparation(prep: OutreachPreparation):
-    outreach_preparations.append(prep)
+    get_outreach_store().add("preparation", prep.dict())
     log_event("preparation_created", prep.dict())
     return prep
 
-@router.get("/preparation", response_model=List[OutreachPreparation])
-def list_preparations():
-    return outreach_preparations
+@router.get("/preparation", response_class=StreamingResponse)
+def list_preparations(cursor: Optional[int] = Query(None, ge=0, description="Return records after this cursor"),
+                      limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+                      since: Optional[datetime] = None, until: Optional[datetime] = None):
+    return _list_records("preparation", cursor, limit, since, until, None)
 
 @router.post("/contact", response_model=Contact)
 def create_contact(contact: Contact):
-    contacts.append(contact)
+    get_outreach_store().add("contact", contact.dict())
     log_event("contact_created", contact.dict())
     return contact
 
-@router.get("/contact", response_model=List[Contact])
-def list_contacts():
-    return contacts
+@router.get("/contact", response_class=StreamingResponse)
+def list_contacts(cursor: Optional[int] = Query(None, ge=0, description="Return records after this cursor"),
+                  limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+                  since: Optional[datetime] = None, until: Optional[datetime] = None,
+                  type: Optional[str] = Query(None, description="Filter by contact_type")):
+    return _list_records("contact", cursor, limit, since, until, type)
 
 @router.post("/engagement", response_model=Engagement)
 def create_engagement(engagement: Engagement):
-    engagements.append(engagement)
+    get_outreach_store().add("engagement", engagement.dict())
     log_event("engagement_created", engagement.dict())
     return engagement
 
-@router.get("/engagement", response_model=List[Engagement])
-def list_engagements():
-    return engagements
+@router.get("/engagement", response_class=StreamingResponse)
+def list_engagements(cursor: Optional[int] = Query(None, ge=0, description="Return records after this cursor"),
+                     limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+                     since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     type: Optional[str] = Query(None, description="Filter by engagement_type")):
+    return _list_records("engagement", cursor, limit, since, until, type)
 
 @router.post("/conversion", response_model=Conversion)
 def create_conversion(conversion: Conversion):
-    conversions.append(conversion)
+    get_outreach_store().add("conversion", conversion.dict())
     log_event("conversion_created", conversion.dict())
     return conversion
 
-@router.get("/conversion", response_model=List[Conversion])
-def list_conversions():
-    return conversions
+@router.get("/conversion", response_class=StreamingResponse)
+def list_conversions(cursor: Optional[int] = Query(None, ge=0, description="Return records after this cursor"),
+                     limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+                     since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     type: Optional[str] = Query(None, description="Filter by conversion_type")):
+    return _list_records("conversion", cursor, limit, since, until, type)
 
 @router.post("/overflow", response_model=OverflowAllocation)
 def create_overflow(overflow: OverflowAllocation):
-    overflow_allocations.append(overflow)
+    get_outreach_store().add("overflow", overflow.dict())
     log_event("overflow_created", overflow.dict())
     return overflow
 
-@router.get("/overflow", response_model=List[OverflowAllocation])
-def list_overflows():
-    return overflow_allocations
-
-
-@router.get("/log", response_model=List[dict])
-def get_log():
-    return immutable_log
+@router.get("/overflow", response_class=StreamingResponse)
+def list_overflows(cursor: Optional[int] = Query(None, ge=0, description="Return records after this cursor"),
+                   limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+                   since: Optional[datetime] = None, until: Optional[datetime] = None,
+                   type: Optional[str] = Query(None, description="Filter by allocation_type")):
+    return _list_records("overflow", cursor, limit, since, until, type)
+
+@router.get("/log", response_class=StreamingResponse)
+def get_log(cursor: Optional[int] = Query(None, ge=0, description="Return records after this cursor"),
+            limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+            since: Optional[datetime] = None, until: Optional[datetime] = None,
+            event_type: Optional[str] = None):
+    entries = get_outreach_store().iter_log(after=cursor, limit=limit, since=since, until=until,
+                                            event_type=event_type)
+    if limit is None:
+        return _stream_ndjson(entries)
+    page = list(entries)
+    return _stream_ndjson(page, page[-1]["seq"] if len(page) == limit else None)
+
+@router.get("/log/verify")
+def verify_log():
+    """Recompute the immutable log's hash chain"""
+    return get_outreach_store().verify_log()
 
 # Diaspora Training Scrolls endpoint
 @router.get("/diaspora_training_scrolls", response_model=DiasporaTrainingScrolls)
@@ -1859,11 +1904,7 @@ def get_canon_schema():
 
 # Automation stubs (to be implemented with real scheduling/email logic)
 def log_event(event_type: str, data: dict):
-    immutable_log.append({
-        "timestamp": datetime.utcnow().isoformat(),
-        "event_type": event_type,
-        "data": data
-    })
+    return get_outreach_store().append_log(event_type, data)
 
 def schedule_email(contact: Contact, subject: str, body: str):
     log_event("email_scheduled", {"contact": contact.dict(), "subject": subject})
@@ -1876,124 +1917,10 @@ def follow_up(contact: Contact, engagement_id: int):
 
 def allocate_overflow(allocation_type: str, value: float):
     log_event("overflow_allocation", {"type": allocation_type, "value": value})
-    notes: Optional[str]
-    scheduled_at: Optional[datetime]
-    created_at: datetime = Field(default_factory=datetime.utcnow)
 
-class Conversion(BaseModel):
-    id: int
-    contact_id: int
-    conversion_type: str  # pilot, annual, licensing
-    value: float
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+# Static scrolls: serialized once, served with strong ETags, gzip and 304s.
+# Must stay below every route definition.
+from .scroll_cache import ScrollResponseCache
 
-class OverflowAllocation(BaseModel):
-    id: int
-    allocation_type: str  # scholarship, diaspora_gift, community_monument
-    value: float
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-
-
-# EmailTemplate model
-class EmailTemplate(BaseModel):
-    type: str  # agencies, franchises, at_risk_companies
-    subject: str
-    body: str
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-
-# In-memory stores (replace with DB in production)
-outreach_preparations: List[OutreachPreparation] = []
-contacts: List[Contact] = []
-engagements: List[Engagement] = []
-conversions: List[Conversion] = []
-overflow_allocations: List[OverflowAllocation] = []
-email_templates: List[EmailTemplate] = [
-    EmailTemplate(type="agencies", subject="stewardship_proposal", body="covenantal_governance"),
-    EmailTemplate(type="franchises", subject="strengthening_franchise", body="transparent_governance"),
-    EmailTemplate(type="at_risk_companies", subject="covenant_of_resilience", body="renewal_and_trust"),
-]
-# Email Template Endpoints
-@router.get("/email_template/{template_type}", response_model=EmailTemplate)
-def get_email_template(template_type: str):
-    for template in email_templates:
-        if template.type == template_type:
-            return template
-    raise HTTPException(status_code=404, detail="Template not found")
-
-# Immutable log (append-only)
-immutable_log: List[dict] = []
-
-def log_event(event_type: str, data: dict):
-    immutable_log.append({
-        "timestamp": datetime.utcnow().isoformat(),
-        "event_type": event_type,
-        "data": data
-    })
-
-# Endpoints
-@router.post("/preparation", response_model=OutreachPreparation)
-def create_preparation(prep: OutreachPreparation):
-    outreach_preparations.append(prep)
-    log_event("preparation_created", prep.dict())
-    return prep
-
-@router.get("/preparation", response_model=List[OutreachPreparation])
-def list_preparations():
-    return outreach_preparations
-
-@router.post("/contact", response_model=Contact)
-def create_contact(contact: Contact):
-    contacts.append(contact)
-    log_event("contact_created", contact.dict())
-    return contact
-
-@router.get("/contact", response_model=List[Contact])
-def list_contacts():
-    return contacts
-
-@router.post("/engagement", response_model=Engagement)
-def create_engagement(engagement: Engagement):
-    engagements.append(engagement)
-    log_event("engagement_created", engagement.dict())
-    return engagement
-
-@router.get("/engagement", response_model=List[Engagement])
-def list_engagements():
-    return engagements
-
-@router.post("/conversion", response_model=Conversion)
-def create_conversion(conversion: Conversion):
-    conversions.append(conversion)
-    log_event("conversion_created", conversion.dict())
-    return conversion
-
-@router.get("/conversion", response_model=List[Conversion])
-def list_conversions():
-    return conversions
-
-@router.post("/overflow", response_model=OverflowAllocation)
-def create_overflow(overflow: OverflowAllocation):
-    overflow_allocations.append(overflow)
-    log_event("overflow_created", overflow.dict())
-    return overflow
-
-@router.get("/overflow", response_model=List[OverflowAllocation])
-def list_overflows():
-    return overflow_allocations
-
-@router.get("/log", response_model=List[dict])
-def get_log():
-    return immutable_log
-
-# Automation stubs (to be implemented with real scheduling/email logic)
-def schedule_email(contact: Contact, subject: str, body: str):
-    log_event("email_scheduled", {"contact": contact.dict(), "subject": subject})
-
-def schedule_meeting(contact: Contact, time: datetime):
-    log_event("meeting_scheduled", {"contact": contact.dict(), "time": time.isoformat()})
-
-def follow_up(contact: Contact, engagement_id: int):
-    log_event("follow_up_scheduled", {"contact": contact.dict(), "engagement_id": engagement_id})
-
-def allocate_overflow(allocation_type: str, value: float):
-    log_event("overflow_allocation", {"type": allocation_type, "value": value})
+scroll_cache = ScrollResponseCache()
+scroll_cache.install(router)
@@ -0,0 +1,414 @@
+"""
+Durable storage for outreach records and the immutable event log.
+
+``OutreachStore`` is the interface the outreach endpoints use;
+``SQLiteOutreachStore`` is the default backend. Records (contacts,
+engagements, conversions, overflow allocations, preparations) live in one
+SQLite table indexed for keyset ("cursor") pagination by kind, type and
+creation time. The immutable log is a ``SegmentedLog``: append-only JSONL
+segment files whose entries are chained by SHA-256, so any edit or deletion
+is detectable with ``verify``.
+
+Reads are generators that fetch in small batches, so callers can stream
+results without materializing the whole history.
+"""
+import bisect
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within one process
+    fcntl = None
+
+OUTREACH_DATA_DIR = os.getenv("OUTREACH_DATA_DIR", os.path.join("data", "outreach"))
+OUTREACH_DB_PATH = os.getenv("OUTREACH_DB_PATH", os.path.join(OUTREACH_DATA_DIR, "outreach.sqlite3"))
+OUTREACH_LOG_DIR = os.getenv("OUTREACH_LOG_DIR", os.path.join(OUTREACH_DATA_DIR, "log"))
+OUTREACH_LOG_SEGMENT_SIZE = int(os.getenv("OUTREACH_LOG_SEGMENT_SIZE", "10000"))
+
+# Field holding each record kind's filterable type
+RECORD_TYPE_FIELDS = {
+    "preparation": None,
+    "contact": "contact_type",
+    "engagement": "engagement_type",
+    "conversion": "conversion_type",
+    "overflow": "allocation_type",
+}
+
+GENESIS_HASH = "0" * 64
+BATCH_SIZE = 500
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def _to_json(value: Any) -> str:
+    return json.dumps(value, default=_json_default, separators=(",", ":"), sort_keys=True)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Stored timestamps are naive UTC; convert aware values so ISO strings compare in time order"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    return _naive_utc(value).isoformat() if value is not None else None
+
+
+class SegmentedLog:
+    """Append-only, hash-chained event log split into fixed-size JSONL segments
+
+    Segment files are named after the sequence number of their first entry,
+    so a cursor lookup only opens the segments at or after it. Each entry's
+    ``hash`` covers its content and the previous entry's hash.
+
+    Several processes (e.g. uvicorn workers) may append to one directory:
+    appends hold an exclusive ``flock`` on it and first re-read whatever
+    other writers added to the last segment since this instance last looked.
+    A torn trailing line left by a crashed writer is truncated under the same
+    lock, and readers skip it.
+    """
+
+    def __init__(self, directory: str, segment_size: int = OUTREACH_LOG_SEGMENT_SIZE, fsync: bool = False):
+        if segment_size < 1:
+            raise ValueError("segment_size must be positive")
+        self.directory = directory
+        self.segment_size = segment_size
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        self._segments: List[int] = []
+        self._first_timestamps: Dict[int, str] = {}
+        self.last_seq = 0
+        self.last_hash = GENESIS_HASH
+        self._segment_count = 0
+        self._tail_offset = 0  # bytes of the last segment already read
+
+        # Only the newest segment is read to recover the chain head
+        with self._lock, self._locked():
+            self._sync_head()
+
+    def _path(self, first_seq: int) -> str:
+        return os.path.join(self.directory, f"log-{first_seq:012d}.jsonl")
+
+    def _list_segments(self) -> List[int]:
+        return sorted(
+            int(name[4:-6]) for name in os.listdir(self.directory)
+            if name.startswith("log-") and name.endswith(".jsonl")
+        )
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock on the log directory, shared by every process appending to it"""
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)  # also releases the lock
+
+    def _sync_head(self):
+        """Catch up with entries other processes appended; caller holds both locks"""
+        segments = self._list_segments()
+        if self._segments and segments and segments[-1] != self._segments[-1]:
+            self._tail_offset, self._segment_count = 0, 0
+        self._segments = segments
+
+        while self._segments:
+            path = self._path(self._segments[-1])
+            with open(path, "rb") as f:
+                f.seek(self._tail_offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.last_seq = entry["seq"]
+                        self.last_hash = entry["hash"]
+                        self._segment_count += 1
+                    self._tail_offset += len(line)
+            if self._tail_offset:
+                # A torn write from a crashed appender: drop it before appending after it
+                if os.path.getsize(path) > self._tail_offset:
+                    os.truncate(path, self._tail_offset)
+                return
+            # A segment the crashed appender started but never completed a line in
+            os.remove(path)
+            self._segments.pop()
+            self._segment_count = 0
+
+    def _read_segment(self, first_seq: int) -> Iterator[Dict[str, Any]]:
+        with open(self._path(first_seq), "r", encoding="utf-8") as f:
+            for line in f:
+                # An unterminated last line is an append still in progress (or torn)
+                if line.strip() and line.endswith("\n"):
+                    yield json.loads(line)
+
+    @staticmethod
+    def _hash(prev_hash: str, seq: int, timestamp: str, event_type: str, data: Any) -> str:
+        content = _to_json({"seq": seq, "timestamp": timestamp, "event_type": event_type, "data": data})
+        return hashlib.sha256((prev_hash + content).encode("utf-8")).hexdigest()
+
+    def append(self, event_type: str, data: Any) -> Dict[str, Any]:
+        """Append an event and return the stored entry"""
+        data = json.loads(_to_json(data))  # store exactly what is hashed
+        with self._lock, self._locked():
+            self._sync_head()
+            seq = self.last_seq + 1
+            if not self._segments or self._segment_count >= self.segment_size:
+                self._segments.append(seq)
+                self._segment_count = 0
+                self._tail_offset = 0
+
+            timestamp = datetime.utcnow().isoformat()
+            entry = {
+                "seq": seq,
+                "timestamp": timestamp,
+                "event_type": event_type,
+                "data": data,
+                "prev_hash": self.last_hash,
+                "hash": self._hash(self.last_hash, seq, timestamp, event_type, data),
+            }
+            line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+            with open(self._path(self._segments[-1]), "ab") as f:
+                f.write(line)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+
+            self._tail_offset += len(line)
+            self.last_seq = seq
+            self.last_hash = entry["hash"]
+            self._segment_count += 1
+            return entry
+
+    def _first_timestamp(self, first_seq: int) -> Optional[str]:
+        if first_seq not in self._first_timestamps:
+            first = next(self._read_segment(first_seq), None)
+            if first is None:
+                return None
+            self._first_timestamps[first_seq] = first["timestamp"]
+        return self._first_timestamps[first_seq]
+
+    def iter_entries(self, after: Optional[int] = None, limit: Optional[int] = None,
+                     since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     event_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Entries with seq > ``after``, oldest first, optionally filtered"""
+        since_ts, until_ts = _timestamp(since), _timestamp(until)
+        # Listed from disk so segments started by other processes are included
+        segments = self._list_segments()
+
+        start = max(bisect.bisect_right(segments, after or 0) - 1, 0)
+        produced = 0
+        for index in range(start, len(segments)):
+            # Skip segments that end before ``since`` (the next one starts before it)
+            if since_ts and index + 1 < len(segments):
+                next_first = self._first_timestamp(segments[index + 1])
+                if next_first is not None and next_first < since_ts:
+                    continue
+            if until_ts:
+                first = self._first_timestamp(segments[index])
+                if first is not None and first > until_ts:
+                    return
+
+            for entry in self._read_segment(segments[index]):
+                if after and entry["seq"] <= after:
+                    continue
+                if since_ts and entry["timestamp"] < since_ts:
+                    continue
+                if until_ts and entry["timestamp"] > until_ts:
+                    return
+                if event_type and entry["event_type"] != event_type:
+                    continue
+                yield entry
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+
+    def verify(self) -> Dict[str, Any]:
+        """Recompute the hash chain over every segment"""
+        prev_hash, expected_seq, count = GENESIS_HASH, 1, 0
+        for entry in self.iter_entries():
+            recomputed = self._hash(prev_hash, entry["seq"], entry["timestamp"], entry["event_type"], entry["data"])
+            if entry["seq"] != expected_seq or entry["prev_hash"] != prev_hash or entry["hash"] != recomputed:
+                return {"valid": False, "entries": count, "first_invalid_seq": entry["seq"]}
+            prev_hash, expected_seq, count = entry["hash"], expected_seq + 1, count + 1
+        return {"valid": True, "entries": count, "first_invalid_seq": None, "head": prev_hash}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": self.last_seq,
+            "segments": len(self._segments),
+            "segment_size": self.segment_size,
+            "head": self.last_hash,
+        }
+
+
+class OutreachStore(ABC):
+    """Persistence interface for outreach records and the immutable log"""
+
+    @abstractmethod
+    def add(self, kind: str, record: Dict[str, Any]) -> int:
+        """Store a record; returns its cursor"""
+
+    @abstractmethod
+    def iter_records(self, kind: str, after: Optional[int] = None, limit: Optional[int] = None,
+                     since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     record_type: Optional[str] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """(cursor, record) pairs after ``after``, oldest first"""
+
+    @abstractmethod
+    def append_log(self, event_type: str, data: Any) -> Dict[str, Any]:
+        """Append an event to the immutable log; returns the chained entry"""
+
+    @abstractmethod
+    def iter_log(self, **filters) -> Iterator[Dict[str, Any]]:
+        """Log entries matching ``filters``, oldest first"""
+
+    @abstractmethod
+    def verify_log(self) -> Dict[str, Any]:
+        """Check the log's hash chain"""
+
+    def close(self):
+        pass
+
+
+class SQLiteOutreachStore(OutreachStore):
+    """SQLite-backed records plus a segmented JSONL log"""
+
+    def __init__(self, db_path: str = OUTREACH_DB_PATH, log_dir: str = OUTREACH_LOG_DIR,
+                 segment_size: int = OUTREACH_LOG_SEGMENT_SIZE):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS outreach_records (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                record_id INTEGER,
+                record_type TEXT,
+                created_at TEXT NOT NULL,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_outreach_kind_seq ON outreach_records (kind, seq);
+            CREATE INDEX IF NOT EXISTS ix_outreach_kind_created ON outreach_records (kind, created_at, seq);
+            CREATE INDEX IF NOT EXISTS ix_outreach_kind_type ON outreach_records (kind, record_type, seq);
+        """)
+        self._conn.commit()
+        self.log = SegmentedLog(log_dir, segment_size)
+
+    def add(self, kind: str, record: Dict[str, Any]) -> int:
+        if kind not in RECORD_TYPE_FIELDS:
+            raise ValueError(f"Unknown record kind: {kind}")
+        payload = _to_json(record)
+        type_field = RECORD_TYPE_FIELDS[kind]
+        created_at = record.get("created_at") or datetime.utcnow()
+        if isinstance(created_at, str):
+            try:
+                created_at = datetime.fromisoformat(created_at)
+            except ValueError:
+                pass
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO outreach_records (kind, record_id, record_type, created_at, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (kind, record.get("id"), record.get(type_field) if type_field else None,
+                 _timestamp(created_at) if isinstance(created_at, datetime) else str(created_at), payload)
+            )
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def iter_records(self, kind: str, after: Optional[int] = None, limit: Optional[int] = None,
+                     since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     record_type: Optional[str] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        clauses, params = ["kind = ?"], [kind]
+        if record_type is not None:
+            clauses.append("record_type = ?")
+            params.append(record_type)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(_timestamp(since))
+        if until is not None:
+            clauses.append("created_at <= ?")
+            params.append(_timestamp(until))
+        where = " AND ".join(clauses)
+
+        last_seq, remaining = after or 0, limit
+        while remaining is None or remaining > 0:
+            batch = BATCH_SIZE if remaining is None else min(BATCH_SIZE, remaining)
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT seq, payload FROM outreach_records WHERE {where} AND seq > ? "
+                    f"ORDER BY seq LIMIT ?",
+                    (*params, last_seq, batch)
+                ).fetchall()
+            for seq, payload in rows:
+                yield seq, json.loads(payload)
+            if len(rows) < batch:
+                return
+            last_seq = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def count(self, kind: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM outreach_records WHERE kind = ?", (kind,)
+            ).fetchone()[0]
+
+    def append_log(self, event_type: str, data: Any) -> Dict[str, Any]:
+        return self.log.append(event_type, data)
+
+    def iter_log(self, **filters) -> Iterator[Dict[str, Any]]:
+        return self.log.iter_entries(**filters)
+
+    def verify_log(self) -> Dict[str, Any]:
+        return self.log.verify()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[OutreachStore] = None
+_store_lock = threading.Lock()
+
+
+def get_outreach_store() -> OutreachStore:
+    """The process-wide store, opened on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SQLiteOutreachStore()
+    return _store
+
+
+def set_outreach_store(store: Optional[OutreachStore]):
+    """Swap the backend (tests, alternative databases)"""
+    global _store
+    with _store_lock:
+        _store = store
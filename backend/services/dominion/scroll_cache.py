@@ -0,0 +1,174 @@
+"""
+Pre-serialized responses for static dominion scrolls.
+
+The scroll endpoints return module-level Pydantic objects that never change
+after import. ``ScrollResponseCache`` serializes each one once (on first
+request) into JSON and gzip bytes with a strong ETag, answers
+``If-None-Match`` with 304, and assembles bundles of several scrolls from the
+cached bytes without re-serializing them.
+"""
+import gzip
+import hashlib
+import inspect
+import json
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+GZIP_MIN_SIZE = 512
+CACHE_CONTROL = "public, max-age=300"
+
+
+class CachedPayload:
+    """One serialized JSON body, its gzip form and their ETags"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=9, mtime=0) if len(body) >= GZIP_MIN_SIZE else None
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gz"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return self.etag in tags or self.gzip_etag in tags
+
+    def respond(self, request: Request) -> Response:
+        headers = {"Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        if self.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers={**headers, "ETag": self.etag})
+
+        if self.gzipped is not None and "gzip" in request.headers.get("accept-encoding", ""):
+            headers.update({"ETag": self.gzip_etag, "Content-Encoding": "gzip"})
+            return Response(self.gzipped, media_type="application/json", headers=headers)
+
+        headers["ETag"] = self.etag
+        return Response(self.body, media_type="application/json", headers=headers)
+
+
+def _is_static_scroll(route: Any) -> bool:
+    if not isinstance(route, APIRoute) or route.methods != {"GET"}:
+        return False
+    if inspect.signature(route.endpoint).parameters or inspect.iscoroutinefunction(route.endpoint):
+        return False
+    # List[...] and other generic response models are not classes
+    model = route.response_model
+    return isinstance(model, type) and issubclass(model, BaseModel)
+
+
+def _serialize(value: Any) -> bytes:
+    # Same JSON rendering FastAPI's JSONResponse uses
+    return json.dumps(
+        jsonable_encoder(value), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class ScrollResponseCache:
+    """Serve registered scrolls from bytes built once per process"""
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._payloads: Dict[str, CachedPayload] = {}
+        self._lock = threading.Lock()
+        self._bundle = lru_cache(maxsize=64)(self._build_bundle)
+
+    @property
+    def names(self) -> List[str]:
+        return sorted(self._loaders)
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """Register a scroll; ``loader`` returns the object and is called once
+
+        Raises ValueError if another scroll already uses ``name``.
+        """
+        if name in self._loaders and self._loaders[name] is not loader:
+            raise ValueError(f"Duplicate scroll name: {name}")
+        self._loaders[name] = loader
+
+    def payload(self, name: str) -> CachedPayload:
+        payload = self._payloads.get(name)
+        if payload is None:
+            if name not in self._loaders:
+                raise KeyError(name)
+            with self._lock:
+                payload = self._payloads.get(name)
+                if payload is None:
+                    payload = self._payloads[name] = CachedPayload(_serialize(self._loaders[name]()))
+        return payload
+
+    def warm(self):
+        """Serialize every registered scroll now instead of on first request"""
+        for name in self._loaders:
+            self.payload(name)
+
+    def _build_bundle(self, names: Tuple[str, ...]) -> CachedPayload:
+        parts = [json.dumps(name).encode("utf-8") + b":" + self.payload(name).body for name in names]
+        return CachedPayload(b"{" + b",".join(parts) + b"}")
+
+    def bundle(self, names: Optional[Iterable[str]] = None) -> CachedPayload:
+        """One JSON object keyed by scroll name, built from the cached bodies"""
+        selected = tuple(sorted(set(names))) if names else tuple(self.names)
+        unknown = [name for name in selected if name not in self._loaders]
+        if unknown:
+            raise KeyError(", ".join(unknown))
+        return self._bundle(selected)
+
+    def install(self, router: APIRouter, bundle_path: str = "/scrolls/bundle") -> List[str]:
+        """Serve the router's static scroll routes from this cache
+
+        A static scroll route is a synchronous GET route without parameters
+        whose response model is a Pydantic model class; endpoints are not
+        called until the first request. Each one is replaced in place by a
+        route answering from the cache, documented with the original response
+        model. A scroll is named by the last segment of its path, and two
+        routes sharing one raise ValueError. Also adds ``bundle_path``.
+        Returns the cached scroll names.
+        """
+        for index, route in enumerate(list(router.routes)):
+            if not _is_static_scroll(route):
+                continue
+
+            name = route.path.rsplit("/", 1)[-1]
+            self.register(name, route.endpoint)
+            router.routes[index] = APIRoute(
+                route.path,
+                self._endpoint(name),
+                methods=["GET"],
+                name=route.name,
+                tags=route.tags,
+                summary=route.summary,
+                description=route.description,
+                response_class=Response,
+                responses={200: {"model": route.response_model}, 304: {"description": "Not Modified"}}
+            )
+
+        cache = self
+
+        def get_scroll_bundle(request: Request, names: Optional[str] = None):
+            """All static scrolls (or a comma-separated selection) in one response"""
+            requested = [name.strip() for name in names.split(",") if name.strip()] if names else None
+            try:
+                payload = cache.bundle(requested)
+            except KeyError as e:
+                raise HTTPException(status_code=404, detail=f"Unknown scrolls: {e.args[0]}")
+            return payload.respond(request)
+
+        router.add_api_route(bundle_path, get_scroll_bundle, methods=["GET"], response_class=Response,
+                             responses={304: {"description": "Not Modified"}})
+        return self.names
+
+    def _endpoint(self, name: str) -> Callable[[Request], Response]:
+        def serve_scroll(request: Request) -> Response:
+            return self.payload(name).respond(request)
+
+        serve_scroll.__name__ = f"get_{name}"
+        return serve_scroll
@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+
+from backend.gateway import AxiomClient
+
+
+def make_client(calls, delay=0.01, status=200):
+    async def handler(request):
+        calls.append(request.url.path)
+        await asyncio.sleep(delay)
+        return httpx.Response(status, json={"path": request.url.path})
+
+    return AxiomClient("http://axiom.test", transport=httpx.MockTransport(handler))
+
+
+def test_identical_gets_are_coalesced():
+    calls = []
+
+    async def scenario():
+        client = make_client(calls)
+        responses = await asyncio.gather(*(client.get("/api/replay/AXF-1") for _ in range(5)))
+        await client.get("/api/audit/AXF-1")
+        await client.aclose()
+        return client, responses
+
+    client, responses = asyncio.run(scenario())
+    assert calls == ["/api/replay/AXF-1", "/api/audit/AXF-1"]
+    assert {r.json()["path"] for r in responses} == {"/api/replay/AXF-1"}
+    assert client.stats["coalesced"] == 4
+
+
+def test_cached_get_expires():
+    calls = []
+
+    async def scenario():
+        client = make_client(calls, delay=0)
+        await client.get("/api/ledger", cache_ttl=0.05)
+        await client.get("/api/ledger", cache_ttl=0.05)
+        await asyncio.sleep(0.06)
+        await client.get("/api/ledger", cache_ttl=0.05)
+        await client.aclose()
+        return client
+
+    client = asyncio.run(scenario())
+    assert calls == ["/api/ledger", "/api/ledger"]
+    assert client.stats["cache_hits"] == 1
+
+
+def test_error_responses_are_not_cached():
+    calls = []
+
+    async def scenario():
+        client = make_client(calls, delay=0, status=503)
+        await client.get("/health", cache_ttl=5)
+        await client.get("/health", cache_ttl=5)
+        await client.aclose()
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+
+
+def test_cancelled_caller_does_not_cancel_shared_request():
+    calls = []
+
+    async def scenario():
+        client = make_client(calls, delay=0.05)
+        first = asyncio.ensure_future(client.get("/api/audit/AXF-2"))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(client.get("/api/audit/AXF-2"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        response = await second
+        await client.aclose()
+        return response
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert calls == ["/api/audit/AXF-2"]
@@ -0,0 +1,163 @@
+import json
+import multiprocessing
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.services.dominion.outreach_store import OutreachStore, SegmentedLog, SQLiteOutreachStore
+
+
+def make_store(tmp_path, segment_size=3):
+    return SQLiteOutreachStore(str(tmp_path / "outreach.sqlite3"), str(tmp_path / "log"), segment_size)
+
+
+def contact(i, contact_type="agency", created_at=None):
+    return {"id": i, "name": f"contact-{i}", "organization": "org", "contact_type": contact_type,
+            "email": None, "created_at": created_at or datetime.utcnow()}
+
+
+def test_cursor_pagination_and_filters(tmp_path):
+    store = make_store(tmp_path)
+    old = datetime(2024, 1, 1)
+    for i in range(10):
+        store.add("contact", contact(i, "agency" if i % 2 else "franchise", old if i < 4 else None))
+    store.add("conversion", {"id": 1, "contact_id": 1, "conversion_type": "pilot", "value": 5.0})
+
+    first = list(store.iter_records("contact", limit=4))
+    assert [record["id"] for _, record in first] == [0, 1, 2, 3]
+    rest = list(store.iter_records("contact", after=first[-1][0]))
+    assert [record["id"] for _, record in rest] == [4, 5, 6, 7, 8, 9]
+
+    agencies = [record["id"] for _, record in store.iter_records("contact", record_type="agency")]
+    assert agencies == [1, 3, 5, 7, 9]
+    recent = [record["id"] for _, record in store.iter_records("contact", since=old + timedelta(days=1))]
+    assert recent == [4, 5, 6, 7, 8, 9]
+    assert store.count("contact") == 10
+    store.close()
+
+
+def test_time_filters_convert_offsets_to_utc(tmp_path):
+    store = make_store(tmp_path)
+    eastern = timezone(timedelta(hours=-5))
+    store.add("contact", contact(1, created_at=datetime(2025, 1, 1, 12, 0)))
+    # 08:30 at UTC-05:00 is 13:30 UTC
+    store.add("contact", contact(2, created_at=datetime(2025, 1, 1, 8, 30, tzinfo=eastern)))
+    store.add("contact", contact(3, created_at="2025-01-01T14:00:00+00:00"))
+
+    def ids(**filters):
+        return [record["id"] for _, record in store.iter_records("contact", **filters)]
+
+    # 08:00 at UTC-05:00 is 13:00 UTC, after the 12:00 naive UTC record
+    assert ids(since=datetime(2025, 1, 1, 8, 0, tzinfo=eastern)) == [2, 3]
+    assert ids(until=datetime(2025, 1, 1, 8, 45, tzinfo=eastern)) == [1, 2]
+    assert ids(since=datetime(2025, 1, 1, 13, 0), until=datetime(2025, 1, 1, 13, 45)) == [2]
+
+    store.append_log("contact_added", {"id": 1})
+    now = datetime.now(timezone.utc).astimezone(eastern)
+    assert list(store.iter_log(since=now + timedelta(minutes=1))) == []
+    assert len(list(store.iter_log(since=now - timedelta(minutes=1)))) == 1
+    assert list(store.iter_log(until=now - timedelta(minutes=1))) == []
+    store.close()
+
+
+def test_records_survive_reopen(tmp_path):
+    store = make_store(tmp_path)
+    store.add("overflow", {"id": 7, "allocation_type": "scholarship", "value": 1.5})
+    store.close()
+
+    reopened = make_store(tmp_path)
+    assert [record["id"] for _, record in reopened.iter_records("overflow")] == [7]
+    reopened.close()
+
+
+def test_log_segments_and_hash_chain(tmp_path):
+    log = SegmentedLog(str(tmp_path / "log"), segment_size=3)
+    for i in range(7):
+        log.append("contact_created" if i % 2 else "email_scheduled", {"id": i, "at": datetime(2025, 1, 1)})
+
+    assert sorted(os.listdir(tmp_path / "log")) == [
+        "log-000000000001.jsonl", "log-000000000004.jsonl", "log-000000000007.jsonl"
+    ]
+    assert [entry["seq"] for entry in log.iter_entries(after=4, limit=2)] == [5, 6]
+    assert [entry["data"]["id"] for entry in log.iter_entries(event_type="contact_created")] == [1, 3, 5]
+    assert log.verify()["valid"]
+
+    # A reopened log continues the same chain
+    reopened = SegmentedLog(str(tmp_path / "log"), segment_size=3)
+    entry = reopened.append("contact_created", {"id": 7})
+    assert entry["seq"] == 8
+    assert entry["prev_hash"] == log.last_hash
+    result = reopened.verify()
+    assert result["valid"] and result["entries"] == 8 and result["head"] == entry["hash"]
+
+
+def test_log_tampering_is_detected(tmp_path):
+    log = SegmentedLog(str(tmp_path / "log"), segment_size=3)
+    for i in range(5):
+        log.append("contact_created", {"id": i})
+
+    segment = tmp_path / "log" / "log-000000000004.jsonl"
+    lines = segment.read_text().splitlines()
+    entry = json.loads(lines[0])
+    entry["data"]["id"] = 99
+    lines[0] = json.dumps(entry, separators=(",", ":"))
+    segment.write_text("\n".join(lines) + "\n")
+
+    result = log.verify()
+    assert result["valid"] is False
+    assert result["first_invalid_seq"] == 4
+
+
+def _append_many(directory, worker, count):
+    log = SegmentedLog(directory, segment_size=4)
+    for i in range(count):
+        log.append("contact_created", {"worker": worker, "i": i})
+
+
+def test_concurrent_writers_share_one_chain(tmp_path):
+    directory = str(tmp_path / "log")
+    first = SegmentedLog(directory, segment_size=4)
+    second = SegmentedLog(directory, segment_size=4)
+    for i in range(5):
+        first.append("contact_created", {"id": i})
+        second.append("contact_created", {"id": i})
+    assert second.last_seq == 10
+
+    workers = [multiprocessing.Process(target=_append_many, args=(directory, w, 20)) for w in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert all(worker.exitcode == 0 for worker in workers)
+
+    result = first.verify()
+    assert result["valid"] and result["entries"] == 70
+    assert [entry["seq"] for entry in first.iter_entries(after=66)] == [67, 68, 69, 70]
+
+
+def test_torn_trailing_line_is_truncated(tmp_path):
+    log = SegmentedLog(str(tmp_path / "log"), segment_size=3)
+    for i in range(4):
+        log.append("contact_created", {"id": i})
+    with open(tmp_path / "log" / "log-000000000004.jsonl", "a") as f:
+        f.write('{"seq":5,"timestamp":"2025-')
+    # A crashed writer may also leave a segment it never wrote a full line to
+    (tmp_path / "log" / "log-000000000005.jsonl").write_text('{"seq":5')
+
+    assert [entry["seq"] for entry in log.iter_entries()] == [1, 2, 3, 4]
+    reopened = SegmentedLog(str(tmp_path / "log"), segment_size=3)
+    assert reopened.append("contact_created", {"id": 4})["seq"] == 5
+    assert reopened.verify()["valid"]
+    assert sorted(os.listdir(tmp_path / "log")) == [
+        "log-000000000001.jsonl", "log-000000000004.jsonl"
+    ]
+
+
+def test_incomplete_backend_fails_on_creation():
+    class PartialStore(OutreachStore):
+        def add(self, kind, record):
+            return 0
+
+    with pytest.raises(TypeError, match="iter_records"):
+        PartialStore()
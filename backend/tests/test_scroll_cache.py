@@ -0,0 +1,116 @@
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from backend.services.dominion.scroll_cache import ScrollResponseCache
+
+
+class Scroll(BaseModel):
+    title: str
+    verses: list[str]
+
+
+constitution = Scroll(title="Constitution", verses=["article"] * 200)
+seals = Scroll(title="Seals", verses=["seal"])
+entries = []
+
+
+calls = []
+
+
+def make_client():
+    router = APIRouter(prefix="/api/outreach")
+
+    @router.get("/constitution", response_model=Scroll)
+    def get_constitution():
+        return constitution
+
+    @router.get("/seals", response_model=Scroll)
+    def get_seals():
+        calls.append("seals")
+        return seals
+
+    @router.get("/ledger", response_model=list[Scroll])
+    def get_ledger():
+        return [seals]
+
+    @router.get("/entries")
+    def list_entries():
+        return entries
+
+    cache = ScrollResponseCache()
+    names = cache.install(router)
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app), names
+
+
+def test_only_static_scrolls_are_cached():
+    client, names = make_client()
+    assert names == ["constitution", "seals"]
+    entries.append("live")
+    assert client.get("/api/outreach/entries").json() == ["live"]
+    assert client.get("/api/outreach/ledger").json() == [seals.model_dump()]
+    entries.clear()
+
+
+def test_endpoints_are_not_called_at_install():
+    calls.clear()
+    client, _ = make_client()
+    assert calls == []
+    client.get("/api/outreach/seals")
+    client.get("/api/outreach/seals")
+    assert calls == ["seals"]
+
+
+def test_duplicate_scroll_names_are_rejected():
+    router = APIRouter()
+
+    @router.get("/council/seals", response_model=Scroll)
+    def get_council_seals():
+        return seals
+
+    @router.get("/archive/seals", response_model=Scroll)
+    def get_archive_seals():
+        return constitution
+
+    with pytest.raises(ValueError, match="seals"):
+        ScrollResponseCache().install(router)
+
+
+def test_etag_and_not_modified():
+    client, _ = make_client()
+    first = client.get("/api/outreach/seals")
+    assert first.json() == seals.model_dump()
+    etag = first.headers["etag"]
+
+    again = client.get("/api/outreach/seals", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+
+def test_large_scrolls_are_gzipped_once():
+    client, _ = make_client()
+    identity = client.get("/api/outreach/constitution", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/api/outreach/constitution", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in identity.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"] != identity.headers["etag"]
+    assert compressed.json() == identity.json() == constitution.model_dump()
+
+    # Either representation's tag revalidates
+    revalidated = client.get("/api/outreach/constitution", headers={"If-None-Match": identity.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+def test_bundle():
+    client, _ = make_client()
+    bundle = client.get("/api/outreach/scrolls/bundle", headers={"Accept-Encoding": "identity"})
+    assert bundle.json() == {"constitution": constitution.model_dump(), "seals": seals.model_dump()}
+
+    subset = client.get("/api/outreach/scrolls/bundle?names=seals")
+    assert subset.json() == {"seals": seals.model_dump()}
+    assert client.get("/api/outreach/scrolls/bundle?names=missing").status_code == 404
+    assert client.get("/api/outreach/scrolls/bundle",
+                      headers={"If-None-Match": bundle.headers["etag"]}).status_code == 304
@@ -2,12 +2,21 @@
 """
 Circuit Breaker Pattern Implementation for Health Checks
 Prevents cascading failures by stopping requests to failing services
+
+Only state transitions are guarded; the protected call itself runs without
+holding any lock, so a slow upstream does not serialize its callers. The
+breaker trips after consecutive failures and, optionally, on the failure rate
+over a sliding window of recent calls. It admits a limited number of probe
+calls while half-open, and can cap the number of concurrent calls per
+upstream (a bulkhead) with a queue timeout.
 """
 import time
 import asyncio
+import threading
+from collections import deque
 from enum import Enum
 from typing import Dict, Any, Callable, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,91 +26,300 @@ class CircuitBreakerState(Enum):
     OPEN = "open"          # Circuit is open, failing fast
     HALF_OPEN = "half_open"  # Testing if service has recovered
 
+class CircuitBreakerError(Exception):
+    """Raised when a call is rejected without reaching the upstream"""
+
+class CircuitBreakerOpenError(CircuitBreakerError):
+    """The circuit is open, or half-open with its probe budget in use"""
+
+class BulkheadFullError(CircuitBreakerError):
+    """No concurrency slot became free within the queue timeout"""
+
 class CircuitBreaker:
     def __init__(
         self,
         name: str,
         failure_threshold: int = 5,
         reset_timeout: int = 60,
-        expected_exception: type = Exception
+        expected_exception: type = Exception,
+        failure_rate_threshold: float = 0.5,
+        window_size: Optional[int] = None,
+        half_open_max_calls: int = 1,
+        max_concurrent: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+        latency_samples: int = 200
     ):
+        """
+        The circuit opens after ``failure_threshold`` consecutive failures.
+        With ``window_size`` set, it also opens once the last ``window_size``
+        calls contain at least ``failure_threshold`` failures and their failure
+        rate reaches ``failure_rate_threshold``, so intermittent failures trip it
+        too. After ``reset_timeout`` seconds up to
+        ``half_open_max_calls`` probes are let through; the circuit closes when
+        all of them succeed and reopens on the first failure.
+        ``max_concurrent`` enables the bulkhead; callers wait at most
+        ``queue_timeout`` seconds for a slot (``None`` waits indefinitely).
+        """
+        if not 0.0 < failure_rate_threshold <= 1.0:
+            raise ValueError("failure_rate_threshold must be in (0, 1]")
+        if failure_threshold < 1 or half_open_max_calls < 1:
+            raise ValueError("failure_threshold and half_open_max_calls must be positive")
+        if window_size is not None and window_size < failure_threshold:
+            raise ValueError("window_size must be at least failure_threshold")
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError("max_concurrent must be positive")
+
         self.name = name
         self.failure_threshold = failure_threshold
         self.reset_timeout = reset_timeout
         self.expected_exception = expected_exception
-        
-        self.failure_count = 0
-        self.last_failure_time = None
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_size = window_size
+        self.half_open_max_calls = half_open_max_calls
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+
         self.state = CircuitBreakerState.CLOSED
-        self._lock = asyncio.Lock()
-    
+        self.last_failure_time = None
+        self._consecutive_failures = 0
+        self._window = deque(maxlen=window_size) if window_size else None  # True for a failed call
+        self._opened_at: Optional[float] = None
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._generation = 0  # bumped on every transition; identifies a probe's half-open period
+        self._lock = threading.Lock()  # held for state transitions only
+        self._bulkhead = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+
+        # Metrics
+        self.in_flight = 0
+        self.total_calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.rejections = {"open": 0, "half_open": 0, "bulkhead": 0}
+        self.state_changes = 0
+        self._latencies = deque(maxlen=latency_samples)
+        self._latency_max = 0.0
+
+    @property
+    def failure_count(self) -> int:
+        """Consecutive failures since the last success"""
+        return self._consecutive_failures
+
+    @property
+    def window_failures(self) -> int:
+        """Failures among the calls in the sliding window"""
+        return sum(self._window) if self._window else 0
+
+    @property
+    def failure_rate(self) -> float:
+        return self.window_failures / len(self._window) if self._window else 0.0
+
+    def _should_trip(self) -> bool:
+        if self._consecutive_failures >= self.failure_threshold:
+            return True
+        return (self._window is not None and self.window_failures >= self.failure_threshold
+                and self.failure_rate >= self.failure_rate_threshold)
+
     async def call(self, func: Callable, *args, **kwargs):
         """Execute function with circuit breaker protection"""
-        async with self._lock:
-            if self.state == CircuitBreakerState.OPEN:
-                if self._should_attempt_reset():
-                    self.state = CircuitBreakerState.HALF_OPEN
-                    logger.info(f"Circuit breaker {self.name} moved to HALF_OPEN")
-                else:
-                    raise Exception(f"Circuit breaker {self.name} is OPEN")
-            
+        probe = self._acquire_permission()
+
+        if self._bulkhead is not None:
             try:
-                result = await func(*args, **kwargs)
-                await self._on_success()
-                return result
-            except self.expected_exception as e:
-                await self._on_failure()
-                raise e
-    
-    async def _on_success(self):
+                await asyncio.wait_for(self._bulkhead.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._release_probe(probe)
+                with self._lock:
+                    self.rejections["bulkhead"] += 1
+                raise BulkheadFullError(
+                    f"Circuit breaker {self.name} bulkhead is full "
+                    f"({self.max_concurrent} calls in flight)"
+                )
+            except BaseException:
+                self._release_probe(probe)
+                raise
+
+        self.in_flight += 1
+        started = time.monotonic()
+        try:
+            result = await func(*args, **kwargs)
+        except self.expected_exception:
+            self._on_failure(probe, time.monotonic() - started)
+            raise
+        except BaseException:
+            # Unexpected errors and cancellation say nothing about upstream health
+            self._release_probe(probe)
+            raise
+        else:
+            self._on_success(probe, time.monotonic() - started)
+            return result
+        finally:
+            self.in_flight -= 1
+            if self._bulkhead is not None:
+                self._bulkhead.release()
+
+    def _acquire_permission(self) -> Optional[int]:
+        """Admit or reject a call; half-open probes get their period's generation"""
+        with self._lock:
+            if self.state == CircuitBreakerState.OPEN:
+                if not self._should_attempt_reset():
+                    self.rejections["open"] += 1
+                    raise CircuitBreakerOpenError(f"Circuit breaker {self.name} is OPEN")
+                self._transition(CircuitBreakerState.HALF_OPEN)
+
+            if self.state == CircuitBreakerState.HALF_OPEN:
+                if self._probes_in_flight + self._probe_successes >= self.half_open_max_calls:
+                    self.rejections["half_open"] += 1
+                    raise CircuitBreakerOpenError(
+                        f"Circuit breaker {self.name} is HALF_OPEN and its probe budget is in use"
+                    )
+                self._probes_in_flight += 1
+                return self._generation
+
+            return None
+
+    def _is_current_probe(self, probe: Optional[int]) -> bool:
+        return probe is not None and probe == self._generation
+
+    def _release_probe(self, probe: Optional[int]):
+        """Give back a probe slot for a call that produced no outcome"""
+        if probe is not None:
+            with self._lock:
+                if self._is_current_probe(probe):
+                    self._probes_in_flight -= 1
+
+    def _record_latency(self, latency: float):
+        self._latencies.append(latency)
+        self._latency_max = max(self._latency_max, latency)
+
+    def _on_success(self, probe: Optional[int], latency: float):
         """Handle successful call"""
-        self.failure_count = 0
-        if self.state == CircuitBreakerState.HALF_OPEN:
-            self.state = CircuitBreakerState.CLOSED
-            logger.info(f"Circuit breaker {self.name} moved to CLOSED")
-    
-    async def _on_failure(self):
+        with self._lock:
+            self.total_calls += 1
+            self.successes += 1
+            self._record_latency(latency)
+
+            if self._is_current_probe(probe):
+                self._probes_in_flight -= 1
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_calls:
+                    self._transition(CircuitBreakerState.CLOSED)
+            elif self.state == CircuitBreakerState.CLOSED:
+                self._consecutive_failures = 0
+                if self._window is not None:
+                    self._window.append(False)
+
+    def _on_failure(self, probe: Optional[int], latency: float):
         """Handle failed call"""
-        self.failure_count += 1
-        self.last_failure_time = datetime.utcnow()
-        
-        if self.failure_count >= self.failure_threshold:
-            self.state = CircuitBreakerState.OPEN
-            logger.warning(f"Circuit breaker {self.name} moved to OPEN after {self.failure_count} failures")
-    
+        with self._lock:
+            self.total_calls += 1
+            self.failures += 1
+            self._record_latency(latency)
+            self.last_failure_time = datetime.utcnow()
+
+            if self._is_current_probe(probe):
+                self._probes_in_flight -= 1
+                self._transition(CircuitBreakerState.OPEN)
+            elif self.state == CircuitBreakerState.CLOSED:
+                self._consecutive_failures += 1
+                if self._window is not None:
+                    self._window.append(True)
+                if self._should_trip():
+                    logger.warning(
+                        f"Circuit breaker {self.name} tripping: {self._consecutive_failures} consecutive "
+                        f"failures, {self.window_failures} in the recent-call window"
+                    )
+                    self._transition(CircuitBreakerState.OPEN)
+
+    def _transition(self, state: CircuitBreakerState):
+        """Move to a new state; callers hold the lock"""
+        self.state = state
+        self.state_changes += 1
+        self._generation += 1
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == CircuitBreakerState.OPEN:
+            self._opened_at = time.monotonic()
+        elif state == CircuitBreakerState.CLOSED:
+            self._consecutive_failures = 0
+            if self._window is not None:
+                self._window.clear()
+            self._opened_at = None
+        log = logger.warning if state == CircuitBreakerState.OPEN else logger.info
+        log(f"Circuit breaker {self.name} moved to {state.name}")
+
     def _should_attempt_reset(self) -> bool:
         """Check if enough time has passed to attempt reset"""
-        if self.last_failure_time is None:
+        if self._opened_at is None:
             return True
-        
-        time_since_failure = datetime.utcnow() - self.last_failure_time
-        return time_since_failure.total_seconds() > self.reset_timeout
-    
-    def get_status(self) -> Dict[str, Any]:
-        """Get current circuit breaker status"""
+        return time.monotonic() - self._opened_at > self.reset_timeout
+
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """Latency of recent completed calls, in milliseconds"""
+        samples = sorted(self._latencies)
+        if not samples:
+            return {"samples": 0, "avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0,
+                    "max_ms": self._latency_max * 1000}
+
+        def percentile(q: float) -> float:
+            return samples[min(int(q * len(samples)), len(samples) - 1)] * 1000
+
         return {
-            "name": self.name,
-            "state": self.state.value,
-            "failure_count": self.failure_count,
-            "failure_threshold": self.failure_threshold,
-            "last_failure_time": self.last_failure_time.isoformat() if self.last_failure_time else None,
-            "reset_timeout": self.reset_timeout
+            "samples": len(samples),
+            "avg_ms": sum(samples) / len(samples) * 1000,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": self._latency_max * 1000
         }
 
+    def get_status(self) -> Dict[str, Any]:
+        """Get current circuit breaker status"""
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self.state.value,
+                "failure_count": self.failure_count,
+                "failure_threshold": self.failure_threshold,
+                "window_failures": self.window_failures,
+                "failure_rate": self.failure_rate,
+                "failure_rate_threshold": self.failure_rate_threshold,
+                "window_size": self.window_size,
+                "last_failure_time": self.last_failure_time.isoformat() if self.last_failure_time else None,
+                "reset_timeout": self.reset_timeout,
+                "half_open_max_calls": self.half_open_max_calls,
+                "bulkhead": {
+                    "max_concurrent": self.max_concurrent,
+                    "queue_timeout": self.queue_timeout
+                } if self.max_concurrent else None,
+                "in_flight": self.in_flight,
+                "total_calls": self.total_calls,
+                "successes": self.successes,
+                "failures": self.failures,
+                "rejections": dict(self.rejections, total=sum(self.rejections.values())),
+                "state_changes": self.state_changes,
+                "latency": self.get_latency_stats()
+            }
+
 class CircuitBreakerRegistry:
     """Global registry for circuit breakers"""
     def __init__(self):
         self._breakers: Dict[str, CircuitBreaker] = {}
-    
+        self._lock = threading.Lock()
+
     def get_or_create(self, name: str, **kwargs) -> CircuitBreaker:
         """Get existing circuit breaker or create new one"""
-        if name not in self._breakers:
-            self._breakers[name] = CircuitBreaker(name=name, **kwargs)
-        return self._breakers[name]
-    
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(name)
+                if breaker is None:
+                    breaker = self._breakers[name] = CircuitBreaker(name=name, **kwargs)
+        return breaker
+
     def get_all_status(self) -> Dict[str, Dict[str, Any]]:
-        """Get status of all circuit breakers"""
-        return {name: breaker.get_status() for name, breaker in self._breakers.items()}
+        """Get status of all circuit breakers, including latency and rejection counters"""
+        return {name: breaker.get_status() for name, breaker in list(self._breakers.items())}
 
 # Global registry instance
-circuit_breaker_registry = CircuitBreakerRegistry()
\ No newline at end of file
+circuit_breaker_registry = CircuitBreakerRegistry()
@@ -15,8 +15,10 @@ The honors system provides:
 
 import json
 import os
+import sqlite3
+import threading
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 from pathlib import Path
@@ -26,6 +28,18 @@ HONORS_LEDGER_PATH = "codex-flame/storage/honors/ledger"
 ACHIEVEMENTS_PATH = "codex-flame/storage/honors/achievements"
 MERIT_RECORDS_PATH = "codex-flame/storage/honors/merit-records"
 DISTINCTIONS_PATH = "codex-flame/storage/honors/distinctions"
+HONORS_INDEX_PATH = "codex-flame/storage/honors/honors-index.sqlite3"
+
+# Honor levels from lowest to highest
+HONOR_LEVEL_HIERARCHY = ['recognition', 'commendation', 'distinction', 'excellence', 'mastery', 'eternal_honor']
+
+# Record kind -> (profile list, field naming the individual)
+RECORD_KINDS = {
+    "honor": ("sacred_honors", "recipient_name"),
+    "merit": ("merit_records", "recipient_name"),
+    "achievement": ("achievements", "achiever_name"),
+    "distinction": ("ceremonial_distinctions", "holder_name")
+}
 
 class HonorCategory(Enum):
     """Categories of sacred honors"""
@@ -133,6 +147,164 @@ class CeremonialDistinction:
     ceremonial_regalia: Dict[str, Any]
     metadata: Dict[str, Any]
 
+class HonorsIndex:
+    """Recipient-keyed SQLite index over honors records with maintained merit totals
+
+    Each stored record is indexed under the individual it names, and the
+    recipient's running totals are updated in the same transaction, so merit
+    totals, profiles and leaderboards never scan the storage directories.
+    """
+
+    # Batch size for IN (...) lookups, under SQLite's bound-parameter limit
+    LOOKUP_BATCH = 500
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS honors_records (
+                    record_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    recipient TEXT NOT NULL,
+                    recorded_at TEXT NOT NULL,
+                    payload TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_honors_records_recipient
+                    ON honors_records (recipient, kind, recorded_at);
+                CREATE TABLE IF NOT EXISTS recipient_totals (
+                    recipient TEXT PRIMARY KEY,
+                    merit_points INTEGER NOT NULL DEFAULT 0,
+                    total_honors INTEGER NOT NULL DEFAULT 0,
+                    total_achievements INTEGER NOT NULL DEFAULT 0,
+                    active_distinctions INTEGER NOT NULL DEFAULT 0,
+                    highest_level_rank INTEGER NOT NULL DEFAULT -1
+                );
+                CREATE INDEX IF NOT EXISTS ix_recipient_totals_merit
+                    ON recipient_totals (merit_points DESC, recipient);
+                CREATE TABLE IF NOT EXISTS index_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            """)
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Held across a read-then-record sequence such as awarding merit"""
+        return self._lock
+
+    def _insert(self, kind: str, record_id: str, recorded_at: str, record: Dict[str, Any]) -> bool:
+        recipient = record.get(RECORD_KINDS[kind][1])
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO honors_records (record_id, kind, recipient, recorded_at, payload) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (record_id, kind, recipient, recorded_at, json.dumps(record))
+        )
+        if cursor.rowcount == 0:
+            return False
+
+        level = record.get('honor_level') if kind == "honor" else None
+        self._conn.execute(
+            "INSERT INTO recipient_totals "
+            "(recipient, merit_points, total_honors, total_achievements, active_distinctions, highest_level_rank) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (recipient) DO UPDATE SET "
+            "merit_points = merit_points + excluded.merit_points, "
+            "total_honors = total_honors + excluded.total_honors, "
+            "total_achievements = total_achievements + excluded.total_achievements, "
+            "active_distinctions = active_distinctions + excluded.active_distinctions, "
+            "highest_level_rank = MAX(highest_level_rank, excluded.highest_level_rank)",
+            (recipient,
+             record.get('merit_points', 0) if kind == "merit" else 0,
+             int(kind == "honor"),
+             int(kind == "achievement"),
+             int(kind == "distinction"),
+             HONOR_LEVEL_HIERARCHY.index(level) if level in HONOR_LEVEL_HIERARCHY else -1)
+        )
+        return True
+
+    def record(self, kind: str, record_id: str, recorded_at: str, record: Dict[str, Any]) -> bool:
+        """Index a record and update its recipient's totals; False if already indexed"""
+        with self._lock, self._conn:
+            return self._insert(kind, record_id, recorded_at, record)
+
+    def total_merit(self, recipient: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT merit_points FROM recipient_totals WHERE recipient = ?", (recipient,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def records_for(self, recipients: List[str]) -> Dict[str, List[Tuple[str, Dict[str, Any]]]]:
+        """(kind, record) pairs per recipient, in the order they were recorded"""
+        found: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {name: [] for name in recipients}
+        names = list(found)
+        with self._lock:
+            for start in range(0, len(names), self.LOOKUP_BATCH):
+                batch = names[start:start + self.LOOKUP_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT recipient, kind, payload FROM honors_records "
+                    f"WHERE recipient IN ({','.join('?' * len(batch))}) "
+                    f"ORDER BY recipient, recorded_at, record_id",
+                    batch
+                ).fetchall()
+                for recipient, kind, payload in rows:
+                    found[recipient].append((kind, json.loads(payload)))
+        return found
+
+    def leaderboard(self, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+        """Recipients ranked by total merit points"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT recipient, merit_points, total_honors, total_achievements, active_distinctions, "
+                "highest_level_rank FROM recipient_totals "
+                "ORDER BY merit_points DESC, recipient LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        return [{
+            "rank": offset + position,
+            "individual_name": recipient,
+            "total_merit_points": merit_points,
+            "total_honors": total_honors,
+            "total_achievements": total_achievements,
+            "active_distinctions": active_distinctions,
+            "highest_honor_level": HONOR_LEVEL_HIERARCHY[level_rank] if level_rank >= 0 else None
+        } for position, (recipient, merit_points, total_honors, total_achievements,
+                         active_distinctions, level_rank) in enumerate(rows, start=1)]
+
+    def import_json_storage(self, directories: Dict[str, Path]) -> int:
+        """Index the per-record JSON files of each kind; already indexed records are skipped"""
+        id_fields = {"honor": ("honor_id", "bestowment_date"), "merit": ("merit_id", "award_date"),
+                     "achievement": ("achievement_id", "completion_date"),
+                     "distinction": ("distinction_id", "appointment_date")}
+        imported = 0
+        with self._lock, self._conn:
+            for kind, directory in directories.items():
+                id_field, date_field = id_fields[kind]
+                for record_file in sorted(Path(directory).glob("*.json")):
+                    with open(record_file, 'r') as f:
+                        record = json.load(f)
+                    imported += self._insert(kind, record[id_field], record.get(date_field, ""), record)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO index_meta (key, value) VALUES ('json_imported_at', ?)",
+                (datetime.now(timezone.utc).isoformat(),)
+            )
+        return imported
+
+    @property
+    def json_imported(self) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM index_meta WHERE key = 'json_imported_at'"
+            ).fetchone() is not None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
 class HonorsSystem:
     """Main class for managing sacred honors, merits, and achievements"""
     
@@ -146,6 +318,16 @@ class HonorsSystem:
         
         # Ensure storage directories exist
         self._ensure_storage_directories()
+
+        # Recipient index; records written before it existed are imported once
+        self.index = HonorsIndex(self.storage_root / HONORS_INDEX_PATH)
+        if not self.index.json_imported:
+            self.index.import_json_storage({
+                "honor": self.honors_path,
+                "merit": self.merit_path,
+                "achievement": self.achievements_path,
+                "distinction": self.distinctions_path
+            })
         
     def _ensure_storage_directories(self):
         """Create necessary storage directories for honors system"""
@@ -253,41 +435,44 @@ class HonorsSystem:
         timestamp = datetime.now(timezone.utc).isoformat()
         merit_id = f"MR-{datetime.now().strftime('%Y-%m-%d')}-{os.urandom(4).hex().upper()}"
         
-        # Calculate total accumulated merit for recipient
-        accumulation_total = self._calculate_total_merit(recipient_name) + merit_points
-        
-        # Generate merit seal
-        seal_data = {
-            "merit_id": merit_id,
-            "recipient": recipient_name,
-            "points": merit_points,
-            "authority": awarding_authority,
-            "timestamp": timestamp
-        }
-        merit_seal = self._generate_sacred_seal(seal_data)
-        
-        # Create merit record
-        merit = MeritRecord(
-            merit_id=merit_id,
-            merit_type=merit_type,
-            recipient_name=recipient_name,
-            merit_points=merit_points,
-            awarding_authority=awarding_authority,
-            award_date=timestamp,
-            merit_reason=merit_reason,
-            validation_criteria=validation_criteria,
-            ceremonial_witness=ceremonial_witness,
-            merit_seal=merit_seal,
-            accumulation_total=accumulation_total,
-            metadata={
-                "merit_ceremony": "sacred_merit_recognition",
-                "validation_authority": awarding_authority,
-                "merit_covenant": "continuous_improvement"
+        # Hold the index lock from reading the total to storing the record so concurrent awards can't
+        # both build on the same total
+        with self.index.lock:
+            # Calculate total accumulated merit for recipient
+            accumulation_total = self._calculate_total_merit(recipient_name) + merit_points
+            
+            # Generate merit seal
+            seal_data = {
+                "merit_id": merit_id,
+                "recipient": recipient_name,
+                "points": merit_points,
+                "authority": awarding_authority,
+                "timestamp": timestamp
             }
-        )
-        
-        # Store merit record
-        self._store_merit_record(merit)
+            merit_seal = self._generate_sacred_seal(seal_data)
+            
+            # Create merit record
+            merit = MeritRecord(
+                merit_id=merit_id,
+                merit_type=merit_type,
+                recipient_name=recipient_name,
+                merit_points=merit_points,
+                awarding_authority=awarding_authority,
+                award_date=timestamp,
+                merit_reason=merit_reason,
+                validation_criteria=validation_criteria,
+                ceremonial_witness=ceremonial_witness,
+                merit_seal=merit_seal,
+                accumulation_total=accumulation_total,
+                metadata={
+                    "merit_ceremony": "sacred_merit_recognition",
+                    "validation_authority": awarding_authority,
+                    "merit_covenant": "continuous_improvement"
+                }
+            )
+            
+            # Store merit record
+            self._store_merit_record(merit)
         
         return merit
     
@@ -400,17 +585,8 @@ class HonorsSystem:
         return distinction
     
     def _calculate_total_merit(self, recipient_name: str) -> int:
-        """Calculate total accumulated merit points for a recipient"""
-        total_merit = 0
-        
-        for merit_file in self.merit_path.glob("*.json"):
-            with open(merit_file, 'r') as f:
-                merit_data = json.load(f)
-            
-            if merit_data.get('recipient_name') == recipient_name:
-                total_merit += merit_data.get('merit_points', 0)
-        
-        return total_merit
+        """Total accumulated merit points for a recipient, maintained by the index"""
+        return self.index.total_merit(recipient_name)
     
     def _store_sacred_honor(self, honor: SacredHonor):
         """Store a sacred honor to persistent storage"""
@@ -420,6 +596,7 @@ class HonorsSystem:
         honor_dict['honor_category'] = honor.honor_category.value
         honor_dict['honor_level'] = honor.honor_level.value
         
+        self.index.record("honor", honor.honor_id, honor.bestowment_date, honor_dict)
         honor_file = self.honors_path / f"{honor.honor_id}.json"
         with open(honor_file, 'w') as f:
             json.dump(honor_dict, f, indent=2)
@@ -429,6 +606,7 @@ class HonorsSystem:
         merit_dict = asdict(merit)
         merit_dict['merit_type'] = merit.merit_type.value
         
+        self.index.record("merit", merit.merit_id, merit.award_date, merit_dict)
         merit_file = self.merit_path / f"{merit.merit_id}.json"
         with open(merit_file, 'w') as f:
             json.dump(merit_dict, f, indent=2)
@@ -438,6 +616,7 @@ class HonorsSystem:
         achievement_dict = asdict(achievement)
         achievement_dict['achievement_type'] = achievement.achievement_type.value
         
+        self.index.record("achievement", achievement.achievement_id, achievement.completion_date, achievement_dict)
         achievement_file = self.achievements_path / f"{achievement.achievement_id}.json"
         with open(achievement_file, 'w') as f:
             json.dump(achievement_dict, f, indent=2)
@@ -446,73 +625,60 @@ class HonorsSystem:
         """Store a ceremonial distinction to persistent storage"""
         distinction_dict = asdict(distinction)
         
+        self.index.record("distinction", distinction.distinction_id, distinction.appointment_date,
+                          distinction_dict)
         distinction_file = self.distinctions_path / f"{distinction.distinction_id}.json"
         with open(distinction_file, 'w') as f:
             json.dump(distinction_dict, f, indent=2)
     
     def get_honors_profile(self, individual_name: str) -> Dict[str, Any]:
         """Get comprehensive honors profile for an individual"""
-        profile = {
-            "individual_name": individual_name,
-            "sacred_honors": [],
-            "merit_records": [],
-            "achievements": [],
-            "ceremonial_distinctions": [],
-            "total_merit_points": 0,
-            "honor_statistics": {
-                "total_honors": 0,
-                "highest_honor_level": None,
-                "total_achievements": 0,
-                "active_distinctions": 0
+        return self.get_honors_profiles([individual_name])[individual_name]
+    
+    def get_honors_profiles(self, individual_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get honors profiles for several individuals from one index lookup"""
+        profiles = {}
+        
+        for individual_name, records in self.index.records_for(individual_names).items():
+            profile = {
+                "individual_name": individual_name,
+                "sacred_honors": [],
+                "merit_records": [],
+                "achievements": [],
+                "ceremonial_distinctions": [],
+                "total_merit_points": 0,
+                "honor_statistics": {
+                    "total_honors": 0,
+                    "highest_honor_level": None,
+                    "total_achievements": 0,
+                    "active_distinctions": 0
+                }
             }
-        }
-        
-        # Collect sacred honors
-        for honor_file in self.honors_path.glob("*.json"):
-            with open(honor_file, 'r') as f:
-                honor_data = json.load(f)
             
-            if honor_data.get('recipient_name') == individual_name:
-                profile["sacred_honors"].append(honor_data)
-        
-        # Collect merit records
-        for merit_file in self.merit_path.glob("*.json"):
-            with open(merit_file, 'r') as f:
-                merit_data = json.load(f)
+            # Collect records by kind
+            for kind, record in records:
+                profile[RECORD_KINDS[kind][0]].append(record)
+                if kind == "merit":
+                    profile["total_merit_points"] += record.get('merit_points', 0)
             
-            if merit_data.get('recipient_name') == individual_name:
-                profile["merit_records"].append(merit_data)
-                profile["total_merit_points"] += merit_data.get('merit_points', 0)
-        
-        # Collect achievements
-        for achievement_file in self.achievements_path.glob("*.json"):
-            with open(achievement_file, 'r') as f:
-                achievement_data = json.load(f)
+            # Calculate statistics
+            profile["honor_statistics"]["total_honors"] = len(profile["sacred_honors"])
+            profile["honor_statistics"]["total_achievements"] = len(profile["achievements"])
+            profile["honor_statistics"]["active_distinctions"] = len(profile["ceremonial_distinctions"])
             
-            if achievement_data.get('achiever_name') == individual_name:
-                profile["achievements"].append(achievement_data)
-        
-        # Collect ceremonial distinctions
-        for distinction_file in self.distinctions_path.glob("*.json"):
-            with open(distinction_file, 'r') as f:
-                distinction_data = json.load(f)
-            
-            if distinction_data.get('holder_name') == individual_name:
-                profile["ceremonial_distinctions"].append(distinction_data)
-        
-        # Calculate statistics
-        profile["honor_statistics"]["total_honors"] = len(profile["sacred_honors"])
-        profile["honor_statistics"]["total_achievements"] = len(profile["achievements"])
-        profile["honor_statistics"]["active_distinctions"] = len(profile["ceremonial_distinctions"])
-        
-        # Determine highest honor level
-        if profile["sacred_honors"]:
+            # Determine highest honor level
             honor_levels = [honor.get('honor_level', '') for honor in profile["sacred_honors"]]
-            level_hierarchy = ['recognition', 'commendation', 'distinction', 'excellence', 'mastery', 'eternal_honor']
-            highest_index = max(level_hierarchy.index(level) for level in honor_levels if level in level_hierarchy)
-            profile["honor_statistics"]["highest_honor_level"] = level_hierarchy[highest_index]
+            ranked = [HONOR_LEVEL_HIERARCHY.index(level) for level in honor_levels if level in HONOR_LEVEL_HIERARCHY]
+            if ranked:
+                profile["honor_statistics"]["highest_honor_level"] = HONOR_LEVEL_HIERARCHY[max(ranked)]
+            
+            profiles[individual_name] = profile
         
-        return profile
+        return profiles
+    
+    def get_merit_leaderboard(self, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+        """Individuals ranked by total merit points, with their honor counts"""
+        return self.index.leaderboard(limit=limit, offset=offset)
 
 # Factory function for easy honors system creation
 def create_honors_system(storage_root: str = ".") -> HonorsSystem:
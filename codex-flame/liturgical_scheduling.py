@@ -13,10 +13,14 @@ The liturgical scheduling system ensures that:
 4. Ritual resources and sacred spaces are allocated appropriately
 """
 
+import copy
 import json
 import os
+import random
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import Dict, List, Optional, Any, Union, Tuple, Iterable
 from dataclasses import dataclass, asdict
 from enum import Enum
 from pathlib import Path
@@ -27,6 +31,9 @@ RITUAL_CALENDAR_PATH = "codex-flame/storage/liturgy/calendar"
 SACRED_OBSERVANCES_PATH = "codex-flame/storage/liturgy/observances"
 CEREMONIAL_RESOURCES_PATH = "codex-flame/storage/liturgy/resources"
 
+# Number of (start, end) windows whose observance expansions are kept
+RECURRENCE_CACHE_SIZE = 32
+
 class CeremonyType(Enum):
     """Types of sacred ceremonies"""
     DAILY_FLAME_TENDING = "daily_flame_tending"
@@ -118,6 +125,275 @@ class CeremonialResource:
     resource_status: str
     metadata: Dict[str, Any]
 
+def _to_timestamp(iso_datetime: str) -> float:
+    """POSIX timestamp of an ISO datetime; naive values are taken as UTC"""
+    dt = datetime.fromisoformat(iso_datetime.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+class JsonDirectoryMirror:
+    """In-memory copy of a directory of JSON records, kept in sync with disk
+
+    ``sync`` stats every file and re-reads only those whose (mtime, size,
+    inode) changed since the last look, so records written by other
+    processes are picked up without re-parsing the whole directory on every
+    call. The directory mtime alone is not used: rewriting a file in place
+    does not change it. ``write`` replaces files atomically so readers never
+    see a half-written record.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._signatures: Dict[str, Tuple[int, int, int]] = {}
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> Tuple[int, int, int]:
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def sync(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Reload changed files; returns the (added or updated, removed) records"""
+        changed, seen = [], set()
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                seen.add(entry.name)
+                signature = self._signature(entry.stat())
+                if self._signatures.get(entry.name) == signature:
+                    continue
+                with open(entry.path, 'r') as f:
+                    record = json.load(f)
+                self.records[entry.name] = record
+                self._signatures[entry.name] = signature
+                changed.append(record)
+
+        removed = [self.records.pop(name) for name in list(self.records) if name not in seen]
+        for name in set(self._signatures) - seen:
+            del self._signatures[name]
+        return changed, removed
+
+    def write(self, record_id: str, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Write a record file and mirror it; returns the record it replaced, if any"""
+        name = f"{record_id}.json"
+        path = self.directory / name
+        temp_path = self.directory / f".{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(record, f, indent=2)
+        os.replace(temp_path, path)
+
+        previous = self.records.get(name)
+        self.records[name] = record
+        self._signatures[name] = self._signature(os.stat(path))
+        return previous
+
+class _IntervalNode:
+    __slots__ = ("interval", "priority", "max_end", "left", "right")
+
+    def __init__(self, interval: Tuple[float, float, str]):
+        self.interval = interval
+        self.priority = random.random()
+        self.max_end = interval[1]
+        self.left: Optional["_IntervalNode"] = None
+        self.right: Optional["_IntervalNode"] = None
+
+    def update(self):
+        self.max_end = max(self.interval[1],
+                           self.left.max_end if self.left else self.interval[1],
+                           self.right.max_end if self.right else self.interval[1])
+
+class IntervalTree:
+    """(start, end, ceremony ID) intervals in a treap ordered by start
+
+    Every node carries the largest end in its subtree, so overlap queries
+    skip subtrees that finish before the query starts and stop descending
+    right once starts pass the query end: O(log n + k) expected, however
+    long any one reservation is. Inserts and removals are O(log n) expected.
+    """
+
+    def __init__(self):
+        self._root: Optional[_IntervalNode] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _rotate_right(node: _IntervalNode) -> _IntervalNode:
+        pivot = node.left
+        node.left, pivot.right = pivot.right, node
+        node.update()
+        pivot.update()
+        return pivot
+
+    @staticmethod
+    def _rotate_left(node: _IntervalNode) -> _IntervalNode:
+        pivot = node.right
+        node.right, pivot.left = pivot.left, node
+        node.update()
+        pivot.update()
+        return pivot
+
+    def _insert(self, node: Optional[_IntervalNode], new: _IntervalNode) -> _IntervalNode:
+        if node is None:
+            self._size += 1
+            return new
+        if new.interval < node.interval:
+            node.left = self._insert(node.left, new)
+            if node.left.priority > node.priority:
+                return self._rotate_right(node)
+        elif new.interval > node.interval:
+            node.right = self._insert(node.right, new)
+            if node.right.priority > node.priority:
+                return self._rotate_left(node)
+        node.update()
+        return node
+
+    @classmethod
+    def _merge(cls, left: Optional[_IntervalNode], right: Optional[_IntervalNode]) -> Optional[_IntervalNode]:
+        """Join two treaps whose intervals all sort left before right"""
+        if left is None or right is None:
+            return left or right
+        if left.priority > right.priority:
+            left.right = cls._merge(left.right, right)
+            left.update()
+            return left
+        right.left = cls._merge(left, right.left)
+        right.update()
+        return right
+
+    def _delete(self, node: Optional[_IntervalNode], interval: Tuple[float, float, str]) -> Optional[_IntervalNode]:
+        if node is None:
+            return None
+        if interval < node.interval:
+            node.left = self._delete(node.left, interval)
+        elif interval > node.interval:
+            node.right = self._delete(node.right, interval)
+        else:
+            self._size -= 1
+            return self._merge(node.left, node.right)
+        node.update()
+        return node
+
+    def add(self, start: float, end: float, ceremony_id: str):
+        self._root = self._insert(self._root, _IntervalNode((start, end, ceremony_id)))
+
+    def remove(self, start: float, end: float, ceremony_id: str):
+        self._root = self._delete(self._root, (start, end, ceremony_id))
+
+    def overlapping(self, start: float, end: float) -> Iterable[Tuple[float, float, str]]:
+        """Intervals with other_start < end and other_end > start, in no particular order"""
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None or node.max_end <= start:
+                continue
+            stack.append(node.left)
+            if node.interval[0] < end:
+                if node.interval[1] > start:
+                    yield node.interval
+                stack.append(node.right)
+
+    def starting_within(self, start: float, end: float) -> List[Tuple[float, float, str]]:
+        """Intervals whose start lies in [start, end], in order"""
+        found, stack, node = [], [], self._root
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                # Everything left of a node starting before the window does too
+                node = node.left if node.interval[0] >= start else None
+                continue
+            node = stack.pop()
+            if node.interval[0] > end:
+                break
+            if node.interval[0] >= start:
+                found.append(node.interval)
+            node = node.right
+        return found
+
+class CeremonyIndex:
+    """Time-ordered index of stored ceremonies with per-resource interval trees
+
+    Queries sync with the directory once per call: ``conflicts`` takes a whole
+    batch so scheduling N ceremonies stats the stored files once, not N times.
+    """
+
+    def __init__(self, ceremonies_path: Path):
+        self.mirror = JsonDirectoryMirror(ceremonies_path)
+        self._lock = threading.RLock()
+        self._by_id: Dict[str, Tuple[float, float, Dict[str, Any]]] = {}
+        self._by_time = IntervalTree()
+        self._by_resource: Dict[str, IntervalTree] = {}
+        self.sync()
+
+    def _add(self, ceremony_data: Dict[str, Any]):
+        ceremony_id = ceremony_data['ceremony_id']
+        self._remove(ceremony_id)
+        start = _to_timestamp(ceremony_data['scheduled_datetime'])
+        end = start + ceremony_data['duration_minutes'] * 60
+        self._by_id[ceremony_id] = (start, end, ceremony_data)
+        self._by_time.add(start, end, ceremony_id)
+        for resource in set(ceremony_data.get('required_resources', [])):
+            self._by_resource.setdefault(resource, IntervalTree()).add(start, end, ceremony_id)
+
+    def _remove(self, ceremony_id: str):
+        existing = self._by_id.pop(ceremony_id, None)
+        if existing is None:
+            return
+        start, end, ceremony_data = existing
+        self._by_time.remove(start, end, ceremony_id)
+        for resource in set(ceremony_data.get('required_resources', [])):
+            intervals = self._by_resource.get(resource)
+            if intervals is not None:
+                intervals.remove(start, end, ceremony_id)
+                if not intervals:
+                    del self._by_resource[resource]
+
+    def sync(self):
+        """Pick up ceremony files written or removed outside this index"""
+        with self._lock:
+            changed, removed = self.mirror.sync()
+            for ceremony_data in removed:
+                self._remove(ceremony_data['ceremony_id'])
+            for ceremony_data in changed:
+                self._add(ceremony_data)
+
+    def store(self, ceremony_dicts: List[Dict[str, Any]]):
+        """Write ceremonies to disk and index them"""
+        with self._lock:
+            for ceremony_dict in ceremony_dicts:
+                ceremony_dict = copy.deepcopy(ceremony_dict)
+                self.mirror.write(ceremony_dict['ceremony_id'], ceremony_dict)
+                self._add(ceremony_dict)
+
+    def in_window(self, start: float, end: float) -> List[Dict[str, Any]]:
+        """Ceremonies starting within [start, end], in time order"""
+        with self._lock:
+            self.sync()
+            # Copies, so callers cannot change the indexed times or resources
+            return [copy.deepcopy(self._by_id[ceremony_id][2])
+                    for _, _, ceremony_id in self._by_time.starting_within(start, end)]
+
+    def conflicts(self, requests: List[Tuple[str, float, float, List[str]]]) -> List[List[Tuple[str, List[str]]]]:
+        """For each (ceremony ID, start, end, resources), the (other ceremony ID, shared
+        resources) pairs overlapping it in time and resources, ordered by start"""
+        results = []
+        with self._lock:
+            self.sync()
+            for ceremony_id, start, end, resources in requests:
+                shared: Dict[str, List[str]] = {}
+                for resource in dict.fromkeys(resources):
+                    intervals = self._by_resource.get(resource)
+                    if intervals is None:
+                        continue
+                    for _, _, other_id in intervals.overlapping(start, end):
+                        if other_id != ceremony_id:
+                            shared.setdefault(other_id, []).append(resource)
+                order = {other_id: self._by_id[other_id][0] for other_id in shared}
+                results.append(sorted(shared.items(), key=lambda item: (order[item[0]], item[0])))
+        return results
+
 class LiturgicalScheduler:
     """Main class for managing liturgical scheduling and sacred ceremony coordination"""
     
@@ -131,6 +407,12 @@ class LiturgicalScheduler:
         
         # Ensure storage directories exist
         self._ensure_storage_directories()
+
+        # In-memory indexes over the stored ceremonies and observances
+        self.ceremony_index = CeremonyIndex(self.ceremonies_path)
+        self._observances = JsonDirectoryMirror(self.observances_path)
+        self._recurrence_cache: "OrderedDict[Tuple[str, str], List[Dict[str, Any]]]" = OrderedDict()
+        self._recurrence_lock = threading.Lock()
         
     def _ensure_storage_directories(self):
         """Create necessary storage directories for liturgical scheduling"""
@@ -189,11 +471,59 @@ class LiturgicalScheduler:
                         ceremonial_notes: str = "") -> CeremonySchedule:
         """Schedule a sacred ceremony"""
         
+        ceremony = self._build_ceremony(
+            ceremony_name, ceremony_type, scheduled_datetime, duration_minutes, location, presider,
+            participants, ceremony_purpose, priority, required_resources, sacred_preparations, ceremonial_notes
+        )
+        
+        # Store ceremony schedule
+        self._store_ceremony_schedules([ceremony])
+        
+        # Check for resource conflicts
+        conflicts = self._check_resource_conflicts([ceremony])[0]
+        if conflicts:
+            ceremony.metadata["resource_conflicts"] = conflicts
+        
+        return ceremony
+    
+    def schedule_ceremonies(self, ceremonies: List[Dict[str, Any]]) -> List[CeremonySchedule]:
+        """Schedule a batch of ceremonies, then check the whole batch for resource conflicts
+        
+        Each item holds the keyword arguments of ``schedule_ceremony``. Every
+        ceremony is stored before any conflicts are checked, so ceremonies in the
+        batch are also reported as conflicting with each other. The whole batch
+        is checked in one pass over the index.
+        """
+        scheduled = [self._build_ceremony(**request) for request in ceremonies]
+        
+        self._store_ceremony_schedules(scheduled)
+        
+        for ceremony, conflicts in zip(scheduled, self._check_resource_conflicts(scheduled)):
+            if conflicts:
+                ceremony.metadata["resource_conflicts"] = conflicts
+        
+        return scheduled
+    
+    def _build_ceremony(self,
+                        ceremony_name: str,
+                        ceremony_type: CeremonyType,
+                        scheduled_datetime: str,
+                        duration_minutes: int,
+                        location: str,
+                        presider: str,
+                        participants: List[Dict[str, str]],
+                        ceremony_purpose: str,
+                        priority: CeremonyPriority = CeremonyPriority.IMPORTANT,
+                        required_resources: Optional[List[str]] = None,
+                        sacred_preparations: Optional[List[str]] = None,
+                        ceremonial_notes: str = "") -> CeremonySchedule:
+        """Create a planned ceremony schedule without storing it"""
+        
         ceremony_id = self._generate_ceremony_id(ceremony_name, scheduled_datetime)
         notification_schedule = self._calculate_notification_schedule(scheduled_datetime, priority)
         
         # Create ceremony schedule
-        ceremony = CeremonySchedule(
+        return CeremonySchedule(
             ceremony_id=ceremony_id,
             ceremony_name=ceremony_name,
             ceremony_type=ceremony_type,
@@ -215,16 +545,6 @@ class LiturgicalScheduler:
                 "sacred_protocol": "traditional_ceremony_ordering"
             }
         )
-        
-        # Store ceremony schedule
-        self._store_ceremony_schedule(ceremony)
-        
-        # Check for resource conflicts
-        conflicts = self._check_resource_conflicts(ceremony)
-        if conflicts:
-            ceremony.metadata["resource_conflicts"] = conflicts
-        
-        return ceremony
     
     def establish_sacred_observance(self,
                                   observance_name: str,
@@ -325,16 +645,7 @@ class LiturgicalScheduler:
         }
         
         # Load scheduled ceremonies within date range
-        start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-        end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-        
-        for ceremony_file in self.ceremonies_path.glob("*.json"):
-            with open(ceremony_file, 'r') as f:
-                ceremony_data = json.load(f)
-            
-            ceremony_dt = datetime.fromisoformat(ceremony_data['scheduled_datetime'].replace('Z', '+00:00'))
-            if start_dt <= ceremony_dt <= end_dt:
-                calendar_data["ceremonies"].append(ceremony_data)
+        calendar_data["ceremonies"] = self.ceremony_index.in_window(_to_timestamp(start_date), _to_timestamp(end_date))
         
         # Include recurring observances if requested
         if include_observances:
@@ -385,19 +696,34 @@ class LiturgicalScheduler:
         return significances.get(phase_name, "Sacred lunar observance")
     
     def _generate_observance_instances(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
-        """Generate instances of recurring observances within date range"""
-        observance_instances = []
+        """Generate instances of recurring observances within date range
+        
+        Expansions are cached per (start, end) window and dropped whenever an
+        observance is added, changed or removed.
+        """
+        key = (start_date, end_date)
         
-        for observance_file in self.observances_path.glob("*.json"):
-            with open(observance_file, 'r') as f:
-                observance_data = json.load(f)
+        with self._recurrence_lock:
+            changed, removed = self._observances.sync()
+            if changed or removed:
+                self._recurrence_cache.clear()
             
-            instances = self._calculate_recurrence_instances(
-                observance_data, start_date, end_date
-            )
-            observance_instances.extend(instances)
+            observance_instances = self._recurrence_cache.get(key)
+            if observance_instances is None:
+                observance_instances = []
+                for observance_data in self._observances.records.values():
+                    instances = self._calculate_recurrence_instances(
+                        observance_data, start_date, end_date
+                    )
+                    observance_instances.extend(instances)
+                
+                self._recurrence_cache[key] = observance_instances
+                if len(self._recurrence_cache) > RECURRENCE_CACHE_SIZE:
+                    self._recurrence_cache.popitem(last=False)
+            else:
+                self._recurrence_cache.move_to_end(key)
         
-        return observance_instances
+        return [dict(instance) for instance in observance_instances]
     
     def _calculate_recurrence_instances(self, observance_data: Dict[str, Any], start_date: str, end_date: str) -> List[Dict[str, Any]]:
         """Calculate specific instances of a recurring observance"""
@@ -437,53 +763,44 @@ class LiturgicalScheduler:
         
         return instances
     
-    def _check_resource_conflicts(self, ceremony: CeremonySchedule) -> List[str]:
-        """Check for resource conflicts with scheduled ceremony"""
-        conflicts = []
-        
-        ceremony_start = datetime.fromisoformat(ceremony.scheduled_datetime.replace('Z', '+00:00'))
-        ceremony_end = ceremony_start + timedelta(minutes=ceremony.duration_minutes)
-        
-        # Check other ceremonies for resource conflicts
-        for ceremony_file in self.ceremonies_path.glob("*.json"):
-            with open(ceremony_file, 'r') as f:
-                other_ceremony_data = json.load(f)
-            
-            if other_ceremony_data['ceremony_id'] == ceremony.ceremony_id:
-                continue  # Skip self
-            
-            other_start = datetime.fromisoformat(other_ceremony_data['scheduled_datetime'].replace('Z', '+00:00'))
-            other_end = other_start + timedelta(minutes=other_ceremony_data['duration_minutes'])
-            
-            # Check for time overlap
-            if (ceremony_start < other_end and ceremony_end > other_start):
-                # Check for resource conflicts
-                common_resources = set(ceremony.required_resources) & set(other_ceremony_data.get('required_resources', []))
-                if common_resources:
-                    conflicts.append(f"Resource conflict with ceremony {other_ceremony_data['ceremony_id']}: {list(common_resources)}")
-        
-        return conflicts
+    def _check_resource_conflicts(self, ceremonies: List[CeremonySchedule]) -> List[List[str]]:
+        """Check each scheduled ceremony for resource conflicts"""
+        requests = []
+        for ceremony in ceremonies:
+            ceremony_start = _to_timestamp(ceremony.scheduled_datetime)
+            ceremony_end = ceremony_start + ceremony.duration_minutes * 60
+            requests.append((ceremony.ceremony_id, ceremony_start, ceremony_end, ceremony.required_resources))
+        
+        # Ceremonies overlapping in time that share a resource, from the per-resource interval trees
+        return [
+            [
+                f"Resource conflict with ceremony {other_id}: {common_resources}"
+                for other_id, common_resources in conflicts
+            ]
+            for conflicts in self.ceremony_index.conflicts(requests)
+        ]
     
-    def _store_ceremony_schedule(self, ceremony: CeremonySchedule):
-        """Store a ceremony schedule to persistent storage"""
-        ceremony_dict = asdict(ceremony)
-        
-        # Convert enums to strings for JSON serialization
-        ceremony_dict['ceremony_type'] = ceremony.ceremony_type.value
-        ceremony_dict['priority'] = ceremony.priority.value
-        ceremony_dict['status'] = ceremony.status.value
-        
-        ceremony_file = self.ceremonies_path / f"{ceremony.ceremony_id}.json"
-        with open(ceremony_file, 'w') as f:
-            json.dump(ceremony_dict, f, indent=2)
+    def _store_ceremony_schedules(self, ceremonies: List[CeremonySchedule]):
+        """Store ceremony schedules to persistent storage"""
+        ceremony_dicts = []
+        for ceremony in ceremonies:
+            ceremony_dict = asdict(ceremony)
+            
+            # Convert enums to strings for JSON serialization
+            ceremony_dict['ceremony_type'] = ceremony.ceremony_type.value
+            ceremony_dict['priority'] = ceremony.priority.value
+            ceremony_dict['status'] = ceremony.status.value
+            ceremony_dicts.append(ceremony_dict)
+        
+        self.ceremony_index.store(ceremony_dicts)
     
     def _store_sacred_observance(self, observance: SacredObservance):
         """Store a sacred observance to persistent storage"""
         observance_dict = asdict(observance)
         
-        observance_file = self.observances_path / f"{observance.observance_id}.json"
-        with open(observance_file, 'w') as f:
-            json.dump(observance_dict, f, indent=2)
+        with self._recurrence_lock:
+            self._observances.write(observance.observance_id, observance_dict)
+            self._recurrence_cache.clear()
     
     def _store_ceremonial_resource(self, resource: CeremonialResource):
         """Store a ceremonial resource to persistent storage"""
@@ -494,23 +811,11 @@ class LiturgicalScheduler:
             json.dump(resource_dict, f, indent=2)
     
     def get_upcoming_ceremonies(self, days_ahead: int = 7) -> List[Dict[str, Any]]:
-        """Get upcoming ceremonies within specified number of days"""
-        upcoming = []
+        """Get upcoming ceremonies within specified number of days, sorted by scheduled time"""
         current_time = datetime.now(timezone.utc)
         cutoff_time = current_time + timedelta(days=days_ahead)
         
-        for ceremony_file in self.ceremonies_path.glob("*.json"):
-            with open(ceremony_file, 'r') as f:
-                ceremony_data = json.load(f)
-            
-            ceremony_time = datetime.fromisoformat(ceremony_data['scheduled_datetime'].replace('Z', '+00:00'))
-            if current_time <= ceremony_time <= cutoff_time:
-                upcoming.append(ceremony_data)
-        
-        # Sort by scheduled time
-        upcoming.sort(key=lambda x: x['scheduled_datetime'])
-        
-        return upcoming
+        return self.ceremony_index.in_window(current_time.timestamp(), cutoff_time.timestamp())
 
 # Factory function for easy liturgical scheduler creation
 def create_liturgical_scheduler(storage_root: str = ".") -> LiturgicalScheduler:
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Test Liturgical Scheduling Module - Sacred Ceremony Scheduling Tests
+===================================================================
+
+Test suite for the liturgical scheduler indexes, covering:
+- Resource conflict detection through the interval trees
+- Batch ceremony scheduling
+- Time-sorted upcoming ceremony lookups
+- Observance expansion caching and on-disk synchronization
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+from datetime import datetime, timezone, timedelta
+
+from liturgical_scheduling import (
+    LiturgicalScheduler,
+    CeremonyType,
+    IntervalTree
+)
+
+
+BASE = datetime(2030, 1, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def ceremony_request(name, start_hours, duration_minutes=60, resources=None):
+    return {
+        "ceremony_name": name,
+        "ceremony_type": CeremonyType.WEEKLY_CONCORD,
+        "scheduled_datetime": (BASE + timedelta(hours=start_hours)).isoformat(),
+        "duration_minutes": duration_minutes,
+        "location": "Sacred Assembly Chamber",
+        "presider": "Elder Maximus",
+        "participants": [],
+        "ceremony_purpose": "test_ceremony",
+        "required_resources": resources or []
+    }
+
+
+class TestLiturgicalIndexes:
+    """Test suite for the LiturgicalScheduler ceremony and observance indexes"""
+
+    def setup_method(self):
+        """Set up test environment with temporary storage"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.scheduler = LiturgicalScheduler(storage_root=self.temp_dir)
+
+    def teardown_method(self):
+        """Clean up temporary storage"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_interval_tree_overlap(self):
+        """Test overlap queries, including a long reservation starting well before the window"""
+        intervals = IntervalTree()
+        intervals.add(0, 1000, "long")
+        intervals.add(900, 950, "short")
+        intervals.add(2000, 2100, "later")
+
+        assert sorted(i[2] for i in intervals.overlapping(940, 960)) == ["long", "short"]
+        assert list(intervals.overlapping(1000, 2000)) == []
+        intervals.remove(0, 1000, "long")
+        assert [i[2] for i in intervals.overlapping(940, 960)] == ["short"]
+        assert len(intervals) == 2
+
+    def test_interval_tree_matches_brute_force(self):
+        """Test overlap and start-window queries against a plain list through inserts and removals"""
+        rng = random.Random(5)
+        intervals, expected = IntervalTree(), set()
+        for n in range(600):
+            start = rng.randrange(0, 10000)
+            interval = (start, start + rng.choice([1, 30, 200, 5000]), f"c{n}")
+            intervals.add(*interval)
+            expected.add(interval)
+            if n % 3 == 0:
+                removed = rng.choice(sorted(expected))
+                intervals.remove(*removed)
+                expected.discard(removed)
+
+            if n % 50 == 0:
+                lo = rng.randrange(0, 10000)
+                hi = lo + rng.randrange(1, 500)
+                assert sorted(intervals.overlapping(lo, hi)) == sorted(
+                    i for i in expected if i[0] < hi and i[1] > lo)
+                assert intervals.starting_within(lo, hi) == sorted(
+                    i for i in expected if lo <= i[0] <= hi)
+
+        intervals.remove(-1, 0, "missing")
+        assert len(intervals) == len(expected)
+
+    def test_batch_scheduling_syncs_once(self):
+        """Test that a batch is stored and checked with one directory sync"""
+        for hours in range(5):
+            self.scheduler.schedule_ceremony(**ceremony_request(f"Stored {hours}", hours, 60, ["Flame"]))
+
+        mirror = self.scheduler.ceremony_index.mirror
+        calls = []
+        original_sync = mirror.sync
+        mirror.sync = lambda: calls.append(1) or original_sync()
+        scheduled = self.scheduler.schedule_ceremonies([
+            ceremony_request(f"Batch {hours}", hours + 0.5, 90, ["Flame"]) for hours in range(4)
+        ])
+
+        assert len(calls) == 1
+        # Each overlaps two stored ceremonies and its batch neighbours
+        assert [len(c.metadata["resource_conflicts"]) for c in scheduled] == [3, 4, 4, 3]
+
+    def test_single_ceremony_conflicts(self):
+        """Test that only ceremonies overlapping in time and resources conflict"""
+        first = self.scheduler.schedule_ceremony(**ceremony_request("Dawn Rite", 0, 120, ["Flame", "Chamber"]))
+        self.scheduler.schedule_ceremony(**ceremony_request("Later Rite", 3, 60, ["Flame"]))
+        self.scheduler.schedule_ceremony(**ceremony_request("Scroll Rite", 1, 60, ["Scrolls"]))
+
+        overlapping = self.scheduler.schedule_ceremony(**ceremony_request("Noon Rite", 1, 60, ["Chamber", "Flame"]))
+        assert overlapping.metadata["resource_conflicts"] == [
+            f"Resource conflict with ceremony {first.ceremony_id}: ['Chamber', 'Flame']"
+        ]
+
+        adjacent = self.scheduler.schedule_ceremony(**ceremony_request("Evening Rite", 4, 60, ["Flame"]))
+        assert "resource_conflicts" not in adjacent.metadata
+
+    def test_batch_scheduling_checks_whole_batch(self):
+        """Test that batch members are checked against each other and stored ceremonies"""
+        stored = self.scheduler.schedule_ceremony(**ceremony_request("Stored Rite", 0, 60, ["Flame"]))
+        first, second, third = self.scheduler.schedule_ceremonies([
+            ceremony_request("Batch One", 0.5, 60, ["Flame"]),
+            ceremony_request("Batch Two", 1, 60, ["Flame"]),
+            ceremony_request("Batch Three", 5, 60, ["Flame"])
+        ])
+
+        assert len(first.metadata["resource_conflicts"]) == 2
+        assert stored.ceremony_id in first.metadata["resource_conflicts"][0]
+        assert second.metadata["resource_conflicts"] == [
+            f"Resource conflict with ceremony {first.ceremony_id}: ['Flame']"
+        ]
+        assert "resource_conflicts" not in third.metadata
+        assert len(os.listdir(self.scheduler.ceremonies_path)) == 4
+
+    def test_upcoming_ceremonies_sorted(self):
+        """Test upcoming lookups return only the window, in time order"""
+        now = datetime.now(timezone.utc)
+        for name, days in [("Third", 3), ("First", 1), ("Beyond", 10), ("Second", 2), ("Past", -1)]:
+            request = ceremony_request(name, 0)
+            request["scheduled_datetime"] = (now + timedelta(days=days)).isoformat()
+            self.scheduler.schedule_ceremony(**request)
+
+        upcoming = self.scheduler.get_upcoming_ceremonies(days_ahead=7)
+        assert [c["ceremony_name"] for c in upcoming] == ["First", "Second", "Third"]
+
+    def test_index_picks_up_external_changes(self):
+        """Test that ceremony files written or removed outside the scheduler are synchronized"""
+        kept = self.scheduler.schedule_ceremony(**ceremony_request("Kept Rite", 0, 60, ["Flame"]))
+        removed = self.scheduler.schedule_ceremony(**ceremony_request("Removed Rite", 24, 60, ["Flame"]))
+
+        # Another process reads the same storage
+        other = LiturgicalScheduler(storage_root=self.temp_dir)
+        assert len(other.ceremony_index.in_window(BASE.timestamp(), (BASE + timedelta(days=2)).timestamp())) == 2
+
+        os.remove(self.scheduler.ceremonies_path / f"{removed.ceremony_id}.json")
+        with open(self.scheduler.ceremonies_path / f"{kept.ceremony_id}.json") as f:
+            external = json.load(f)
+        external.update({"ceremony_id": "LIT-EXTERNAL", "ceremony_name": "External Rite"})
+        with open(self.scheduler.ceremonies_path / "LIT-EXTERNAL.json", 'w') as f:
+            json.dump(external, f)
+
+        clash = other.schedule_ceremony(**ceremony_request("Clash Rite", 24.5, 60, ["Flame"]))
+        assert "resource_conflicts" not in clash.metadata
+        names = [c["ceremony_name"] for c in other.generate_ceremonial_calendar(
+            BASE.isoformat(), (BASE + timedelta(days=2)).isoformat(), include_observances=False
+        )["ceremonies"]]
+        assert names == ["Kept Rite", "External Rite", "Clash Rite"]
+
+    def test_observance_expansion_cache(self):
+        """Test cached observance expansions are invalidated when observances change"""
+        start, end = BASE.isoformat(), (BASE + timedelta(days=6)).isoformat()
+        self.scheduler.establish_sacred_observance(
+            observance_name="Daily Flame Tending",
+            observance_type="maintenance_ritual",
+            recurrence_pattern="daily",
+            base_datetime=BASE.isoformat(),
+            duration_minutes=45,
+            ceremonial_authority="Master Keeper",
+            sacred_significance="test_observance"
+        )
+
+        first = self.scheduler._generate_observance_instances(start, end)
+        assert len(first) == 7
+        first[0]["observance_name"] = "mutated"
+        assert self.scheduler._generate_observance_instances(start, end)[0]["observance_name"] == "Daily Flame Tending"
+
+        self.scheduler.establish_sacred_observance(
+            observance_name="Weekly Concord",
+            observance_type="gathering",
+            recurrence_pattern="weekly",
+            base_datetime=BASE.isoformat(),
+            duration_minutes=90,
+            ceremonial_authority="Master Keeper",
+            sacred_significance="test_observance"
+        )
+        assert len(self.scheduler._generate_observance_instances(start, end)) == 8
+
+    def test_in_place_rewrite_is_picked_up(self):
+        """Test that rewriting a ceremony file in place, which leaves the directory mtime alone, is synchronized"""
+        ceremony = self.scheduler.schedule_ceremony(**ceremony_request("Dawn Rite", 0, 60, ["Flame"]))
+        window = (BASE.timestamp(), (BASE + timedelta(days=1)).timestamp())
+        assert len(self.scheduler.ceremony_index.in_window(*window)) == 1
+
+        path = self.scheduler.ceremonies_path / f"{ceremony.ceremony_id}.json"
+        dir_mtime = os.stat(self.scheduler.ceremonies_path).st_mtime_ns
+        with open(path) as f:
+            stored = json.load(f)
+        stored.update({"ceremony_name": "Renamed Rite", "required_resources": ["Chamber"]})
+        with open(path, 'r+') as f:
+            json.dump(stored, f)
+            f.truncate()
+        assert os.stat(self.scheduler.ceremonies_path).st_mtime_ns == dir_mtime
+
+        assert [c["ceremony_name"] for c in self.scheduler.ceremony_index.in_window(*window)] == ["Renamed Rite"]
+        clash = self.scheduler.schedule_ceremony(**ceremony_request("Clash Rite", 0, 60, ["Chamber"]))
+        assert clash.metadata["resource_conflicts"] == [
+            f"Resource conflict with ceremony {ceremony.ceremony_id}: ['Chamber']"
+        ]
+
+    def test_in_window_returns_copies(self):
+        """Test that mutating returned ceremonies leaves the index untouched"""
+        self.scheduler.schedule_ceremony(**ceremony_request("Dawn Rite", 0, 60, ["Flame"]))
+        window = (BASE.timestamp(), (BASE + timedelta(days=1)).timestamp())
+
+        returned = self.scheduler.ceremony_index.in_window(*window)[0]
+        returned["ceremony_name"] = "mutated"
+        returned["required_resources"].append("Chamber")
+
+        assert self.scheduler.ceremony_index.in_window(*window)[0]["ceremony_name"] == "Dawn Rite"
+        clash = self.scheduler.schedule_ceremony(**ceremony_request("Chamber Rite", 0, 60, ["Chamber"]))
+        assert "resource_conflicts" not in clash.metadata
+        assert not [name for name in os.listdir(self.scheduler.ceremonies_path) if name.endswith(".tmp")]
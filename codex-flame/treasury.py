@@ -14,6 +14,8 @@ The treasury binding operates as the financial heart of the ceremonial system, e
 
 import json
 import os
+import sqlite3
+import threading
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, asdict
@@ -24,6 +26,11 @@ from pathlib import Path
 TREASURY_STORAGE_PATH = "codex-flame/storage/treasury"
 ABUNDANCE_FLOW_PATH = "codex-flame/storage/abundance-flows"
 BINDING_REGISTRY_PATH = "codex-flame/storage/binding-registry"
+TREASURY_LEDGER_PATH = "codex-flame/storage/treasury-ledger.sqlite3"
+
+# Operations that credit or debit the entities named on a treasury entry
+CREDIT_OPERATIONS = {"allocation", "ceremonial_grant"}
+DEBIT_OPERATIONS = {"transfer", "release"}
 
 class ResourceType(Enum):
     """Sacred resource types in the treasury binding system"""
@@ -71,6 +78,174 @@ class AbundanceFlow:
     ceremonial_authority: str
     binding_signature: str
 
+class TreasuryLedger:
+    """Indexed SQLite ledger of treasury entries, abundance flows and running balances
+
+    Every entry and flow is written together with the balance changes it causes
+    in one transaction, so balance lookups read a single row per resource type
+    and audits scan an index instead of the entry files.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS treasury_entries (
+                    entry_id TEXT PRIMARY KEY,
+                    timestamp TEXT NOT NULL,
+                    actor TEXT NOT NULL,
+                    capsule TEXT,
+                    resource_type TEXT NOT NULL,
+                    operation TEXT NOT NULL,
+                    amount REAL NOT NULL,
+                    payload TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_treasury_entries_timestamp
+                    ON treasury_entries (timestamp);
+                CREATE INDEX IF NOT EXISTS ix_treasury_entries_actor
+                    ON treasury_entries (actor, timestamp);
+                CREATE TABLE IF NOT EXISTS abundance_flows (
+                    flow_id TEXT PRIMARY KEY,
+                    timestamp TEXT NOT NULL,
+                    source_entity TEXT NOT NULL,
+                    target_entity TEXT NOT NULL,
+                    resource_type TEXT NOT NULL,
+                    flow_amount REAL NOT NULL,
+                    payload TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_abundance_flows_timestamp
+                    ON abundance_flows (timestamp);
+                CREATE TABLE IF NOT EXISTS treasury_balances (
+                    entity TEXT NOT NULL,
+                    resource_type TEXT NOT NULL,
+                    balance REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (entity, resource_type)
+                );
+                CREATE TABLE IF NOT EXISTS ledger_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            """)
+
+    def _apply(self, entity: str, resource_type: str, delta: float):
+        """Adjust a running balance (callers hold an open transaction)"""
+        self._conn.execute(
+            "INSERT INTO treasury_balances (entity, resource_type, balance) VALUES (?, ?, ?) "
+            "ON CONFLICT (entity, resource_type) DO UPDATE SET balance = balance + excluded.balance",
+            (entity, resource_type, delta)
+        )
+
+    def _insert_entry(self, entry_dict: Dict[str, Any]) -> bool:
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO treasury_entries "
+            "(entry_id, timestamp, actor, capsule, resource_type, operation, amount, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (entry_dict["entry_id"], entry_dict["timestamp"], entry_dict["actor"], entry_dict.get("capsule"),
+             entry_dict["resource_type"], entry_dict["operation"], entry_dict["amount"],
+             json.dumps(entry_dict))
+        )
+        if cursor.rowcount == 0:
+            return False
+
+        operation = entry_dict["operation"]
+        amount = entry_dict["amount"]
+        delta = amount if operation in CREDIT_OPERATIONS else -amount if operation in DEBIT_OPERATIONS else 0.0
+        # An entry counts toward both its actor and its capsule
+        for entity in {entry_dict["actor"], entry_dict.get("capsule")} - {None}:
+            self._apply(entity, entry_dict["resource_type"], delta)
+        return True
+
+    def _insert_flow(self, flow_dict: Dict[str, Any]) -> bool:
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO abundance_flows "
+            "(flow_id, timestamp, source_entity, target_entity, resource_type, flow_amount, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (flow_dict["flow_id"], flow_dict["timestamp"], flow_dict["source_entity"], flow_dict["target_entity"],
+             flow_dict["resource_type"], flow_dict["flow_amount"], json.dumps(flow_dict))
+        )
+        if cursor.rowcount == 0:
+            return False
+
+        self._apply(flow_dict["source_entity"], flow_dict["resource_type"], -flow_dict["flow_amount"])
+        self._apply(flow_dict["target_entity"], flow_dict["resource_type"], flow_dict["flow_amount"])
+        return True
+
+    def record_entry(self, entry_dict: Dict[str, Any]) -> bool:
+        """Record a treasury entry and its balance changes; False if already recorded"""
+        with self._lock, self._conn:
+            return self._insert_entry(entry_dict)
+
+    def record_flow(self, flow_dict: Dict[str, Any]) -> bool:
+        """Record an abundance flow, debiting the source and crediting the target"""
+        with self._lock, self._conn:
+            return self._insert_flow(flow_dict)
+
+    def get_balances(self, entity: str, resource_type: Optional[str] = None) -> Dict[str, float]:
+        query = "SELECT resource_type, balance FROM treasury_balances WHERE entity = ?"
+        params: List[Any] = [entity]
+        if resource_type:
+            query += " AND resource_type = ?"
+            params.append(resource_type)
+        with self._lock:
+            return {rt: balance for rt, balance in self._conn.execute(query, params)}
+
+    def query_entries(self,
+                      start_date: Optional[str] = None,
+                      end_date: Optional[str] = None,
+                      actor: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Entries in timestamp order, filtered through the timestamp/actor indexes"""
+        clauses, params = [], []
+        if actor:
+            clauses.append("actor = ?")
+            params.append(actor)
+        if start_date:
+            clauses.append("timestamp >= ?")
+            params.append(start_date)
+        if end_date:
+            clauses.append("timestamp <= ?")
+            params.append(end_date)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT payload FROM treasury_entries{where} ORDER BY timestamp, entry_id", params
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def import_json_storage(self, treasury_path: Path, abundance_path: Path) -> Dict[str, int]:
+        """Import per-entry JSON files into the ledger
+
+        Entries and flows already in the ledger are skipped, so the import can
+        be re-run safely. Returns how many of each were added.
+        """
+        imported = {"entries": 0, "flows": 0}
+        with self._lock, self._conn:
+            for entry_file in sorted(Path(treasury_path).glob("*.json")):
+                with open(entry_file, 'r') as f:
+                    imported["entries"] += self._insert_entry(json.load(f))
+            for flow_file in sorted(Path(abundance_path).glob("*.json")):
+                with open(flow_file, 'r') as f:
+                    imported["flows"] += self._insert_flow(json.load(f))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ledger_meta (key, value) VALUES ('json_imported_at', ?)",
+                (datetime.now(timezone.utc).isoformat(),)
+            )
+        return imported
+
+    @property
+    def json_imported(self) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM ledger_meta WHERE key = 'json_imported_at'"
+            ).fetchone() is not None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
 class TreasuryBinding:
     """Main treasury binding class for ceremonial resource management"""
     
@@ -83,6 +258,11 @@ class TreasuryBinding:
         
         # Ensure storage directories exist
         self._ensure_storage_directories()
+
+        # Indexed ledger; entry files written before it existed are imported once
+        self.ledger = TreasuryLedger(self.storage_root / TREASURY_LEDGER_PATH)
+        if not self.ledger.json_imported:
+            self.ledger.import_json_storage(self.treasury_path, self.abundance_path)
         
     def _ensure_storage_directories(self):
         """Create necessary storage directories"""
@@ -228,22 +408,24 @@ class TreasuryBinding:
         return binding_registry
     
     def _store_treasury_entry(self, entry: TreasuryEntry):
-        """Store a treasury entry to persistent storage"""
+        """Store a treasury entry in the ledger and to persistent storage"""
         entry_dict = asdict(entry)
         # Convert enum to string for JSON serialization
         entry_dict['resource_type'] = entry.resource_type.value
         entry_dict['operation'] = entry.operation.value
         
+        self.ledger.record_entry(entry_dict)
         entry_path = self.treasury_path / f"{entry.entry_id}.json"
         with open(entry_path, 'w') as f:
             json.dump(entry_dict, f, indent=2)
     
     def _store_abundance_flow(self, flow: AbundanceFlow):
-        """Store an abundance flow to persistent storage"""
+        """Store an abundance flow in the ledger and to persistent storage"""
         flow_dict = asdict(flow)
         # Convert enum to string for JSON serialization
         flow_dict['resource_type'] = flow.resource_type.value
         
+        self.ledger.record_flow(flow_dict)
         flow_path = self.abundance_path / f"{flow.flow_id}.json"
         with open(flow_path, 'w') as f:
             json.dump(flow_dict, f, indent=2)
@@ -251,62 +433,20 @@ class TreasuryBinding:
     def get_treasury_balance(self, 
                            entity_name: str, 
                            resource_type: Optional[ResourceType] = None) -> Dict[str, float]:
-        """Calculate current treasury balance for an entity"""
-        balances = {}
-        
-        # Scan all treasury entries for this entity
-        for entry_file in self.treasury_path.glob("*.json"):
-            with open(entry_file, 'r') as f:
-                entry_data = json.load(f)
-                
-            # Check if entry involves this entity
-            if entry_data.get('actor') == entity_name or entry_data.get('capsule') == entity_name:
-                rt = entry_data['resource_type']
-                amount = entry_data['amount']
-                operation = entry_data['operation']
-                
-                # Filter by resource type if specified
-                if resource_type and rt != resource_type.value:
-                    continue
-                
-                # Initialize balance if not exists
-                if rt not in balances:
-                    balances[rt] = 0.0
-                
-                # Add or subtract based on operation
-                if operation in ['allocation', 'ceremonial_grant']:
-                    balances[rt] += amount
-                elif operation in ['transfer', 'release']:
-                    balances[rt] -= amount
-        
-        return balances
+        """Current treasury balance for an entity, read from the ledger's running balances
+
+        Entries credit (allocation, ceremonial grant) or debit (transfer, release)
+        both their actor and capsule; abundance flows debit the source entity and
+        credit the target.
+        """
+        return self.ledger.get_balances(entity_name, resource_type.value if resource_type else None)
     
     def audit_treasury_operations(self, 
                                 start_date: Optional[str] = None,
                                 end_date: Optional[str] = None,
                                 actor: Optional[str] = None) -> List[Dict[str, Any]]:
         """Perform treasury audit with optional filters"""
-        audit_results = []
-        
-        # Scan all treasury entries
-        for entry_file in self.treasury_path.glob("*.json"):
-            with open(entry_file, 'r') as f:
-                entry_data = json.load(f)
-            
-            # Apply filters
-            if start_date and entry_data['timestamp'] < start_date:
-                continue
-            if end_date and entry_data['timestamp'] > end_date:
-                continue
-            if actor and entry_data['actor'] != actor:
-                continue
-            
-            audit_results.append(entry_data)
-        
-        # Sort by timestamp
-        audit_results.sort(key=lambda x: x['timestamp'])
-        
-        return audit_results
+        return self.ledger.query_entries(start_date=start_date, end_date=end_date, actor=actor)
 
 # Twilio integration for dominion flame treasury notifications
 class TwilioTreasuryNotifier:
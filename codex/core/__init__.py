@@ -1,7 +1,7 @@
 # Core module for Super-Codex-AI
 # Foundation components for the Codex system
 
-from .config import Settings, settings
+from .config import Settings, CodexConfig, settings
 from .bus import bus
 from .audit import log_event
 from .replay import archive
@@ -10,6 +10,7 @@ from .utils import CodexUtils
 
 __all__ = [
     'Settings',
+    'CodexConfig',
     'settings', 
     'bus',
     'log_event',
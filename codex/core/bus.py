@@ -1,14 +1,280 @@
-from typing import Callable, Dict, List
+"""
+Event bus for Super-Codex-AI.
+
+``on``/``emit`` keep the original behaviour: plain handlers run inline on the
+caller's thread. ``subscribe`` (and ``on`` with a coroutine function) registers
+a handler that runs off the caller's path instead: every subscription gets its
+own bounded queue and worker count, coroutine handlers are awaited on the
+event loop and blocking handlers run on the subscription's thread pool.
+Event names can be subscribed with wildcards such as ``user.*`` or ``*``.
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _is_pattern(evt: str) -> bool:
+    return any(char in evt for char in "*?[")
+
+
+class EventHandler:
+    """Base class for objects whose methods are subscribed to the bus"""
+
+
+class Subscription:
+    """A handler with its own bounded queue and workers
+
+    ``overflow`` decides what happens when the queue is full: ``block`` makes
+    ``publish`` wait for room (``emit`` cannot wait and drops instead),
+    ``drop`` discards the event. Lag is the time an event spent queued
+    before a worker picked it up.
+    """
+
+    OVERFLOW_POLICIES = ("block", "drop")
+
+    def __init__(self, pattern: str, handler: Callable, queue_size: int = 1000,
+                 workers: int = 1, overflow: str = "block"):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        if queue_size <= 0 or workers <= 0:
+            raise ValueError("queue_size and workers must be positive")
+
+        self.pattern = pattern
+        self.handler = handler
+        self.name = getattr(handler, "__qualname__", repr(handler))
+        self.is_coroutine = inspect.iscoroutinefunction(handler)
+        self.queue_size = queue_size
+        self.workers = workers
+        self.overflow = overflow
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Metrics
+        self.delivered = 0
+        self.processed = 0
+        self.errors = 0
+        self.dropped = 0
+        self.last_error: Optional[str] = None
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.last_lag = 0.0
+
+    def matches(self, evt: str) -> bool:
+        if _is_pattern(self.pattern):
+            return fnmatchcase(evt, self.pattern)
+        return evt == self.pattern
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """Bind the queue and workers to a running loop (first use only)"""
+        if self.loop is not None:
+            return
+        self.loop = loop
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        if not self.is_coroutine:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                thread_name_prefix=f"bus-{self.name}")
+        self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+    def offer(self, evt: str, payload: Dict[str, Any]) -> bool:
+        """Queue without waiting (loop thread only); False if dropped"""
+        try:
+            self._queue.put_nowait((time.monotonic(), evt, payload))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self.delivered += 1
+        return True
+
+    async def put(self, evt: str, payload: Dict[str, Any]) -> bool:
+        """Queue, waiting for room when the overflow policy is ``block``"""
+        if self.overflow == "drop":
+            return self.offer(evt, payload)
+        await self._queue.put((time.monotonic(), evt, payload))
+        self.delivered += 1
+        return True
+
+    async def _work(self):
+        while True:
+            enqueued, evt, payload = await self._queue.get()
+            lag = time.monotonic() - enqueued
+            self.last_lag = lag
+            self.lag_total += lag
+            self.lag_max = max(self.lag_max, lag)
+            try:
+                if self.is_coroutine:
+                    await self.handler(payload)
+                else:
+                    await self.loop.run_in_executor(self._executor, self.handler, payload)
+                self.processed += 1
+            except Exception as e:
+                self.errors += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.error(f"Event handler {self.name} failed on {evt}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def drain(self):
+        """Wait until every queued event has been handled"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self):
+        """Drain, then stop the workers"""
+        await self.drain()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        started = self.processed + self.errors
+        return {
+            "pattern": self.pattern,
+            "handler": self.name,
+            "mode": "coroutine" if self.is_coroutine else "thread",
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_size": self.queue_size,
+            "delivered": self.delivered,
+            "processed": self.processed,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "last_error": self.last_error,
+            "lag_seconds": {
+                "last": self.last_lag,
+                "average": self.lag_total / started if started else 0.0,
+                "max": self.lag_max
+            }
+        }
+
 
 class EventBus:
     def __init__(self):
         self._handlers: Dict[str, List[Callable]] = {}
+        self._subscriptions: List[Subscription] = []
+        self._resolved: Dict[str, Tuple[List[Callable], List[Subscription]]] = {}
+        self._lock = threading.Lock()
 
     def on(self, evt: str, handler: Callable):
-        self._handlers.setdefault(evt, []).append(handler)
+        """Register a handler; coroutine functions become async subscriptions"""
+        if inspect.iscoroutinefunction(handler):
+            self.subscribe(evt, handler)
+            return
+        with self._lock:
+            self._handlers.setdefault(evt, []).append(handler)
+            self._resolved.clear()
+
+    def subscribe(self, evt: str, handler: Callable, queue_size: int = 1000,
+                  workers: int = 1, overflow: str = "block") -> Subscription:
+        """Run ``handler`` off the emitting path with its own queue and workers"""
+        subscription = Subscription(evt, handler, queue_size, workers, overflow)
+        with self._lock:
+            self._subscriptions.append(subscription)
+            self._resolved.clear()
+
+        try:
+            subscription.start(asyncio.get_running_loop())
+        except RuntimeError:
+            pass  # started by the first emit/publish inside a loop
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription):
+        """Stop routing events to a subscription and drain what it has queued"""
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+            self._resolved.clear()
+        await subscription.close()
+
+    def _resolve(self, evt: str) -> Tuple[List[Callable], List[Subscription]]:
+        """Handlers and subscriptions for an event name (cached until they change)"""
+        resolved = self._resolved.get(evt)
+        if resolved is None:
+            with self._lock:
+                handlers = list(self._handlers.get(evt, []))
+                for pattern, pattern_handlers in self._handlers.items():
+                    if pattern != evt and _is_pattern(pattern) and fnmatchcase(evt, pattern):
+                        handlers.extend(pattern_handlers)
+                subscriptions = [s for s in self._subscriptions if s.matches(evt)]
+                resolved = self._resolved[evt] = (handlers, subscriptions)
+        return resolved
+
+    @staticmethod
+    def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def _offer(self, subscription: Subscription, evt: str, payload: Dict[str, Any],
+               loop: Optional[asyncio.AbstractEventLoop]):
+        if subscription.loop is None:
+            if loop is None:
+                subscription.dropped += 1
+                logger.warning(f"No event loop for async handler {subscription.name}; dropping {evt}")
+                return
+            subscription.start(loop)
+
+        if subscription.loop is loop:
+            subscription.offer(evt, payload)
+        else:
+            subscription.loop.call_soon_threadsafe(subscription.offer, evt, payload)
 
     def emit(self, evt: str, payload: dict):
-        for h in self._handlers.get(evt, []):
+        handlers, subscriptions = self._resolve(evt)
+        for h in handlers:
+            h(payload)
+
+        if subscriptions:
+            loop = self._running_loop()
+            for subscription in subscriptions:
+                self._offer(subscription, evt, payload, loop)
+
+    async def publish(self, evt: str, payload: dict):
+        """Like ``emit``, but waits for queue room on ``block`` subscriptions"""
+        handlers, subscriptions = self._resolve(evt)
+        for h in handlers:
             h(payload)
 
-bus = EventBus()
\ No newline at end of file
+        loop = asyncio.get_running_loop()
+        for subscription in subscriptions:
+            if subscription.loop is None:
+                subscription.start(loop)
+            if subscription.loop is loop:
+                await subscription.put(evt, payload)
+            else:
+                self._offer(subscription, evt, payload, loop)
+
+    async def drain(self):
+        """Wait until every subscription has handled what it has queued"""
+        await asyncio.gather(*(s.drain() for s in list(self._subscriptions) if s.loop is not None))
+
+    async def close(self):
+        """Drain and stop all subscriptions"""
+        subscriptions = list(self._subscriptions)
+        with self._lock:
+            self._subscriptions.clear()
+            self._resolved.clear()
+        await asyncio.gather(*(s.close() for s in subscriptions if s.loop is not None))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-subscription queue depth, lag and error counters"""
+        return {
+            "sync_handlers": sum(len(handlers) for handlers in self._handlers.values()),
+            "subscriptions": [s.get_stats() for s in self._subscriptions]
+        }
+
+bus = EventBus()
@@ -16,4 +16,31 @@ class Settings(BaseSettings):
         Path(self.VECTOR_DIR).mkdir(parents=True, exist_ok=True)
         return str(Path(self.VECTOR_DIR) / self.VECTOR_NAME)
 
+class CodexConfig(Settings):
+    """Settings under the lower-case names the engines read"""
+
+    @property
+    def corpus_dir(self) -> str:
+        return self.CORPUS_DIR
+
+    @property
+    def vector_store_dir(self) -> str:
+        return self.VECTOR_DIR
+
+    @property
+    def audit_log_path(self) -> str:
+        return self.AUDIT_LOG_PATH
+
+    @property
+    def replay_dir(self) -> str:
+        return self.REPLAY_DIR
+
+    @property
+    def identity_dir(self) -> str:
+        return self.IDENTITIES_DIR
+
+    @property
+    def seal_dir(self) -> str:
+        return self.SEALS_DIR
+
 settings = Settings()
\ No newline at end of file
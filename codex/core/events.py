@@ -4,7 +4,9 @@ Event Management System for Super-Codex-AI
 Provides event handling and bus integration
 """
 
-from typing import Dict, List, Callable, Any, Optional
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Callable, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -40,15 +42,22 @@ class Event:
     correlation_id: Optional[str] = None
 
 class EventManager:
-    """Enhanced event manager with filtering and history"""
+    """Enhanced event manager with filtering and history
     
-    def __init__(self):
-        self.event_history: List[Event] = []
-        self.max_history_size = 1000
-        
-    def emit_event(self, event_type: str, payload: Dict[str, Any], 
-                  source: Optional[str] = None, correlation_id: Optional[str] = None):
-        """Emit an event through the bus and record it in history"""
+    History is a ring buffer of the last ``max_history_size`` events, so
+    recording is O(1). ``history_by_type`` indexes the same events by type;
+    an event leaving the ring is also the oldest of its type, so it is popped
+    from the front of that type's deque and the index never holds more than
+    the ring does.
+    """
+    
+    def __init__(self, max_history_size: int = 1000):
+        self.max_history_size = max_history_size
+        self.event_history: Deque[Event] = deque(maxlen=max_history_size)
+        self.history_by_type: Dict[str, Deque[Event]] = {}
+    
+    def _record(self, event_type: str, payload: Dict[str, Any],
+                source: Optional[str], correlation_id: Optional[str]) -> Event:
         event = Event(
             event_type=event_type,
             payload=payload,
@@ -57,34 +66,60 @@ class EventManager:
             correlation_id=correlation_id
         )
         
-        # Add to history (with size limit)
-        self.event_history.append(event)
-        if len(self.event_history) > self.max_history_size:
-            self.event_history.pop(0)
+        # Prune the type index for the event the ring is about to drop
+        history = self.event_history
+        if history.maxlen is not None and history and len(history) == history.maxlen:
+            evicted = history[0]
+            of_type = self.history_by_type[evicted.event_type]
+            of_type.popleft()
+            if not of_type:
+                del self.history_by_type[evicted.event_type]
+        
+        # Add to history (the ring buffer drops the oldest)
+        history.append(event)
+        if history.maxlen != 0:
+            self.history_by_type.setdefault(event_type, deque()).append(event)
+        return event
+        
+    def emit_event(self, event_type: str, payload: Dict[str, Any], 
+                  source: Optional[str] = None, correlation_id: Optional[str] = None):
+        """Emit an event through the bus and record it in history"""
+        self._record(event_type, payload, source, correlation_id)
         
         # Emit through bus
         bus.emit(event_type, payload)
+    
+    async def publish_event(self, event_type: str, payload: Dict[str, Any],
+                            source: Optional[str] = None, correlation_id: Optional[str] = None):
+        """Record an event and publish it, waiting for room on full async queues"""
+        self._record(event_type, payload, source, correlation_id)
+        await bus.publish(event_type, payload)
         
     def register_handler(self, event_type: str, handler: Callable):
         """Register an event handler"""
         bus.on(event_type, handler)
+    
+    def subscribe_handler(self, event_type: str, handler: Callable, **options):
+        """Register a handler that runs off the emitting path (see ``EventBus.subscribe``)"""
+        return bus.subscribe(event_type, handler, **options)
         
     def get_event_history(self, event_type: Optional[str] = None, 
                          limit: Optional[int] = None) -> List[Event]:
         """Get event history with optional filtering"""
-        events = self.event_history
-        
         if event_type:
-            events = [e for e in events if e.event_type == event_type]
-            
+            events = self.history_by_type.get(event_type, ())
+        else:
+            events = self.event_history
+        
         if limit:
-            events = events[-limit:]
+            return list(islice(reversed(events), limit))[::-1]
             
-        return events
+        return list(events)
         
     def clear_history(self):
         """Clear event history"""
         self.event_history.clear()
+        self.history_by_type.clear()
 
 # Global event manager instance
 event_manager = EventManager()
@@ -94,6 +129,10 @@ def on(event_type: str, handler: Callable):
     """Register an event handler (convenience function)"""
     event_manager.register_handler(event_type, handler)
 
+def subscribe(event_type: str, handler: Callable, **options):
+    """Register an off-path handler with its own queue (convenience function)"""
+    return event_manager.subscribe_handler(event_type, handler, **options)
+
 def emit(event_type: str, payload: Dict[str, Any], 
          source: Optional[str] = None, correlation_id: Optional[str] = None):
     """Emit an event (convenience function)"""
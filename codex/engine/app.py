@@ -148,6 +148,9 @@ class CodexEngine:
             if hasattr(self.rag, 'cleanup'):
                 await self.rag.cleanup()
             
+            # Drain buffered audit events to the ledger
+            await self.auditor.shutdown()
+            
             logger.info("Codex Engine shutdown complete")
             
         except Exception as e:
@@ -8,12 +8,15 @@ import os
 import sys
 import asyncio
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
-from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional, Any, Union, Callable
+from datetime import datetime, timezone
 import logging
 import json
 import hashlib
-from collections import defaultdict, deque
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict, deque, OrderedDict
 from dataclasses import dataclass, asdict
 from enum import Enum
 
@@ -69,13 +72,142 @@ class AuditEvent:
         return cls(**data)
 
 
+class QuantileSketch:
+    """Mergeable streaming quantile sketch with bounded relative error
+    
+    Values land in logarithmic buckets whose bounds grow by
+    ``gamma = (1 + a) / (1 - a)``, so every reported quantile is within
+    ``relative_accuracy`` of a true sample value while memory grows with the
+    log of the value range rather than with the number of samples.
+    """
+    
+    MIN_VALUE = 1e-9
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= self.MIN_VALUE:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + 1
+    
+    def merge(self, other: "QuantileSketch"):
+        """Fold another sketch with the same accuracy into this one"""
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        
+        # Nearest rank: the smallest value with at least q of the samples at or below it
+        rank = max(1, math.ceil(q * self.count))
+        seen = self.zero_count
+        if seen >= rank:
+            return max(self.min, 0.0)
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+    
+    def summary(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "average": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99)
+        }
+
+
+class RollingWindow:
+    """Time-bucketed rolling window of counts, errors and a quantile sketch
+    
+    Holds ``bucket_count`` buckets of ``bucket_seconds`` each in a ring; a
+    bucket is reset when its slot is reused, so memory is fixed and reads
+    merge at most ``bucket_count`` sketches regardless of traffic.
+    """
+    
+    def __init__(self, bucket_seconds: int, bucket_count: int, relative_accuracy: float = 0.01):
+        self.bucket_seconds = bucket_seconds
+        self.bucket_count = bucket_count
+        self.relative_accuracy = relative_accuracy
+        self._epochs: List[int] = [-1] * bucket_count
+        self._buckets: List[Optional[Dict[str, Any]]] = [None] * bucket_count
+    
+    def _bucket(self, now: float) -> Dict[str, Any]:
+        epoch = int(now // self.bucket_seconds)
+        slot = epoch % self.bucket_count
+        if self._epochs[slot] != epoch:
+            self._epochs[slot] = epoch
+            self._buckets[slot] = {"errors": 0, "sketch": QuantileSketch(self.relative_accuracy)}
+        return self._buckets[slot]
+    
+    def record(self, value: float, error: bool = False, now: Optional[float] = None):
+        bucket = self._bucket(time.time() if now is None else now)
+        bucket["sketch"].add(value)
+        if error:
+            bucket["errors"] += 1
+    
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Merged statistics for the live buckets"""
+        current = int((time.time() if now is None else now) // self.bucket_seconds)
+        merged = QuantileSketch(self.relative_accuracy)
+        errors = 0
+        for epoch, bucket in zip(self._epochs, self._buckets):
+            if bucket is not None and current - self.bucket_count < epoch <= current:
+                merged.merge(bucket["sketch"])
+                errors += bucket["errors"]
+        
+        summary = merged.summary()
+        summary["errors"] = errors
+        summary["window_seconds"] = self.bucket_seconds * self.bucket_count
+        return summary
+
+
 class QueryTracker:
-    """Track query lifecycle and performance"""
+    """Track query lifecycle and performance
+    
+    Completed queries are kept in an id-keyed ``OrderedDict`` (oldest evicted
+    first) and latencies feed quantile sketches and rolling windows, so
+    lookups and dashboard statistics cost the same however long the process
+    has been up.
+    """
     
     def __init__(self, max_queries: int = 1000):
+        self.max_queries = max_queries
         self.active_queries: Dict[str, Dict[str, Any]] = {}
-        self.completed_queries: deque = deque(maxlen=max_queries)
+        self.completed_queries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self.query_stats = defaultdict(lambda: {"count": 0, "total_time": 0, "errors": 0})
+        self.latency_by_type: Dict[str, QuantileSketch] = defaultdict(QuantileSketch)
+        self.recent_by_type: Dict[str, RollingWindow] = {}
+        self.last_hour = RollingWindow(bucket_seconds=60, bucket_count=60)
+        self.last_day = RollingWindow(bucket_seconds=3600, bucket_count=24)
     
     def start_query(self, query_id: str, query: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Start tracking a query"""
@@ -122,8 +254,16 @@ class QueryTracker:
         if error:
             stats["errors"] += 1
         
-        # Add to completed queries
-        self.completed_queries.append(query_info)
+        self.latency_by_type[query_type].add(query_info["duration"])
+        if query_type not in self.recent_by_type:
+            self.recent_by_type[query_type] = RollingWindow(bucket_seconds=60, bucket_count=60)
+        for window in (self.recent_by_type[query_type], self.last_hour, self.last_day):
+            window.record(query_info["duration"], error=bool(error))
+        
+        # Add to completed queries, evicting the oldest
+        self.completed_queries[query_id] = query_info
+        if len(self.completed_queries) > self.max_queries:
+            self.completed_queries.popitem(last=False)
         
         return query_info
     
@@ -134,11 +274,7 @@ class QueryTracker:
             return self.active_queries[query_id]
         
         # Check completed queries
-        for query_info in self.completed_queries:
-            if query_info["query_id"] == query_id:
-                return query_info
-        
-        return None
+        return self.completed_queries.get(query_id)
     
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get performance statistics"""
@@ -146,59 +282,264 @@ class QueryTracker:
         total_time = sum(stats["total_time"] for stats in self.query_stats.values())
         total_errors = sum(stats["errors"] for stats in self.query_stats.values())
         
+        last_hour = self.last_hour.snapshot()
+        
         return {
             "total_queries": total_queries,
             "total_processing_time": total_time,
             "average_response_time": total_time / total_queries if total_queries > 0 else 0,
             "error_rate": total_errors / total_queries if total_queries > 0 else 0,
             "active_queries": len(self.active_queries),
-            "by_type": dict(self.query_stats),
-            "last_hour_queries": self._get_recent_query_count(hours=1),
-            "last_day_queries": self._get_recent_query_count(hours=24)
+            "by_type": {
+                query_type: {**stats, "latency": self.latency_by_type[query_type].summary()}
+                for query_type, stats in self.query_stats.items()
+            },
+            "last_hour_queries": last_hour["count"],
+            "last_day_queries": self.last_day.snapshot()["count"],
+            "last_hour_latency": last_hour,
+            "last_hour_by_type": {
+                query_type: window.snapshot() for query_type, window in self.recent_by_type.items()
+            }
         }
-    
-    def _get_recent_query_count(self, hours: int) -> int:
-        """Count queries in the last N hours"""
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
-        count = 0
-        
-        for query_info in self.completed_queries:
-            if query_info.get("end_time", datetime.min.replace(tzinfo=timezone.utc)) >= cutoff:
-                count += 1
-        
-        return count
 
 
-class EventBuffer:
-    """Buffer for batching audit events"""
-    
-    def __init__(self, max_size: int = 100, flush_interval: int = 30):
-        self.max_size = max_size
-        self.flush_interval = flush_interval
-        self.buffer: List[AuditEvent] = []
-        self.last_flush = datetime.now(timezone.utc)
-    
-    def add_event(self, event: AuditEvent) -> bool:
-        """Add event to buffer, return True if flush is needed"""
-        self.buffer.append(event)
-        
-        # Check if flush is needed
-        now = datetime.now(timezone.utc)
-        return (
-            len(self.buffer) >= self.max_size or
-            (now - self.last_flush).total_seconds() >= self.flush_interval
-        )
+def _append_jsonl_batch(path: Path, entries: List[Dict[str, Any]]):
+    """Append entries as JSON lines with one write and one fsync"""
+    data = "".join(json.dumps(entry, default=str) + "\n" for entry in entries).encode()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "ab") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class LedgerWriteError(Exception):
+    """A batch write that failed after ``written`` entries had already landed"""
     
-    def get_events(self) -> List[AuditEvent]:
-        """Get and clear buffered events"""
-        events = self.buffer.copy()
-        self.buffer.clear()
-        self.last_flush = datetime.now(timezone.utc)
-        return events
+    def __init__(self, message: str, written: int = 0):
+        super().__init__(message)
+        self.written = written
+
+
+def _write_ledger_batch(entries: List[Dict[str, Any]]):
+    """Hand a batch to the shared ledger system
+    
+    ``write_ledger`` takes one entry at a time, so a failure partway through
+    raises ``LedgerWriteError`` carrying how many entries were written; the
+    retry resumes after them instead of writing them twice.
+    """
+    for written, entry in enumerate(entries):
+        try:
+            write_ledger("codex_audit", entry)
+        except Exception as e:
+            raise LedgerWriteError(str(e), written=written) from e
+
+
+class LedgerWriter:
+    """Background writer that moves audit events to the ledger in batches
+    
+    ``submit`` only enqueues. One writer task drains the queue, lingering up to
+    ``linger_ms`` to fill a batch of ``batch_size``, and runs ``write_batch`` on
+    a single-thread executor so ledger I/O stays off the event loop and
+    batches land in order. When the queue is full ``overflow_policy`` applies:
+    ``block`` makes the caller wait (backpressure), ``drop_newest`` discards
+    the incoming event and ``drop_oldest`` discards the oldest queued one.
+    Failed batches are retried, resuming after any entries a partial write
+    reported through ``LedgerWriteError``; what is still unwritten after the
+    last retry is carried into the next batch. The carry-over is capped at
+    ``max_unwritten`` (default ``max_queue``): under ``block`` the writer stops
+    taking new entries until it clears, so the queue fills and ``submit``
+    waits, while the drop policies discard from the matching end of it.
+    ``close`` drains everything that was accepted.
+    """
+    
+    OVERFLOW_POLICIES = ("block", "drop_newest", "drop_oldest")
+    _STOP = object()
+    
+    def __init__(self, write_batch: Callable[[List[Dict[str, Any]]], None],
+                 max_queue: int = 10000, batch_size: int = 256, linger_ms: int = 50,
+                 overflow_policy: str = "block", max_retries: int = 3,
+                 retry_delay: float = 0.1, max_unwritten: Optional[int] = None):
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.linger = linger_ms / 1000
+        self.overflow_policy = overflow_policy
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        # An unbounded queue (max_queue=0) leaves the carry-over unbounded too
+        self.max_unwritten = (max_unwritten if max_unwritten is not None else max_queue) or math.inf
+        
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="codex-audit-ledger")
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._unwritten: List[Dict[str, Any]] = []
+        
+        # Metrics
+        self.max_queue_depth = 0
+        self.events_submitted = 0
+        self.events_written = 0
+        self.events_dropped = 0
+        self.batches_written = 0
+        self.write_failures = 0
+        self.flush_latencies = deque(maxlen=1024)
+    
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+    
+    def start(self):
+        """Start the writer task on the running loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def submit(self, entry: Dict[str, Any]) -> bool:
+        """Queue an entry; returns False if it was dropped"""
+        if self._closed:
+            logger.warning("Ledger writer is closed; dropping audit event")
+            self.events_dropped += 1
+            return False
+        self.start()
+        
+        if self._queue.full():
+            if self.overflow_policy == "drop_newest":
+                self.events_dropped += 1
+                return False
+            if self.overflow_policy == "drop_oldest":
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self.events_dropped += 1
+        
+        await self._queue.put(entry)
+        self.events_submitted += 1
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return True
+    
+    async def flush(self):
+        """Wait until every queued entry has been handed to the ledger"""
+        if self._task is not None:
+            await self._queue.join()
+    
+    async def close(self):
+        """Stop accepting entries and drain everything already queued"""
+        if self._closed:
+            return
+        self._closed = True
+        
+        if self._task is not None:
+            await self._queue.put(self._STOP)
+            await self._task
+        
+        if self._unwritten:
+            logger.error(f"Ledger writer closed with {len(self._unwritten)} unwritten audit events")
+        self._executor.shutdown(wait=True)
+    
+    async def _run(self):
+        while True:
+            # Backpressure: retry the carry-over alone until it fits again
+            while (self.overflow_policy == "block" and not self._closed
+                   and len(self._unwritten) >= self.max_unwritten):
+                await self._write([])
+                if self._unwritten:
+                    await asyncio.sleep(self.retry_delay)
+            
+            batch: List[Dict[str, Any]] = []
+            taken = 0
+            stop = False
+            
+            item = await self._queue.get()
+            taken += 1
+            if item is self._STOP:
+                stop = True
+            else:
+                batch.append(item)
+                if self.linger and self._queue.qsize() < self.batch_size - 1:
+                    await asyncio.sleep(self.linger)
+            
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                taken += 1
+                if item is self._STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+            
+            try:
+                if batch or (stop and self._unwritten):
+                    await self._write(batch)
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+            
+            if stop:
+                return
     
-    def is_empty(self) -> bool:
-        """Check if buffer is empty"""
-        return len(self.buffer) == 0
+    async def _write(self, batch: List[Dict[str, Any]]):
+        """Write a batch (plus anything left from failed writes), retrying on error"""
+        batch = self._unwritten + batch
+        loop = asyncio.get_running_loop()
+        
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                await loop.run_in_executor(self._executor, self.write_batch, batch)
+            except Exception as e:
+                # Resume after whatever a partial write already landed
+                written = getattr(e, "written", 0)
+                self.events_written += written
+                batch = batch[written:]
+                self.write_failures += 1
+                logger.error(f"Failed to write {len(batch)} audit events (attempt {attempt + 1}): {e}")
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self.retry_delay * (2 ** attempt))
+                continue
+            
+            self._unwritten = []
+            self.flush_latencies.append(time.perf_counter() - started)
+            self.events_written += len(batch)
+            self.batches_written += 1
+            logger.debug(f"Flushed {len(batch)} audit events to ledger")
+            return
+        
+        # Keep the events for the next batch rather than losing them
+        overflow = len(batch) - self.max_unwritten
+        if overflow > 0 and self.overflow_policy != "block":
+            self.events_dropped += overflow
+            logger.warning(f"Dropping {overflow} unwritten audit events ({self.overflow_policy})")
+            if self.overflow_policy == "drop_oldest":
+                batch = batch[overflow:]
+            else:
+                batch = batch[:self.max_unwritten]
+        self._unwritten = batch
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, throughput and flush latency"""
+        latencies = sorted(self.flush_latencies)
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_capacity": self._queue.maxsize,
+            "overflow_policy": self.overflow_policy,
+            "events_submitted": self.events_submitted,
+            "events_written": self.events_written,
+            "events_dropped": self.events_dropped,
+            "events_unwritten": len(self._unwritten),
+            "batches_written": self.batches_written,
+            "average_batch_size": self.events_written / self.batches_written if self.batches_written else 0.0,
+            "write_failures": self.write_failures,
+            "flush_latency_ms": {
+                "last": self.flush_latencies[-1] * 1000 if latencies else 0.0,
+                "average": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+                "p95": latencies[int(0.95 * (len(latencies) - 1))] * 1000 if latencies else 0.0,
+                "max": latencies[-1] * 1000 if latencies else 0.0
+            }
+        }
 
 
 class CodexAuditor:
@@ -212,15 +553,28 @@ class CodexAuditor:
         
         # Components
         self.query_tracker = QueryTracker()
-        self.event_buffer = EventBuffer()
+        self.ledger_writer = self._create_ledger_writer() if self.ledger_integration else None
         self.session_events: Dict[str, List[AuditEvent]] = {}
         
-        # Performance tracking
-        self.performance_metrics = defaultdict(list)
+        # Performance tracking (last hour per metric, in minute buckets)
+        self.performance_metrics: Dict[str, RollingWindow] = {}
         self.error_patterns = defaultdict(int)
-        
-        # Background task for flushing
-        self._flush_task = None
+    
+    def _create_ledger_writer(self) -> LedgerWriter:
+        """Batched writer targeting the JSONL ledger file or the shared ledger system"""
+        ledger_path = self.config.audit_ledger_path
+        if ledger_path:
+            write_batch = lambda entries: _append_jsonl_batch(Path(ledger_path), entries)
+        else:
+            write_batch = _write_ledger_batch
+        
+        return LedgerWriter(
+            write_batch,
+            max_queue=self.config.audit_queue_size,
+            batch_size=self.config.audit_batch_size,
+            linger_ms=self.config.audit_flush_interval_ms,
+            overflow_policy=self.config.audit_overflow_policy
+        )
     
     async def initialize(self):
         """Initialize the audit system"""
@@ -228,8 +582,9 @@ class CodexAuditor:
             logger.info("Audit system disabled by configuration")
             return
         
-        # Start background flush task
-        self._flush_task = asyncio.create_task(self._flush_loop())
+        # Start background ledger writer
+        if self.ledger_writer:
+            self.ledger_writer.start()
         
         # Log initialization
         await self.log_event({
@@ -249,16 +604,9 @@ class CodexAuditor:
         if not self.enabled:
             return
         
-        # Cancel flush task
-        if self._flush_task:
-            self._flush_task.cancel()
-            try:
-                await self._flush_task
-            except asyncio.CancelledError:
-                pass
-        
-        # Final flush
-        await self._flush_events()
+        # Drain everything buffered for the ledger
+        if self.ledger_writer:
+            await self.ledger_writer.close()
         
         logger.info("Audit system shutdown complete")
     
@@ -300,9 +648,9 @@ class CodexAuditor:
         if event_type == EventType.ERROR:
             self._track_error_pattern(details)
         
-        # Add to buffer
-        if self.event_buffer.add_event(event):
-            await self._flush_events()
+        # Queue for the background ledger writer
+        if self.ledger_writer:
+            await self.ledger_writer.submit(event.to_dict())
         
         return event_id
     
@@ -410,7 +758,8 @@ class CodexAuditor:
             "top_error_patterns": dict(sorted(self.error_patterns.items(), 
                                              key=lambda x: x[1], reverse=True)[:10]),
             "recent_performance": self._get_recent_performance_summary(),
-            "system_health": self._assess_system_health()
+            "system_health": self._assess_system_health(),
+            "ledger_writer": self.ledger_writer.get_metrics() if self.ledger_writer else None
         }
     
     def _generate_event_id(self, details: Dict[str, Any]) -> str:
@@ -424,7 +773,7 @@ class CodexAuditor:
         return {
             "audit_level": self.audit_level.value,
             "active_queries": len(self.query_tracker.active_queries),
-            "buffer_size": len(self.event_buffer.buffer)
+            "buffer_size": self.ledger_writer.queue_depth if self.ledger_writer else 0
         }
     
     def _get_user_context(self) -> Optional[Dict[str, Any]]:
@@ -437,14 +786,9 @@ class CodexAuditor:
         metric_name = details.get("metric", "unknown")
         value = details.get("value", 0)
         
-        self.performance_metrics[metric_name].append({
-            "timestamp": datetime.now(timezone.utc),
-            "value": value
-        })
-        
-        # Keep only recent metrics (last 1000 per metric)
-        if len(self.performance_metrics[metric_name]) > 1000:
-            self.performance_metrics[metric_name] = self.performance_metrics[metric_name][-1000:]
+        if metric_name not in self.performance_metrics:
+            self.performance_metrics[metric_name] = RollingWindow(bucket_seconds=60, bucket_count=60)
+        self.performance_metrics[metric_name].record(value)
     
     def _track_error_pattern(self, details: Dict[str, Any]):
         """Track error patterns for analysis"""
@@ -469,15 +813,10 @@ class CodexAuditor:
         """Get summary of recent performance metrics"""
         summary = {}
         
-        for metric_name, values in self.performance_metrics.items():
-            if values:
-                recent_values = [v["value"] for v in values[-100:]]  # Last 100 values
-                summary[metric_name] = {
-                    "average": sum(recent_values) / len(recent_values),
-                    "min": min(recent_values),
-                    "max": max(recent_values),
-                    "count": len(recent_values)
-                }
+        for metric_name, window in self.performance_metrics.items():
+            recent = window.snapshot()
+            if recent["count"]:
+                summary[metric_name] = recent
         
         return summary
     
@@ -537,34 +876,6 @@ class CodexAuditor:
                 recommendations.append("Implement query throttling or increase processing capacity")
         
         return recommendations
-    
-    async def _flush_events(self):
-        """Flush buffered events to ledger"""
-        if not self.ledger_integration or self.event_buffer.is_empty():
-            return
-        
-        try:
-            events = self.event_buffer.get_events()
-            
-            for event in events:
-                write_ledger("codex_audit", event.to_dict())
-            
-            logger.debug(f"Flushed {len(events)} audit events to ledger")
-            
-        except Exception as e:
-            logger.error(f"Failed to flush audit events: {e}")
-    
-    async def _flush_loop(self):
-        """Background task for periodic event flushing"""
-        try:
-            while True:
-                await asyncio.sleep(30)  # Flush every 30 seconds
-                await self._flush_events()
-        except asyncio.CancelledError:
-            logger.debug("Audit flush loop cancelled")
-            raise
-        except Exception as e:
-            logger.error(f"Audit flush loop error: {e}")
 
 
 # Example usage
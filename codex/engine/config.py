@@ -29,9 +29,22 @@ class CodexConfig:
     vector_dimension: int = 1536
     chunk_size: int = 1000
     chunk_overlap: int = 200
+    chunk_unit: str = "chars"  # chars, tokens
     max_chunks_per_query: int = 5
     similarity_threshold: float = 0.7
     
+    # Vector index configuration (exact, ivf, hnsw)
+    vector_index: str = "exact"
+    ivf_nlist: int = 256
+    ivf_nprobe: int = 8
+    hnsw_m: int = 32
+    hnsw_ef_search: int = 64
+    hnsw_ef_construction: int = 80
+    vector_compaction_ratio: float = 0.5  # superseded/live records before log compaction
+    vector_load_mode: str = "memory"  # memory (private copy) or mmap (shared, lazy chunks)
+    retrieval_mode: str = "vector"  # vector, hybrid (BM25 + vector, reciprocal rank fusion)
+    rrf_k: int = 60
+    
     # Model configuration
     embedding_model: str = "text-embedding-ada-002"
     completion_model: str = "gpt-4"
@@ -46,17 +59,29 @@ class CodexConfig:
     audit_enabled: bool = True
     audit_retention_days: int = 90
     audit_detail_level: str = "standard"  # minimal, standard, verbose
+    audit_queue_size: int = 10000  # events buffered for the ledger writer
+    audit_batch_size: int = 256  # events per ledger write
+    audit_flush_interval_ms: int = 50  # how long the writer waits to fill a batch
+    audit_overflow_policy: str = "block"  # block, drop_newest, drop_oldest
+    audit_ledger_path: Optional[Path] = None  # append JSONL batches here instead of write_ledger
     
     # Replay configuration
     replay_enabled: bool = True
     max_replay_queries: int = 100
     replay_timeout_minutes: int = 30
+    replay_bulk_workers: int = 8  # concurrent replays in replay_bulk
+    replay_target_qps: float = 0.0  # pipeline executions per second in replay_bulk; 0 = unpaced
     
     # Performance configuration
-    batch_size: int = 10
+    batch_size: int = 10  # files per ingest batch
+    embedding_batch_size: int = 64  # texts per embedding model call
+    ingest_workers: int = 0  # processes for parallel ingest; 0 = one per CPU
     max_concurrent_queries: int = 5
     cache_enabled: bool = True
     cache_ttl_minutes: int = 60
+    cache_max_entries: int = 1024
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_shared_dir: Optional[Path] = None  # on-disk tier shared across workers
     
     # Security configuration
     api_key_required: bool = False
@@ -154,6 +179,27 @@ class CodexConfig:
         if os.getenv("CODEX_CHUNK_OVERLAP"):
             self.chunk_overlap = int(os.getenv("CODEX_CHUNK_OVERLAP"))
         
+        if os.getenv("CODEX_CHUNK_UNIT"):
+            self.chunk_unit = os.getenv("CODEX_CHUNK_UNIT")
+        
+        if os.getenv("CODEX_VECTOR_INDEX"):
+            self.vector_index = os.getenv("CODEX_VECTOR_INDEX").lower()
+        
+        if os.getenv("CODEX_IVF_NLIST"):
+            self.ivf_nlist = int(os.getenv("CODEX_IVF_NLIST"))
+        
+        if os.getenv("CODEX_IVF_NPROBE"):
+            self.ivf_nprobe = int(os.getenv("CODEX_IVF_NPROBE"))
+        
+        if os.getenv("CODEX_HNSW_EF_SEARCH"):
+            self.hnsw_ef_search = int(os.getenv("CODEX_HNSW_EF_SEARCH"))
+        
+        if os.getenv("CODEX_VECTOR_LOAD_MODE"):
+            self.vector_load_mode = os.getenv("CODEX_VECTOR_LOAD_MODE").lower()
+        
+        if os.getenv("CODEX_RETRIEVAL_MODE"):
+            self.retrieval_mode = os.getenv("CODEX_RETRIEVAL_MODE").lower()
+        
         # Model configuration
         if os.getenv("CODEX_EMBEDDING_MODEL"):
             self.embedding_model = os.getenv("CODEX_EMBEDDING_MODEL")
@@ -181,12 +227,42 @@ class CodexConfig:
         if os.getenv("CODEX_AUDIT_ENABLED"):
             self.audit_enabled = os.getenv("CODEX_AUDIT_ENABLED").lower() == "true"
         
+        if os.getenv("CODEX_AUDIT_QUEUE_SIZE"):
+            self.audit_queue_size = int(os.getenv("CODEX_AUDIT_QUEUE_SIZE"))
+        
+        if os.getenv("CODEX_AUDIT_BATCH_SIZE"):
+            self.audit_batch_size = int(os.getenv("CODEX_AUDIT_BATCH_SIZE"))
+        
+        if os.getenv("CODEX_AUDIT_OVERFLOW_POLICY"):
+            self.audit_overflow_policy = os.getenv("CODEX_AUDIT_OVERFLOW_POLICY")
+        
+        if os.getenv("CODEX_AUDIT_LEDGER_PATH"):
+            self.audit_ledger_path = Path(os.getenv("CODEX_AUDIT_LEDGER_PATH"))
+        
         if os.getenv("CODEX_REPLAY_ENABLED"):
             self.replay_enabled = os.getenv("CODEX_REPLAY_ENABLED").lower() == "true"
         
+        if os.getenv("CODEX_REPLAY_BULK_WORKERS"):
+            self.replay_bulk_workers = int(os.getenv("CODEX_REPLAY_BULK_WORKERS"))
+        
+        if os.getenv("CODEX_REPLAY_TARGET_QPS"):
+            self.replay_target_qps = float(os.getenv("CODEX_REPLAY_TARGET_QPS"))
+        
         if os.getenv("CODEX_CACHE_ENABLED"):
             self.cache_enabled = os.getenv("CODEX_CACHE_ENABLED").lower() == "true"
         
+        if os.getenv("CODEX_CACHE_MAX_ENTRIES"):
+            self.cache_max_entries = int(os.getenv("CODEX_CACHE_MAX_ENTRIES"))
+        
+        if os.getenv("CODEX_CACHE_SHARED_DIR"):
+            self.cache_shared_dir = Path(os.getenv("CODEX_CACHE_SHARED_DIR"))
+        
+        if os.getenv("CODEX_EMBEDDING_BATCH_SIZE"):
+            self.embedding_batch_size = int(os.getenv("CODEX_EMBEDDING_BATCH_SIZE"))
+        
+        if os.getenv("CODEX_INGEST_WORKERS"):
+            self.ingest_workers = int(os.getenv("CODEX_INGEST_WORKERS"))
+        
         # Integration flags
         if os.getenv("CODEX_LEDGER_INTEGRATION"):
             self.ledger_integration = os.getenv("CODEX_LEDGER_INTEGRATION").lower() == "true"
@@ -209,6 +285,43 @@ class CodexConfig:
         if self.chunk_overlap >= self.chunk_size:
             errors.append("chunk_overlap must be less than chunk_size")
         
+        if self.chunk_unit not in ["chars", "tokens"]:
+            errors.append("chunk_unit must be one of: chars, tokens")
+        
+        # Validate vector index
+        if self.vector_index not in ["exact", "ivf", "hnsw"]:
+            errors.append("vector_index must be one of: exact, ivf, hnsw")
+        
+        if self.ivf_nlist <= 0 or not (0 < self.ivf_nprobe <= self.ivf_nlist):
+            errors.append("ivf_nprobe must be between 1 and ivf_nlist")
+        
+        if self.hnsw_m <= 0 or self.hnsw_ef_search <= 0:
+            errors.append("hnsw_m and hnsw_ef_search must be positive")
+        
+        if self.vector_load_mode not in ["memory", "mmap"]:
+            errors.append("vector_load_mode must be one of: memory, mmap")
+        
+        if self.retrieval_mode not in ["vector", "hybrid"]:
+            errors.append("retrieval_mode must be one of: vector, hybrid")
+        
+        if self.rrf_k <= 0:
+            errors.append("rrf_k must be positive")
+        
+        if self.batch_size <= 0 or self.embedding_batch_size <= 0:
+            errors.append("batch_size and embedding_batch_size must be positive")
+        
+        if self.ingest_workers < 0:
+            errors.append("ingest_workers must be zero or positive")
+        
+        if self.audit_queue_size <= 0 or self.audit_batch_size <= 0 or self.audit_flush_interval_ms < 0:
+            errors.append("audit_queue_size and audit_batch_size must be positive, audit_flush_interval_ms zero or positive")
+        
+        if self.audit_overflow_policy not in ("block", "drop_newest", "drop_oldest"):
+            errors.append("audit_overflow_policy must be block, drop_newest or drop_oldest")
+        
+        if self.replay_bulk_workers <= 0 or self.replay_target_qps < 0:
+            errors.append("replay_bulk_workers must be positive and replay_target_qps zero or positive")
+        
         # Validate temperature
         if not (0.0 <= self.temperature <= 2.0):
             errors.append("temperature must be between 0.0 and 2.0")
@@ -270,8 +383,17 @@ class CodexConfig:
             "vector_dimension": self.vector_dimension,
             "chunk_size": self.chunk_size,
             "chunk_overlap": self.chunk_overlap,
+            "chunk_unit": self.chunk_unit,
             "max_chunks_per_query": self.max_chunks_per_query,
             "similarity_threshold": self.similarity_threshold,
+            "vector_index": self.vector_index,
+            "ivf_nlist": self.ivf_nlist,
+            "ivf_nprobe": self.ivf_nprobe,
+            "hnsw_m": self.hnsw_m,
+            "hnsw_ef_search": self.hnsw_ef_search,
+            "vector_load_mode": self.vector_load_mode,
+            "retrieval_mode": self.retrieval_mode,
+            "rrf_k": self.rrf_k,
             "corpus_path": str(self.corpus_path),
             "vectors_path": str(self.vectors_path)
         }
@@ -282,7 +404,12 @@ class CodexConfig:
             "enabled": self.audit_enabled,
             "retention_days": self.audit_retention_days,
             "detail_level": self.audit_detail_level,
-            "ledger_integration": self.ledger_integration
+            "ledger_integration": self.ledger_integration,
+            "queue_size": self.audit_queue_size,
+            "batch_size": self.audit_batch_size,
+            "flush_interval_ms": self.audit_flush_interval_ms,
+            "overflow_policy": self.audit_overflow_policy,
+            "ledger_path": str(self.audit_ledger_path) if self.audit_ledger_path else None
         }
     
     def get_scroll_config(self) -> Dict[str, Any]:
@@ -297,9 +424,16 @@ class CodexConfig:
         """Get performance-specific configuration"""
         return {
             "batch_size": self.batch_size,
+            "embedding_batch_size": self.embedding_batch_size,
+            "ingest_workers": self.ingest_workers,
+            "replay_bulk_workers": self.replay_bulk_workers,
+            "replay_target_qps": self.replay_target_qps,
             "max_concurrent_queries": self.max_concurrent_queries,
             "cache_enabled": self.cache_enabled,
-            "cache_ttl_minutes": self.cache_ttl_minutes
+            "cache_ttl_minutes": self.cache_ttl_minutes,
+            "cache_max_entries": self.cache_max_entries,
+            "cache_max_bytes": self.cache_max_bytes,
+            "cache_shared_dir": str(self.cache_shared_dir) if self.cache_shared_dir else None
         }
     
     def get_security_config(self) -> Dict[str, Any]:
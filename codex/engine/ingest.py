@@ -12,7 +12,8 @@ from datetime import datetime, timezone
 import logging
 import mimetypes
 import hashlib
-from concurrent.futures import ThreadPoolExecutor
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 # Document parsing libraries (mock implementations for demo)
 import json
@@ -83,10 +84,11 @@ class JSONProcessor(DocumentProcessor):
         """Process JSON file"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+                content = f.read()
             
-            # Convert JSON to searchable text
-            content = json.dumps(data, indent=2)
+            # The stored text is already searchable; parse it for analysis only
+            # rather than re-serializing a second, indented copy
+            data = json.loads(content)
             
             # JSON structure analysis
             structure = self._analyze_json_structure(data)
@@ -96,7 +98,7 @@ class JSONProcessor(DocumentProcessor):
                 "raw_data": data,
                 "analysis": {
                     "structure": structure,
-                    "size_bytes": len(content.encode('utf-8')),
+                    "size_bytes": file_path.stat().st_size,
                     "keys": list(data.keys()) if isinstance(data, dict) else []
                 },
                 "content_type": "json",
@@ -322,6 +324,47 @@ class ArtifactProcessor(DocumentProcessor):
         return " ".join(searchable_parts)
 
 
+class IngestProgress:
+    """Running progress and throughput figures for a directory ingest"""
+    
+    def __init__(self, total_files: int):
+        self.total_files = total_files
+        self.files = 0
+        self.failed = 0
+        self.chunks = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+    
+    def record(self, result: Dict[str, Any]):
+        """Count one successfully ingested file"""
+        self.files += 1
+        self.chunks += result.get("chunks_created", 0)
+        self.bytes += result.get("enhanced_metadata", {}).get("file_size", 0)
+    
+    def record_failure(self):
+        """Count one file that failed to ingest"""
+        self.failed += 1
+    
+    def report(self) -> Dict[str, Any]:
+        """Throughput since the ingest started"""
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "files_per_second": round(self.files / elapsed, 2),
+            "chunks_per_second": round(self.chunks / elapsed, 2),
+            "mb_per_second": round(self.bytes / elapsed / (1024 * 1024), 3)
+        }
+    
+    def log(self):
+        """Log progress so far"""
+        report = self.report()
+        logger.info(
+            f"Processed {self.files + self.failed}/{self.total_files} files "
+            f"({report['files_per_second']} files/s, {report['chunks_per_second']} chunks/s, "
+            f"{report['mb_per_second']} MB/s)"
+        )
+
+
 class CodexIngest:
     """Main ingestion pipeline for Codex documents"""
     
@@ -333,70 +376,213 @@ class CodexIngest:
             'json': JSONProcessor(config),
             'artifact': ArtifactProcessor(config)
         }
-        self.executor = ThreadPoolExecutor(max_workers=4)
     
     async def ingest_file(self, file_path: Union[str, Path], 
                          document_type: Optional[str] = None,
                          metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Ingest single file"""
         try:
-            file_path = Path(file_path)
-            if not file_path.exists():
-                raise FileNotFoundError(f"File not found: {file_path}")
-            
-            # Auto-detect document type if not provided
-            if not document_type:
-                document_type = self._detect_document_type(file_path)
-            
-            # Select appropriate processor
-            processor = self._select_processor(file_path, document_type)
-            
-            # Process document
-            processed = await processor.process(file_path, metadata)
-            
-            # Enhanced metadata
-            enhanced_metadata = {
-                **(metadata or {}),
-                "file_name": file_path.name,
-                "file_path": str(file_path),
-                "file_size": file_path.stat().st_size,
-                "file_modified": datetime.fromtimestamp(
-                    file_path.stat().st_mtime, timezone.utc
-                ).isoformat(),
-                "document_type": document_type,
-                "content_type": processed.get("content_type", "unknown"),
-                "processor_used": processor.__class__.__name__,
-                "ingestion_id": self._generate_ingestion_id(file_path)
-            }
-            
-            # Merge analysis data into metadata
-            if "analysis" in processed:
-                enhanced_metadata.update(processed["analysis"])
+            prepared = await self._prepare_file(file_path, document_type, metadata)
             
             # Ingest into RAG system
-            rag_result = await self.rag_system.ingest(
-                content=processed["content"],
-                document_type=document_type,
-                metadata=enhanced_metadata
-            )
+            rag_result = await self.rag_system.ingest(**prepared["document"])
             
-            return {
+            return {**prepared["result"], **rag_result}
+            
+        except Exception as e:
+            logger.error(f"Failed to ingest file {file_path}: {e}")
+            raise
+    
+    async def _prepare_file(self, file_path: Union[str, Path],
+                            document_type: Optional[str] = None,
+                            metadata: Optional[Dict[str, Any]] = None,
+                            fingerprint: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Process a file into a RAG ingest document without embedding it
+        
+        Returns ``document`` (for ``rag_system.ingest_many``; also the kwargs
+        for ``rag_system.ingest`` when there is no ``fingerprint``) and
+        ``result`` (the per-file fields reported back to the caller).
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        # Auto-detect document type if not provided
+        if not document_type:
+            document_type = self._detect_document_type(file_path)
+        
+        # Select appropriate processor
+        processor = self._select_processor(file_path, document_type)
+        
+        # Process document
+        processed = await processor.process(file_path, metadata)
+        
+        # Enhanced metadata
+        enhanced_metadata = {
+            **(metadata or {}),
+            "file_name": file_path.name,
+            "file_path": str(file_path),
+            "file_size": file_path.stat().st_size,
+            "file_modified": datetime.fromtimestamp(
+                file_path.stat().st_mtime, timezone.utc
+            ).isoformat(),
+            "document_type": document_type,
+            "content_type": processed.get("content_type", "unknown"),
+            "processor_used": processor.__class__.__name__,
+            "ingestion_id": self._generate_ingestion_id(file_path)
+        }
+        
+        # Merge analysis data into metadata
+        if "analysis" in processed:
+            enhanced_metadata.update(processed["analysis"])
+        
+        document = {
+            "content": processed["content"],
+            "document_type": document_type,
+            "metadata": enhanced_metadata
+        }
+        if fingerprint:
+            document["fingerprint"] = fingerprint
+        
+        return {
+            "document": document,
+            "result": {
                 "file_path": str(file_path),
                 "document_type": document_type,
                 "content_type": processed.get("content_type"),
                 "processor": processor.__class__.__name__,
-                "enhanced_metadata": enhanced_metadata,
-                **rag_result
+                "enhanced_metadata": enhanced_metadata
             }
-            
+        }
+    
+    async def _ingest_batch(self, batch: List[Path],
+                            fingerprints: Optional[Dict[Path, Dict[str, Any]]] = None) -> List[Any]:
+        """Ingest a batch of files with one embedding/persist pass
+        
+        Files are processed concurrently, then every successfully prepared
+        file goes to ``rag_system.ingest_many`` together so their chunks share
+        embedding batches. Returns a result or exception per file.
+        """
+        fingerprints = fingerprints or {}
+        prepared = await asyncio.gather(
+            *[self._prepare_file(f, fingerprint=fingerprints.get(f)) for f in batch],
+            return_exceptions=True
+        )
+        return await self._ingest_prepared(prepared)
+    
+    async def _ingest_prepared(self, prepared: List[Any]) -> List[Any]:
+        """Embed and index prepared files; exceptions in ``prepared`` pass through"""
+        ready = [p for p in prepared if not isinstance(p, Exception)]
+        if not ready:
+            return prepared
+        
+        try:
+            rag_results = await self.rag_system.ingest_many([p["document"] for p in ready])
+            if len(rag_results) != len(ready):
+                raise RuntimeError("ingest_many returned a mismatched result count")
         except Exception as e:
-            logger.error(f"Failed to ingest file {file_path}: {e}")
-            raise
+            return [p if isinstance(p, Exception) else e for p in prepared]
+        
+        rag_iter = iter(rag_results)
+        results = []
+        for p in prepared:
+            if isinstance(p, Exception):
+                results.append(p)
+                continue
+            rag_result = next(rag_iter)
+            # A document whose chunk stream failed is reported like a failed read
+            if "error" in rag_result:
+                results.append(RuntimeError(rag_result["error"]))
+            else:
+                results.append({**p["result"], **rag_result})
+        return results
+    
+    async def _ingest_parallel(self, files: List[Path], progress: IngestProgress,
+                               max_workers: Optional[int] = None,
+                               fingerprints: Optional[Dict[Path, Dict[str, Any]]] = None) -> List[Any]:
+        """Ingest files with reading, processing and splitting in a process pool
+        
+        Worker results stream through a bounded queue into a single
+        embedding/indexing stage, ``batch_size`` files at a time. When that
+        stage falls behind, the queue fills and no further files are submitted
+        to the pool until it drains.
+        """
+        max_workers = max_workers or self.config.ingest_workers or os.cpu_count() or 1
+        batch_size = self.config.batch_size
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=batch_size * 2)
+        in_flight = asyncio.Semaphore(max_workers * 2)
+        outcomes: Dict[Path, Any] = {}
+        fingerprints = fingerprints or {}
+        
+        async def prepare(pool: ProcessPoolExecutor, file_path: Path):
+            try:
+                try:
+                    prepared = await loop.run_in_executor(
+                        pool, _prepare_file_in_worker, str(file_path), fingerprints.get(file_path)
+                    )
+                except Exception as e:
+                    prepared = e
+                await queue.put((file_path, prepared))
+            finally:
+                in_flight.release()
+        
+        async def produce(pool: ProcessPoolExecutor):
+            tasks = []
+            for file_path in files:
+                await in_flight.acquire()
+                tasks.append(asyncio.create_task(prepare(pool, file_path)))
+            await asyncio.gather(*tasks)
+            await queue.put(None)
+        
+        async def flush(batch: List[Any]):
+            batch_results = await self._ingest_prepared([prepared for _, prepared in batch])
+            for (file_path, _), result in zip(batch, batch_results):
+                outcomes[file_path] = result
+                if isinstance(result, Exception):
+                    progress.record_failure()
+                else:
+                    progress.record(result)
+            progress.log()
+        
+        async def consume():
+            batch = []
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    await flush(batch)
+                    batch = []
+            if batch:
+                await flush(batch)
+        
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_ingest_worker,
+            initargs=(self.rag_system.text_splitter,)
+        ) as pool:
+            await asyncio.gather(produce(pool), consume())
+        
+        return [outcomes[file_path] for file_path in files]
     
     async def ingest_directory(self, directory_path: Union[str, Path],
                               recursive: bool = True,
-                              file_pattern: str = "*") -> Dict[str, Any]:
-        """Ingest all files in directory"""
+                              file_pattern: str = "*",
+                              parallel: bool = False,
+                              max_workers: Optional[int] = None,
+                              incremental: bool = False) -> Dict[str, Any]:
+        """Ingest all files in directory
+        
+        With ``parallel=True`` file reading, processing and chunking run in a
+        pool of ``max_workers`` processes (default ``config.ingest_workers``,
+        or one per CPU) while embedding and indexing stay in this process.
+        
+        With ``incremental=True`` the RAG system's ingest manifest decides what
+        to do: unchanged files are skipped, modified ones re-embedded, and
+        chunks of files removed from the directory deleted.
+        """
         try:
             directory_path = Path(directory_path)
             if not directory_path.exists() or not directory_path.is_dir():
@@ -413,38 +599,67 @@ class CodexIngest:
             
             logger.info(f"Found {len(supported_files)} supported files in {directory_path}")
             
-            # Process files in batches
-            batch_size = self.config.batch_size
-            results = []
-            failed = []
+            fingerprints: Dict[Path, Dict[str, Any]] = {}
+            skipped = 0
+            removal = {"files_removed": 0, "chunks_removed": 0}
+            if incremental:
+                plan = await self.rag_system.plan_file_sync(supported_files, root=directory_path)
+                changed = {fingerprint["path"]: fingerprint for fingerprint in plan["changed"]}
+                fingerprints = {
+                    f: changed[str(f.resolve())] for f in supported_files if str(f.resolve()) in changed
+                }
+                skipped = len(plan["unchanged"])
+                removal = await self.rag_system.remove_documents(plan["removed"])
+                supported_files = [f for f in supported_files if f in fingerprints]
+                logger.info(
+                    f"Incremental ingest: {len(supported_files)} new or modified, {skipped} unchanged, "
+                    f"{removal['files_removed']} removed"
+                )
             
-            for i in range(0, len(supported_files), batch_size):
-                batch = supported_files[i:i + batch_size]
-                batch_results = await asyncio.gather(
-                    *[self.ingest_file(f) for f in batch],
-                    return_exceptions=True
+            progress = IngestProgress(len(supported_files))
+            
+            if parallel and supported_files:
+                file_results = await self._ingest_parallel(
+                    supported_files, progress, max_workers, fingerprints
                 )
+            else:
+                # Process files in batches
+                batch_size = self.config.batch_size
+                file_results = []
                 
-                for file_path, result in zip(batch, batch_results):
-                    if isinstance(result, Exception):
-                        failed.append({"file": str(file_path), "error": str(result)})
-                        logger.error(f"Failed to ingest {file_path}: {result}")
-                    else:
-                        results.append(result)
-                
-                # Log progress
-                processed = len(results) + len(failed)
-                logger.info(f"Processed {processed}/{len(supported_files)} files")
+                for i in range(0, len(supported_files), batch_size):
+                    batch_results = await self._ingest_batch(
+                        supported_files[i:i + batch_size], fingerprints
+                    )
+                    for result in batch_results:
+                        if isinstance(result, Exception):
+                            progress.record_failure()
+                        else:
+                            progress.record(result)
+                    file_results.extend(batch_results)
+                    progress.log()
+            
+            results = []
+            failed = []
+            for file_path, result in zip(supported_files, file_results):
+                if isinstance(result, Exception):
+                    failed.append({"file": str(file_path), "error": str(result)})
+                    logger.error(f"Failed to ingest {file_path}: {result}")
+                else:
+                    results.append(result)
             
             return {
                 "directory": str(directory_path),
-                "total_files": len(supported_files),
+                "total_files": len(supported_files) + skipped,
                 "successful": len(results),
                 "failed": len(failed),
                 "success_rate": len(results) / len(supported_files) if supported_files else 1.0,
                 "results": results,
                 "failures": failed,
-                "total_chunks": sum(r.get("chunks_created", 0) for r in results)
+                "total_chunks": sum(r.get("chunks_created", 0) for r in results),
+                "skipped": skipped,
+                **removal,
+                "throughput": progress.report()
             }
             
         except Exception as e:
@@ -504,6 +719,31 @@ class CodexIngest:
         return f"ing_{timestamp}_{file_hash}"
 
 
+# Per-process state for parallel ingestion workers
+_worker_ingest: Optional[CodexIngest] = None
+_worker_splitter = None
+
+
+def _init_ingest_worker(text_splitter):
+    """Process pool initializer: build the worker's processors and splitter"""
+    global _worker_ingest, _worker_splitter
+    _worker_ingest = CodexIngest(config=None, rag_system=None)
+    _worker_splitter = text_splitter
+
+
+def _prepare_file_in_worker(file_path: str, fingerprint: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Read, process and chunk one file inside a pool worker
+    
+    The returned document carries its ``chunks`` instead of the raw content,
+    so only the chunks cross the process boundary.
+    """
+    prepared = asyncio.run(_worker_ingest._prepare_file(file_path, fingerprint=fingerprint))
+    document = prepared["document"]
+    document["chunks"] = _worker_splitter.split_ingest_document(document)
+    del document["content"]
+    return prepared
+
+
 # Example usage
 if __name__ == "__main__":
     async def test_ingestion():
@@ -5,16 +5,28 @@ context enhancement, and real-time processing capabilities.
 """
 
 import os
+import re
 import json
 import asyncio
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Set, Iterable, Iterator
 from datetime import datetime, timezone
 import logging
 import hashlib
+import uuid
 import numpy as np
 from concurrent.futures import ThreadPoolExecutor
 import pickle
+import time
+import mmap
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
 
 # Note: In production, you would import actual libraries like:
 # import openai
@@ -28,6 +40,8 @@ logger = logging.getLogger(__name__)
 class DocumentChunk:
     """Represents a chunk of a document with metadata"""
     
+    __slots__ = ("content", "metadata", "chunk_id", "embedding", "created_at")
+    
     def __init__(self, content: str, metadata: Dict[str, Any], chunk_id: str = None):
         self.content = content
         self.metadata = metadata
@@ -40,14 +54,17 @@ class DocumentChunk:
         content_hash = hashlib.md5(self.content.encode()).hexdigest()
         return f"chunk_{content_hash[:12]}"
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, include_embedding: bool = True) -> Dict[str, Any]:
         """Convert chunk to dictionary representation"""
         return {
             "chunk_id": self.chunk_id,
             "content": self.content,
             "metadata": self.metadata,
             "created_at": self.created_at.isoformat(),
-            "embedding": self.embedding.tolist() if self.embedding is not None else None
+            "embedding": (
+                np.asarray(self.embedding).tolist()
+                if include_embedding and self.embedding is not None else None
+            )
         }
     
     @classmethod
@@ -65,133 +82,852 @@ class DocumentChunk:
 
 
 class MockEmbeddingModel:
-    """Mock embedding model for demonstration purposes"""
+    """Mock embedding model for demonstration purposes
+    
+    Batch-first: ``embed_rows`` turns a list of texts into one float32 matrix,
+    and ``embed_batch`` feeds it ``batch_size`` texts at a time off the event
+    loop, as a real batched model client would.
+    """
     
-    def __init__(self, dimension: int = 1536):
+    def __init__(self, dimension: int = 1536, batch_size: int = 64):
         self.dimension = dimension
+        self.batch_size = batch_size
         self.model_name = "mock-embedding-model"
     
     def embed(self, text):
         """Generate mock embedding for text (sync version for testing)"""
         if isinstance(text, list):
-            return [self._embed_single(t) for t in text]
+            return self.embed_rows(text).astype(np.float64).tolist()
         return self._embed_single(text)
     
     def _embed_single(self, text: str) -> list:
         """Generate deterministic embedding for single text"""
-        if not text.strip():
-            return [0.0] * self.dimension
+        return self.embed_rows([text])[0].astype(np.float64).tolist()
+    
+    def embed_rows(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into an (n, dimension) float32 matrix of unit rows
         
-        # Generate deterministic "embedding" based on text hash
-        hash_value = hashlib.md5(text.encode()).hexdigest()
-        seed = int(hash_value[:8], 16)
-        np.random.seed(seed)
+        Each text seeds its own RandomState from its hash, so output is
+        deterministic without touching the global np.random state. Duplicate
+        texts in a batch are embedded once.
+        """
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float64)
+        first_row: Dict[str, int] = {}
         
-        # Generate normalized random vector
-        embedding = np.random.normal(0, 0.3, self.dimension)
-        embedding = embedding / np.linalg.norm(embedding) if np.linalg.norm(embedding) > 0 else embedding
+        for row, text in enumerate(texts):
+            if not text.strip():
+                continue
+            if text in first_row:
+                matrix[row] = matrix[first_row[text]]
+                continue
+            first_row[text] = row
+            
+            # Generate deterministic "embedding" based on text hash
+            seed = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+            matrix[row] = np.random.RandomState(seed).normal(0, 0.3, self.dimension)
         
-        return embedding.tolist()
+        # Normalize all rows at once
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix.astype(np.float32)
     
     async def embed_text(self, text: str) -> np.ndarray:
         """Generate mock embedding for text (async version)"""
-        return np.array(self._embed_single(text))
+        return self.embed_rows([text])[0]
+    
+    async def embed_batch(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """Generate embeddings for texts as one (n, dimension) matrix
+        
+        Texts are embedded ``batch_size`` at a time in a worker thread.
+        """
+        batch_size = batch_size or self.batch_size
+        loop = asyncio.get_event_loop()
+        batches = [
+            await loop.run_in_executor(None, self.embed_rows, texts[start:start + batch_size])
+            for start in range(0, len(texts), batch_size)
+        ]
+        return np.vstack(batches) if batches else np.zeros((0, self.dimension), dtype=np.float32)
+
+
+class VectorIndex:
+    """Base class for approximate nearest-neighbour indexes behind VectorStore
+    
+    Indexes only propose candidate rows; VectorStore re-scores candidates
+    exactly against its embedding matrix, so an index never changes scores,
+    only which rows get scored.
+    """
+    
+    index_type = "exact"
+    
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+    
+    @property
+    def is_trained(self) -> bool:
+        return True
+    
+    @property
+    def min_train_size(self) -> int:
+        return 0
+    
+    def train(self, vectors: np.ndarray):
+        """Fit index structures to a sample of vectors"""
+    
+    def add(self, rows: np.ndarray, vectors: np.ndarray):
+        """Insert new rows"""
+    
+    def update(self, row: int, vector: np.ndarray):
+        """Re-index a row whose embedding was overwritten"""
+    
+    supports_remove = True
+    
+    def remove(self, row: int):
+        """Drop a deleted row"""
+    
+    def reset(self):
+        """Drop all indexed rows (and training)"""
+    
+    def candidates(self, query: np.ndarray, k: int) -> Optional[np.ndarray]:
+        """Return candidate rows for query, or None to scan every row"""
+        return None
+    
+    def set_search_params(self, **params):
+        """Adjust recall/speed knobs at runtime"""
+        for key, value in params.items():
+            if not hasattr(self, key):
+                raise ValueError(f"Unknown search parameter for {self.index_type}: {key}")
+            setattr(self, key, value)
     
-    async def embed_batch(self, texts: List[str]) -> List[np.ndarray]:
-        """Generate embeddings for batch of texts"""
-        return [await self.embed_text(text) for text in texts]
+    def get_params(self) -> Dict[str, Any]:
+        return {}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {"index_type": self.index_type, "is_trained": self.is_trained, **self.get_params()}
+
+
+class IVFIndex(VectorIndex):
+    """Inverted-file index: spherical k-means centroids with per-centroid row lists
+    
+    Until ``min_train_size`` rows exist the index is untrained and search falls
+    back to an exact scan. ``nprobe`` lists closest to the query are scanned.
+    """
+    
+    index_type = "ivf"
+    
+    def __init__(self, dimension: int, nlist: int = 256, nprobe: int = 8,
+                 train_iterations: int = 10, seed: int = 0):
+        super().__init__(dimension)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_iterations = train_iterations
+        self.seed = seed
+        self.reset()
+    
+    def reset(self):
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: List[List[int]] = []
+        self._list_arrays: List[Optional[np.ndarray]] = []
+        self._assignments: Dict[int, int] = {}  # row -> list number
+    
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+    
+    @property
+    def min_train_size(self) -> int:
+        return self.nlist * 8
+    
+    def train(self, vectors: np.ndarray):
+        """Spherical k-means over a sample of the stored vectors"""
+        rng = np.random.default_rng(self.seed)
+        sample_size = min(len(vectors), self.nlist * 64)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        sample = sample / np.maximum(np.linalg.norm(sample, axis=1, keepdims=True), 1e-12)
+        
+        nlist = min(self.nlist, sample_size)
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        
+        for _ in range(self.train_iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=nlist)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        
+        self.centroids = centroids.astype(np.float32)
+        self.lists = [[] for _ in range(nlist)]
+        self._list_arrays = [None] * nlist
+        self._assignments = {}
+        logger.info(f"IVF index trained with {nlist} lists on {sample_size} vectors")
+    
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.centroids.T, axis=1)
+    
+    def add(self, rows: np.ndarray, vectors: np.ndarray):
+        if not self.is_trained or len(rows) == 0:
+            return
+        
+        for row, list_no in zip(rows.tolist(), self._assign(vectors).tolist()):
+            self.lists[list_no].append(row)
+            self._list_arrays[list_no] = None
+            self._assignments[row] = list_no
+    
+    def update(self, row: int, vector: np.ndarray):
+        if not self.is_trained:
+            return
+        
+        old_list = self._assignments.get(row)
+        if old_list is not None:
+            self.lists[old_list].remove(row)
+            self._list_arrays[old_list] = None
+        self.add(np.array([row]), vector[None, :])
+    
+    def remove(self, row: int):
+        list_no = self._assignments.pop(row, None)
+        if list_no is not None:
+            self.lists[list_no].remove(row)
+            self._list_arrays[list_no] = None
+    
+    def _list_rows(self, list_no: int) -> np.ndarray:
+        if self._list_arrays[list_no] is None:
+            self._list_arrays[list_no] = np.array(self.lists[list_no], dtype=np.int64)
+        return self._list_arrays[list_no]
+    
+    def candidates(self, query: np.ndarray, k: int) -> Optional[np.ndarray]:
+        if not self.is_trained:
+            return None
+        
+        nprobe = min(self.nprobe, len(self.lists))
+        centroid_scores = self.centroids @ query
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        return np.concatenate([self._list_rows(list_no) for list_no in probe])
+    
+    def get_params(self) -> Dict[str, Any]:
+        return {"nlist": self.nlist, "nprobe": self.nprobe}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        if self.is_trained:
+            sizes = [len(rows) for rows in self.lists]
+            stats.update({"indexed_rows": sum(sizes), "max_list_size": max(sizes)})
+        return stats
+
+
+class HNSWIndex(VectorIndex):
+    """HNSW graph index backed by faiss-cpu (optional dependency)
+    
+    faiss assigns sequential ids, so rows must be inserted in order; the
+    graph cannot move an overwritten vector, which only affects recall
+    because results are re-scored against the matrix. Nodes cannot be
+    removed either, so VectorStore rebuilds the graph after deletions.
+    """
+    
+    index_type = "hnsw"
+    supports_remove = False
+    
+    def __init__(self, dimension: int, m: int = 32, ef_search: int = 64,
+                 ef_construction: int = 80):
+        if not FAISS_AVAILABLE:
+            raise ImportError("faiss-cpu is required for the HNSW vector index")
+        super().__init__(dimension)
+        self.m = m
+        self.ef_search = ef_search
+        self.ef_construction = ef_construction
+        self.reset()
+    
+    def reset(self):
+        self._index = faiss.IndexHNSWFlat(self.dimension, self.m, faiss.METRIC_INNER_PRODUCT)
+        self._index.hnsw.efConstruction = self.ef_construction
+    
+    def add(self, rows: np.ndarray, vectors: np.ndarray):
+        if len(rows) == 0:
+            return
+        if int(rows[0]) != self._index.ntotal:
+            raise ValueError("HNSW index rows must be added in order")
+        self._index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+    
+    def candidates(self, query: np.ndarray, k: int) -> Optional[np.ndarray]:
+        if self._index.ntotal == 0:
+            return None
+        
+        self._index.hnsw.efSearch = max(self.ef_search, k)
+        _, ids = self._index.search(query[None, :].astype(np.float32), max(self.ef_search, k))
+        return ids[0][ids[0] >= 0].astype(np.int64)
+    
+    def get_params(self) -> Dict[str, Any]:
+        return {"m": self.m, "ef_search": self.ef_search, "ef_construction": self.ef_construction}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["indexed_rows"] = self._index.ntotal
+        return stats
+
+
+def create_vector_index(config) -> Optional[VectorIndex]:
+    """Build the ANN index selected by ``config.vector_index`` (None for exact)"""
+    index_type = getattr(config, "vector_index", "exact")
+    dimension = config.vector_dimension
+    
+    if index_type == "hnsw":
+        if FAISS_AVAILABLE:
+            return HNSWIndex(
+                dimension,
+                m=config.hnsw_m,
+                ef_search=config.hnsw_ef_search,
+                ef_construction=config.hnsw_ef_construction
+            )
+        logger.warning("faiss-cpu not installed; falling back to IVF vector index")
+        index_type = "ivf"
+    
+    if index_type == "ivf":
+        return IVFIndex(dimension, nlist=config.ivf_nlist, nprobe=config.ivf_nprobe)
+    
+    return None
+
+
+class BM25Index:
+    """Incremental inverted index with Okapi BM25 scoring
+    
+    Postings map term -> {doc number: term frequency}. Documents are keyed by
+    chunk_id; internal doc numbers are reused after removal. Each term's
+    postings are turned into numpy arrays on first use and cached until the
+    term changes, so a query costs one vectorized pass per query term.
+    """
+    
+    # Words plus joined identifiers such as HSA-2024-001 or scroll_id.v2
+    TOKEN_PATTERN = re.compile(r"\w+(?:[-_.:/]\w+)*")
+    
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.reset()
+    
+    def reset(self):
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self._posting_arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.doc_keys: List[Optional[str]] = []  # doc number -> chunk_id
+        self.doc_numbers: Dict[str, int] = {}  # chunk_id -> doc number
+        self._doc_lengths = np.zeros(256, dtype=np.float32)
+        self._free: List[int] = []
+        self.total_length = 0
+    
+    def __len__(self) -> int:
+        return len(self.doc_numbers)
+    
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        """Lowercased terms; joined identifiers also yield their parts"""
+        terms = []
+        for match in cls.TOKEN_PATTERN.finditer(text.lower()):
+            term = match.group()
+            terms.append(term)
+            if not term.isalnum():
+                terms.extend(part for part in re.split(r"[-_.:/]", term) if part)
+        return terms
+    
+    def _term_counts(self, text: str) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for term in self.tokenize(text):
+            counts[term] = counts.get(term, 0) + 1
+        return counts
+    
+    def add(self, key: str, text: str):
+        """Index a document; the key must not already be indexed"""
+        if key in self.doc_numbers:
+            raise ValueError(f"Document already indexed: {key}")
+        
+        if self._free:
+            doc = self._free.pop()
+            self.doc_keys[doc] = key
+        else:
+            doc = len(self.doc_keys)
+            self.doc_keys.append(key)
+            if doc >= len(self._doc_lengths):
+                self._doc_lengths = np.concatenate([self._doc_lengths, np.zeros_like(self._doc_lengths)])
+        self.doc_numbers[key] = doc
+        
+        counts = self._term_counts(text)
+        for term, count in counts.items():
+            self.postings.setdefault(term, {})[doc] = count
+            self._posting_arrays.pop(term, None)
+        length = sum(counts.values())
+        self._doc_lengths[doc] = length
+        self.total_length += length
+    
+    def remove(self, key: str, text: str):
+        """Drop a document; ``text`` must be the content it was indexed with"""
+        doc = self.doc_numbers.pop(key, None)
+        if doc is None:
+            return
+        
+        for term in self._term_counts(text):
+            postings = self.postings.get(term)
+            if postings is not None and postings.pop(doc, None) is not None:
+                self._posting_arrays.pop(term, None)
+                if not postings:
+                    del self.postings[term]
+        self.total_length -= int(self._doc_lengths[doc])
+        self._doc_lengths[doc] = 0
+        self.doc_keys[doc] = None
+        self._free.append(doc)
+    
+    def _arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        postings = self.postings.get(term)
+        if not postings:
+            return None
+        arrays = self._posting_arrays.get(term)
+        if arrays is None:
+            arrays = (
+                np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float32, count=len(postings))
+            )
+            self._posting_arrays[term] = arrays
+        return arrays
+    
+    @staticmethod
+    def _idf(doc_count: int, doc_frequency: int) -> float:
+        return float(np.log(1.0 + (doc_count - doc_frequency + 0.5) / (doc_frequency + 0.5)))
+    
+    def max_score(self, query: str) -> float:
+        """Upper bound on any document's score for a query; 0.0 when no term matches
+        
+        Each term contributes less than ``idf * (k1 + 1)``, so dividing scores
+        by this keeps them in [0, 1).
+        """
+        doc_count = len(self.doc_numbers)
+        return sum(
+            self._idf(doc_count, len(self.postings[term])) * (self.k1 + 1.0)
+            for term in set(self.tokenize(query)) if term in self.postings
+        )
+    
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """Top-k (chunk_id, BM25 score) pairs for a query; k <= 0 returns every match"""
+        doc_count = len(self.doc_numbers)
+        if doc_count == 0:
+            return []
+        
+        average_length = max(self.total_length / doc_count, 1e-9)
+        scores = np.zeros(len(self.doc_keys), dtype=np.float32)
+        for term in set(self.tokenize(query)):
+            arrays = self._arrays(term)
+            if arrays is None:
+                continue
+            docs, frequencies = arrays
+            idf = self._idf(doc_count, len(docs))
+            norm = self.k1 * (1.0 - self.b + self.b * self._doc_lengths[docs] / average_length)
+            scores[docs] += idf * frequencies * (self.k1 + 1.0) / (frequencies + norm)
+        
+        docs = np.flatnonzero(scores)
+        if k > 0 and docs.size > k:
+            docs = docs[np.argpartition(-scores[docs], k - 1)[:k]]
+        docs = docs[np.argsort(-scores[docs], kind="stable")]
+        return [(self.doc_keys[doc], float(scores[doc])) for doc in docs]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self.doc_numbers),
+            "terms": len(self.postings),
+            "average_length": self.total_length / len(self.doc_numbers) if self.doc_numbers else 0.0,
+            "k1": self.k1,
+            "b": self.b
+        }
 
 
 class VectorStore:
-    """Simple vector store with similarity search"""
+    """Matrix-backed vector store with similarity search
+    
+    Embeddings live in one preallocated float32 matrix that grows by doubling.
+    Row ``i`` belongs to ``self.row_ids[i]``; metadata postings hold row numbers
+    so filters become boolean row masks over the matrix. An optional
+    VectorIndex narrows the rows scored per query, and an optional BM25Index
+    over chunk content enables lexical and hybrid search.
+    """
     
-    def __init__(self, dimension: int = 1536):
+    def __init__(self, dimension: int = 1536, initial_capacity: int = 256,
+                 index: Optional[VectorIndex] = None,
+                 lexical_index: Optional[BM25Index] = None):
         self.dimension = dimension
+        self.index = index
+        self.lexical_index = lexical_index
         self.chunks: Dict[str, DocumentChunk] = {}
-        self.embeddings: Dict[str, np.ndarray] = {}
-        self.metadata_index: Dict[str, List[str]] = {}  # metadata_key -> [chunk_ids]
+        self.row_ids: List[str] = []  # row -> chunk_id
+        self.id_to_row: Dict[str, int] = {}  # chunk_id -> row
+        self.metadata_index: Dict[str, List[int]] = {}  # metadata_key -> [rows]
+        self._matrix = np.zeros((max(1, initial_capacity), dimension), dtype=np.float32)
+        self._size = 0
+        self._content_length = 0
+        self.version = 0  # bumped on every write; keys query-cache generations
+        self.lineage = uuid.uuid4().hex[:16]  # which writer's history ``version`` counts
+        self._lineage_shared = False  # lineage came from a manifest other processes may load
+        self._persisted_rows = 0  # rows already written by VectorStoreLog
+        self._dirty_rows: Set[int] = set()  # persisted rows overwritten since
     
-    def add_chunk(self, chunk: DocumentChunk):
-        """Add chunk to vector store"""
+    def __len__(self) -> int:
+        return self._size
+    
+    @property
+    def generation(self) -> str:
+        """Query-cache generation: equal only for stores with the same contents
+        
+        A version alone is not enough: two processes that load the same log
+        and then ingest different documents reach the same version number.
+        A store restored from a log takes a fresh lineage on its first write.
+        """
+        return f"{self.version}-{self.lineage}"
+    
+    def _bump_version(self):
+        if self._lineage_shared:
+            self.lineage = uuid.uuid4().hex[:16]
+            self._lineage_shared = False
+        self.version += 1
+    
+    @property
+    def embeddings(self) -> np.ndarray:
+        """Live view of the populated rows of the embedding matrix"""
+        return self._matrix[:self._size]
+    
+    def _ensure_capacity(self, required: int):
+        """Grow the embedding matrix (amortized doubling) to hold ``required`` rows"""
+        capacity = self._matrix.shape[0]
+        if required <= capacity:
+            return
+        
+        new_capacity = max(required, capacity * 2)
+        grown = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        grown[:self._size] = self._matrix[:self._size]
+        self._matrix = grown
+        logger.debug(f"Vector store matrix grown to {new_capacity} rows")
+    
+    def _index_metadata(self, row: int, metadata: Dict[str, Any]):
+        """Record row in metadata postings"""
+        for key, value in metadata.items():
+            index_key = f"{key}:{value}"
+            self.metadata_index.setdefault(index_key, []).append(row)
+    
+    def _unindex_metadata(self, row: int, metadata: Dict[str, Any]):
+        """Remove row from metadata postings"""
+        for key, value in metadata.items():
+            rows = self.metadata_index.get(f"{key}:{value}")
+            if rows and row in rows:
+                rows.remove(row)
+                if not rows:
+                    del self.metadata_index[f"{key}:{value}"]
+    
+    def _make_writable(self):
+        """Copy a read-only (memory-mapped) matrix into private memory before writing"""
+        if self._matrix.flags.writeable:
+            return
+        
+        logger.info("Promoting memory-mapped vector matrix to private memory for writes")
+        self._ensure_capacity(self._matrix.shape[0] + 1)
+    
+    def _index_rows(self, rows: List[int]):
+        """Feed new rows to the ANN index, training it once enough rows exist"""
+        if self.index is None or not rows:
+            return
+        
+        if not self.index.is_trained:
+            if self._size < self.index.min_train_size:
+                return
+            self.index.train(self.embeddings)
+            rows = list(range(self._size))
+        
+        row_array = np.asarray(rows, dtype=np.int64)
+        self.index.add(row_array, self._matrix[row_array])
+    
+    def _insert_chunk(self, chunk: DocumentChunk) -> Tuple[int, bool]:
+        """Write chunk into the matrix; returns (row, is_new_row)"""
         if chunk.embedding is None:
             raise ValueError("Chunk must have embedding before adding to store")
         
+        embedding = np.asarray(chunk.embedding, dtype=np.float32)
+        if embedding.shape != (self.dimension,):
+            raise ValueError(
+                f"Embedding dimension {embedding.shape} does not match store dimension {self.dimension}"
+            )
+        
+        row = self.id_to_row.get(chunk.chunk_id)
+        is_new = row is None
+        if is_new:
+            self._ensure_capacity(self._size + 1)
+            row = self._size
+            self._size += 1
+            self.row_ids.append(chunk.chunk_id)
+            self.id_to_row[chunk.chunk_id] = row
+        else:
+            previous = self.chunks[chunk.chunk_id]
+            self._unindex_metadata(row, previous.metadata)
+            self._content_length -= len(previous.content)
+            if self.lexical_index is not None:
+                self.lexical_index.remove(chunk.chunk_id, previous.content)
+        
+        if self.lexical_index is not None:
+            self.lexical_index.add(chunk.chunk_id, chunk.content)
+        self._index_metadata(row, chunk.metadata)
+        self._content_length += len(chunk.content)
+        self._bump_version()
+        self._make_writable()
+        self._matrix[row] = embedding
         self.chunks[chunk.chunk_id] = chunk
-        self.embeddings[chunk.chunk_id] = chunk.embedding
         
-        # Update metadata index
-        for key, value in chunk.metadata.items():
-            index_key = f"{key}:{value}"
-            if index_key not in self.metadata_index:
-                self.metadata_index[index_key] = []
-            self.metadata_index[index_key].append(chunk.chunk_id)
+        if not is_new:
+            if row < self._persisted_rows:
+                self._dirty_rows.add(row)
+            if self.index is not None:
+                self.index.update(row, self._matrix[row])
+        return row, is_new
+    
+    def add_chunk(self, chunk: DocumentChunk):
+        """Add chunk to vector store"""
+        row, is_new = self._insert_chunk(chunk)
+        if is_new:
+            self._index_rows([row])
     
     def add_chunks(self, chunks: List[DocumentChunk]):
         """Add multiple chunks to vector store"""
+        self._ensure_capacity(self._size + len(chunks))
+        new_rows = []
         for chunk in chunks:
-            self.add_chunk(chunk)
+            row, is_new = self._insert_chunk(chunk)
+            if is_new:
+                new_rows.append(row)
+        self._index_rows(new_rows)
+    
+    def delete_chunks(self, chunk_ids: Iterable[str]) -> int:
+        """Remove chunks; returns how many were present
+        
+        Each freed row is filled by the current last row (swap-remove), so the
+        matrix stays dense. The moved row is marked dirty and the log drops
+        the rows past the new end on the next persist.
+        """
+        rebuild_index = self.index is not None and not self.index.supports_remove
+        removed = 0
+        
+        for chunk_id in chunk_ids:
+            row = self.id_to_row.pop(chunk_id, None)
+            if row is None:
+                continue
+            
+            self._make_writable()
+            chunk = self.chunks.pop(chunk_id)
+            self._unindex_metadata(row, chunk.metadata)
+            self._content_length -= len(chunk.content)
+            if self.lexical_index is not None:
+                self.lexical_index.remove(chunk_id, chunk.content)
+            if self.index is not None and not rebuild_index:
+                self.index.remove(row)
+            
+            last = self._size - 1
+            if row != last:
+                moved_id = self.row_ids[last]
+                moved_metadata = self.chunks[moved_id].metadata
+                self._unindex_metadata(last, moved_metadata)
+                self._index_metadata(row, moved_metadata)
+                self._matrix[row] = self._matrix[last]
+                self.row_ids[row] = moved_id
+                self.id_to_row[moved_id] = row
+                if row < self._persisted_rows:
+                    self._dirty_rows.add(row)
+                if self.index is not None and not rebuild_index:
+                    self.index.remove(last)
+                    self.index.add(np.array([row]), self._matrix[row][None, :])
+            
+            self.row_ids.pop()
+            self._dirty_rows.discard(last)
+            self._size -= 1
+            self._bump_version()
+            removed += 1
+        
+        if rebuild_index and removed:
+            self.index.reset()
+            self._index_rows(list(range(self._size)))
+        return removed
+    
+    def _filter_mask(self, metadata_filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Build boolean row mask for metadata filters (None means no filtering)"""
+        if not metadata_filters:
+            return None
+        
+        mask = np.ones(self._size, dtype=bool)
+        for key, value in metadata_filters.items():
+            rows = self.metadata_index.get(f"{key}:{value}")
+            if not rows:
+                return np.zeros(self._size, dtype=bool)
+            
+            key_mask = np.zeros(self._size, dtype=bool)
+            key_mask[rows] = True
+            mask &= key_mask
+        
+        return mask
     
     def similarity_search(self, query_embedding: np.ndarray, k: int = 5, 
                          threshold: float = 0.7, 
-                         metadata_filters: Optional[Dict[str, Any]] = None) -> List[Tuple[DocumentChunk, float]]:
-        """Perform similarity search with optional metadata filtering"""
-        if not self.embeddings:
+                         metadata_filters: Optional[Dict[str, Any]] = None,
+                         exact: bool = False) -> List[Tuple[DocumentChunk, float]]:
+        """Perform similarity search with optional metadata filtering
+        
+        Uses the ANN index when one is configured unless ``exact`` is set.
+        """
+        if self._size == 0 or k <= 0:
             return []
         
-        # Apply metadata filters if specified
-        candidate_chunk_ids = set(self.chunks.keys())
-        if metadata_filters:
-            for key, value in metadata_filters.items():
-                index_key = f"{key}:{value}"
-                if index_key in self.metadata_index:
-                    candidate_chunk_ids &= set(self.metadata_index[index_key])
-                else:
-                    return []  # No chunks match the filter
+        mask = self._filter_mask(metadata_filters)
+        if mask is not None and not mask.any():
+            return []  # No chunks match the filter
+        
+        query = np.asarray(query_embedding, dtype=np.float32)
+        rows = None
+        if self.index is not None and not exact:
+            rows = self.index.candidates(query, k)
+        
+        if rows is None:
+            # Score every row with a single matrix-vector product
+            scores = self.embeddings @ query
+            eligible = scores >= threshold
+            if mask is not None:
+                eligible &= mask
+            rows = np.flatnonzero(eligible)
+            row_scores = scores[rows]
+        else:
+            if mask is not None:
+                rows = rows[mask[rows]]
+            row_scores = self._matrix[rows] @ query
+            keep = row_scores >= threshold
+            rows, row_scores = rows[keep], row_scores[keep]
+        
+        if rows.size == 0:
+            return []
+        
+        # Select top k without sorting every candidate
+        if rows.size > k:
+            top = np.argpartition(-row_scores, k - 1)[:k]
+            rows, row_scores = rows[top], row_scores[top]
+        order = np.argsort(-row_scores, kind="stable")
+        
+        return [
+            (self.chunks[self.row_ids[row]], float(score))
+            for row, score in zip(rows[order], row_scores[order])
+        ]
+    
+    def lexical_search(self, query_text: str, k: int = 5,
+                       metadata_filters: Optional[Dict[str, Any]] = None) -> List[Tuple[DocumentChunk, float]]:
+        """BM25 keyword search over chunk content (requires a lexical index)"""
+        if self.lexical_index is None:
+            raise ValueError("Vector store has no lexical index")
+        if k <= 0:
+            return []
+        
+        mask = self._filter_mask(metadata_filters)
+        if mask is None:
+            hits = self.lexical_index.search(query_text, k)
+        else:
+            hits = [
+                (chunk_id, score) for chunk_id, score in self.lexical_index.search(query_text, 0)
+                if mask[self.id_to_row[chunk_id]]
+            ][:k]
+        return [(self.chunks[chunk_id], score) for chunk_id, score in hits]
+    
+    def hybrid_search(self, query_embedding: np.ndarray, query_text: str, k: int = 5,
+                      threshold: float = 0.7,
+                      metadata_filters: Optional[Dict[str, Any]] = None,
+                      rrf_k: int = 60) -> List[Tuple[DocumentChunk, float, Dict[str, Any]]]:
+        """Fuse vector and BM25 rankings with reciprocal rank fusion
+        
+        Each list is searched ``max(4k, 20)`` deep; a chunk scores
+        ``sum(1 / (rrf_k + rank))`` over the lists it appears in. Returns
+        ``(chunk, cosine similarity, fusion details)`` in fused order, so exact
+        term matches surface even when their cosine is below ``threshold``.
+        """
+        depth = max(k * 4, 20)
+        fused: Dict[str, Dict[str, Any]] = {}
         
-        # Calculate similarities
+        vector_hits = self.similarity_search(query_embedding, depth, threshold, metadata_filters)
+        for rank, (chunk, similarity) in enumerate(vector_hits, 1):
+            entry = fused.setdefault(chunk.chunk_id, {"chunk": chunk, "rrf_score": 0.0})
+            entry.update(rrf_score=entry["rrf_score"] + 1.0 / (rrf_k + rank),
+                         vector_rank=rank, similarity=similarity)
+        
+        for rank, (chunk, bm25) in enumerate(self.lexical_search(query_text, depth, metadata_filters), 1):
+            entry = fused.setdefault(chunk.chunk_id, {"chunk": chunk, "rrf_score": 0.0})
+            entry.update(rrf_score=entry["rrf_score"] + 1.0 / (rrf_k + rank),
+                         lexical_rank=rank, bm25=bm25)
+        
+        query = np.asarray(query_embedding, dtype=np.float32)
         results = []
-        for chunk_id in candidate_chunk_ids:
-            embedding = self.embeddings[chunk_id]
-            similarity = np.dot(query_embedding, embedding)
+        for entry in sorted(fused.values(), key=lambda e: e["rrf_score"], reverse=True)[:k]:
+            chunk = entry.pop("chunk")
+            similarity = entry.pop("similarity", None)
+            if similarity is None:
+                similarity = float(self._matrix[self.id_to_row[chunk.chunk_id]] @ query)
+            results.append((chunk, similarity, entry))
+        return results
+    
+    def evaluate_recall(self, queries: np.ndarray, k: int = 10) -> Dict[str, Any]:
+        """Compare ANN results against exact search (recall@k and latency)"""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        recalls = []
+        exact_seconds = 0.0
+        ann_seconds = 0.0
+        
+        for query in queries:
+            started = time.perf_counter()
+            exact_ids = {c.chunk_id for c, _ in self.similarity_search(query, k, -np.inf, exact=True)}
+            exact_seconds += time.perf_counter() - started
             
-            if similarity >= threshold:
-                chunk = self.chunks[chunk_id]
-                results.append((chunk, similarity))
+            started = time.perf_counter()
+            ann_ids = {c.chunk_id for c, _ in self.similarity_search(query, k, -np.inf)}
+            ann_seconds += time.perf_counter() - started
+            
+            if exact_ids:
+                recalls.append(len(exact_ids & ann_ids) / len(exact_ids))
         
-        # Sort by similarity and return top k
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:k]
+        count = max(len(queries), 1)
+        return {
+            "index_type": self.index.index_type if self.index else "exact",
+            "params": self.index.get_params() if self.index else {},
+            "k": k,
+            "queries": len(queries),
+            "total_chunks": self._size,
+            "recall_at_k": float(np.mean(recalls)) if recalls else 1.0,
+            "min_recall": float(np.min(recalls)) if recalls else 1.0,
+            "exact_ms_avg": exact_seconds * 1000 / count,
+            "ann_ms_avg": ann_seconds * 1000 / count,
+            "speedup": exact_seconds / ann_seconds if ann_seconds > 0 else None
+        }
     
     def get_chunk(self, chunk_id: str) -> Optional[DocumentChunk]:
         """Get chunk by ID"""
         return self.chunks.get(chunk_id)
     
+    def get_embedding(self, chunk_id: str) -> Optional[np.ndarray]:
+        """Get embedding row for a chunk"""
+        row = self.id_to_row.get(chunk_id)
+        return self._matrix[row] if row is not None else None
+    
     def list_chunks(self, metadata_filters: Optional[Dict[str, Any]] = None) -> List[DocumentChunk]:
         """List all chunks with optional metadata filtering"""
         if not metadata_filters:
             return list(self.chunks.values())
         
-        # Apply metadata filters
-        candidate_chunk_ids = set(self.chunks.keys())
-        for key, value in metadata_filters.items():
-            index_key = f"{key}:{value}"
-            if index_key in self.metadata_index:
-                candidate_chunk_ids &= set(self.metadata_index[index_key])
-            else:
-                return []
-        
-        return [self.chunks[chunk_id] for chunk_id in candidate_chunk_ids]
+        mask = self._filter_mask(metadata_filters)
+        return [self.chunks[self.row_ids[row]] for row in np.flatnonzero(mask)]
     
     def save(self, path: Path):
         """Save vector store to disk"""
         data = {
-            "chunks": {chunk_id: chunk.to_dict() for chunk_id, chunk in self.chunks.items()},
-            "metadata_index": self.metadata_index,
+            "chunks": {
+                chunk_id: chunk.to_dict(include_embedding=False)
+                for chunk_id, chunk in self.chunks.items()
+            },
+            "row_ids": self.row_ids,
+            "embeddings": self.embeddings.copy(),
             "dimension": self.dimension
         }
         
         with open(path, 'wb') as f:
-            pickle.dump(data, f)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
         
         logger.info(f"Vector store saved to {path}")
     
@@ -201,130 +937,937 @@ class VectorStore:
             data = pickle.load(f)
         
         self.dimension = data["dimension"]
-        self.metadata_index = data["metadata_index"]
         
-        # Reconstruct chunks and embeddings
-        self.chunks = {}
-        self.embeddings = {}
-        for chunk_id, chunk_data in data["chunks"].items():
-            chunk = DocumentChunk.from_dict(chunk_data)
-            self.chunks[chunk_id] = chunk
-            if chunk.embedding is not None:
-                self.embeddings[chunk_id] = chunk.embedding
+        if "embeddings" in data:
+            # Matrix format: rows line up with row_ids
+            self.restore(
+                np.asarray(data["embeddings"], dtype=np.float32),
+                [DocumentChunk.from_dict(data["chunks"][chunk_id]) for chunk_id in data["row_ids"]]
+            )
+        else:
+            # Legacy format: embeddings stored as lists on each chunk
+            self._reset(len(data["chunks"]))
+            self.add_chunks([
+                DocumentChunk.from_dict(chunk_data)
+                for chunk_data in data["chunks"].values()
+                if chunk_data.get("embedding")
+            ])
         
         logger.info(f"Vector store loaded from {path} with {len(self.chunks)} chunks")
     
+    def _reset(self, capacity: int):
+        """Drop all rows and reallocate the matrix"""
+        self.chunks = {}
+        self.row_ids = []
+        self.id_to_row = {}
+        self.metadata_index = {}
+        self._matrix = np.zeros((max(1, capacity), self.dimension), dtype=np.float32)
+        self._size = 0
+        self._content_length = 0
+        self._persisted_rows = 0
+        self._dirty_rows = set()
+        if self.index is not None:
+            self.index.reset()
+        if self.lexical_index is not None:
+            self.lexical_index.reset()
+    
+    def _attach(self, row_ids: List[str], metadatas: List[Dict[str, Any]],
+                content_length: int, persisted: bool, version: int = 0,
+                contents: Optional[Iterable[str]] = None, lineage: str = ""):
+        """Rebuild row maps, metadata postings and ANN/lexical indexes for restored rows"""
+        self.version = version
+        self.lineage = lineage
+        self._lineage_shared = True
+        for row, (chunk_id, metadata) in enumerate(zip(row_ids, metadatas)):
+            self.row_ids.append(chunk_id)
+            self.id_to_row[chunk_id] = row
+            self._index_metadata(row, metadata)
+        if self.lexical_index is not None and contents is not None:
+            for chunk_id, content in zip(row_ids, contents):
+                self.lexical_index.add(chunk_id, content)
+        self._size = len(row_ids)
+        self._content_length = content_length
+        self._index_rows(list(range(self._size)))
+        if persisted:
+            self._persisted_rows = self._size
+    
+    def restore(self, matrix: np.ndarray, chunks: List[DocumentChunk], persisted: bool = False,
+                version: int = 0, lineage: str = ""):
+        """Replace contents with ``chunks`` whose embeddings are the rows of ``matrix``
+        
+        Embeddings stay in the matrix; use get_embedding() for a chunk's row.
+        """
+        self._reset(len(chunks))
+        self._matrix[:len(chunks)] = matrix[:len(chunks)]
+        self.chunks = {chunk.chunk_id: chunk for chunk in chunks}
+        self._attach(
+            [chunk.chunk_id for chunk in chunks],
+            [chunk.metadata for chunk in chunks],
+            sum(len(chunk.content) for chunk in chunks),
+            persisted,
+            version,
+            contents=[chunk.content for chunk in chunks],
+            lineage=lineage
+        )
+    
+    def restore_mapped(self, matrix: np.ndarray, chunks: "LazyChunkMap",
+                       metadatas: List[Dict[str, Any]], content_length: int, version: int = 0,
+                       contents: Optional[List[str]] = None, lineage: str = ""):
+        """Zero-copy restore: ``matrix`` (a read-only memmap) becomes the store matrix
+        
+        ``chunks`` materializes DocumentChunks on access. The first write
+        promotes the matrix to private memory. ``contents`` (row order) feeds
+        the lexical index, if the store has one.
+        """
+        self._reset(0)
+        self._matrix = matrix if len(matrix) else self._matrix
+        self.chunks = chunks
+        self._attach(chunks.row_ids, metadatas, content_length, persisted=True, version=version,
+                     contents=contents, lineage=lineage)
+    
+    def take_delta(self) -> Dict[str, Any]:
+        """Collect rows written since the last persist (new rows and overwrites)
+        
+        ``truncate`` is set when deletions left fewer rows than the log holds.
+        """
+        start_row = min(self._persisted_rows, self._size)
+        dirty_rows = sorted(row for row in self._dirty_rows if row < start_row)
+        rows = dirty_rows + list(range(start_row, self._size))
+        
+        return {
+            "start_row": start_row,
+            "end_row": self._size,
+            "truncate": self._size < self._persisted_rows,
+            "version": self.version,
+            "lineage": self.lineage,
+            "dirty_rows": dirty_rows,
+            "records": [
+                {"op": "put", "row": row, **self.chunks[self.row_ids[row]].to_dict(include_embedding=False)}
+                for row in rows
+            ],
+            "embeddings": self._matrix[rows].copy()
+        }
+    
+    def mark_persisted(self, delta: Dict[str, Any]):
+        """Record that a delta from take_delta() reached disk"""
+        self._persisted_rows = delta["end_row"]
+        self._dirty_rows.difference_update(delta["dirty_rows"])
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get vector store statistics"""
-        document_types = {}
-        total_content_length = 0
-        
-        for chunk in self.chunks.values():
-            doc_type = chunk.metadata.get("document_type", "unknown")
-            document_types[doc_type] = document_types.get(doc_type, 0) + 1
-            total_content_length += len(chunk.content)
+        # Counted from postings so lazily loaded chunks are not materialized
+        document_types = {
+            key.split(":", 1)[1]: len(rows)
+            for key, rows in self.metadata_index.items()
+            if key.startswith("document_type:")
+        }
+        untyped = self._size - sum(document_types.values())
+        if untyped:
+            document_types["unknown"] = document_types.get("unknown", 0) + untyped
+        total_content_length = self._content_length
         
         return {
             "total_chunks": len(self.chunks),
             "dimension": self.dimension,
+            "matrix_capacity": self._matrix.shape[0],
+            "matrix_bytes": self._matrix.nbytes,
+            "memory_mapped": isinstance(self._matrix, np.memmap),
+            "index": self.index.get_stats() if self.index else {"index_type": "exact"},
+            "lexical_index": self.lexical_index.get_stats() if self.lexical_index is not None else None,
             "document_types": document_types,
             "total_content_length": total_content_length,
             "average_chunk_length": total_content_length / len(self.chunks) if self.chunks else 0
         }
 
 
+class LazyChunkMap(MutableMapping):
+    """chunk_id -> DocumentChunk mapping backed by a memory-mapped JSONL log
+    
+    Only byte offsets are kept per row; a DocumentChunk is built when a query
+    actually returns it (a small LRU keeps recently used ones). Chunks
+    assigned after loading are held in memory.
+    """
+    
+    def __init__(self, buffer, row_ids: List[str], offsets: Dict[str, Tuple[int, int]],
+                 cache_size: int = 1024):
+        self._buffer = buffer
+        self.row_ids = row_ids
+        self._offsets = offsets
+        self._written: Dict[str, DocumentChunk] = {}
+        self._cache: "OrderedDict[str, DocumentChunk]" = OrderedDict()
+        self.cache_size = cache_size
+        self.materialized = 0
+    
+    def __getitem__(self, chunk_id: str) -> DocumentChunk:
+        if chunk_id in self._written:
+            return self._written[chunk_id]
+        if chunk_id in self._cache:
+            self._cache.move_to_end(chunk_id)
+            return self._cache[chunk_id]
+        
+        start, end = self._offsets[chunk_id]
+        chunk = DocumentChunk.from_dict(json.loads(self._buffer[start:end]))
+        self.materialized += 1
+        self._cache[chunk_id] = chunk
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return chunk
+    
+    def __setitem__(self, chunk_id: str, chunk: DocumentChunk):
+        self._offsets.pop(chunk_id, None)
+        self._cache.pop(chunk_id, None)
+        self._written[chunk_id] = chunk
+    
+    def __delitem__(self, chunk_id: str):
+        if chunk_id not in self:
+            raise KeyError(chunk_id)
+        self._offsets.pop(chunk_id, None)
+        self._cache.pop(chunk_id, None)
+        self._written.pop(chunk_id, None)
+    
+    def __contains__(self, chunk_id) -> bool:
+        return chunk_id in self._offsets or chunk_id in self._written
+    
+    def __iter__(self):
+        yield from list(self._offsets)
+        yield from list(self._written)
+    
+    def __len__(self) -> int:
+        return len(self._offsets) + len(self._written)
+
+
+class VectorStoreLog:
+    """Append-only on-disk layout for VectorStore
+    
+    The embedding file holds raw float32 rows ("slots"). Every row write,
+    new or overwritten, is appended to a fresh slot, and ``chunks-<gen>.jsonl``
+    gets one record per write naming the store row and its slot; committed
+    slots are never rewritten. ``manifest.json`` (replaced atomically)
+    records how many rows, slots and bytes are committed, so a torn write is
+    simply ignored on load. Periodic compaction drops superseded records and
+    slots by writing the next generation of both files, with slots back in
+    row order.
+    """
+    
+    FORMAT_VERSION = 2
+    LEGACY_EMBEDDINGS_FILE = "embeddings.f32"
+    COMPACTION_BLOCK_ROWS = 4096
+    
+    def __init__(self, directory: Path, compaction_ratio: float = 0.5,
+                 min_compaction_records: int = 256):
+        self.directory = Path(directory)
+        self.compaction_ratio = compaction_ratio
+        self.min_compaction_records = min_compaction_records
+        self.manifest_path = self.directory / "manifest.json"
+        self.bytes_written = 0
+        self.compactions = 0
+    
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+    
+    def _chunks_path(self, generation: int) -> Path:
+        return self.directory / f"chunks-{generation:06d}.jsonl"
+    
+    def _embeddings_path(self, manifest: Dict[str, Any]) -> Path:
+        # Logs written before slots existed keep their single embeddings.f32
+        return self.directory / manifest.get("embeddings_file", self.LEGACY_EMBEDDINGS_FILE)
+    
+    @property
+    def embeddings_path(self) -> Path:
+        """Embedding file of the committed generation"""
+        return self._embeddings_path(self.read_manifest() if self.exists() else {})
+    
+    @staticmethod
+    def _slots(manifest: Dict[str, Any]) -> int:
+        return manifest.get("slots", manifest["rows"])
+    
+    def read_manifest(self) -> Dict[str, Any]:
+        with open(self.manifest_path, 'r') as f:
+            return json.load(f)
+    
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+    
+    def write_delta(self, delta: Dict[str, Any], dimension: int) -> Dict[str, Any]:
+        """Persist a VectorStore.take_delta() result; writes only the delta"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.exists():
+            manifest = self.read_manifest()
+        else:
+            manifest = {
+                "format_version": self.FORMAT_VERSION,
+                "dimension": dimension,
+                "rows": 0,
+                "records": 0,
+                "generation": 1,
+                "chunks_bytes": 0,
+                "slots": 0,
+                "embeddings_file": f"embeddings-{1:06d}.f32"
+            }
+        
+        if manifest["dimension"] != dimension:
+            raise ValueError(f"Vector log dimension {manifest['dimension']} != store dimension {dimension}")
+        if delta["start_row"] != manifest["rows"] and not delta.get("truncate"):
+            raise ValueError(
+                f"Vector log holds {manifest['rows']} rows but delta starts at row {delta['start_row']}"
+            )
+        
+        row_bytes = dimension * 4
+        slots = self._slots(manifest)
+        chunks_path = self._chunks_path(manifest["generation"])
+        embeddings_path = self._embeddings_path(manifest)
+        lines = b"".join(
+            json.dumps({**record, "slot": slots + position}, default=str).encode("utf-8") + b"\n"
+            for position, record in enumerate(delta["records"])
+        )
+        embeddings = np.ascontiguousarray(delta["embeddings"], dtype=np.float32)
+        
+        # Discard anything a previous interrupted write left past the committed
+        # slots, then append. Committed slots are never touched, so a crash
+        # before the manifest is replaced leaves the last commit readable.
+        with open(embeddings_path, 'r+b' if embeddings_path.exists() else 'w+b') as f:
+            f.truncate(slots * row_bytes)
+            f.seek(slots * row_bytes)
+            f.write(embeddings.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        
+        with open(chunks_path, 'a+b') as f:
+            f.truncate(manifest["chunks_bytes"])
+            f.seek(manifest["chunks_bytes"])
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        
+        manifest.update({
+            "format_version": self.FORMAT_VERSION,
+            "rows": delta["end_row"],
+            "slots": slots + len(delta["records"]),
+            "records": manifest["records"] + len(delta["records"]),
+            "chunks_bytes": manifest["chunks_bytes"] + len(lines),
+            "version": delta.get("version", manifest.get("version", 0)),
+            "lineage": delta.get("lineage", manifest.get("lineage", "")),
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        })
+        self._write_manifest(manifest)
+        self.bytes_written += len(lines) + embeddings.nbytes
+        
+        if self._needs_compaction(manifest):
+            self.compact()
+        
+        return {"records_written": len(delta["records"]), "bytes_written": len(lines) + embeddings.nbytes}
+    
+    def _needs_compaction(self, manifest: Dict[str, Any]) -> bool:
+        # Every record holds a slot, so this also counts the superseded slots
+        superseded = manifest["records"] - manifest["rows"]
+        return (superseded >= self.min_compaction_records and
+                superseded > self.compaction_ratio * manifest["rows"])
+    
+    def _read_records(self, manifest: Dict[str, Any]) -> List[Optional[Dict[str, Any]]]:
+        """Latest record per row from the committed part of the JSONL log"""
+        latest: List[Optional[Dict[str, Any]]] = [None] * manifest["rows"]
+        with open(self._chunks_path(manifest["generation"]), 'rb') as f:
+            data = f.read(manifest["chunks_bytes"])
+        for line in data.splitlines():
+            record = json.loads(line)
+            if record["op"] == "put" and record["row"] < manifest["rows"]:
+                latest[record["row"]] = record
+        return latest
+    
+    def compact(self):
+        """Rewrite the log keeping only the latest record and slot per row
+        
+        Live slots are copied into a new embedding file in row order, so the
+        next load can map it without gathering rows.
+        """
+        manifest = self.read_manifest()
+        records = self._read_records(manifest)
+        generation = manifest["generation"] + 1
+        embeddings_file = f"embeddings-{generation:06d}.f32"
+        lines = b"".join(
+            json.dumps({**record, "slot": row}, default=str).encode("utf-8") + b"\n"
+            for row, record in enumerate(records) if record
+        )
+        
+        source = self._map_slots(manifest)
+        with open(self.directory / embeddings_file, 'wb') as f:
+            for start in range(0, len(records), self.COMPACTION_BLOCK_ROWS):
+                block = records[start:start + self.COMPACTION_BLOCK_ROWS]
+                slots = [self._slot(record, start + offset) if record else 0 for offset, record in enumerate(block)]
+                f.write(np.ascontiguousarray(source[slots]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        del source
+        
+        with open(self._chunks_path(generation), 'wb') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        
+        old_paths = [self._chunks_path(manifest["generation"]), self._embeddings_path(manifest)]
+        manifest.update({
+            "format_version": self.FORMAT_VERSION,
+            "generation": generation,
+            "records": sum(1 for record in records if record),
+            "slots": len(records),
+            "chunks_bytes": len(lines),
+            "embeddings_file": embeddings_file
+        })
+        self._write_manifest(manifest)
+        for old_path in old_paths:
+            try:
+                old_path.unlink(missing_ok=True)
+            except OSError as e:
+                # Still mapped by a reader on platforms that forbid unlinking open files
+                logger.warning(f"Could not remove old vector log {old_path}: {e}")
+        self.compactions += 1
+        logger.info(f"Vector log compacted to generation {generation}")
+    
+    @staticmethod
+    def _slot(record: Dict[str, Any], row: int) -> int:
+        return record.get("slot", row)
+    
+    def _map_slots(self, manifest: Dict[str, Any]) -> np.ndarray:
+        """Read-only memmap of every committed slot"""
+        slots, dimension = self._slots(manifest), manifest["dimension"]
+        if not slots:
+            return np.zeros((0, dimension), dtype=np.float32)
+        return np.memmap(self._embeddings_path(manifest), dtype=np.float32, mode='r', shape=(slots, dimension))
+    
+    def _matrix(self, manifest: Dict[str, Any], slot_by_row: List[int]) -> np.ndarray:
+        """Row-ordered embeddings: the memmap itself when slots are in row order, else a gathered copy"""
+        mapped = self._map_slots(manifest)
+        if slot_by_row == list(range(len(slot_by_row))):
+            return mapped[:len(slot_by_row)]
+        return np.asarray(mapped[slot_by_row])
+    
+    def load(self, store: "VectorStore", mmap_mode: bool = False):
+        """Load committed rows into ``store`` by memory-mapping the embedding file
+        
+        With ``mmap_mode`` the read-only memmap is used directly as the store
+        matrix (shared page cache across processes) and chunks are
+        materialized lazily; otherwise rows and chunks are copied into memory.
+        Rows overwritten since the last compaction live out of row order, so
+        until then the matrix is gathered into memory even with ``mmap_mode``.
+        """
+        manifest = self.read_manifest()
+        rows = manifest["rows"]
+        store.dimension = manifest["dimension"]
+        
+        if mmap_mode:
+            self._load_mapped(store, manifest)
+        else:
+            records = self._read_records(manifest)
+            matrix = self._matrix(manifest, [self._slot(record, row) for row, record in enumerate(records)])
+            chunks = [DocumentChunk.from_dict(record) for record in records]
+            store.restore(matrix, chunks, persisted=True, version=manifest.get("version", 0),
+                          lineage=manifest.get("lineage", ""))
+        logger.info(f"Vector store loaded from {self.directory} with {rows} chunks (mmap={mmap_mode})")
+    
+    def _load_mapped(self, store: "VectorStore", manifest: Dict[str, Any]):
+        """Index record offsets in the mapped JSONL log without keeping chunk objects"""
+        rows = manifest["rows"]
+        slot_by_row = list(range(rows))
+        offsets_by_row: List[Optional[Tuple[int, int]]] = [None] * rows
+        metadatas: List[Dict[str, Any]] = [{}] * rows
+        content_lengths = [0] * rows
+        row_ids: List[str] = [""] * rows
+        contents: Optional[List[str]] = [""] * rows if store.lexical_index is not None else None
+        
+        buffer = b""
+        if manifest["chunks_bytes"]:
+            with open(self._chunks_path(manifest["generation"]), 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), manifest["chunks_bytes"], access=mmap.ACCESS_READ)
+        
+        start = 0
+        while start < manifest["chunks_bytes"]:
+            end = buffer.find(b"\n", start, manifest["chunks_bytes"])
+            end = manifest["chunks_bytes"] if end < 0 else end
+            record = json.loads(buffer[start:end])
+            row = record["row"]
+            if record["op"] == "put" and row < rows:
+                slot_by_row[row] = self._slot(record, row)
+                offsets_by_row[row] = (start, end)
+                row_ids[row] = record["chunk_id"]
+                metadatas[row] = record["metadata"]
+                content_lengths[row] = len(record["content"])
+                if contents is not None:
+                    contents[row] = record["content"]
+            start = end + 1
+        
+        chunks = LazyChunkMap(
+            buffer, row_ids,
+            {row_ids[row]: offsets for row, offsets in enumerate(offsets_by_row) if offsets}
+        )
+        matrix = self._matrix(manifest, slot_by_row)
+        store.restore_mapped(matrix, chunks, metadatas, sum(content_lengths), manifest.get("version", 0),
+                             contents=contents, lineage=manifest.get("lineage", ""))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        manifest = self.read_manifest() if self.exists() else {}
+        return {
+            "directory": str(self.directory),
+            "rows": manifest.get("rows", 0),
+            "slots": manifest.get("slots", manifest.get("rows", 0)),
+            "records": manifest.get("records", 0),
+            "generation": manifest.get("generation", 0),
+            "bytes_written": self.bytes_written,
+            "compactions": self.compactions
+        }
+
+
+class IngestManifest:
+    """Per-file record of ingested sources: size, mtime, content hash and chunk_ids
+    
+    Lets a re-ingest skip unchanged files, re-embed modified ones and delete
+    the chunks of removed ones. Keys are resolved file paths; the file is
+    replaced atomically on save.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f).get("files", {})
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    @staticmethod
+    def hash_file(file_path: Path) -> str:
+        """SHA-256 of the file contents"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def fingerprint(self, file_path: Path) -> Dict[str, Any]:
+        """Size, mtime and hash of a file; the hash is reused while size and mtime match"""
+        file_path = Path(file_path).resolve()
+        stat = file_path.stat()
+        entry = self.entries.get(str(file_path))
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            sha256 = entry["sha256"]
+        else:
+            sha256 = self.hash_file(file_path)
+        return {"path": str(file_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+    
+    def plan(self, file_paths: List[Path], root: Optional[Path] = None) -> Dict[str, Any]:
+        """Sort files into changed (new or modified) and unchanged fingerprints
+        
+        ``removed`` lists recorded paths under ``root`` (or anywhere, without a
+        root) that are no longer among ``file_paths``.
+        """
+        changed, unchanged = [], []
+        for file_path in file_paths:
+            fingerprint = self.fingerprint(file_path)
+            entry = self.entries.get(fingerprint["path"])
+            if entry and entry["sha256"] == fingerprint["sha256"]:
+                # Touched but identical: remember the new mtime to skip hashing next time
+                entry.update(size=fingerprint["size"], mtime_ns=fingerprint["mtime_ns"])
+                unchanged.append(fingerprint)
+            else:
+                changed.append(fingerprint)
+        
+        seen = {fingerprint["path"] for fingerprint in changed + unchanged}
+        root = Path(root).resolve() if root else None
+        removed = [
+            path for path in self.entries
+            if path not in seen and (root is None or Path(path).is_relative_to(root))
+        ]
+        return {"changed": changed, "unchanged": unchanged, "removed": removed}
+    
+    def record(self, fingerprint: Dict[str, Any], chunk_ids: List[str]) -> List[str]:
+        """Store a file's fingerprint and chunk_ids; returns its previous chunk_ids"""
+        previous = self.entries.get(fingerprint["path"], {}).get("chunk_ids", [])
+        self.entries[fingerprint["path"]] = {
+            "size": fingerprint["size"],
+            "mtime_ns": fingerprint["mtime_ns"],
+            "sha256": fingerprint["sha256"],
+            "chunk_ids": list(chunk_ids),
+            "ingested_at": datetime.now(timezone.utc).isoformat()
+        }
+        return previous
+    
+    def forget(self, path: str) -> List[str]:
+        """Drop a file's entry; returns its chunk_ids"""
+        return self.entries.pop(path, {}).get("chunk_ids", [])
+    
+    def referenced_chunk_ids(self) -> Set[str]:
+        """chunk_ids still produced by some recorded file (chunk ids are content hashes)"""
+        return {chunk_id for entry in self.entries.values() for chunk_id in entry["chunk_ids"]}
+    
+    def clear(self):
+        self.entries = {}
+    
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"files": self.entries}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
 class TextSplitter:
-    """Text splitter for creating document chunks"""
+    """Text splitter for creating document chunks
+    
+    Splitting is generator-based: ``iter_spans`` walks text that arrives in
+    blocks (a whole string or a file read incrementally) and yields
+    ``(start, end, content)`` windows, keeping only the current window in
+    memory. ``chunk_unit="tokens"`` measures chunk_size/chunk_overlap in
+    whitespace-delimited tokens, so boundaries never fall inside a token.
+    """
     
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+    TOKEN_PATTERN = re.compile(r"\S+")
+    READ_BLOCK_SIZE = 64 * 1024
+    
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200, chunk_unit: str = "chars"):
+        if chunk_unit not in ("chars", "tokens"):
+            raise ValueError(f"Unknown chunk unit: {chunk_unit}")
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.chunk_unit = chunk_unit
     
     def split_text(self, text: str, metadata: Dict[str, Any] = None) -> List[DocumentChunk]:
         """Split text into overlapping chunks"""
+        chunks = list(self.iter_text(text, metadata))
+        logger.debug(f"Split text into {len(chunks)} chunks")
+        return chunks
+    
+    def iter_text(self, text: str, metadata: Dict[str, Any] = None) -> Iterator[DocumentChunk]:
+        """Lazily yield overlapping chunks of text"""
         if not text.strip():
-            return []
-        
-        metadata = metadata or {}
-        chunks = []
+            return
+        yield from self._chunks_from_spans(self.iter_spans([text]), metadata or {})
+    
+    def iter_spans(self, blocks: Iterable[str]) -> Iterator[Tuple[int, int, str]]:
+        """Yield ``(start, end, content)`` windows over text arriving in blocks
         
-        # Simple character-based splitting with overlap
+        Positions are character offsets into the full text.
+        """
+        if self.chunk_unit == "tokens":
+            return self._iter_token_spans(iter(blocks))
+        return self._iter_char_spans(iter(blocks))
+    
+    def _chunks_from_spans(self, spans: Iterator[Tuple[int, int, str]],
+                           metadata: Dict[str, Any]) -> Iterator[DocumentChunk]:
+        for chunk_index, (start, end, content) in enumerate(spans):
+            # Create chunk with enhanced metadata
+            yield DocumentChunk(
+                content=content,
+                metadata={
+                    **metadata,
+                    "chunk_index": chunk_index,
+                    "start_position": start,
+                    "end_position": end,
+                    "chunk_length": len(content)
+                }
+            )
+    
+    def _iter_char_spans(self, blocks: Iterator[str]) -> Iterator[Tuple[int, int, str]]:
+        """Character windows, breaking at a space near the end when possible"""
+        buffer = ""
+        offset = 0  # absolute position of buffer[0]
+        exhausted = False
         start = 0
-        chunk_index = 0
         
-        while start < len(text):
+        while True:
+            # Buffer one character past the window to know whether it is the last
+            while not exhausted and offset + len(buffer) <= start + self.chunk_size:
+                block = next(blocks, None)
+                if block is None:
+                    exhausted = True
+                else:
+                    buffer += block
+            text_end = offset + len(buffer)
+            if start >= text_end:
+                return
+            
             # Calculate end position
             end = start + self.chunk_size
             
             # If not the last chunk, try to break at word boundary
-            if end < len(text):
+            if end < text_end:
                 # Look for word boundary within last 100 characters
                 boundary_search_start = max(start, end - 100)
-                word_boundary = text.rfind(' ', boundary_search_start, end)
-                
-                if word_boundary > start:
-                    end = word_boundary + 1
+                word_boundary = buffer.rfind(' ', boundary_search_start - offset, end - offset)
+                if word_boundary >= 0 and word_boundary + offset > start:
+                    end = word_boundary + offset + 1
             
             # Extract chunk content
-            chunk_content = text[start:end].strip()
-            
+            chunk_content = buffer[start - offset:end - offset].strip()
             if chunk_content:
-                # Create chunk with enhanced metadata
-                chunk_metadata = {
-                    **metadata,
-                    "chunk_index": chunk_index,
-                    "start_position": start,
-                    "end_position": end,
-                    "chunk_length": len(chunk_content)
-                }
-                
-                chunk = DocumentChunk(
-                    content=chunk_content,
-                    metadata=chunk_metadata
-                )
-                chunks.append(chunk)
-                chunk_index += 1
+                yield start, end, chunk_content
             
-            # Move start position (with overlap)
-            start = end - self.chunk_overlap
+            # Move start position (with overlap), always making progress
+            next_start = end - self.chunk_overlap
+            start = end if next_start <= start else next_start
             
-            # Ensure progress
-            if start <= 0:
-                start = end
-        
-        logger.debug(f"Split text into {len(chunks)} chunks")
-        return chunks
+            # Drop consumed text once it is most of the buffer (amortized O(1) per char)
+            consumed = min(start, text_end) - offset
+            if consumed > len(buffer) // 2:
+                buffer = buffer[consumed:]
+                offset += consumed
     
-    def split_document(self, file_path: Path, metadata: Dict[str, Any] = None) -> List[DocumentChunk]:
-        """Split document file into chunks"""
-        try:
-            # Enhanced metadata with file information
-            file_metadata = {
-                **(metadata or {}),
-                "file_name": file_path.name,
-                "file_path": str(file_path),
-                "file_size": file_path.stat().st_size,
-                "file_modified": datetime.fromtimestamp(file_path.stat().st_mtime, timezone.utc).isoformat()
-            }
+    def _iter_token_spans(self, blocks: Iterator[str]) -> Iterator[Tuple[int, int, str]]:
+        """Windows of chunk_size tokens, advancing chunk_size - chunk_overlap tokens"""
+        buffer = ""
+        offset = 0
+        exhausted = False
+        scanned = 0  # absolute position up to which tokens were collected
+        tokens: List[Tuple[int, int]] = []  # pending (start, end) token positions
+        step = max(1, self.chunk_size - self.chunk_overlap)
+        
+        while True:
+            while not exhausted and len(tokens) <= self.chunk_size:
+                block = next(blocks, None)
+                if block is None:
+                    exhausted = True
+                else:
+                    buffer += block
+                for match in self.TOKEN_PATTERN.finditer(buffer, scanned - offset):
+                    if not exhausted and match.end() == len(buffer):
+                        break  # token may continue in the next block
+                    tokens.append((match.start() + offset, match.end() + offset))
+                    scanned = match.end() + offset
             
-            # Read file content based on extension
-            if file_path.suffix.lower() == '.txt':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            elif file_path.suffix.lower() == '.json':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    content = json.dumps(data, indent=2)
-            else:
-                # For other file types, read as text (in production, use proper parsers)
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
+            if not tokens:
+                return
             
-            return self.split_text(content, file_metadata)
+            window = tokens[:self.chunk_size]
+            start, end = window[0][0], window[-1][1]
+            yield start, end, buffer[start - offset:end - offset]
             
+            if exhausted and len(tokens) <= self.chunk_size:
+                return
+            del tokens[:step]
+            
+            consumed = tokens[0][0] - offset if tokens else scanned - offset
+            if consumed > len(buffer) // 2:
+                buffer = buffer[consumed:]
+                offset += consumed
+    
+    def split_ingest_document(self, document: Dict[str, Any]) -> List[DocumentChunk]:
+        """Split an ingest document (``content`` or ``file_path``) into chunks"""
+        return list(self.iter_ingest_document(document))
+    
+    def iter_ingest_document(self, document: Dict[str, Any]) -> Iterator[DocumentChunk]:
+        """Lazily chunk an ingest document (``content`` or ``file_path``)
+        
+        Stamps ``document_type`` and ``ingested_at`` into the chunk metadata
+        without modifying the caller's metadata dict.
+        """
+        metadata = {
+            **(document.get("metadata") or {}),
+            "document_type": document.get("document_type") or "general",
+            "ingested_at": datetime.now(timezone.utc).isoformat()
+        }
+        
+        if document.get("content"):
+            return self.iter_text(document["content"], metadata)
+        elif document.get("file_path"):
+            return self.iter_document(Path(document["file_path"]), metadata)
+        raise ValueError("Either content or file_path must be provided")
+    
+    def split_document(self, file_path: Path, metadata: Dict[str, Any] = None) -> List[DocumentChunk]:
+        """Split document file into chunks (an unreadable file yields none)"""
+        try:
+            return list(self.iter_document(file_path, metadata))
         except Exception as e:
             logger.error(f"Failed to split document {file_path}: {e}")
             return []
+    
+    def iter_document(self, file_path: Path, metadata: Dict[str, Any] = None) -> Iterator[DocumentChunk]:
+        """Lazily chunk a file, reading it in blocks
+        
+        JSON files are chunked as stored rather than parsed and re-serialized,
+        so memory stays bounded by the read block and one chunk. Read errors
+        propagate, possibly after some chunks were yielded, so callers can
+        tell a truncated file from a complete one.
+        """
+        # Enhanced metadata with file information
+        stat = file_path.stat()
+        file_metadata = {
+            **(metadata or {}),
+            "file_name": file_path.name,
+            "file_path": str(file_path),
+            "file_size": stat.st_size,
+            "file_modified": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat()
+        }
+        
+        # Text and JSON must be valid UTF-8; other types are read leniently
+        errors = 'strict' if file_path.suffix.lower() in ('.txt', '.json') else 'ignore'
+        with open(file_path, 'r', encoding='utf-8', errors=errors) as f:
+            blocks = iter(lambda: f.read(self.READ_BLOCK_SIZE), "")
+            yield from self._chunks_from_spans(self.iter_spans(blocks), file_metadata)
+
+
+class QueryCache:
+    """Bounded LRU/TTL cache for query results keyed by vector store generation
+    
+    Entries are tagged with the vector store generation (version plus
+    lineage) they were computed against; seeing another generation drops
+    the in-memory tier. An optional
+    on-disk tier lets several workers share hits.
+    """
+    
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 ttl_seconds: float = 3600, shared_dir: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.shared_dir = Path(shared_dir) if shared_dir else None
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._generation: Optional[str] = None
+        self.stats = {
+            "hits": 0, "misses": 0, "disk_hits": 0, "evictions": 0,
+            "expirations": 0, "invalidations": 0
+        }
+        if self.shared_dir:
+            self.shared_dir.mkdir(parents=True, exist_ok=True)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def make_key(query: str, context: Dict[str, Any]) -> str:
+        return hashlib.md5(f"{query}{json.dumps(context, sort_keys=True, default=str)}".encode()).hexdigest()
+    
+    def _observe_generation(self, generation: str):
+        if generation != self._generation:
+            if self._generation is not None:
+                self.stats["invalidations"] += 1
+            self.clear()
+            self._generation = generation
+    
+    def _disk_path(self, key: str, generation: str) -> Path:
+        return self.shared_dir / f"{generation}-{key}.json"
+    
+    def get(self, key: str, generation: str) -> Optional[Dict[str, Any]]:
+        """Return a live cached result for the given store generation"""
+        self._observe_generation(generation)
+        now = time.time()
+        
+        entry = self._entries.get(key)
+        if entry is not None:
+            result, size, expires_at = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return result
+            self._remove(key)
+            self.stats["expirations"] += 1
+        
+        if self.shared_dir:
+            result = self._read_disk(key, generation, now)
+            if result is not None:
+                self.stats["hits"] += 1
+                self.stats["disk_hits"] += 1
+                self._store(key, result, len(json.dumps(result, default=str)), now + self.ttl_seconds)
+                return result
+        
+        self.stats["misses"] += 1
+        return None
+    
+    def put(self, key: str, generation: str, result: Dict[str, Any]):
+        """Cache a result computed against the given store generation"""
+        self._observe_generation(generation)
+        payload = json.dumps(result, default=str)
+        if len(payload) > self.max_bytes:
+            return
+        
+        expires_at = time.time() + self.ttl_seconds
+        self._store(key, result, len(payload), expires_at)
+        if self.shared_dir:
+            self._write_disk(key, generation, payload, expires_at)
+    
+    def _store(self, key: str, result: Dict[str, Any], size: int, expires_at: float):
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (result, size, expires_at)
+        self._bytes += size
+        
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats["evictions"] += 1
+    
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+    
+    def _read_disk(self, key: str, generation: str, now: float) -> Optional[Dict[str, Any]]:
+        path = self._disk_path(key, generation)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if entry["expires_at"] <= now:
+            path.unlink(missing_ok=True)
+            self.stats["expirations"] += 1
+            return None
+        return entry["result"]
+    
+    def _write_disk(self, key: str, generation: str, payload: str, expires_at: float):
+        path = self._disk_path(key, generation)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(f'{{"expires_at": {expires_at}, "result": {payload}}}')
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write shared cache entry {path}: {e}")
+    
+    def prune_disk(self) -> int:
+        """Delete expired and other-generation entries from the shared tier"""
+        if not self.shared_dir:
+            return 0
+        
+        removed = 0
+        now = time.time()
+        for path in self.shared_dir.glob("*.json"):
+            try:
+                stale = not path.name.startswith(f"{self._generation}-")
+                if not stale:
+                    with open(path, 'r') as f:
+                        stale = json.load(f)["expires_at"] <= now
+                if stale:
+                    path.unlink()
+                    removed += 1
+            except (OSError, ValueError, KeyError):
+                continue
+        return removed
+    
+    def clear(self):
+        """Drop the in-memory tier"""
+        self._entries.clear()
+        self._bytes = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "generation": self._generation,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            "shared_dir": str(self.shared_dir) if self.shared_dir else None
+        }
 
 
 class CodexRAG:
@@ -332,27 +1875,58 @@ class CodexRAG:
     
     def __init__(self, config):
         self.config = config
-        self.embedding_model = MockEmbeddingModel(config.vector_dimension)
-        self.vector_store = VectorStore(config.vector_dimension)
-        self.text_splitter = TextSplitter(config.chunk_size, config.chunk_overlap)
-        self.cache = {} if config.cache_enabled else None
+        self.embedding_model = MockEmbeddingModel(
+            config.vector_dimension, batch_size=getattr(config, "embedding_batch_size", 64)
+        )
+        self.vector_store = VectorStore(
+            config.vector_dimension,
+            index=create_vector_index(config),
+            lexical_index=BM25Index() if getattr(config, "retrieval_mode", "vector") == "hybrid" else None
+        )
+        self.text_splitter = TextSplitter(
+            config.chunk_size, config.chunk_overlap, chunk_unit=getattr(config, "chunk_unit", "chars")
+        )
+        self.cache = QueryCache(
+            max_entries=getattr(config, "cache_max_entries", 1024),
+            max_bytes=getattr(config, "cache_max_bytes", 64 * 1024 * 1024),
+            ttl_seconds=config.cache_ttl_minutes * 60,
+            shared_dir=getattr(config, "cache_shared_dir", None)
+        ) if config.cache_enabled else None
         self.executor = ThreadPoolExecutor(max_workers=4)
         
-        # Vector store file path
+        # Vector store paths: append-only log, plus the legacy pickle for migration
         self.vector_store_path = config.vectors_path / "codex_vectors.pkl"
+        self.vector_log = VectorStoreLog(
+            config.vectors_path / "codex_store",
+            compaction_ratio=getattr(config, "vector_compaction_ratio", 0.5)
+        )
+        self.ingest_manifest = IngestManifest(config.vectors_path / "ingest_manifest.json")
+        self._persist_lock = asyncio.Lock()
     
     async def initialize(self):
         """Initialize the RAG system"""
         try:
             # Load existing vector store if available
-            if self.vector_store_path.exists():
+            if self.vector_log.exists():
                 await asyncio.get_event_loop().run_in_executor(
-                    self.executor, self.vector_store.load, self.vector_store_path
+                    self.executor, self.vector_log.load, self.vector_store,
+                    getattr(self.config, "vector_load_mode", "memory") == "mmap"
                 )
                 logger.info("Existing vector store loaded")
+            elif self.vector_store_path.exists():
+                await asyncio.get_event_loop().run_in_executor(
+                    self.executor, self.vector_store.load, self.vector_store_path
+                )
+                await self._persist_vector_store()
+                logger.info(f"Migrated pickled vector store to {self.vector_log.directory}")
             else:
                 logger.info("Starting with empty vector store")
             
+            # An empty store has nothing the ingest manifest could vouch for
+            if not self.vector_store.chunks and len(self.ingest_manifest):
+                self.ingest_manifest.clear()
+                self.ingest_manifest.save()
+            
             # Auto-ingest documents from corpus if vector store is empty
             if not self.vector_store.chunks and self.config.corpus_path.exists():
                 await self._auto_ingest_corpus()
@@ -363,72 +1937,216 @@ class CodexRAG:
             logger.error(f"Failed to initialize RAG system: {e}")
             raise
     
+    async def _persist_vector_store(self):
+        """Append rows written since the last persist to the vector log"""
+        async with self._persist_lock:
+            delta = self.vector_store.take_delta()
+            if not delta["records"] and not delta["truncate"]:
+                return
+            
+            await asyncio.get_event_loop().run_in_executor(
+                self.executor, self.vector_log.write_delta, delta, self.vector_store.dimension
+            )
+            self.vector_store.mark_persisted(delta)
+    
     async def _auto_ingest_corpus(self):
         """Auto-ingest documents from corpus directory"""
         try:
-            document_files = []
-            
-            # Find all documents in corpus
-            for ext in ['*.txt', '*.json', '*.md']:
-                document_files.extend(self.config.corpus_path.glob(ext))
-            
-            if document_files:
-                logger.info(f"Auto-ingesting {len(document_files)} documents from corpus")
-                
-                for doc_file in document_files:
-                    await self.ingest(file_path=str(doc_file))
-                
+            result = await self.sync_corpus()
+            if result["ingested"]:
                 logger.info("Auto-ingestion completed")
             
         except Exception as e:
             logger.warning(f"Auto-ingestion failed: {e}")
     
+    async def sync_corpus(self, corpus_path: Optional[Path] = None) -> Dict[str, Any]:
+        """Bring the store in line with a corpus directory using the ingest manifest
+        
+        Only new or modified files are chunked and embedded; chunks of files
+        that disappeared from the directory are deleted.
+        """
+        corpus_path = Path(corpus_path or self.config.corpus_path)
+        document_files = []
+        
+        # Find all documents in corpus
+        for ext in ['*.txt', '*.json', '*.md']:
+            document_files.extend(corpus_path.glob(ext))
+        
+        plan = await self.plan_file_sync(document_files, root=corpus_path)
+        removal = await self.remove_documents(plan["removed"])
+        
+        failed = []
+        if plan["changed"]:
+            logger.info(
+                f"Ingesting {len(plan['changed'])} new or modified documents from corpus "
+                f"({len(plan['unchanged'])} unchanged)"
+            )
+            results = await self.ingest_many([
+                {"file_path": fingerprint["path"], "fingerprint": fingerprint}
+                for fingerprint in plan["changed"]
+            ])
+            failed = [
+                {"file": fingerprint["path"], "error": result["error"]}
+                for fingerprint, result in zip(plan["changed"], results) if "error" in result
+            ]
+        
+        return {
+            "ingested": len(plan["changed"]) - len(failed),
+            "skipped": len(plan["unchanged"]),
+            "failed": failed,
+            **removal
+        }
+    
+    async def plan_file_sync(self, file_paths: List[Path], root: Optional[Path] = None) -> Dict[str, Any]:
+        """Classify files against the ingest manifest (see IngestManifest.plan)"""
+        return await asyncio.get_event_loop().run_in_executor(
+            self.executor, self.ingest_manifest.plan, list(file_paths), root
+        )
+    
+    def _delete_unreferenced(self, chunk_ids: Iterable[str]) -> int:
+        """Delete chunks no file in the ingest manifest still produces"""
+        referenced = self.ingest_manifest.referenced_chunk_ids()
+        return self.vector_store.delete_chunks(
+            chunk_id for chunk_id in set(chunk_ids) if chunk_id not in referenced
+        )
+    
+    async def remove_documents(self, file_paths: List[str]) -> Dict[str, Any]:
+        """Delete the chunks of files recorded in the ingest manifest"""
+        stale = [
+            chunk_id
+            for path in file_paths
+            for chunk_id in self.ingest_manifest.forget(str(Path(path).resolve()))
+        ]
+        chunks_removed = self._delete_unreferenced(stale)
+        
+        if file_paths:
+            await self._persist_vector_store()
+            self.ingest_manifest.save()
+            logger.info(f"Removed {chunks_removed} chunks from {len(file_paths)} deleted files")
+        
+        return {"files_removed": len(file_paths), "chunks_removed": chunks_removed}
+    
     async def ingest(self, content: Optional[str] = None, file_path: Optional[str] = None,
                     document_type: str = "general", metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Ingest document content or file into vector store"""
+        results = await self.ingest_many([{
+            "content": content,
+            "file_path": file_path,
+            "document_type": document_type,
+            "metadata": metadata
+        }])
+        return results[0]
+    
+    def _iter_for_ingest(self, document: Dict[str, Any]) -> Iterable[DocumentChunk]:
+        """Chunks for one ingest document, unless it arrives already split"""
+        if document.get("chunks") is not None:
+            return document["chunks"]
+        return self.text_splitter.iter_ingest_document(document)
+    
+    async def ingest_many(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Ingest several documents, embedding their chunks in full batches
+        
+        Chunks are produced lazily and embedded/indexed one embedding batch at
+        a time, so a large file is never held as a full list of chunks. Each
+        document is a dict with ``content`` or ``file_path`` plus optional
+        ``document_type`` and ``metadata``; a document may instead carry
+        pre-split ``chunks`` (e.g. from a worker process). A document with a
+        ``fingerprint`` (from IngestManifest) is recorded in the ingest
+        manifest, and chunks its file no longer produces are deleted.
+        Returns one result per document. A document whose chunk stream fails
+        partway is reported with an ``error``; its chunks are discarded and
+        its manifest entry is left as it was, so it is retried on the next sync.
+        """
         try:
-            metadata = metadata or {}
-            metadata.update({
-                "document_type": document_type,
-                "ingested_at": datetime.now(timezone.utc).isoformat()
-            })
+            # Chunk iterators are created up front so a bad document fails before any writes
+            chunk_streams = [iter(self._iter_for_ingest(document)) for document in documents]
+            chunk_ids_by_document: List[List[str]] = [[] for _ in documents]
+            pending: List[DocumentChunk] = []
+            batch_size = self.embedding_model.batch_size
+            total_chunks = 0
             
-            # Get chunks from content or file
-            if content:
-                chunks = self.text_splitter.split_text(content, metadata)
-            elif file_path:
-                chunks = self.text_splitter.split_document(Path(file_path), metadata)
-            else:
-                raise ValueError("Either content or file_path must be provided")
+            async def flush():
+                # Embed one batch, hand the rows to the store, then drop per-chunk copies
+                embeddings = await self.embedding_model.embed_batch([chunk.content for chunk in pending])
+                for chunk, embedding in zip(pending, embeddings):
+                    chunk.embedding = embedding
+                self.vector_store.add_chunks(pending)
+                for chunk in pending:
+                    chunk.embedding = None
+                pending.clear()
             
-            if not chunks:
-                logger.warning("No chunks created from input")
-                return {"chunks_created": 0, "vectors_indexed": 0}
+            # Chunks stream from the splitter into full embedding batches across documents
+            errors: Dict[int, Exception] = {}
+            for index, (chunk_ids, chunks) in enumerate(zip(chunk_ids_by_document, chunk_streams)):
+                # Only the splitter's errors fail a document; embedding errors fail the call
+                while True:
+                    try:
+                        chunk = next(chunks)
+                    except StopIteration:
+                        break
+                    except Exception as e:
+                        logger.error(f"Failed to chunk {documents[index].get('file_path') or 'content'}: {e}")
+                        errors[index] = e
+                        # Chunks of the failed document still waiting for a batch are never embedded
+                        failed_ids = set(chunk_ids)
+                        pending[:] = [chunk for chunk in pending if chunk.chunk_id not in failed_ids]
+                        break
+                    pending.append(chunk)
+                    chunk_ids.append(chunk.chunk_id)
+                    total_chunks += 1
+                    if len(pending) >= batch_size:
+                        await flush()
+            if pending:
+                await flush()
             
-            # Generate embeddings for chunks
-            contents = [chunk.content for chunk in chunks]
-            embeddings = await self.embedding_model.embed_batch(contents)
+            # Record file fingerprints, then drop chunks of earlier file versions
+            stale = []
+            fingerprinted = False
+            for index, (document, chunk_ids) in enumerate(zip(documents, chunk_ids_by_document)):
+                if document.get("fingerprint") and index not in errors:
+                    fingerprinted = True
+                    previous = self.ingest_manifest.record(document["fingerprint"], chunk_ids)
+                    stale.extend(set(previous) - set(chunk_ids))
             
-            # Assign embeddings to chunks
-            for chunk, embedding in zip(chunks, embeddings):
-                chunk.embedding = embedding
-            
-            # Add to vector store
-            self.vector_store.add_chunks(chunks)
+            # Partial chunks of failed documents go too, unless a successful document shares them
+            kept = {
+                chunk_id
+                for index, chunk_ids in enumerate(chunk_ids_by_document) if index not in errors
+                for chunk_id in chunk_ids
+            }
+            for index in errors:
+                stale.extend(set(chunk_ids_by_document[index]) - kept)
+                total_chunks -= len(chunk_ids_by_document[index])
+            chunks_removed = self._delete_unreferenced(stale)
             
-            # Save updated vector store
-            await asyncio.get_event_loop().run_in_executor(
-                self.executor, self.vector_store.save, self.vector_store_path
-            )
+            if total_chunks or chunks_removed:
+                # Append only the new rows to disk
+                await self._persist_vector_store()
+            if fingerprinted:
+                self.ingest_manifest.save()
+            if chunks_removed:
+                logger.info(f"Removed {chunks_removed} chunks from earlier versions of modified files")
             
-            logger.info(f"Ingested {len(chunks)} chunks from {file_path or 'content'}")
+            results = []
+            for index, (document, chunk_ids) in enumerate(zip(documents, chunk_ids_by_document)):
+                source = document.get("file_path") or "content"
+                if index in errors:
+                    results.append({"chunks_created": 0, "vectors_indexed": 0, "error": str(errors[index])})
+                    continue
+                if not chunk_ids:
+                    logger.warning(f"No chunks created from {source}")
+                    results.append({"chunks_created": 0, "vectors_indexed": 0})
+                    continue
+                
+                logger.info(f"Ingested {len(chunk_ids)} chunks from {source}")
+                results.append({
+                    "chunks_created": len(chunk_ids),
+                    "vectors_indexed": len(chunk_ids),
+                    "document_type": document.get("document_type") or "general",
+                    "chunk_ids": chunk_ids
+                })
             
-            return {
-                "chunks_created": len(chunks),
-                "vectors_indexed": len(chunks),
-                "document_type": document_type,
-                "chunk_ids": [chunk.chunk_id for chunk in chunks]
-            }
+            return results
             
         except Exception as e:
             logger.error(f"Ingestion failed: {e}")
@@ -441,11 +2159,13 @@ class CodexRAG:
             context = context or {}
             query_start = datetime.now(timezone.utc)
             
-            # Check cache if enabled
-            if self.cache and not real_time:
-                cache_key = hashlib.md5(f"{query}{json.dumps(context, sort_keys=True)}".encode()).hexdigest()
-                if cache_key in self.cache:
-                    cached_result = self.cache[cache_key]
+            # Check cache if enabled (entries die when the vector store changes)
+            use_cache = self.cache is not None and not real_time
+            if use_cache:
+                cache_key = QueryCache.make_key(query, context)
+                cache_generation = self.vector_store.generation
+                cached_result = self.cache.get(cache_key, cache_generation)
+                if cached_result is not None:
                     logger.info("Returning cached result")
                     return cached_result
             
@@ -457,26 +2177,45 @@ class CodexRAG:
             if context.get("document_type"):
                 metadata_filters["document_type"] = context["document_type"]
             
+            # Hybrid retrieval needs the lexical index, built only in hybrid mode
+            retrieval_mode = context.get("retrieval_mode", getattr(self.config, "retrieval_mode", "vector"))
+            hybrid = retrieval_mode == "hybrid" and self.vector_store.lexical_index is not None
+            
             # Perform similarity search
-            search_results = self.vector_store.similarity_search(
-                query_embedding,
-                k=self.config.max_chunks_per_query,
-                threshold=self.config.similarity_threshold,
-                metadata_filters=metadata_filters
-            )
+            if hybrid:
+                hybrid_results = self.vector_store.hybrid_search(
+                    query_embedding,
+                    query,
+                    k=self.config.max_chunks_per_query,
+                    threshold=self.config.similarity_threshold,
+                    metadata_filters=metadata_filters,
+                    rrf_k=getattr(self.config, "rrf_k", 60)
+                )
+                search_results = [(chunk, similarity) for chunk, similarity, _ in hybrid_results]
+            else:
+                hybrid_results = None
+                search_results = self.vector_store.similarity_search(
+                    query_embedding,
+                    k=self.config.max_chunks_per_query,
+                    threshold=self.config.similarity_threshold,
+                    metadata_filters=metadata_filters
+                )
             
             # Build context from search results
             search_context = []
             sources = []
             
-            for chunk, similarity in search_results:
+            for position, (chunk, similarity) in enumerate(search_results):
                 search_context.append(chunk.content)
-                sources.append({
+                source = {
                     "chunk_id": chunk.chunk_id,
                     "similarity": float(similarity),
                     "metadata": chunk.metadata,
                     "content_preview": chunk.content[:200] + "..." if len(chunk.content) > 200 else chunk.content
-                })
+                }
+                if hybrid_results is not None:
+                    source["retrieval"] = hybrid_results[position][2]
+                sources.append(source)
             
             # Generate answer (mock implementation)
             answer = await self._generate_answer(query, search_context, context)
@@ -494,12 +2233,13 @@ class CodexRAG:
                 "processing_time": processing_time,
                 "timestamp": query_start.isoformat(),
                 "real_time": real_time,
+                "retrieval_mode": "hybrid" if hybrid else "vector",
                 "context_used": len(search_context) > 0
             }
             
             # Cache result if caching is enabled
-            if self.cache and not real_time:
-                self.cache[cache_key] = result
+            if use_cache:
+                self.cache.put(cache_key, cache_generation, result)
             
             return result
             
@@ -538,9 +2278,12 @@ class CodexRAG:
         try:
             stats = self.vector_store.get_stats()
             stats.update({
-                "vector_store_path": str(self.vector_store_path),
-                "cache_size": len(self.cache) if self.cache else 0,
-                "cache_enabled": self.config.cache_enabled
+                "vector_store_path": str(self.vector_log.directory),
+                "persistence": self.vector_log.get_stats(),
+                "tracked_files": len(self.ingest_manifest),
+                "cache_size": len(self.cache) if self.cache is not None else 0,
+                "cache_enabled": self.config.cache_enabled,
+                "cache": self.cache.get_stats() if self.cache is not None else None
             })
             return stats
             
@@ -548,6 +2291,31 @@ class CodexRAG:
             logger.error(f"Failed to get document stats: {e}")
             return {}
     
+    async def evaluate_index_recall(self, queries: Optional[List[str]] = None,
+                                    k: Optional[int] = None,
+                                    sample_size: int = 100) -> Dict[str, Any]:
+        """Report recall@k of the configured vector index against exact search
+        
+        Without explicit queries, stored embeddings are sampled and lightly
+        perturbed so a query is not trivially its own nearest neighbour.
+        """
+        k = k or self.config.max_chunks_per_query
+        stored = self.vector_store.embeddings
+        
+        if queries:
+            query_vectors = np.stack(await self.embedding_model.embed_batch(queries))
+        elif len(stored):
+            rng = np.random.default_rng(0)
+            picks = rng.choice(len(stored), min(sample_size, len(stored)), replace=False)
+            noise = rng.normal(0, 0.05, (len(picks), stored.shape[1])).astype(np.float32)
+            query_vectors = stored[picks] + noise
+        else:
+            query_vectors = np.zeros((0, self.vector_store.dimension), dtype=np.float32)
+        
+        return await asyncio.get_event_loop().run_in_executor(
+            self.executor, self.vector_store.evaluate_recall, query_vectors, k
+        )
+    
     async def search_documents(self, query: str, document_type: Optional[str] = None,
                               limit: int = 10) -> List[Dict[str, Any]]:
         """Search documents by text similarity"""
@@ -582,11 +2350,8 @@ class CodexRAG:
     async def cleanup(self):
         """Cleanup resources"""
         try:
-            # Save vector store one final time
-            if self.vector_store.chunks:
-                await asyncio.get_event_loop().run_in_executor(
-                    self.executor, self.vector_store.save, self.vector_store_path
-                )
+            # Flush any rows not yet in the vector log
+            await self._persist_vector_store()
             
             # Shutdown executor
             self.executor.shutdown(wait=True)
@@ -7,15 +7,18 @@ Supports capturing query state, replaying queries, and analyzing differences.
 import os
 import asyncio
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import Dict, List, Optional, Any, Union, Tuple, Callable
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
 import logging
 import json
 import hashlib
 import pickle
+import sqlite3
 from dataclasses import dataclass, asdict
 from enum import Enum
 import copy
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -86,18 +89,167 @@ class ReplayResult:
         return cls(**data)
 
 
+class SnapshotIndex:
+    """SQLite catalog of captured snapshots
+    
+    Holds one row per snapshot (id, query id, timestamp, query text and result
+    summary) so listing, text filtering and retention pruning are index lookups
+    instead of globbing and parsing every snapshot file. The snapshot files
+    keep the full captured state; the index is the source of truth for result
+    summaries, which are patched in place.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            snapshot_id TEXT PRIMARY KEY,
+            query_id TEXT NOT NULL,
+            query_text TEXT NOT NULL,
+            query_folded TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            result_summary TEXT
+        );
+        CREATE INDEX IF NOT EXISTS snapshots_by_time ON snapshots (timestamp, snapshot_id);
+    """
+    
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+    
+    @staticmethod
+    def _row(snapshot: QuerySnapshot) -> Tuple:
+        summary = snapshot.result_summary
+        return (
+            snapshot.snapshot_id,
+            snapshot.query_id,
+            snapshot.query_text,
+            snapshot.query_text.lower(),
+            snapshot.timestamp,
+            json.dumps(summary) if summary is not None else None
+        )
+    
+    def add(self, snapshot: QuerySnapshot):
+        """Insert or replace the catalog row for a snapshot"""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                self._row(snapshot)
+            )
+    
+    def add_many(self, snapshots: List[QuerySnapshot]):
+        """Insert catalog rows in one transaction"""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                [self._row(snapshot) for snapshot in snapshots]
+            )
+    
+    def update_result(self, snapshot_id: str, result_summary: Dict[str, Any]) -> bool:
+        """Patch one snapshot's result summary; False if it is not indexed"""
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE snapshots SET result_summary = ? WHERE snapshot_id = ?",
+                (json.dumps(result_summary), snapshot_id)
+            )
+        return cursor.rowcount > 0
+    
+    def get_result(self, snapshot_id: str) -> Optional[Dict[str, Any]]:
+        """Result summary recorded for a snapshot"""
+        row = self._conn.execute(
+            "SELECT result_summary FROM snapshots WHERE snapshot_id = ?", (snapshot_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+    
+    def get_results(self, snapshot_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Result summaries for many snapshots in one query"""
+        if not snapshot_ids:
+            return {}
+        placeholders = ",".join("?" * len(snapshot_ids))
+        return {
+            snapshot_id: json.loads(summary)
+            for snapshot_id, summary in self._conn.execute(
+                f"SELECT snapshot_id, result_summary FROM snapshots "
+                f"WHERE snapshot_id IN ({placeholders}) AND result_summary IS NOT NULL",
+                snapshot_ids
+            )
+        }
+    
+    def list_entries(self, limit: int = 50,
+                     query_filter: Optional[str] = None) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Newest-first (snapshot_id, result_summary) pairs, optionally filtered by query text"""
+        sql = "SELECT snapshot_id, result_summary FROM snapshots"
+        params: List[Any] = []
+        if query_filter:
+            sql += " WHERE instr(query_folded, ?) > 0"
+            params.append(query_filter.lower())
+        sql += " ORDER BY timestamp DESC, snapshot_id DESC LIMIT ?"
+        params.append(limit)
+        return [
+            (snapshot_id, json.loads(summary) if summary else None)
+            for snapshot_id, summary in self._conn.execute(sql, params)
+        ]
+    
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+    
+    def prune(self, keep: int) -> List[str]:
+        """Drop all but the newest ``keep`` rows and return the removed ids"""
+        excess = self.count() - keep
+        if excess <= 0:
+            return []
+        
+        with self._conn:
+            removed = [
+                row[0] for row in self._conn.execute(
+                    "SELECT snapshot_id FROM snapshots ORDER BY timestamp, snapshot_id LIMIT ?",
+                    (excess,)
+                )
+            ]
+            self._conn.executemany(
+                "DELETE FROM snapshots WHERE snapshot_id = ?", [(sid,) for sid in removed]
+            )
+        return removed
+    
+    def close(self):
+        self._conn.close()
+
+
 class QueryCapturer:
     """Capture query state for replay"""
     
+    INDEX_FILE = "snapshot_index.sqlite3"
+    
     def __init__(self, config):
         self.config = config
         self.enabled = config.replay_capture_enabled
         self.snapshots_path = config.replay_snapshots_path
         self.max_snapshots = config.replay_max_snapshots
+        self.index: Optional[SnapshotIndex] = None
         
-        # Ensure snapshots directory exists
+        # Ensure snapshots directory exists and open its catalog
         if self.enabled:
             self.snapshots_path.mkdir(parents=True, exist_ok=True)
+            self.index = SnapshotIndex(self.snapshots_path / self.INDEX_FILE)
+            self._index_existing_snapshots()
+    
+    def _index_existing_snapshots(self):
+        """Catalog snapshot files written before the index existed (one-time)"""
+        if self.index.count() > 0:
+            return
+        
+        snapshots = []
+        for snapshot_file in self.snapshots_path.glob("*.json"):
+            try:
+                with open(snapshot_file, 'r') as f:
+                    snapshots.append(QuerySnapshot.from_dict(json.load(f)))
+            except Exception as e:
+                logger.warning(f"Failed to index snapshot {snapshot_file}: {e}")
+        
+        if snapshots:
+            self.index.add_many(snapshots)
+            logger.info(f"Indexed {len(snapshots)} existing snapshots")
     
     async def capture_query_state(self, query_id: str, query_text: str, 
                                  context: Dict[str, Any],
@@ -150,19 +302,18 @@ class QueryCapturer:
             return
         
         try:
-            snapshot = await self._load_snapshot(snapshot_id)
-            if snapshot:
-                # Create result summary (not full result to save space)
-                snapshot.result_summary = {
-                    "success": result.get("success", False),
-                    "scroll_type": result.get("scroll_type"),
-                    "content_length": len(result.get("content", "")),
-                    "source_count": len(result.get("sources", [])),
-                    "processing_time": result.get("processing_time"),
-                    "confidence_score": result.get("confidence_score")
-                }
-                
-                await self._save_snapshot(snapshot)
+            # Create result summary (not full result to save space)
+            result_summary = {
+                "success": result.get("success", False),
+                "scroll_type": result.get("scroll_type"),
+                "content_length": len(result.get("content", "")),
+                "source_count": len(result.get("sources", [])),
+                "processing_time": result.get("processing_time"),
+                "confidence_score": result.get("confidence_score")
+            }
+            
+            # Only the catalog row changes; the snapshot file is left alone
+            if self.index.update_result(snapshot_id, result_summary):
                 logger.debug(f"Updated snapshot {snapshot_id} with result summary")
                 
         except Exception as e:
@@ -181,25 +332,16 @@ class QueryCapturer:
         try:
             snapshots = []
             
-            # Load all snapshot files
-            for snapshot_file in self.snapshots_path.glob("*.json"):
-                try:
-                    snapshot = await self._load_snapshot_from_file(snapshot_file)
-                    
-                    # Apply filter if specified
-                    if query_filter:
-                        if query_filter.lower() not in snapshot.query_text.lower():
-                            continue
-                    
-                    snapshots.append(snapshot)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to load snapshot from {snapshot_file}: {e}")
-            
-            # Sort by timestamp (newest first)
-            snapshots.sort(key=lambda s: s.timestamp, reverse=True)
+            # Newest-first ids come from the index; only those files are read
+            for snapshot_id, result_summary in self.index.list_entries(limit, query_filter):
+                snapshot = await self._load_snapshot_from_file(self.snapshots_path / f"{snapshot_id}.json")
+                if snapshot is None:
+                    continue
+                if result_summary is not None:
+                    snapshot.result_summary = result_summary
+                snapshots.append(snapshot)
             
-            return snapshots[:limit]
+            return snapshots
             
         except Exception as e:
             logger.error(f"Failed to list snapshots: {e}")
@@ -216,8 +358,8 @@ class QueryCapturer:
         try:
             if hasattr(rag_system, 'vector_store') and rag_system.vector_store:
                 return {
-                    "total_documents": len(rag_system.vector_store.documents),
-                    "vector_dimension": len(rag_system.vector_store.embeddings[0]) if rag_system.vector_store.embeddings else 0,
+                    "total_documents": len(rag_system.vector_store.chunks),
+                    "vector_dimension": rag_system.vector_store.dimension,
                     "last_update": getattr(rag_system.vector_store, 'last_update', None)
                 }
         except Exception as e:
@@ -252,11 +394,34 @@ class QueryCapturer:
         
         with open(snapshot_file, 'w') as f:
             json.dump(snapshot.to_dict(), f, indent=2)
+        
+        self.index.add(snapshot)
     
     async def _load_snapshot(self, snapshot_id: str) -> Optional[QuerySnapshot]:
-        """Load snapshot from disk"""
+        """Load snapshot from disk with its indexed result summary"""
         snapshot_file = self.snapshots_path / f"{snapshot_id}.json"
-        return await self._load_snapshot_from_file(snapshot_file)
+        snapshot = await self._load_snapshot_from_file(snapshot_file)
+        
+        if snapshot is not None and self.index is not None:
+            result_summary = self.index.get_result(snapshot_id)
+            if result_summary is not None:
+                snapshot.result_summary = result_summary
+        return snapshot
+    
+    def read_snapshot_files(self, snapshot_ids: List[str]) -> List[Optional[QuerySnapshot]]:
+        """Read snapshot files without touching the index (safe to run in a worker thread)"""
+        snapshots = []
+        for snapshot_id in snapshot_ids:
+            snapshot_file = self.snapshots_path / f"{snapshot_id}.json"
+            try:
+                with open(snapshot_file, 'r') as f:
+                    snapshots.append(QuerySnapshot.from_dict(json.load(f)))
+            except FileNotFoundError:
+                snapshots.append(None)
+            except Exception as e:
+                logger.warning(f"Failed to load snapshot from {snapshot_file}: {e}")
+                snapshots.append(None)
+        return snapshots
     
     async def _load_snapshot_from_file(self, snapshot_file: Path) -> Optional[QuerySnapshot]:
         """Load snapshot from file"""
@@ -274,20 +439,11 @@ class QueryCapturer:
     async def _cleanup_old_snapshots(self):
         """Remove old snapshots beyond max limit"""
         try:
-            snapshot_files = list(self.snapshots_path.glob("*.json"))
-            
-            if len(snapshot_files) <= self.max_snapshots:
-                return
-            
-            # Sort by modification time (oldest first)
-            snapshot_files.sort(key=lambda f: f.stat().st_mtime)
-            
-            # Remove oldest files
-            files_to_remove = snapshot_files[:-self.max_snapshots]
-            
-            for file_path in files_to_remove:
+            # Oldest snapshots by capture time come straight from the index
+            for snapshot_id in self.index.prune(self.max_snapshots):
+                file_path = self.snapshots_path / f"{snapshot_id}.json"
                 try:
-                    file_path.unlink()
+                    file_path.unlink(missing_ok=True)
                     logger.debug(f"Removed old snapshot {file_path.name}")
                 except Exception as e:
                     logger.warning(f"Failed to remove old snapshot {file_path}: {e}")
@@ -296,6 +452,144 @@ class QueryCapturer:
             logger.error(f"Failed to cleanup old snapshots: {e}")
 
 
+def _latency_summary(values: List[float]) -> Dict[str, Any]:
+    """Count, mean and nearest-rank percentiles of a list of latencies"""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+    
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+    
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": percentile(50),
+        "p95": percentile(95),
+        "p99": percentile(99),
+        "max": ordered[-1]
+    }
+
+
+class RatePacer:
+    """Spaces out starts to at most ``qps`` per second (0 disables pacing)"""
+    
+    def __init__(self, qps: float = 0.0):
+        self.interval = 1.0 / qps if qps > 0 else 0.0
+        self._next_slot = 0.0
+    
+    async def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class BulkReplayStats:
+    """Running counters and latencies for a bulk replay"""
+    
+    MAX_DIFFERING_SAMPLES = 50
+    
+    def __init__(self, total: int):
+        self.total = total
+        self.started = time.monotonic()
+        self.completed = 0
+        self.failed = 0
+        self.missing = 0
+        self.executed = 0
+        self.shared = 0
+        self.comparisons = {result.value: 0 for result in ComparisonResult}
+        self.uncompared = 0
+        self.errors: Dict[str, int] = {}
+        self.differing: List[Dict[str, Any]] = []
+        self.original_times: List[float] = []
+        self.replay_times: List[float] = []
+        self.execution_times: List[float] = []
+    
+    @property
+    def processed(self) -> int:
+        return self.completed + self.failed + self.missing
+    
+    def record_execution(self, outcome: Dict[str, Any]):
+        """Count one pipeline execution (shared by every snapshot with the same query)"""
+        self.executed += 1
+        self.execution_times.append(outcome["execution_time"])
+        if outcome.get("summary") and outcome["summary"].get("processing_time") is not None:
+            self.replay_times.append(outcome["summary"]["processing_time"])
+    
+    def record(self, snapshot: QuerySnapshot, outcome: Dict[str, Any],
+               comparison: Optional[Dict[str, Any]], shared: bool):
+        if shared:
+            self.shared += 1
+        
+        if outcome.get("error"):
+            self.failed += 1
+            self.errors[outcome["error"]] = self.errors.get(outcome["error"], 0) + 1
+            return
+        
+        self.completed += 1
+        original_time = (snapshot.result_summary or {}).get("processing_time")
+        if original_time is not None:
+            self.original_times.append(original_time)
+        
+        if comparison is None:
+            self.uncompared += 1
+            return
+        
+        overall = comparison.get("overall_result", ComparisonResult.ERROR.value)
+        self.comparisons[overall] += 1
+        if overall != ComparisonResult.IDENTICAL.value and len(self.differing) < self.MAX_DIFFERING_SAMPLES:
+            self.differing.append({
+                "snapshot_id": snapshot.snapshot_id,
+                "overall_result": overall,
+                "differences": comparison.get("differences", {})
+            })
+    
+    def progress(self) -> Dict[str, Any]:
+        """Incremental statistics suitable for streaming"""
+        elapsed = time.monotonic() - self.started
+        compared = sum(self.comparisons.values())
+        return {
+            "processed": self.processed,
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "missing": self.missing,
+            "executed": self.executed,
+            "shared": self.shared,
+            "comparison_results": dict(self.comparisons),
+            "identical_rate": self.comparisons[ComparisonResult.IDENTICAL.value] / compared if compared else None,
+            "elapsed_seconds": elapsed,
+            "replays_per_second": self.processed / elapsed if elapsed > 0 else 0.0
+        }
+    
+    def report(self) -> Dict[str, Any]:
+        """Final report with original vs replayed latency"""
+        report = self.progress()
+        elapsed = report["elapsed_seconds"]
+        original = _latency_summary(self.original_times)
+        replayed = _latency_summary(self.replay_times)
+        report.update({
+            "executions_per_second": self.executed / elapsed if elapsed > 0 else 0.0,
+            "uncompared": self.uncompared,
+            "errors": self.errors,
+            "differing_samples": self.differing,
+            "latency": {
+                "original_processing_time": original,
+                "replay_processing_time": replayed,
+                "replay_execution_time": _latency_summary(self.execution_times),
+                "mean_ratio": (
+                    replayed["mean"] / original["mean"]
+                    if original.get("mean") and replayed.get("count") else None
+                )
+            }
+        })
+        return report
+
+
 class QueryReplayer:
     """Replay queries from snapshots"""
     
@@ -336,10 +630,12 @@ class QueryReplayer:
             start_time = datetime.now(timezone.utc)
             
             try:
-                # Execute query with captured context
+                # Execute query with captured context, bypassing the query cache
+                # so the replay measures a real pipeline run
                 result = await self.rag_system.query(
                     query=snapshot.query_text,
-                    context=snapshot.context
+                    context=snapshot.context,
+                    real_time=True
                 )
                 
                 end_time = datetime.now(timezone.utc)
@@ -404,6 +700,127 @@ class QueryReplayer:
         
         return final_results
     
+    async def replay_bulk(self, snapshot_ids: Optional[List[str]] = None,
+                          workers: Optional[int] = None,
+                          target_qps: Optional[float] = None,
+                          query_filter: Optional[str] = None,
+                          limit: Optional[int] = None,
+                          on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                          progress_every: int = 500,
+                          prefetch_batch: int = 256,
+                          dedupe_window: int = 10000) -> Dict[str, Any]:
+        """Regression-replay many snapshots and report throughput and drift
+        
+        Snapshots are prefetched in batches by a worker thread into a bounded
+        queue. ``workers`` coroutines replay them; snapshots with the same query
+        text and context share a single pipeline execution, and executions are
+        paced to ``target_qps``. Executions are remembered for the
+        ``dedupe_window`` most recently seen queries, so memory stays bounded
+        on long runs. ``on_progress`` receives incremental statistics each
+        time another ``progress_every`` snapshots are processed. Individual
+        results are not kept in ``replay_results``; the returned report
+        summarizes them.
+        """
+        workers = workers or getattr(self.config, "replay_bulk_workers", 8)
+        if target_qps is None:
+            target_qps = getattr(self.config, "replay_target_qps", 0.0)
+        
+        index = self.capturer.index
+        if snapshot_ids is None:
+            if index is None:
+                raise ValueError("Snapshot index is unavailable; pass snapshot_ids explicitly")
+            snapshot_ids = [
+                snapshot_id for snapshot_id, _ in
+                index.list_entries(limit or index.count(), query_filter)
+            ]
+        elif limit:
+            snapshot_ids = snapshot_ids[:limit]
+        
+        stats = BulkReplayStats(len(snapshot_ids))
+        pacer = RatePacer(target_qps)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(prefetch_batch, workers) * 2)
+        executions: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        next_progress = progress_every
+        loop = asyncio.get_running_loop()
+        
+        logger.info(f"Starting bulk replay of {len(snapshot_ids)} snapshots "
+                    f"({workers} workers, target {target_qps or 'unpaced'} qps)")
+        
+        async def prefetch():
+            try:
+                for start in range(0, len(snapshot_ids), prefetch_batch):
+                    batch = snapshot_ids[start:start + prefetch_batch]
+                    summaries = index.get_results(batch) if index is not None else {}
+                    snapshots = await loop.run_in_executor(None, self.capturer.read_snapshot_files, batch)
+                    for snapshot_id, snapshot in zip(batch, snapshots):
+                        if snapshot is None:
+                            stats.missing += 1
+                            continue
+                        if snapshot_id in summaries:
+                            snapshot.result_summary = summaries[snapshot_id]
+                        await queue.put(snapshot)
+            finally:
+                for _ in range(workers):
+                    await queue.put(None)
+        
+        async def execute(snapshot: QuerySnapshot) -> Dict[str, Any]:
+            await pacer.wait()
+            started = time.perf_counter()
+            try:
+                result = await self.rag_system.query(query=snapshot.query_text, context=snapshot.context,
+                                                     real_time=True)
+                outcome = {"summary": self._summarize_result(result)}
+            except Exception as e:
+                outcome = {"error": f"{type(e).__name__}: {e}"}
+            outcome["execution_time"] = time.perf_counter() - started
+            stats.record_execution(outcome)
+            return outcome
+        
+        async def worker():
+            nonlocal next_progress
+            while True:
+                snapshot = await queue.get()
+                if snapshot is None:
+                    return
+                
+                key = self._replay_key(snapshot)
+                execution = executions.get(key)
+                shared = execution is not None
+                if shared:
+                    executions.move_to_end(key)
+                else:
+                    execution = executions[key] = asyncio.ensure_future(execute(snapshot))
+                    # Evicted executions keep running for the workers already awaiting them
+                    if len(executions) > dedupe_window:
+                        executions.popitem(last=False)
+                outcome = await asyncio.shield(execution)
+                
+                comparison = None
+                if "summary" in outcome and snapshot.result_summary:
+                    comparison = self._compare_summaries(snapshot.result_summary, outcome["summary"])
+                stats.record(snapshot, outcome, comparison, shared)
+                
+                # Missing snapshots also advance ``processed``, so thresholds can be skipped over
+                if on_progress and stats.processed >= next_progress:
+                    next_progress = (stats.processed // progress_every + 1) * progress_every
+                    on_progress(stats.progress())
+        
+        await asyncio.gather(prefetch(), *(worker() for _ in range(workers)))
+        
+        report = stats.report()
+        report.update({"workers": workers, "target_qps": target_qps, "unique_queries": stats.executed})
+        if on_progress:
+            on_progress(stats.progress())
+        
+        logger.info(f"Bulk replay finished: {report['completed']} completed, {report['failed']} failed, "
+                    f"{report['replays_per_second']:.1f} replays/s")
+        return report
+    
+    @staticmethod
+    def _replay_key(snapshot: QuerySnapshot) -> str:
+        """Snapshots with equal query text and context replay identically"""
+        return snapshot.query_text + "\x00" + json.dumps(snapshot.context, sort_keys=True, default=str)
+    
     async def get_replay_result(self, replay_id: str) -> Optional[ReplayResult]:
         """Get replay result by ID"""
         return self.replay_results.get(replay_id)
@@ -489,18 +906,28 @@ class QueryReplayer:
     async def _compare_results(self, original_summary: Dict[str, Any], 
                               replay_result: Dict[str, Any]) -> Dict[str, Any]:
         """Compare original and replay results"""
+        return self._compare_summaries(original_summary, self._summarize_result(replay_result))
+    
+    @staticmethod
+    def _summarize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a query result to the fields replays are compared on"""
+        return {
+            "success": result.get("success", False),
+            "scroll_type": result.get("scroll_type"),
+            "content_length": len(result.get("content", "")),
+            "source_count": len(result.get("sources", [])),
+            "processing_time": result.get("processing_time"),
+            "confidence_score": result.get("confidence_score")
+        }
+    
+    def _compare_summaries(self, original_summary: Dict[str, Any],
+                           replay_summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Compare an original result summary against a replayed one"""
         try:
             comparison = {
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "original_summary": original_summary,
-                "replay_summary": {
-                    "success": replay_result.get("success", False),
-                    "scroll_type": replay_result.get("scroll_type"),
-                    "content_length": len(replay_result.get("content", "")),
-                    "source_count": len(replay_result.get("sources", [])),
-                    "processing_time": replay_result.get("processing_time"),
-                    "confidence_score": replay_result.get("confidence_score")
-                },
+                "replay_summary": replay_summary,
                 "differences": {},
                 "similarity_score": 0.0
             }
@@ -548,8 +975,8 @@ class QueryReplayer:
                 similarity_factors.append(1.0)
             
             # Processing time comparison (informational, not part of similarity)
-            orig_time = orig.get("processing_time", 0)
-            replay_time = replay.get("processing_time", 0)
+            orig_time = orig.get("processing_time") or 0
+            replay_time = replay.get("processing_time") or 0
             
             if orig_time > 0 and replay_time > 0:
                 time_factor = replay_time / orig_time
@@ -7,6 +7,7 @@ from pathlib import Path
 
 from ..core.config import CodexConfig
 from ..core.utils import CodexUtils
+from ..engine.rag import BM25Index
 
 class Document:
     """Document structure for RAG system"""
@@ -18,18 +19,32 @@ class Document:
         self.embedding: Optional[np.ndarray] = None
 
 class RAGEngine:
-    """Retrieval-Augmented Generation engine for knowledge processing"""
+    """Retrieval-Augmented Generation engine for knowledge processing
+    
+    Search uses the codex engine's BM25Index, keyed by document ID and
+    updated as documents are added, changed or deleted.
+    """
     
     def __init__(self, config: CodexConfig):
         self.config = config
         self.documents: Dict[str, Document] = {}
         self.index_built = False
+        self.lexical_index = BM25Index()
+    
+    def _index_document(self, document: Document) -> None:
+        """Add a document's terms to the inverted index"""
+        self.lexical_index.add(document.id, document.content)
+    
+    def _unindex_document(self, document: Document) -> None:
+        """Remove a document's terms from the inverted index"""
+        self.lexical_index.remove(document.id, document.content)
         
     def add_document(self, content: str, metadata: Dict[str, Any] = None) -> str:
         """Add a document to the corpus"""
         doc_id = CodexUtils.generate_id()
         document = Document(doc_id, content, metadata)
         self.documents[doc_id] = document
+        self._index_document(document)
         
         # Save to corpus directory
         self._save_document(document)
@@ -68,7 +83,10 @@ class RAGEngine:
                     content=doc_data["content"],
                     metadata=doc_data.get("metadata", {})
                 )
+                if document.id in self.documents:
+                    self._unindex_document(self.documents[document.id])
                 self.documents[document.id] = document
+                self._index_document(document)
     
     def build_index(self) -> bool:
         """Build vector index for documents"""
@@ -76,15 +94,16 @@ class RAGEngine:
             return False
         
         try:
-            # Simple text-based similarity for now
+            # The inverted index is maintained incrementally; this records it
             # In production, this would use proper embeddings
             self.index_built = True
             
             # Save index metadata
             index_meta = {
                 "documents": len(self.documents),
+                "terms": len(self.lexical_index.postings),
                 "built_at": CodexUtils.generate_timestamp(),
-                "method": "text_similarity"
+                "method": "bm25_inverted_index"
             }
             
             CodexUtils.ensure_directory(self.config.vector_store_dir)
@@ -105,24 +124,13 @@ class RAGEngine:
         if not self.documents:
             return []
         
-        # Simple text-based search (keyword matching)
-        query_words = set(query.lower().split())
-        results = []
-        
-        for doc in self.documents.values():
-            doc_words = set(doc.content.lower().split())
-            
-            # Calculate simple overlap score
-            overlap = len(query_words.intersection(doc_words))
-            total_words = len(query_words)
-            
-            if overlap > 0:
-                score = overlap / total_words
-                results.append((doc, score))
+        top = self.lexical_index.search(query, limit)
+        if not top:
+            return []
         
-        # Sort by score and return top results
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:limit]
+        # Normalize by the BM25 upper bound for this query so scores stay in [0, 1)
+        max_score = self.lexical_index.max_score(query)
+        return [(self.documents[doc_id], score / max_score) for doc_id, score in top]
     
     def generate_response(self, query: str, context_limit: int = 3) -> Dict[str, Any]:
         """Generate response using retrieved context"""
@@ -235,7 +243,9 @@ class RAGEngine:
         document = self.documents[doc_id]
         
         if content is not None:
+            self._unindex_document(document)
             document.content = content
+            self._index_document(document)
         
         if metadata is not None:
             document.metadata.update(metadata)
@@ -254,7 +264,7 @@ class RAGEngine:
             return False
         
         # Remove from memory
-        del self.documents[doc_id]
+        self._unindex_document(self.documents.pop(doc_id))
         
         # Remove file
         doc_file = os.path.join(self.config.corpus_dir, f"{doc_id}.json")
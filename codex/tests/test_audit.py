@@ -0,0 +1,507 @@
+"""
+Test suite for the Super-Codex-AI audit system
+Covers the streaming latency metrics, the batched background ledger writer,
+its wiring into CodexAuditor and the engine shutdown path.
+"""
+
+import pytest
+import asyncio
+import json
+import math
+import random
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock, AsyncMock
+
+# Import the modules to test
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "engine"))
+
+from engine import audit
+from engine.audit import (
+    QuantileSketch, RollingWindow, QueryTracker,
+    LedgerWriter, LedgerWriteError, CodexAuditor
+)
+
+
+def exact_quantile(values, q):
+    """Nearest-rank quantile, matching QuantileSketch's definition"""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q * len(ordered))) - 1]
+
+
+class TestQuantileSketch:
+    """Test the streaming quantile sketch"""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Every reported quantile is within ``relative_accuracy`` of the exact one"""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(-3, 1.5) for _ in range(5000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.01, 0.25, 0.5, 0.9, 0.95, 0.99, 1.0):
+            exact = exact_quantile(values, q)
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+
+    def test_summary_tracks_exact_aggregates(self):
+        """Count, average, min and max are exact"""
+        sketch = QuantileSketch()
+        for value in (0.0, 0.5, 1.5, 4.0):
+            sketch.add(value)
+
+        summary = sketch.summary()
+        assert summary["count"] == 4
+        assert summary["average"] == pytest.approx(1.5)
+        assert (summary["min"], summary["max"]) == (0.0, 4.0)
+        assert sketch.quantile(0.25) == 0.0  # zero lands in the zero bucket
+
+    def test_empty_sketch(self):
+        """An empty sketch has no quantiles"""
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) is None
+        assert sketch.summary() == {"count": 0}
+
+    def test_merge_matches_single_sketch(self):
+        """Merging two sketches gives the same answers as one fed everything"""
+        values = [i / 1000 for i in range(1, 2001)]
+        whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for value in values:
+            whole.add(value)
+        for value in values[::2]:
+            left.add(value)
+        for value in values[1::2]:
+            right.add(value)
+
+        left.merge(right)
+        assert left.count == whole.count
+        assert (left.min, left.max) == (whole.min, whole.max)
+        assert left.total == pytest.approx(whole.total)
+        for q in (0.5, 0.95, 0.99):
+            assert left.quantile(q) == whole.quantile(q)
+
+
+class TestRollingWindow:
+    """Test the time-bucketed rolling window"""
+
+    def test_buckets_expire_with_time(self):
+        """Samples drop out once their bucket leaves the window"""
+        window = RollingWindow(bucket_seconds=10, bucket_count=3)
+        window.record(1.0, now=0)
+        window.record(2.0, now=10)
+        window.record(3.0, now=20)
+
+        assert window.snapshot(now=25)["count"] == 3
+        snapshot = window.snapshot(now=35)
+        assert snapshot["count"] == 2
+        assert snapshot["min"] == 2.0
+        assert snapshot["window_seconds"] == 30
+        assert window.snapshot(now=100)["count"] == 0
+
+    def test_reused_slot_is_reset(self):
+        """A ring slot reused by a newer epoch starts empty"""
+        window = RollingWindow(bucket_seconds=10, bucket_count=3)
+        window.record(1.0, error=True, now=0)
+        window.record(5.0, now=30)  # same slot as epoch 0
+
+        snapshot = window.snapshot(now=30)
+        assert snapshot["count"] == 1
+        assert snapshot["max"] == 5.0
+        assert snapshot["errors"] == 0
+
+    def test_error_counts(self):
+        """Errors are counted per bucket and summed over the live window"""
+        window = RollingWindow(bucket_seconds=60, bucket_count=2)
+        window.record(0.1, error=True, now=0)
+        window.record(0.2, now=30)
+        window.record(0.3, error=True, now=70)
+
+        assert window.snapshot(now=70)["errors"] == 2
+        assert window.snapshot(now=130)["errors"] == 1
+
+
+class TestQueryTracker:
+    """Test query lifecycle tracking"""
+
+    def test_oldest_completed_query_evicted(self):
+        """Only the newest ``max_queries`` completed queries are kept"""
+        tracker = QueryTracker(max_queries=3)
+        for n in range(5):
+            tracker.start_query(f"q{n}", "query")
+            tracker.complete_query(f"q{n}")
+
+        assert isinstance(tracker.completed_queries, OrderedDict)
+        assert list(tracker.completed_queries) == ["q2", "q3", "q4"]
+        assert tracker.get_query_info("q1") is None
+        assert tracker.get_query_info("q4")["status"] == "success"
+
+    def test_active_query_lookup(self):
+        """Active queries are found by id before completion"""
+        tracker = QueryTracker()
+        tracker.start_query("q1", "query", {"scroll_type": "ceremony"})
+        tracker.add_query_event("q1", "embedding_generated", {})
+
+        info = tracker.get_query_info("q1")
+        assert info["status"] == "active"
+        assert len(info["events"]) == 1
+
+    def test_performance_stats_count_errors(self):
+        """Errors feed the totals, the per-type stats and the rolling windows"""
+        tracker = QueryTracker()
+        for n, error in enumerate([None, "timeout", None, "timeout"]):
+            tracker.start_query(f"q{n}", "query", {"scroll_type": "ceremony"})
+            tracker.complete_query(f"q{n}", "error" if error else "success", error)
+
+        stats = tracker.get_performance_stats()
+        assert stats["total_queries"] == 4
+        assert stats["error_rate"] == pytest.approx(0.5)
+        assert stats["by_type"]["ceremony"]["errors"] == 2
+        assert stats["by_type"]["ceremony"]["latency"]["count"] == 4
+        assert stats["last_hour_queries"] == 4
+        assert stats["last_hour_latency"]["errors"] == 2
+        assert stats["last_hour_by_type"]["ceremony"]["count"] == 4
+
+
+class RecordingLedger:
+    """write_batch stand-in that records batches and can be gated or failed"""
+
+    def __init__(self):
+        self.batches = []
+        self.failures = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    @property
+    def written(self):
+        return [entry["n"] for batch in self.batches for entry in batch]
+
+    def __call__(self, entries):
+        self.gate.wait(5)
+        if self.failures:
+            self.failures -= 1
+            raise IOError("ledger unavailable")
+        self.batches.append(list(entries))
+
+
+async def wait_for_writer():
+    """Give the writer task a chance to pick up queued work"""
+    await asyncio.sleep(0.02)
+
+
+class TestLedgerWriterOverflow:
+    """Test queue overflow policies"""
+
+    @pytest.mark.asyncio
+    async def test_block_applies_backpressure(self):
+        """``submit`` waits while the queue is full and succeeds once it drains"""
+        ledger = RecordingLedger()
+        ledger.gate.clear()
+        writer = LedgerWriter(ledger, max_queue=2, batch_size=1, linger_ms=0)
+
+        await writer.submit({"n": 0})
+        await wait_for_writer()  # the writer is now stuck writing entry 0
+        await writer.submit({"n": 1})
+        await writer.submit({"n": 2})
+
+        pending = asyncio.create_task(writer.submit({"n": 3}))
+        await asyncio.sleep(0.05)
+        assert not pending.done()
+
+        ledger.gate.set()
+        assert await pending is True
+        await writer.close()
+        assert ledger.written == [0, 1, 2, 3]
+        assert writer.events_dropped == 0
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_discards_incoming(self):
+        """A full ``drop_newest`` queue rejects the new entry"""
+        ledger = RecordingLedger()
+        ledger.gate.clear()
+        writer = LedgerWriter(ledger, max_queue=2, batch_size=1, linger_ms=0,
+                              overflow_policy="drop_newest")
+
+        await writer.submit({"n": 0})
+        await wait_for_writer()
+        assert await writer.submit({"n": 1}) is True
+        assert await writer.submit({"n": 2}) is True
+        assert await writer.submit({"n": 3}) is False
+
+        ledger.gate.set()
+        await writer.close()
+        assert ledger.written == [0, 1, 2]
+        assert writer.get_metrics()["events_dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_discards_queued(self):
+        """A full ``drop_oldest`` queue evicts the oldest queued entry"""
+        ledger = RecordingLedger()
+        ledger.gate.clear()
+        writer = LedgerWriter(ledger, max_queue=2, batch_size=1, linger_ms=0,
+                              overflow_policy="drop_oldest")
+
+        await writer.submit({"n": 0})
+        await wait_for_writer()
+        for n in (1, 2, 3):
+            assert await writer.submit({"n": n}) is True
+
+        ledger.gate.set()
+        await writer.close()
+        assert ledger.written == [0, 2, 3]
+        assert writer.events_dropped == 1
+
+    def test_unknown_policy_rejected(self):
+        """Only the documented policies are accepted"""
+        with pytest.raises(ValueError):
+            LedgerWriter(RecordingLedger(), overflow_policy="drop_everything")
+
+
+class TestLedgerWriterBatching:
+    """Test how entries are grouped into ledger writes"""
+
+    @pytest.mark.asyncio
+    async def test_batches_split_at_batch_size(self):
+        """Queued entries are written in batches of at most ``batch_size``"""
+        ledger = RecordingLedger()
+        writer = LedgerWriter(ledger, batch_size=2, linger_ms=0)
+
+        for n in range(5):
+            await writer.submit({"n": n})
+        await writer.flush()
+
+        assert [len(batch) for batch in ledger.batches] == [2, 2, 1]
+        assert ledger.written == [0, 1, 2, 3, 4]
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_linger_fills_a_batch(self):
+        """Entries arriving within ``linger_ms`` share a batch"""
+        ledger = RecordingLedger()
+        writer = LedgerWriter(ledger, batch_size=10, linger_ms=100)
+
+        await writer.submit({"n": 0})
+        await asyncio.sleep(0.01)
+        await writer.submit({"n": 1})
+        await writer.submit({"n": 2})
+        await writer.flush()
+
+        assert ledger.batches == [[{"n": 0}, {"n": 1}, {"n": 2}]]
+        assert writer.get_metrics()["average_batch_size"] == 3
+        await writer.close()
+
+
+class TestLedgerWriterRetries:
+    """Test failure handling and carry-over"""
+
+    @pytest.mark.asyncio
+    async def test_retry_then_success(self):
+        """A failed batch is retried and written exactly once"""
+        ledger = RecordingLedger()
+        ledger.failures = 1
+        writer = LedgerWriter(ledger, linger_ms=0, retry_delay=0)
+
+        await writer.submit({"n": 0})
+        await writer.close()
+
+        assert ledger.written == [0]
+        assert writer.write_failures == 1
+        assert writer.events_written == 1
+
+    @pytest.mark.asyncio
+    async def test_partial_write_resumes_without_duplicates(self):
+        """A retry starts after the entries a partial write reported"""
+        landed = []
+        calls = []
+
+        def write_batch(entries):
+            calls.append(len(entries))
+            for written, entry in enumerate(entries):
+                if len(calls) == 1 and written == 2:
+                    raise LedgerWriteError("disk full", written=written)
+                landed.append(entry["n"])
+
+        writer = LedgerWriter(write_batch, batch_size=5, linger_ms=0, retry_delay=0)
+        for n in range(5):
+            await writer.submit({"n": n})
+        await writer.close()
+
+        assert landed == [0, 1, 2, 3, 4]
+        assert calls == [5, 3]
+        assert writer.events_written == 5
+
+    @pytest.mark.asyncio
+    async def test_carry_over_after_retries_exhausted(self):
+        """Entries still failing after the last retry go out with the next batch"""
+        ledger = RecordingLedger()
+        ledger.failures = 1
+        writer = LedgerWriter(ledger, linger_ms=0, max_retries=0)
+
+        await writer.submit({"n": 0})
+        await writer.flush()
+        assert ledger.written == []
+        assert writer.get_metrics()["events_unwritten"] == 1
+
+        await writer.submit({"n": 1})
+        await writer.flush()
+        assert ledger.batches == [[{"n": 0}, {"n": 1}]]
+        assert writer.get_metrics()["events_unwritten"] == 0
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_carry_over_is_capped_for_drop_policies(self):
+        """The carry-over keeps at most ``max_unwritten`` entries"""
+        ledger = RecordingLedger()
+        ledger.failures = 1
+        writer = LedgerWriter(ledger, batch_size=4, linger_ms=0, max_retries=0,
+                              overflow_policy="drop_oldest", max_unwritten=2)
+
+        for n in range(4):
+            await writer.submit({"n": n})
+        await writer.flush()
+        assert writer.get_metrics()["events_unwritten"] == 2
+        assert writer.events_dropped == 2
+
+        await writer.close()
+        assert ledger.written == [2, 3]
+
+    @pytest.mark.asyncio
+    async def test_full_carry_over_blocks_submitters(self):
+        """Under ``block`` a full carry-over stops intake until the ledger recovers"""
+        ledger = RecordingLedger()
+        ledger.failures = 1000
+        writer = LedgerWriter(ledger, max_queue=1, batch_size=1, linger_ms=0,
+                              max_retries=0, retry_delay=0.001, max_unwritten=1)
+
+        await writer.submit({"n": 0})
+        await wait_for_writer()
+        await writer.submit({"n": 1})  # fills the queue; the writer is not taking more
+
+        pending = asyncio.create_task(writer.submit({"n": 2}))
+        await asyncio.sleep(0.05)
+        assert not pending.done()
+        assert writer.get_metrics()["events_unwritten"] == 1
+
+        ledger.failures = 0
+        assert await pending is True
+        await writer.close()
+        assert ledger.written == [0, 1, 2]
+        assert writer.events_dropped == 0
+
+    def test_ledger_batch_reports_progress(self, monkeypatch):
+        """``_write_ledger_batch`` says how many entries landed before a failure"""
+        landed = []
+
+        def write_ledger(name, entry):
+            if entry["n"] == 2:
+                raise IOError("ledger unavailable")
+            landed.append(entry["n"])
+
+        monkeypatch.setattr(audit, "write_ledger", write_ledger)
+        with pytest.raises(LedgerWriteError) as excinfo:
+            audit._write_ledger_batch([{"n": n} for n in range(4)])
+        assert excinfo.value.written == 2
+        assert landed == [0, 1]
+
+
+class TestLedgerWriterClose:
+    """Test shutdown draining"""
+
+    @pytest.mark.asyncio
+    async def test_close_drains_accepted_entries(self):
+        """Every accepted entry is written before ``close`` returns"""
+        ledger = RecordingLedger()
+        writer = LedgerWriter(ledger, batch_size=7, linger_ms=20)
+
+        for n in range(50):
+            await writer.submit({"n": n})
+        await writer.close()
+
+        assert ledger.written == list(range(50))
+        assert await writer.submit({"n": 50}) is False
+        assert writer.events_dropped == 1
+
+
+def make_audit_config(tmp_path, **overrides):
+    """Minimal configuration for CodexAuditor"""
+    values = {
+        "audit_detail_level": "standard",
+        "audit_enabled": True,
+        "audit_retention_days": 90,
+        "ledger_integration": True,
+        "audit_ledger_path": tmp_path / "audit.jsonl",
+        "audit_queue_size": 100,
+        "audit_batch_size": 16,
+        "audit_flush_interval_ms": 5,
+        "audit_overflow_policy": "block",
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestCodexAuditorLedger:
+    """Test CodexAuditor's use of the ledger writer"""
+
+    @pytest.mark.asyncio
+    async def test_events_reach_ledger_on_shutdown(self, tmp_path):
+        """Logged events are queued and written as JSON lines by shutdown"""
+        config = make_audit_config(tmp_path)
+        auditor = CodexAuditor(config)
+        await auditor.initialize()
+
+        event_id = await auditor.log_event({"action": "probe"})
+        await auditor.shutdown()
+
+        lines = config.audit_ledger_path.read_text().splitlines()
+        events = [json.loads(line) for line in lines]
+        assert [event["action"] for event in events] == ["audit_system_initialized", "probe"]
+        assert events[1]["event_id"] == event_id
+
+        metrics = auditor.get_performance_dashboard()["ledger_writer"]
+        assert metrics["events_written"] == 2
+        assert metrics["queue_depth"] == 0
+
+    def test_writer_follows_configuration(self, tmp_path):
+        """Queue size, batch size, linger and policy come from the config"""
+        auditor = CodexAuditor(make_audit_config(
+            tmp_path, audit_queue_size=7, audit_batch_size=3,
+            audit_flush_interval_ms=20, audit_overflow_policy="drop_oldest"))
+
+        writer = auditor.ledger_writer
+        assert writer._queue.maxsize == 7
+        assert writer.batch_size == 3
+        assert writer.linger == pytest.approx(0.02)
+        assert writer.overflow_policy == "drop_oldest"
+
+    def test_no_writer_without_ledger_integration(self, tmp_path):
+        """Disabling ledger integration skips the writer entirely"""
+        auditor = CodexAuditor(make_audit_config(tmp_path, ledger_integration=False))
+        assert auditor.ledger_writer is None
+
+
+class TestEngineShutdown:
+    """Test that the engine drains the auditor on shutdown"""
+
+    @pytest.mark.asyncio
+    async def test_shutdown_drains_auditor(self, monkeypatch, tmp_path):
+        """``CodexEngine.shutdown`` awaits ``auditor.shutdown``"""
+        # app.py builds an engine at import from siblings it imports by bare
+        # name; stand in for them so only the shutdown path is exercised
+        for name in ("config", "rag", "audit", "replay", "models.prompts"):
+            monkeypatch.setitem(sys.modules, name, Mock())
+        monkeypatch.delitem(sys.modules, "engine.app", raising=False)
+        monkeypatch.chdir(tmp_path)  # app.py logs to ./codex_engine.log
+        from engine import app
+
+        monkeypatch.setattr(app, "write_ledger", Mock())
+        engine = app.CodexEngine()
+        engine.rag = Mock(spec=[])
+        engine.auditor = Mock(shutdown=AsyncMock())
+
+        await engine.shutdown()
+
+        engine.auditor.shutdown.assert_awaited_once()
+        app.write_ledger.assert_called_once()
@@ -0,0 +1,215 @@
+"""
+Test suite for the Super-Codex-AI event bus and event history
+Covers subscription queues (drop/block overflow, drain), wildcard routing
+and the bounded event history.
+"""
+
+import pytest
+import asyncio
+import random
+import threading
+from pathlib import Path
+
+# Import the modules to test
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.bus import EventBus, Subscription
+from core.events import EventManager
+
+
+class TestSubscriptionOverflow:
+    """Test bounded subscription queues"""
+
+    @pytest.mark.asyncio
+    async def test_drop_policy_discards_when_full(self):
+        """A full ``drop`` queue discards events instead of waiting"""
+        bus = EventBus()
+        release = asyncio.Event()
+        handled = []
+
+        async def handler(payload):
+            await release.wait()
+            handled.append(payload["n"])
+
+        subscription = bus.subscribe("job.done", handler, queue_size=2, overflow="drop")
+        for n in range(5):
+            await bus.publish("job.done", {"n": n})
+            await asyncio.sleep(0)  # let the worker take the first event
+
+        # One event is being handled, two are queued, the rest were dropped
+        assert (subscription.delivered, subscription.dropped) == (3, 2)
+        release.set()
+        await bus.drain()
+        assert handled == [0, 1, 2]
+        assert subscription.get_stats()["queue_depth"] == 0
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_block_policy_waits_for_room(self):
+        """``publish`` waits for room on a ``block`` queue and loses nothing"""
+        bus = EventBus()
+        handled = []
+
+        async def handler(payload):
+            await asyncio.sleep(0.001)
+            handled.append(payload["n"])
+
+        subscription = bus.subscribe("job.done", handler, queue_size=1)
+        for n in range(5):
+            await bus.publish("job.done", {"n": n})
+        await bus.drain()
+
+        assert handled == [0, 1, 2, 3, 4]
+        assert subscription.dropped == 0
+        await bus.close()
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_thread_handlers(self):
+        """Blocking handlers run on the subscription's pool; drain waits for them"""
+        bus = EventBus()
+        threads = []
+
+        def handler(payload):
+            threads.append(threading.current_thread().name)
+
+        subscription = bus.subscribe("job.done", handler, workers=2)
+        for n in range(4):
+            bus.emit("job.done", {"n": n})
+        await subscription.drain()
+
+        assert subscription.processed == 4
+        assert all(name.startswith("bus-") for name in threads)
+        await bus.unsubscribe(subscription)
+        bus.emit("job.done", {"n": 5})
+        assert subscription.delivered == 4
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_are_counted(self):
+        """A failing handler is recorded and the worker keeps going"""
+        bus = EventBus()
+
+        async def handler(payload):
+            if payload["n"] == 0:
+                raise RuntimeError("boom")
+
+        subscription = bus.subscribe("job.done", handler)
+        bus.emit("job.done", {"n": 0})
+        bus.emit("job.done", {"n": 1})
+        await bus.drain()
+
+        assert (subscription.errors, subscription.processed) == (1, 1)
+        assert subscription.last_error == "RuntimeError: boom"
+        await bus.close()
+
+    def test_invalid_options(self):
+        """Unknown overflow policies and empty queues are rejected"""
+        with pytest.raises(ValueError):
+            Subscription("job.done", print, overflow="spill")
+        with pytest.raises(ValueError):
+            Subscription("job.done", print, queue_size=0)
+
+    def test_emit_without_loop_drops(self):
+        """Async handlers cannot run without an event loop; events are counted as dropped"""
+        bus = EventBus()
+
+        async def handler(payload):
+            pass
+
+        subscription = bus.subscribe("job.done", handler)
+        bus.emit("job.done", {})
+        assert subscription.dropped == 1
+
+
+class TestWildcardRouting:
+    """Test pattern subscriptions and handlers"""
+
+    def test_patterns_match_event_names(self):
+        """``user.*`` matches user events only; ``*`` matches everything"""
+        assert Subscription("user.*", print).matches("user.login")
+        assert not Subscription("user.*", print).matches("ai.request")
+        assert Subscription("*", print).matches("ai.request")
+        assert Subscription("user.log?n", print).matches("user.login")
+        assert not Subscription("user.login", print).matches("user.logout")
+
+    def test_sync_pattern_handlers(self):
+        """Inline handlers registered with patterns receive matching events"""
+        bus = EventBus()
+        seen = []
+        bus.on("user.*", lambda payload: seen.append(("user.*", payload["n"])))
+        bus.on("user.login", lambda payload: seen.append(("user.login", payload["n"])))
+
+        bus.emit("user.login", {"n": 1})
+        bus.emit("ai.request", {"n": 2})
+        bus.emit("user.logout", {"n": 3})
+
+        assert seen == [("user.login", 1), ("user.*", 1), ("user.*", 3)]
+
+    @pytest.mark.asyncio
+    async def test_resolution_cache_sees_new_subscriptions(self):
+        """Subscribing after an event name was resolved still routes to the new handler"""
+        bus = EventBus()
+        seen = []
+
+        async def handler(payload):
+            seen.append(payload["n"])
+
+        bus.emit("user.login", {"n": 0})
+        bus.subscribe("user.*", handler)
+        bus.emit("user.login", {"n": 1})
+        await bus.drain()
+
+        assert seen == [1]
+        await bus.close()
+
+
+class TestEventHistory:
+    """Test the bounded event history"""
+
+    def test_history_is_bounded(self):
+        """Only the newest ``max_history_size`` events are kept, across all types"""
+        manager = EventManager(max_history_size=3)
+        for n in range(5):
+            manager._record("user.action" if n % 2 else "ai.request", {"n": n}, None, None)
+
+        assert [event.payload["n"] for event in manager.get_event_history()] == [2, 3, 4]
+        assert [event.payload["n"] for event in manager.get_event_history("user.action")] == [3]
+        assert [event.payload["n"] for event in manager.get_event_history(limit=2)] == [3, 4]
+
+    def test_filtered_limit_returns_newest(self):
+        """A filtered lookup returns the newest matches in emission order"""
+        manager = EventManager()
+        for n in range(6):
+            manager._record("user.action" if n % 2 else "ai.request", {"n": n}, None, None)
+
+        assert [event.payload["n"] for event in manager.get_event_history("ai.request", limit=2)] == [2, 4]
+        assert manager.get_event_history("missing") == []
+        manager.clear_history()
+        assert manager.get_event_history() == []
+
+    def test_type_index_matches_full_scan(self):
+        """Filtered lookups agree with a scan of the ring and the index stays bounded"""
+        manager = EventManager(max_history_size=50)
+        types = ["user.action", "ai.request", "ai.error", "data.ingested"]
+        rng = random.Random(11)
+        for n in range(500):
+            manager._record(rng.choice(types[:3] if n < 250 else types[1:]), {"n": n}, None, None)
+
+            if n % 37 == 0 or n == 499:
+                for event_type in types:
+                    scanned = [event for event in manager.event_history if event.event_type == event_type]
+                    assert manager.get_event_history(event_type) == scanned
+                    assert manager.get_event_history(event_type, limit=3) == scanned[-3:]
+
+        assert sum(len(events) for events in manager.history_by_type.values()) == 50
+        assert "user.action" not in manager.history_by_type
+
+    def test_zero_size_history_keeps_nothing(self):
+        """A manager with no history records nothing and does not fail"""
+        manager = EventManager(max_history_size=0)
+        manager._record("user.action", {"n": 0}, None, None)
+        manager._record("user.action", {"n": 1}, None, None)
+
+        assert manager.get_event_history() == []
+        assert manager.get_event_history("user.action") == []
+        assert manager.history_by_type == {}
@@ -6,6 +6,7 @@ Comprehensive tests for RAG functionality, vector operations, and document proce
 import pytest
 import pytest_asyncio
 import asyncio
+import numpy as np
 import tempfile
 import json
 import shutil
@@ -19,9 +20,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from engine.rag import (
     MockEmbeddingModel, VectorStore, TextSplitter, 
-    CodexRAG, DocumentChunk
+    CodexRAG, DocumentChunk, IVFIndex, VectorStoreLog, QueryCache, BM25Index
 )
 from engine.config import CodexConfig
+from engine.replay import QueryCapturer, QueryReplayer, RatePacer
 from engine.ingest import (
     TextProcessor, JSONProcessor, ArtifactProcessor, 
     CodexIngest
@@ -92,6 +94,31 @@ class TestMockEmbeddingModel:
         
         assert len(embedding) == 1536
         assert all(x == 0.0 for x in embedding)
+    
+    @pytest.mark.asyncio
+    async def test_embed_batch_returns_matrix(self):
+        """Batched embedding returns one float32 matrix matching embed()"""
+        model = MockEmbeddingModel(dimension=32, batch_size=2)
+        texts = ["alpha", "beta", "alpha", "", "gamma"]
+        
+        matrix = await model.embed_batch(texts)
+        
+        assert matrix.shape == (5, 32)
+        assert matrix.dtype == np.float32
+        assert np.array_equal(matrix[0], matrix[2])
+        assert not matrix[3].any()
+        assert np.allclose(matrix[4], model.embed("gamma"), atol=1e-6)
+    
+    def test_embedding_leaves_global_rng_alone(self):
+        """Embedding does not reseed the global numpy RNG"""
+        model = MockEmbeddingModel(dimension=8)
+        np.random.seed(7)
+        expected = np.random.random()
+        
+        np.random.seed(7)
+        model.embed("reseeding would change the next draw")
+        
+        assert np.random.random() == expected
 
 
 class TestVectorStore:
@@ -210,6 +237,698 @@ class TestVectorStore:
         assert vector_store.documents[0] == "Content 2"
 
 
+class TestMatrixVectorStore:
+    """Test the matrix-backed vector store"""
+    
+    @staticmethod
+    def _chunk(content, embedding, **metadata):
+        chunk = DocumentChunk(content=content, metadata=metadata)
+        chunk.embedding = np.asarray(embedding, dtype=np.float32)
+        return chunk
+    
+    def test_matrix_grows_and_maps_rows(self):
+        """Rows are appended to a growable float32 matrix"""
+        store = VectorStore(dimension=4, initial_capacity=2)
+        for i in range(5):
+            store.add_chunk(self._chunk(f"content {i}", np.eye(4)[i % 4]))
+        
+        assert len(store) == 5
+        assert store.embeddings.dtype == np.float32
+        assert store.embeddings.shape == (5, 4)
+        assert store._matrix.shape[0] >= 5
+        assert store.row_ids[store.id_to_row[store.row_ids[3]]] == store.row_ids[3]
+    
+    def test_readding_chunk_overwrites_row(self):
+        """Adding an existing chunk_id updates its row in place"""
+        store = VectorStore(dimension=2)
+        store.add_chunk(self._chunk("same", [1.0, 0.0]))
+        store.add_chunk(self._chunk("same", [0.0, 1.0]))
+        
+        assert len(store) == 1
+        assert store.embeddings[0].tolist() == [0.0, 1.0]
+    
+    def test_top_k_ordering_and_threshold(self):
+        """Top-k results come back sorted and above threshold"""
+        store = VectorStore(dimension=2)
+        store.add_chunks([
+            self._chunk("a", [1.0, 0.0]),
+            self._chunk("b", [0.8, 0.6]),
+            self._chunk("c", [0.6, 0.8]),
+            self._chunk("d", [0.0, 1.0]),
+        ])
+        
+        results = store.similarity_search(np.array([1.0, 0.0]), k=2, threshold=0.0)
+        assert [chunk.content for chunk, _ in results] == ["a", "b"]
+        
+        results = store.similarity_search(np.array([1.0, 0.0]), k=10, threshold=0.7)
+        assert [chunk.content for chunk, _ in results] == ["a", "b"]
+    
+    def test_metadata_filter_mask(self):
+        """Metadata filters restrict candidate rows"""
+        store = VectorStore(dimension=2)
+        store.add_chunks([
+            self._chunk("gov", [1.0, 0.0], document_type="governance"),
+            self._chunk("tech", [1.0, 0.0], document_type="technical"),
+        ])
+        
+        results = store.similarity_search(
+            np.array([1.0, 0.0]), k=5, threshold=0.0,
+            metadata_filters={"document_type": "technical"}
+        )
+        assert [chunk.content for chunk, _ in results] == ["tech"]
+        assert store.similarity_search(
+            np.array([1.0, 0.0]), metadata_filters={"document_type": "missing"}
+        ) == []
+        assert [c.content for c in store.list_chunks({"document_type": "governance"})] == ["gov"]
+    
+    def test_save_and_load_roundtrip(self, tmp_path):
+        """Matrix and row mapping survive save/load"""
+        store = VectorStore(dimension=2)
+        store.add_chunks([
+            self._chunk("a", [1.0, 0.0], document_type="x"),
+            self._chunk("b", [0.0, 1.0], document_type="y"),
+        ])
+        store.save(tmp_path / "vectors.pkl")
+        
+        loaded = VectorStore(dimension=2)
+        loaded.load(tmp_path / "vectors.pkl")
+        
+        assert loaded.row_ids == store.row_ids
+        assert np.array_equal(loaded.embeddings, store.embeddings)
+        results = loaded.similarity_search(
+            np.array([0.0, 1.0]), threshold=0.5, metadata_filters={"document_type": "y"}
+        )
+        assert [chunk.content for chunk, _ in results] == ["b"]
+
+
+class TestIVFIndex:
+    """Test the IVF approximate nearest-neighbour index"""
+    
+    @staticmethod
+    def _clustered_store(nprobe=2, count=400, dimension=16):
+        rng = np.random.default_rng(7)
+        centers = rng.normal(size=(8, dimension))
+        vectors = centers[rng.integers(0, 8, count)] + rng.normal(0, 0.1, (count, dimension))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        
+        store = VectorStore(dimension=dimension, index=IVFIndex(dimension, nlist=8, nprobe=nprobe))
+        chunks = []
+        for i, vector in enumerate(vectors):
+            chunk = DocumentChunk(content=f"chunk {i}", metadata={"group": i % 2})
+            chunk.embedding = vector
+            chunks.append(chunk)
+        store.add_chunks(chunks)
+        return store, vectors
+    
+    def test_untrained_index_falls_back_to_exact(self):
+        """Below the training size search scans every row"""
+        store = VectorStore(dimension=2, index=IVFIndex(2, nlist=8))
+        chunk = DocumentChunk(content="only", metadata={})
+        chunk.embedding = np.array([1.0, 0.0])
+        store.add_chunk(chunk)
+        
+        assert not store.index.is_trained
+        assert store.similarity_search(np.array([1.0, 0.0]), threshold=0.5)[0][0].content == "only"
+    
+    def test_index_trains_and_indexes_all_rows(self):
+        """Crossing the training size trains and indexes existing rows"""
+        store, _ = self._clustered_store()
+        
+        assert store.index.is_trained
+        assert store.index.get_stats()["indexed_rows"] == len(store)
+    
+    def test_recall_report_against_exact(self):
+        """Recall report compares ANN results with exact search"""
+        store, vectors = self._clustered_store(nprobe=8)
+        report = store.evaluate_recall(vectors[:20], k=5)
+        
+        assert report["index_type"] == "ivf"
+        assert report["params"]["nprobe"] == 8
+        assert report["recall_at_k"] == 1.0  # probing every list is exhaustive
+    
+    def test_filtered_search_uses_index_candidates(self):
+        """Metadata masks apply to index candidates"""
+        store, vectors = self._clustered_store()
+        results = store.similarity_search(vectors[1], k=3, threshold=-1.0,
+                                          metadata_filters={"group": 1})
+        
+        assert results
+        assert all(chunk.metadata["group"] == 1 for chunk, _ in results)
+        assert results[0][0].content == "chunk 1"
+    
+    def test_deleted_rows_leave_the_index(self):
+        """Deletions drop rows from the lists and re-file the moved row"""
+        store, vectors = self._clustered_store(nprobe=8)
+        store.delete_chunks([store.row_ids[i] for i in range(0, 100, 2)])
+        
+        assert store.index.get_stats()["indexed_rows"] == len(store) == 350
+        assert store.evaluate_recall(vectors[1:40:2], k=5)["recall_at_k"] == 1.0
+        assert all(row < len(store) for rows in store.index.lists for row in rows)
+    
+    def test_search_params_are_tunable(self):
+        """nprobe can be changed at runtime"""
+        index = IVFIndex(4, nlist=16, nprobe=2)
+        index.set_search_params(nprobe=6)
+        
+        assert index.get_params()["nprobe"] == 6
+        with pytest.raises(ValueError):
+            index.set_search_params(unknown=1)
+
+
+class TestHybridRetrieval:
+    """Test the BM25 inverted index and reciprocal rank fusion"""
+    
+    @staticmethod
+    def _chunk(content, embedding, **metadata):
+        chunk = DocumentChunk(content=content, metadata=metadata)
+        chunk.embedding = np.asarray(embedding, dtype=np.float32)
+        return chunk
+    
+    def test_bm25_ranks_rare_terms_higher(self):
+        """Documents matching rarer query terms rank first"""
+        index = BM25Index()
+        index.add("a", "honor system governance")
+        index.add("b", "honor system ceremony")
+        index.add("c", "the treasury ledger")
+        
+        results = index.search("honor ceremony", k=5)
+        assert [key for key, _ in results] == ["b", "a"]
+        assert results[0][1] > results[1][1] > 0
+    
+    def test_bm25_matches_identifiers_and_parts(self):
+        """Joined identifiers match exactly and by their parts"""
+        index = BM25Index()
+        index.add("scroll", "Replay token HSA-2024-001 was sealed")
+        index.add("other", "Replay token HSA-2023-777 was sealed")
+        
+        assert index.search("HSA-2024-001", k=1)[0][0] == "scroll"
+        assert {key for key, _ in index.search("hsa", k=5)} == {"scroll", "other"}
+    
+    def test_bm25_remove_reuses_slots(self):
+        """Removed documents leave the postings and free their slot"""
+        index = BM25Index()
+        index.add("a", "alpha beta")
+        index.add("b", "beta gamma")
+        index.remove("a", "alpha beta")
+        
+        assert index.search("alpha", k=5) == []
+        assert "alpha" not in index.postings
+        index.add("c", "alpha")
+        assert len(index) == 2
+        assert index.search("alpha", k=5)[0][0] == "c"
+        with pytest.raises(ValueError):
+            index.add("c", "duplicate")
+    
+    def test_bm25_max_score_bounds_scores(self):
+        """Scores divided by the query's upper bound stay below one"""
+        index = BM25Index()
+        index.add("a", "flame " * 50)
+        index.add("b", "flame ledger")
+        index.add("c", "treasury")
+        
+        bound = index.max_score("flame ledger missing")
+        assert bound > 0
+        assert all(0 < score / bound < 1 for _, score in index.search("flame ledger missing", k=0))
+        assert index.max_score("missing") == 0.0
+    
+    def test_store_keeps_lexical_index_in_sync(self):
+        """Overwrites and deletions update the lexical index"""
+        store = VectorStore(dimension=2, lexical_index=BM25Index())
+        first = self._chunk("ceremony of bronze", [1.0, 0.0])
+        store.add_chunk(first)
+        store.add_chunk(self._chunk("treasury ledger", [0.0, 1.0]))
+        
+        assert [c.content for c, _ in store.lexical_search("bronze")] == ["ceremony of bronze"]
+        store.delete_chunks([first.chunk_id])
+        assert store.lexical_search("bronze") == []
+        assert len(store.lexical_index) == 1
+    
+    def test_lexical_search_applies_filters(self):
+        """Metadata filters restrict lexical hits"""
+        store = VectorStore(dimension=2, lexical_index=BM25Index())
+        store.add_chunks([
+            self._chunk("honor rules", [1.0, 0.0], document_type="governance"),
+            self._chunk("honor api", [0.0, 1.0], document_type="technical"),
+        ])
+        
+        results = store.lexical_search("honor", metadata_filters={"document_type": "technical"})
+        assert [c.content for c, _ in results] == ["honor api"]
+    
+    def test_hybrid_surfaces_exact_term_matches(self):
+        """A lexical-only hit is fused in even below the vector threshold"""
+        store = VectorStore(dimension=2, lexical_index=BM25Index())
+        store.add_chunks([
+            self._chunk("general overview", [1.0, 0.0]),
+            self._chunk("token HSA-2024-001 details", [0.0, 1.0]),
+        ])
+        
+        results = store.hybrid_search(np.array([1.0, 0.0]), "HSA-2024-001", k=2, threshold=0.5)
+        by_content = {chunk.content: (similarity, details) for chunk, similarity, details in results}
+        
+        similarity, details = by_content["token HSA-2024-001 details"]
+        assert similarity == pytest.approx(0.0)
+        assert details["lexical_rank"] == 1 and "vector_rank" not in details
+        assert by_content["general overview"][1]["vector_rank"] == 1
+        assert details["rrf_score"] == pytest.approx(1.0 / 61)
+    
+    def test_vector_store_without_lexical_index(self):
+        """Lexical search needs an index"""
+        with pytest.raises(ValueError):
+            VectorStore(dimension=2).lexical_search("anything")
+    
+    @pytest.mark.asyncio
+    async def test_rag_query_in_hybrid_mode(self, tmp_path, monkeypatch):
+        """CodexRAG fuses rankings when retrieval_mode is hybrid"""
+        monkeypatch.setenv("CODEX_DATA_PATH", str(tmp_path))
+        monkeypatch.setenv("CODEX_CORPUS_PATH", str(tmp_path / "corpus"))
+        monkeypatch.setenv("CODEX_VECTORS_PATH", str(tmp_path / "vectors"))
+        monkeypatch.setenv("CODEX_RETRIEVAL_MODE", "hybrid")
+        rag = CodexRAG(CodexConfig())
+        await rag.initialize()
+        await rag.ingest(content="Scroll HSA-2024-001 records the bronze honor.", document_type="test")
+        await rag.ingest(content="The treasury ledger balances.", document_type="test")
+        
+        result = await rag.query("HSA-2024-001")
+        assert result["retrieval_mode"] == "hybrid"
+        assert "HSA-2024-001" in result["sources"][0]["content_preview"]
+        assert result["sources"][0]["retrieval"]["lexical_rank"] == 1
+        
+        reloaded = CodexRAG(CodexConfig())
+        await reloaded.initialize()
+        assert len(reloaded.vector_store.lexical_index) == 2
+
+
+class TestVectorStoreLog:
+    """Test append-only vector store persistence"""
+    
+    @staticmethod
+    def _add(store, content, embedding, **metadata):
+        chunk = DocumentChunk(content=content, metadata=metadata)
+        chunk.embedding = np.asarray(embedding, dtype=np.float32)
+        store.add_chunk(chunk)
+        return chunk
+    
+    @staticmethod
+    def _persist(store, log):
+        delta = store.take_delta()
+        log.write_delta(delta, store.dimension)
+        store.mark_persisted(delta)
+        return delta
+    
+    def test_only_delta_is_written(self, tmp_path):
+        """Each persist writes just the rows added since the last one"""
+        log = VectorStoreLog(tmp_path / "store")
+        store = VectorStore(dimension=2)
+        self._add(store, "a", [1.0, 0.0])
+        assert len(self._persist(store, log)["records"]) == 1
+        
+        self._add(store, "b", [0.0, 1.0])
+        delta = self._persist(store, log)
+        assert [record["row"] for record in delta["records"]] == [1]
+        assert self._persist(store, log)["records"] == []  # nothing new
+        
+        loaded = VectorStore(dimension=2)
+        log.load(loaded)
+        assert loaded.row_ids == store.row_ids
+        assert np.array_equal(loaded.embeddings, store.embeddings)
+        assert loaded.get_chunk(store.row_ids[1]).content == "b"
+    
+    def test_overwritten_rows_are_patched(self, tmp_path):
+        """Re-adding a persisted chunk rewrites its row and metadata"""
+        log = VectorStoreLog(tmp_path / "store")
+        store = VectorStore(dimension=2)
+        self._add(store, "a", [1.0, 0.0], version=1)
+        self._persist(store, log)
+        self._add(store, "a", [0.0, 1.0], version=2)
+        self._persist(store, log)
+        
+        loaded = VectorStore(dimension=2)
+        log.load(loaded)
+        assert len(loaded) == 1
+        assert loaded.embeddings[0].tolist() == [0.0, 1.0]
+        assert loaded.get_chunk(loaded.row_ids[0]).metadata["version"] == 2
+    
+    def test_overwrite_is_crash_safe(self, tmp_path, monkeypatch):
+        """An overwrite interrupted before the manifest commit leaves the old row readable"""
+        log = VectorStoreLog(tmp_path / "store")
+        store = VectorStore(dimension=2)
+        self._add(store, "a", [1.0, 0.0], version=1)
+        self._persist(store, log)
+        
+        self._add(store, "a", [0.0, 1.0], version=2)
+        def crash(manifest):
+            raise OSError("power lost")
+        monkeypatch.setattr(log, "_write_manifest", crash)
+        with pytest.raises(OSError):
+            log.write_delta(store.take_delta(), store.dimension)
+        monkeypatch.undo()
+        
+        loaded = VectorStore(dimension=2)
+        log.load(loaded)
+        assert loaded.embeddings[0].tolist() == [1.0, 0.0]
+        assert loaded.get_chunk(loaded.row_ids[0]).metadata["version"] == 1
+        
+        # The retried write appends past the committed slots
+        self._persist(store, log)
+        assert log.read_manifest()["slots"] == 2
+        log.load(loaded)
+        assert loaded.embeddings[0].tolist() == [0.0, 1.0]
+    
+    def test_overwritten_rows_load_out_of_slot_order(self, tmp_path):
+        """Rows living in appended slots are gathered, also in mmap mode"""
+        log = VectorStoreLog(tmp_path / "store")
+        store = VectorStore(dimension=2)
+        self._add(store, "a", [1.0, 0.0])
+        self._add(store, "b", [0.0, 1.0], version=1)
+        self._persist(store, log)
+        self._add(store, "b", [0.6, 0.8], version=2)
+        self._persist(store, log)
+        
+        for mmap_mode in (False, True):
+            loaded = VectorStore(dimension=2)
+            log.load(loaded, mmap_mode=mmap_mode)
+            assert np.array_equal(loaded.embeddings, store.embeddings)
+        
+        log.compact()
+        manifest = log.read_manifest()
+        assert (manifest["rows"], manifest["slots"], manifest["records"]) == (2, 2, 2)
+        assert sorted(path.name for path in log.directory.glob("embeddings*")) == ["embeddings-000002.f32"]
+        loaded = VectorStore(dimension=2)
+        log.load(loaded, mmap_mode=True)
+        assert isinstance(loaded._matrix, np.memmap)
+        assert np.array_equal(loaded.embeddings, store.embeddings)
+    
+    def test_deletions_shrink_the_log(self, tmp_path):
+        """Deleted chunks are gone after reload; the moved last row is patched"""
+        log = VectorStoreLog(tmp_path / "store")
+        store = VectorStore(dimension=2)
+        first = self._add(store, "a", [1.0, 0.0], kind="x")
+        self._add(store, "b", [0.0, 1.0], kind="y")
+        last = self._add(store, "c", [0.6, 0.8], kind="x")
+        self._persist(store, log)
+        
+        assert store.delete_chunks([first.chunk_id, "missing"]) == 1
+        assert store.id_to_row[last.chunk_id] == 0
+        assert len(store.list_chunks({"kind": "x"})) == 1
+        delta = self._persist(store, log)
+        assert delta["truncate"] and [record["row"] for record in delta["records"]] == [0]
+        
+        loaded = VectorStore(dimension=2)
+        log.load(loaded)
+        assert loaded.row_ids == store.row_ids
+        assert np.array_equal(loaded.embeddings, store.embeddings)
+        assert first.chunk_id not in loaded.chunks
+        
+        self._add(store, "d", [0.0, -1.0])
+        self._persist(store, log)
+        log.load(loaded)
+        assert loaded.get_chunk(loaded.row_ids[2]).content == "d"
+    
+    def test_uncommitted_tail_is_ignored(self, tmp_path):
+        """Bytes past the manifest (a torn write) are ignored and overwritten"""
+        log = VectorStoreLog(tmp_path / "store")
+        store = VectorStore(dimension=2)
+        self._add(store, "a", [1.0, 0.0])
+        self._persist(store, log)
+        
+        with open(log.embeddings_path, 'ab') as f:
+            f.write(b"garbage")
+        with open(log._chunks_path(1), 'ab') as f:
+            f.write(b'{"op": "put", "row"')
+        
+        loaded = VectorStore(dimension=2)
+        log.load(loaded)
+        assert len(loaded) == 1
+        
+        self._add(loaded, "b", [0.0, 1.0])
+        self._persist(loaded, log)
+        reloaded = VectorStore(dimension=2)
+        log.load(reloaded)
+        assert [reloaded.get_chunk(cid).content for cid in reloaded.row_ids] == ["a", "b"]
+    
+    def test_mmap_load_is_zero_copy_and_lazy(self, tmp_path):
+        """mmap mode keeps the matrix on disk and materializes only returned chunks"""
+        log = VectorStoreLog(tmp_path / "store")
+        store = VectorStore(dimension=2)
+        self._add(store, "a", [1.0, 0.0], document_type="x")
+        self._add(store, "b", [0.0, 1.0], document_type="y")
+        self._persist(store, log)
+        
+        loaded = VectorStore(dimension=2)
+        log.load(loaded, mmap_mode=True)
+        assert isinstance(loaded._matrix, np.memmap)
+        assert not loaded._matrix.flags.writeable
+        assert loaded.chunks.materialized == 0
+        assert loaded.get_stats()["document_types"] == {"x": 1, "y": 1}
+        
+        results = loaded.similarity_search(np.array([0.0, 1.0]), threshold=0.5)
+        assert [chunk.content for chunk, _ in results] == ["b"]
+        assert loaded.chunks.materialized == 1
+        
+        # Writes promote the matrix to private memory and persist normally
+        self._add(loaded, "c", [0.6, 0.8])
+        assert not isinstance(loaded._matrix, np.memmap)
+        self._persist(loaded, log)
+        reloaded = VectorStore(dimension=2)
+        log.load(reloaded, mmap_mode=True)
+        assert len(reloaded) == 3
+        assert reloaded.get_chunk(reloaded.row_ids[2]).content == "c"
+    
+    def test_compaction_drops_superseded_records(self, tmp_path):
+        """Compaction keeps one record per row in a new generation"""
+        log = VectorStoreLog(tmp_path / "store", compaction_ratio=0.5, min_compaction_records=2)
+        store = VectorStore(dimension=2)
+        self._add(store, "a", [1.0, 0.0])
+        self._persist(store, log)
+        for version in range(3):
+            self._add(store, "a", [1.0, 0.0], version=version)
+            self._persist(store, log)
+        
+        manifest = log.read_manifest()
+        assert log.compactions >= 1
+        assert manifest["generation"] > 1
+        assert manifest["records"] <= 2
+        assert not log._chunks_path(1).exists()
+        
+        loaded = VectorStore(dimension=2)
+        log.load(loaded)
+        assert loaded.get_chunk(loaded.row_ids[0]).metadata["version"] == 2
+
+    
+    def test_generation_tracks_lineage_across_processes(self, tmp_path):
+        """Stores loaded from one log share a generation until either writes"""
+        log = VectorStoreLog(tmp_path / "store")
+        store = VectorStore(dimension=2)
+        self._add(store, "a", [1.0, 0.0])
+        self._persist(store, log)
+        
+        first, second = VectorStore(dimension=2), VectorStore(dimension=2)
+        log.load(first)
+        log.load(second, mmap_mode=True)
+        assert first.generation == second.generation == store.generation
+        
+        self._add(first, "b", [0.0, 1.0])
+        self._add(second, "c", [0.6, 0.8])
+        assert first.version == second.version
+        assert first.generation != second.generation
+        
+        self._persist(first, log)
+        reloaded = VectorStore(dimension=2)
+        log.load(reloaded)
+        assert reloaded.generation == first.generation
+
+class TestQueryCache:
+    """Test the bounded query-result cache"""
+    
+    def test_lru_eviction_by_entries(self):
+        """Least recently used entries are evicted past max_entries"""
+        cache = QueryCache(max_entries=2)
+        cache.put("a", 0, {"answer": "a"})
+        cache.put("b", 0, {"answer": "b"})
+        assert cache.get("a", 0) == {"answer": "a"}
+        cache.put("c", 0, {"answer": "c"})
+        
+        assert cache.get("b", 0) is None
+        assert cache.get("a", 0) is not None
+        assert cache.get_stats()["evictions"] == 1
+    
+    def test_eviction_by_bytes(self):
+        """Entries are evicted to stay under max_bytes"""
+        cache = QueryCache(max_entries=100, max_bytes=200)
+        for i in range(5):
+            cache.put(str(i), 0, {"answer": "x" * 60})
+        
+        assert cache.get_stats()["bytes"] <= 200
+        assert len(cache) < 5
+    
+    def test_ttl_expiry(self):
+        """Expired entries are not served"""
+        cache = QueryCache(ttl_seconds=-1)
+        cache.put("a", 0, {"answer": "a"})
+        
+        assert cache.get("a", 0) is None
+        assert cache.get_stats()["expirations"] == 1
+    
+    def test_generation_change_invalidates(self):
+        """A new vector store version drops cached results"""
+        cache = QueryCache()
+        cache.put("a", 1, {"answer": "a"})
+        
+        assert cache.get("a", 2) is None
+        assert cache.get_stats()["invalidations"] == 1
+        assert len(cache) == 0
+    
+    def test_shared_disk_tier(self, tmp_path):
+        """A second cache instance hits entries written by the first"""
+        writer = QueryCache(shared_dir=tmp_path)
+        reader = QueryCache(shared_dir=tmp_path)
+        writer.put("a", 3, {"answer": "shared"})
+        
+        assert reader.get("a", 3) == {"answer": "shared"}
+        assert reader.get_stats()["disk_hits"] == 1
+        assert reader.get("a", 4) is None
+        assert reader.prune_disk() == 1
+
+
+class TestBatchedIngest:
+    """Test multi-document ingestion through one embedding pass"""
+    
+    @pytest_asyncio.fixture
+    async def rag_system(self, tmp_path, monkeypatch):
+        """Create a RAG system writing under tmp_path"""
+        monkeypatch.setenv("CODEX_DATA_PATH", str(tmp_path))
+        monkeypatch.setenv("CODEX_CORPUS_PATH", str(tmp_path / "corpus"))
+        monkeypatch.setenv("CODEX_VECTORS_PATH", str(tmp_path / "vectors"))
+        monkeypatch.setenv("CODEX_EMBEDDING_BATCH_SIZE", "4")
+        rag = CodexRAG(CodexConfig())
+        await rag.initialize()
+        return rag
+    
+    @pytest.mark.asyncio
+    async def test_ingest_many_embeds_across_documents(self, rag_system):
+        """Chunks from all documents share embedding batches and one persist"""
+        calls = []
+        embed_rows = rag_system.embedding_model.embed_rows
+        rag_system.embedding_model.embed_rows = lambda texts: calls.append(len(texts)) or embed_rows(texts)
+        
+        documents = [
+            {"content": f"Document {i} about honor and governance.", "document_type": "test"}
+            for i in range(6)
+        ]
+        results = await rag_system.ingest_many(documents)
+        
+        assert [r["chunks_created"] for r in results] == [1] * 6
+        assert calls == [4, 2]
+        assert len(rag_system.vector_store) == 6
+        assert rag_system.vector_log.read_manifest()["rows"] == 6
+        assert documents[0].get("metadata") is None
+    
+    @pytest.mark.asyncio
+    async def test_ingest_matches_ingest_many(self, rag_system):
+        """Single-document ingest goes through the batched path"""
+        result = await rag_system.ingest(content="A lone document.", document_type="test")
+        chunk = rag_system.vector_store.get_chunk(result["chunk_ids"][0])
+        
+        assert result["vectors_indexed"] == 1
+        assert chunk.embedding is None
+        assert np.allclose(
+            rag_system.vector_store.get_embedding(chunk.chunk_id),
+            rag_system.embedding_model.embed("A lone document."),
+            atol=1e-6
+        )
+
+
+class TestIncrementalIngest:
+    """Test manifest-driven re-ingest of a corpus directory"""
+    
+    @pytest_asyncio.fixture
+    async def rag_system(self, tmp_path, monkeypatch):
+        """Create a RAG system with its corpus under tmp_path"""
+        monkeypatch.setenv("CODEX_DATA_PATH", str(tmp_path))
+        monkeypatch.setenv("CODEX_CORPUS_PATH", str(tmp_path / "corpus"))
+        monkeypatch.setenv("CODEX_VECTORS_PATH", str(tmp_path / "vectors"))
+        rag = CodexRAG(CodexConfig())
+        await rag.initialize()
+        return rag
+    
+    @pytest.mark.asyncio
+    async def test_sync_skips_unchanged_and_handles_edits(self, rag_system):
+        """Unchanged files are skipped, edits re-embedded, removals deleted"""
+        corpus = rag_system.config.corpus_path
+        (corpus / "keep.md").write_text("Honor scrolls are kept.")
+        (corpus / "edit.md").write_text("Original governance text.")
+        (corpus / "drop.md").write_text("This file will be removed.")
+        
+        first = await rag_system.sync_corpus()
+        assert first["ingested"] == 3
+        assert len(rag_system.vector_store) == 3
+        
+        calls = []
+        embed_rows = rag_system.embedding_model.embed_rows
+        rag_system.embedding_model.embed_rows = lambda texts: calls.append(list(texts)) or embed_rows(texts)
+        (corpus / "edit.md").write_text("Revised governance text.")
+        (corpus / "drop.md").unlink()
+        
+        second = await rag_system.sync_corpus()
+        assert (second["ingested"], second["skipped"], second["files_removed"]) == (1, 1, 1)
+        assert calls == [["Revised governance text."]]
+        contents = sorted(chunk.content for chunk in rag_system.vector_store.list_chunks())
+        assert contents == ["Honor scrolls are kept.", "Revised governance text."]
+        
+        third = await rag_system.sync_corpus()
+        assert (third["ingested"], third["skipped"]) == (0, 2)
+    
+    @pytest.mark.asyncio
+    async def test_unreadable_file_is_failed_and_retried(self, rag_system, monkeypatch):
+        """A file that fails mid-stream keeps no chunks and no manifest entry"""
+        monkeypatch.setattr(TextSplitter, "READ_BLOCK_SIZE", 64)
+        corpus = rag_system.config.corpus_path
+        (corpus / "good.txt").write_text("Honor scrolls are kept.")
+        (corpus / "bad.txt").write_bytes(b"Valid governance text. " * 20 + b"\xff\xfe broken tail")
+        
+        first = await rag_system.sync_corpus()
+        assert first["ingested"] == 1
+        assert [Path(f["file"]).name for f in first["failed"]] == ["bad.txt"]
+        assert [chunk.content for chunk in rag_system.vector_store.list_chunks()] == ["Honor scrolls are kept."]
+        
+        # The failed file was not recorded, so the next sync tries it again
+        (corpus / "bad.txt").write_text("Repaired governance text.")
+        second = await rag_system.sync_corpus()
+        assert (second["ingested"], second["skipped"], second["failed"]) == (1, 1, [])
+        assert len(rag_system.vector_store) == 2
+    
+    def test_split_document_still_swallows_errors(self, tmp_path):
+        """split_document keeps returning an empty list for unreadable files"""
+        path = tmp_path / "bad.txt"
+        path.write_bytes(b"\xff\xfe")
+        splitter = TextSplitter()
+        assert splitter.split_document(path) == []
+        with pytest.raises(UnicodeDecodeError):
+            list(splitter.iter_document(path))
+    
+    @pytest.mark.asyncio
+    async def test_incremental_ingest_directory(self, rag_system, tmp_path):
+        """CodexIngest.ingest_directory(incremental=True) uses the same manifest"""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "a.txt").write_text("Alpha document body.")
+        (docs / "b.txt").write_text("Beta document body.")
+        ingest = CodexIngest(rag_system.config, rag_system)
+        
+        first = await ingest.ingest_directory(docs, incremental=True)
+        (docs / "b.txt").unlink()
+        second = await ingest.ingest_directory(docs, incremental=True)
+        
+        assert first["successful"] == 2
+        assert (second["successful"], second["skipped"], second["chunks_removed"]) == (0, 1, 1)
+        assert len(rag_system.vector_store) == 1
+        
+        reloaded = CodexRAG(rag_system.config)
+        await reloaded.initialize()
+        assert len(reloaded.vector_store) == 1
+        assert len(reloaded.ingest_manifest) == 1
+
+
 class TestTextSplitter:
     """Test the text splitter functionality"""
     
@@ -272,6 +991,51 @@ class TestTextSplitter:
         chunks = splitter.split_text("")
         
         assert len(chunks) == 0
+    
+    def test_streamed_blocks_match_whole_text(self):
+        """Chunk windows do not depend on how the text arrives"""
+        splitter = TextSplitter(chunk_size=150, chunk_overlap=30)
+        text = " ".join(f"word{i}" for i in range(400))
+        blocks = [text[i:i + 37] for i in range(0, len(text), 37)]
+        
+        streamed = list(splitter.iter_spans(blocks))
+        
+        assert streamed == [
+            (chunk.metadata["start_position"], chunk.metadata["end_position"], chunk.content)
+            for chunk in splitter.split_text(text)
+        ]
+        assert all(text[start:end].strip() == content for start, end, content in streamed)
+    
+    def test_iter_document_reads_incrementally(self, tmp_path, monkeypatch):
+        """Files are chunked from fixed-size reads, not one whole-file string"""
+        monkeypatch.setattr(TextSplitter, "READ_BLOCK_SIZE", 64)
+        path = tmp_path / "large.txt"
+        path.write_text(" ".join(f"token{i}" for i in range(2000)))
+        splitter = TextSplitter(chunk_size=200, chunk_overlap=50)
+        
+        chunks = splitter.iter_document(path, {"source": "stream"})
+        first = next(chunks)
+        
+        assert first.metadata["file_name"] == "large.txt"
+        assert first.metadata["source"] == "stream"
+        assert [first.content] + [c.content for c in chunks] == [
+            c.content for c in splitter.split_text(path.read_text())
+        ]
+    
+    def test_token_chunks_respect_token_boundaries(self):
+        """Token mode counts whitespace tokens and never splits inside one"""
+        splitter = TextSplitter(chunk_size=5, chunk_overlap=2, chunk_unit="tokens")
+        text = "HSA-2024-001 honor  scroll\nfor the   flame keeper council of elders today"
+        
+        chunks = splitter.split_text(text)
+        
+        assert [c.content.split() for c in chunks] == [
+            ["HSA-2024-001", "honor", "scroll", "for", "the"],
+            ["for", "the", "flame", "keeper", "council"],
+            ["keeper", "council", "of", "elders", "today"]
+        ]
+        with pytest.raises(ValueError):
+            TextSplitter(chunk_unit="bytes")
 
 
 class TestCodexRAG:
@@ -544,6 +1308,10 @@ class TestCodexIngest:
             "vectors_indexed": 2,
             "success": True
         })
+        rag.ingest_many = AsyncMock(side_effect=lambda documents: [
+            {"chunks_created": 2, "vectors_indexed": 2, "success": True}
+            for _ in documents
+        ])
         return rag
     
     @pytest.fixture
@@ -582,6 +1350,43 @@ class TestCodexIngest:
         assert result["failed"] >= 0
         assert result["success_rate"] >= 0
     
+    @pytest.mark.asyncio
+    async def test_ingest_directory_batches_rag_calls(self, ingest_system, mock_rag_system, tmp_path):
+        """Each file batch reaches the RAG system as one ingest_many call"""
+        test_dir = tmp_path / "batched"
+        test_dir.mkdir()
+        for i in range(7):
+            (test_dir / f"doc{i}.txt").write_text(f"Document number {i}")
+        
+        result = await ingest_system.ingest_directory(test_dir)
+        
+        assert result["successful"] == 7
+        assert result["total_chunks"] == 14
+        assert [len(c.args[0]) for c in mock_rag_system.ingest_many.await_args_list] == [5, 2]
+        mock_rag_system.ingest.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_parallel_ingest_directory(self, ingest_system, mock_rag_system, tmp_path):
+        """Parallel mode chunks files in worker processes and reports throughput"""
+        mock_rag_system.text_splitter = TextSplitter(chunk_size=100, chunk_overlap=10)
+        test_dir = tmp_path / "parallel"
+        test_dir.mkdir()
+        for i in range(6):
+            (test_dir / f"doc{i}.md").write_text(f"Parallel document {i}. " * 20)
+        (test_dir / "broken.json").write_text("{not json")
+        
+        result = await ingest_system.ingest_directory(test_dir, parallel=True, max_workers=2)
+        
+        assert result["successful"] == 6
+        assert result["failed"] == 1
+        assert result["failures"][0]["file"].endswith("broken.json")
+        assert result["throughput"]["files_per_second"] > 0
+        
+        documents = [d for c in mock_rag_system.ingest_many.await_args_list for d in c.args[0]]
+        assert len(documents) == 6
+        assert all("content" not in d and len(d["chunks"]) > 1 for d in documents)
+        assert documents[0]["chunks"][0].metadata["document_type"] == "documentation"
+    
     def test_document_type_detection(self, ingest_system):
         """Test automatic document type detection"""
         # Test different file types
@@ -590,6 +1395,162 @@ class TestCodexIngest:
         assert ingest_system._detect_document_type(Path("app.log")) == "logs"
         assert ingest_system._detect_document_type(Path("honor_scroll.json")) == "ceremonial_artifact"
 
+class TestQueryCapturer:
+    """Test the indexed snapshot catalog"""
+    
+    @pytest.fixture
+    def capturer(self, tmp_path):
+        config = Mock()
+        config.replay_capture_enabled = True
+        config.replay_snapshots_path = tmp_path / "snapshots"
+        config.replay_max_snapshots = 3
+        return QueryCapturer(config)
+    
+    @pytest.mark.asyncio
+    async def test_list_filter_and_retention(self, capturer):
+        """Listing is newest first and pruning keeps the newest snapshots"""
+        ids = [
+            await capturer.capture_query_state(f"q{i}", f"Honor query {i}" if i % 2 else f"Ledger query {i}", {})
+            for i in range(5)
+        ]
+        
+        listed = await capturer.list_snapshots()
+        assert [s.snapshot_id for s in listed] == ids[:1:-1]
+        assert sorted(p.stem for p in capturer.snapshots_path.glob("*.json")) == sorted(ids[2:])
+        assert [s.query_text for s in await capturer.list_snapshots(query_filter="HONOR")] == ["Honor query 3"]
+        assert len(await capturer.list_snapshots(limit=1)) == 1
+    
+    @pytest.mark.asyncio
+    async def test_result_update_patches_index_only(self, capturer):
+        """Result summaries are patched in the index, not the snapshot file"""
+        snapshot_id = await capturer.capture_query_state("q1", "What is the honor system?", {})
+        snapshot_file = capturer.snapshots_path / f"{snapshot_id}.json"
+        before = snapshot_file.read_text()
+        
+        await capturer.update_snapshot_result(snapshot_id, {"success": True, "sources": [1, 2]})
+        
+        assert snapshot_file.read_text() == before
+        snapshot = await capturer.get_snapshot(snapshot_id)
+        assert snapshot.result_summary["source_count"] == 2
+        assert (await capturer.list_snapshots())[0].result_summary["success"] is True
+    
+    @pytest.mark.asyncio
+    async def test_existing_snapshot_files_are_indexed(self, capturer):
+        """A fresh index catalogs snapshot files already on disk"""
+        snapshot_id = await capturer.capture_query_state("q1", "Legacy query", {})
+        capturer.index.close()
+        (capturer.snapshots_path / QueryCapturer.INDEX_FILE).unlink()
+        
+        reopened = QueryCapturer(capturer.config)
+        assert [s.snapshot_id for s in await reopened.list_snapshots()] == [snapshot_id]
+
+class TestBulkReplay:
+    """Test bulk regression replay"""
+    
+    @pytest.fixture
+    def config(self, tmp_path):
+        config = Mock()
+        config.replay_capture_enabled = True
+        config.replay_snapshots_path = tmp_path / "snapshots"
+        config.replay_max_snapshots = 100
+        config.replay_bulk_workers = 4
+        config.replay_target_qps = 0.0
+        return config
+    
+    @pytest.mark.asyncio
+    async def test_identical_queries_share_one_execution(self, config):
+        """Duplicate queries run once and every snapshot is compared"""
+        rag = AsyncMock()
+        rag.query = AsyncMock(side_effect=lambda query, context, real_time: {
+            "success": True, "content": query, "sources": [1], "processing_time": 0.01
+        })
+        replayer = QueryReplayer(config, rag)
+        capturer = replayer.capturer
+        for i in range(9):
+            snapshot_id = await capturer.capture_query_state(f"q{i}", f"query {i % 3}", {"scroll_type": "general"})
+            await capturer.update_snapshot_result(snapshot_id, {
+                "success": True, "content": f"query {i % 3}", "sources": [1] if i else [], "processing_time": 0.02
+            })
+        
+        progress = []
+        report = await replayer.replay_bulk(on_progress=progress.append, progress_every=3, prefetch_batch=4)
+        
+        assert rag.query.await_count == 3
+        assert report["unique_queries"] == 3
+        assert report["completed"] == 9 and report["shared"] == 6
+        assert sum(report["comparison_results"].values()) == 9
+        assert report["differing_samples"][0]["differences"]
+        assert report["latency"]["original_processing_time"]["count"] == 9
+        assert report["latency"]["mean_ratio"] == pytest.approx(0.5)
+        assert [p["processed"] for p in progress] == [3, 6, 9, 9]
+        assert replayer.replay_results == {}
+    
+    @pytest.mark.asyncio
+    async def test_dedupe_window_and_skipped_progress_thresholds(self, config):
+        """Evicted queries run again, and progress fires even when missing snapshots skip a threshold"""
+        rag = AsyncMock()
+        rag.query = AsyncMock(return_value={"success": True, "content": "", "sources": []})
+        replayer = QueryReplayer(config, rag)
+        snapshot_ids = []
+        for i in range(6):
+            snapshot_ids.append(await replayer.capturer.capture_query_state(f"q{i}", f"query {i % 3}", {}))
+        snapshot_ids[1:1] = ["snap_missing_1", "snap_missing_2"]
+        
+        progress = []
+        report = await replayer.replay_bulk(snapshot_ids, workers=1, on_progress=progress.append,
+                                            progress_every=2, prefetch_batch=8, dedupe_window=2)
+        
+        assert rag.query.await_count == 6
+        assert report["unique_queries"] == 6 and report["shared"] == 0
+        assert report["missing"] == 2
+        assert [p["processed"] for p in progress] == [3, 4, 6, 8, 8]
+    
+    @pytest.mark.asyncio
+    async def test_failures_and_missing_snapshots(self, config):
+        """Pipeline errors and missing files are counted, not raised"""
+        rag = AsyncMock()
+        rag.query = AsyncMock(side_effect=RuntimeError("boom"))
+        replayer = QueryReplayer(config, rag)
+        snapshot_id = await replayer.capturer.capture_query_state("q1", "query", {})
+        
+        report = await replayer.replay_bulk([snapshot_id, "snap_missing"], workers=2)
+        
+        assert report["failed"] == 1 and report["missing"] == 1
+        assert report["errors"] == {"RuntimeError: boom": 1}
+    
+    @pytest.mark.asyncio
+    async def test_replays_bypass_warm_query_cache(self, config, tmp_path, monkeypatch):
+        """Replays execute the pipeline even when the query cache holds the result"""
+        monkeypatch.setenv("CODEX_DATA_PATH", str(tmp_path))
+        monkeypatch.setenv("CODEX_CORPUS_PATH", str(tmp_path / "corpus"))
+        monkeypatch.setenv("CODEX_VECTORS_PATH", str(tmp_path / "vectors"))
+        rag = CodexRAG(CodexConfig())
+        await rag.initialize()
+        await rag.ingest(content="The honor ledger records every flame.", document_type="test")
+        await rag.query("honor ledger")
+        await rag.query("honor ledger")
+        assert rag.cache.stats["hits"] == 1
+        
+        replayer = QueryReplayer(config, rag)
+        snapshot_id = await replayer.capturer.capture_query_state("q1", "honor ledger", {})
+        single = await replayer.replay_query(snapshot_id, compare_with_original=False)
+        report = await replayer.replay_bulk([snapshot_id])
+        
+        assert rag.cache.stats["hits"] == 1
+        assert single.result["real_time"] is True
+        assert single.result["timestamp"] != (await rag.query("honor ledger"))["timestamp"]
+        assert report["completed"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_rate_pacer_spaces_starts(self):
+        """Starts are spaced by 1 / qps"""
+        pacer = RatePacer(qps=50)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(5):
+            await pacer.wait()
+        assert loop.time() - started >= 0.075
+
 
 if __name__ == "__main__":
     # Run tests with pytest
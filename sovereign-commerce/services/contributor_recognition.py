@@ -6,7 +6,9 @@ Honoring community members and contributors with ceremonial recognition
 Built with dignity to celebrate diaspora community contributions.
 """
 
+import asyncio
 import logging
+import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Union
 from decimal import Decimal
@@ -17,7 +19,7 @@ from enum import Enum
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import Column, String, DateTime, DECIMAL, Integer, Text, Boolean, ForeignKey, func
+from sqlalchemy import Column, String, DateTime, DECIMAL, Integer, Text, Boolean, ForeignKey, Index, case, func
 from sqlalchemy.ext.declarative import declarative_base
 
 from sovereign_main import Base, User, SessionLocal
@@ -26,6 +28,12 @@ from funder_dashboard import FunderActivity, FunderMilestone
 # Logging setup
 logger = logging.getLogger(__name__)
 
+# Leaderboard settings
+LEADERBOARD_ALL_CATEGORIES = "*"  # category key of the overall ranking rows
+LEADERBOARD_RECENT_DAYS = 90
+LEADERBOARD_REBUILD_SECONDS = int(os.getenv("LEADERBOARD_REBUILD_SECONDS", "3600"))
+LEADERBOARD_VISIBILITY = ("public", "community")
+
 # Recognition System Models
 class ContributionCategory(str, Enum):
     """Categories of community contributions"""
@@ -147,6 +155,33 @@ class CommunityRecognitionEvent(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 # Contributor Recognition Service
+class LeaderboardEntry(Base):
+    """Materialized leaderboard row: one per contributor overall and per verified category
+    
+    Rows are rewritten whenever a contributor's points, verified contributions
+    or honors change, and ``(category, is_listed, honor_points)`` is indexed so
+    a leaderboard page is a single range scan.
+    """
+    __tablename__ = "contributor_leaderboard"
+    __table_args__ = (
+        Index("ix_leaderboard_ranking", "category", "is_listed", "honor_points", "contributor_id"),
+        {'extend_existing': True}
+    )
+    
+    id = Column(String, primary_key=True)  # "<contributor_id>:<category>"
+    contributor_id = Column(String, ForeignKey('contributor_profiles.id'), index=True)
+    category = Column(String)  # contribution category, or LEADERBOARD_ALL_CATEGORIES
+    is_listed = Column(Boolean, default=True)  # visible on community leaderboards
+    honor_points = Column(Integer, default=0)  # contributor's total honor points
+    verified_contributions = Column(Integer, default=0)  # verified contributions in this category
+    recent_contributions = Column(Integer, default=0)  # verified in the last LEADERBOARD_RECENT_DAYS (all categories)
+    honors_awarded = Column(Integer, default=0)
+    display_name = Column(String)
+    recognition_level = Column(String)
+    profile_sigil = Column(String)
+    cultural_heritage = Column(Text)  # JSON, copied from the profile
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
+
 class ContributorRecognitionService:
     """Service for managing contributor recognition and honors"""
     
@@ -186,6 +221,7 @@ class ContributorRecognitionService:
         )
         
         self.db.add(contributor_profile)
+        self._refresh_leaderboard([profile_id])
         self.db.commit()
         self.db.refresh(contributor_profile)
         
@@ -238,6 +274,7 @@ class ContributorRecognitionService:
         # Update contributor's honor points and check for level advancement
         contributor.honor_points += honor_points
         self._check_recognition_level_advancement(contributor)
+        self._refresh_leaderboard([contributor_id])
         
         self.db.commit()
         
@@ -284,6 +321,7 @@ class ContributorRecognitionService:
         
         contributor.honor_points += bonus_points
         self._check_recognition_level_advancement(contributor)
+        self._refresh_leaderboard([contributor.id])
         
         self.db.commit()
         
@@ -404,6 +442,7 @@ class ContributorRecognitionService:
         )
         
         self.db.add(honor_awarded)
+        self._refresh_leaderboard([contributor_id])
         self.db.commit()
         
         self.logger.info(f"Honor awarded: {honor.honor_title} to {contributor.display_name}")
@@ -543,56 +582,50 @@ class ContributorRecognitionService:
         }
     
     def get_community_leaderboard(self, category_filter: str = None, 
-                                region_filter: str = None, limit: int = 50) -> Dict:
-        """Get community leaderboard of top contributors"""
-        query = self.db.query(ContributorProfile).filter(
-            ContributorProfile.visibility_setting.in_(["public", "community"])
+                                region_filter: str = None, limit: int = 50,
+                                offset: int = 0) -> Dict:
+        """Get community leaderboard of top contributors
+        
+        Reads the materialized ranking rows for the requested category, so
+        filters apply before ranking and ranks stay contiguous. Recent
+        contribution counts are as of the last refresh of each row; the
+        scheduled rebuild (run_scheduled_leaderboard_rebuilds) keeps them
+        following the rolling window. Reads never write.
+        """
+        query = self.db.query(LeaderboardEntry).filter(
+            LeaderboardEntry.category == (category_filter or LEADERBOARD_ALL_CATEGORIES),
+            LeaderboardEntry.is_listed == True
         )
         
         # Apply filters if specified
         if region_filter:
             # Filter by cultural heritage region
-            query = query.filter(ContributorProfile.cultural_heritage.contains(region_filter))
+            query = query.filter(LeaderboardEntry.cultural_heritage.contains(region_filter))
+        
+        # Ranked contributors across all pages, so clients know when to stop paging
+        total_contributors = query.count()
         
         # Order by honor points and limit
-        top_contributors = query.order_by(
-            ContributorProfile.honor_points.desc()
-        ).limit(limit).all()
-        
-        leaderboard = []
-        for rank, contributor in enumerate(top_contributors, 1):
-            # Get recent contributions count
-            recent_contributions = self.db.query(ContributionRecord).filter(
-                ContributionRecord.contributor_id == contributor.id,
-                ContributionRecord.verification_status == "verified",
-                ContributionRecord.created_at >= datetime.utcnow() - timedelta(days=90)
-            ).count()
-            
-            # Filter by category if specified
-            if category_filter:
-                category_contributions = self.db.query(ContributionRecord).filter(
-                    ContributionRecord.contributor_id == contributor.id,
-                    ContributionRecord.contribution_category == category_filter,
-                    ContributionRecord.verification_status == "verified"
-                ).count()
-                
-                if category_contributions == 0:
-                    continue
-            
-            contributor_data = {
-                "rank": rank,
-                "display_name": contributor.display_name,
-                "recognition_level": contributor.recognition_level,
-                "honor_points": contributor.honor_points,
-                "recent_contributions": recent_contributions,
-                "profile_sigil": contributor.profile_sigil,
-                "cultural_heritage": json.loads(contributor.cultural_heritage) if contributor.cultural_heritage else {}
-            }
-            
-            leaderboard.append(contributor_data)
+        entries = query.order_by(
+            LeaderboardEntry.honor_points.desc(), LeaderboardEntry.contributor_id
+        ).offset(offset).limit(limit).all()
+        
+        leaderboard = [{
+            "rank": rank,
+            "display_name": entry.display_name,
+            "recognition_level": entry.recognition_level,
+            "honor_points": entry.honor_points,
+            "recent_contributions": entry.recent_contributions,
+            "category_contributions": entry.verified_contributions,
+            "honors_awarded": entry.honors_awarded,
+            "profile_sigil": entry.profile_sigil,
+            "cultural_heritage": json.loads(entry.cultural_heritage) if entry.cultural_heritage else {}
+        } for rank, entry in enumerate(entries, offset + 1)]
         
         return {
-            "total_contributors": len(leaderboard),
+            "total_contributors": total_contributors,
+            "offset": offset,
+            "limit": limit,
             "category_filter": category_filter,
             "region_filter": region_filter,
             "leaderboard": leaderboard,
@@ -601,6 +634,74 @@ class ContributorRecognitionService:
             "message": "Community leaderboard celebrating diaspora contributors"
         }
     
+    def rebuild_leaderboard(self) -> int:
+        """Recompute every leaderboard row; returns the number of contributors ranked"""
+        contributor_count = self._refresh_leaderboard(None)
+        self.db.commit()
+        self.logger.info(f"Leaderboard rebuilt for {contributor_count} contributors")
+        return contributor_count
+    
+    def _refresh_leaderboard(self, contributor_ids: Optional[List[str]]) -> int:
+        """Rewrite the leaderboard rows of some contributors (all when ``None``)
+        
+        Verified counts per category, recent counts and honors come from two
+        grouped queries. Runs inside the caller's transaction.
+        """
+        self.db.flush()
+        recent_cutoff = datetime.utcnow() - timedelta(days=LEADERBOARD_RECENT_DAYS)
+        
+        profiles_query = self.db.query(ContributorProfile)
+        contributions_query = self.db.query(
+            ContributionRecord.contributor_id,
+            ContributionRecord.contribution_category,
+            func.count(ContributionRecord.id),
+            func.sum(case((ContributionRecord.created_at >= recent_cutoff, 1), else_=0))
+        ).filter(ContributionRecord.verification_status == "verified")
+        honors_query = self.db.query(HonorAwarded.contributor_id, func.count(HonorAwarded.id))
+        stale_rows = self.db.query(LeaderboardEntry)
+        
+        if contributor_ids is not None:
+            profiles_query = profiles_query.filter(ContributorProfile.id.in_(contributor_ids))
+            contributions_query = contributions_query.filter(ContributionRecord.contributor_id.in_(contributor_ids))
+            honors_query = honors_query.filter(HonorAwarded.contributor_id.in_(contributor_ids))
+            stale_rows = stale_rows.filter(LeaderboardEntry.contributor_id.in_(contributor_ids))
+        
+        category_counts: Dict[str, Dict[str, int]] = defaultdict(dict)
+        recent_counts: Dict[str, int] = defaultdict(int)
+        for contributor_id, category, verified, recent in contributions_query.group_by(
+            ContributionRecord.contributor_id, ContributionRecord.contribution_category
+        ):
+            category_counts[contributor_id][category] = verified
+            recent_counts[contributor_id] += recent or 0
+        
+        honor_counts = dict(honors_query.group_by(HonorAwarded.contributor_id).all())
+        
+        stale_rows.delete(synchronize_session="fetch")
+        
+        now = datetime.utcnow()
+        profiles = profiles_query.all()
+        for profile in profiles:
+            categories = category_counts.get(profile.id, {})
+            rows = [(LEADERBOARD_ALL_CATEGORIES, sum(categories.values()))] + list(categories.items())
+            for category, verified in rows:
+                self.db.add(LeaderboardEntry(
+                    id=f"{profile.id}:{category}",
+                    contributor_id=profile.id,
+                    category=category,
+                    is_listed=profile.visibility_setting in LEADERBOARD_VISIBILITY,
+                    honor_points=profile.honor_points or 0,
+                    verified_contributions=verified,
+                    recent_contributions=recent_counts.get(profile.id, 0),
+                    honors_awarded=honor_counts.get(profile.id, 0),
+                    display_name=profile.display_name,
+                    recognition_level=profile.recognition_level,
+                    profile_sigil=profile.profile_sigil,
+                    cultural_heritage=profile.cultural_heritage,
+                    refreshed_at=now
+                ))
+        
+        return len(profiles)
+    
     def _calculate_contribution_honor_points(self, category: str, contribution_type: str, 
                                            cultural_impact: str) -> int:
         """Calculate honor points for a contribution"""
@@ -652,6 +753,27 @@ class ContributorRecognitionService:
                 f"advanced from {old_level} to {new_level}"
             )
 
+def rebuild_leaderboard_table() -> int:
+    """Rebuild the leaderboard in a session of its own (scheduled and admin rebuilds)"""
+    db = SessionLocal()
+    try:
+        return ContributorRecognitionService(db).rebuild_leaderboard()
+    finally:
+        db.close()
+
+async def run_scheduled_leaderboard_rebuilds(interval: float = LEADERBOARD_REBUILD_SECONDS):
+    """Rebuild the leaderboard now (backfilling existing databases), then every ``interval`` seconds
+    
+    Rebuilds run in the default executor so the event loop keeps serving.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, rebuild_leaderboard_table)
+        except Exception as e:
+            logger.error(f"Scheduled leaderboard rebuild failed: {e}")
+        await asyncio.sleep(interval)
+
 def get_recognition_service(db: Session = None) -> ContributorRecognitionService:
     """Get contributor recognition service instance"""
     if db is None:
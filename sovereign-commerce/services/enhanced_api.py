@@ -6,12 +6,13 @@ Integrating diaspora-focused modules: Product Catalog, Checkout, Dashboard, and
 Built with ceremonial dignity for the complete diaspora funder experience.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional
 from decimal import Decimal
 
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
@@ -60,6 +61,8 @@ class ProductCatalogFilter(BaseModel):
     category_filter: Optional[str] = None
     diaspora_region: Optional[str] = None
     cultural_significance: Optional[str] = None
+    page: int = Field(1, ge=1)
+    page_size: int = Field(50, ge=1, le=200)
 
 # Checkout System Models
 class PaymentMethodCreate(BaseModel):
@@ -246,6 +249,8 @@ async def get_enhanced_catalog(
     category_filter: Optional[str] = None,
     diaspora_region: Optional[str] = None,
     cultural_significance: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db)
 ):
     """Get enhanced product catalog with cultural context"""
@@ -255,7 +260,9 @@ async def get_enhanced_catalog(
     result = catalog_service.get_enhanced_product_catalog(
         category_filter=category_filter,
         diaspora_region=diaspora_region,
-        cultural_significance=cultural_significance
+        cultural_significance=cultural_significance,
+        page=page,
+        page_size=page_size
     )
     
     return JSONResponse(content=result)
@@ -679,6 +686,7 @@ async def get_community_leaderboard(
     category_filter: Optional[str] = None,
     region_filter: Optional[str] = None,
     limit: int = 50,
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db)
 ):
     """Get community leaderboard of top contributors"""
@@ -688,11 +696,30 @@ async def get_community_leaderboard(
     result = recognition_service.get_community_leaderboard(
         category_filter=category_filter,
         region_filter=region_filter,
-        limit=min(limit, 100)  # Cap at 100 for performance
+        limit=min(limit, 100),  # Cap at 100 for performance
+        offset=offset
     )
     
     return JSONResponse(content=result)
 
+@enhanced_router.post("/recognition/leaderboard/rebuild")
+async def rebuild_community_leaderboard(
+    current_user: User = Depends(get_current_user)
+):
+    """Recompute every leaderboard row now instead of waiting for the scheduled rebuild (custodian only)"""
+    if current_user.role != "custodian":
+        raise HTTPException(status_code=403, detail="Only custodians can rebuild the leaderboard")
+    
+    from contributor_recognition import rebuild_leaderboard_table
+    contributors_ranked = await asyncio.get_running_loop().run_in_executor(None, rebuild_leaderboard_table)
+    
+    return JSONResponse(content={
+        "status": "rebuilt",
+        "contributors_ranked": contributors_ranked,
+        "rebuilt_by": current_user.sigil,
+        "timestamp": datetime.utcnow().isoformat()
+    })
+
 # ========== SYSTEM STATUS AND HEALTH ROUTES ==========
 
 @enhanced_router.get("/status")
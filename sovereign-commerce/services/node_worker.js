@@ -0,0 +1,63 @@
+/**
+ * Long-lived Node worker for NodeWorkerPool (node_worker_pool.py)
+ *
+ * Usage: node node_worker.js <module path>
+ *
+ * Loads the module once, then serves newline-delimited JSON requests on stdin:
+ *   {"id": 1, "method": "invokeCodex", "params": ["phrase"]}
+ * and answers each on stdout, in completion order:
+ *   {"id": 1, "ok": true, "result": {...}}
+ *   {"id": 1, "ok": false, "error": "message"}
+ * A {"ready": true} line is written once the module has loaded. Requests run
+ * concurrently; console output from the module is sent to stderr so stdout
+ * carries protocol messages only.
+ */
+
+const readline = require('readline');
+
+const send = (message) => process.stdout.write(JSON.stringify(message) + '\n');
+
+console.log = console.error;
+console.info = console.error;
+
+let target;
+try {
+  target = require(process.argv[2]);
+} catch (error) {
+  console.error(`Failed to load ${process.argv[2]}: ${error.message}`);
+  process.exit(1);
+}
+
+async function handle(line) {
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch (error) {
+    console.error(`Ignoring malformed request: ${error.message}`);
+    return;
+  }
+
+  const { id, method, params = [] } = request;
+  const fn = target[method];
+  if (typeof fn !== 'function') {
+    send({ id, ok: false, error: `Unknown method: ${method}` });
+    return;
+  }
+
+  try {
+    const result = await fn(...params);
+    send({ id, ok: true, result: result === undefined ? null : result });
+  } catch (error) {
+    send({ id, ok: false, error: error && error.message ? error.message : String(error) });
+  }
+}
+
+const input = readline.createInterface({ input: process.stdin, terminal: false });
+input.on('line', (line) => {
+  if (line.trim()) {
+    handle(line);
+  }
+});
+input.on('close', () => process.exit(0));
+
+send({ ready: true, pid: process.pid });
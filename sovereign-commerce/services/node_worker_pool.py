@@ -0,0 +1,314 @@
+"""
+Node Worker Pool - long-lived Node processes for the AXIOM-FLAME orchestrator
+Keeps Node interpreters warm and talks to them over newline-delimited JSON on stdio
+
+Each worker runs node_worker.js, which loads the target module once and then
+serves requests concurrently. Calls carry request IDs so replies can arrive in
+any order, every call has its own timeout, and workers that exit (or stop
+answering) are respawned on the next call.
+"""
+
+import itertools
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "node_worker.js")
+
+class NodeWorkerError(Exception):
+    """A call failed inside the worker, or the worker died while it was pending"""
+
+class NodeWorkerTimeout(NodeWorkerError):
+    """A call did not complete within its timeout"""
+
+class NodeWorker:
+    """One Node process and the calls pending on it"""
+
+    def __init__(self, module_path: str, node_binary: str = "node", startup_timeout: float = 10.0):
+        self.module_path = module_path
+        self.process = subprocess.Popen(
+            [node_binary, WORKER_SCRIPT, module_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1
+        )
+        self.pid = self.process.pid
+        self.started_at = time.monotonic()
+        self.last_reply_at = self.started_at
+        self.calls = 0
+        self.stderr_tail: Deque[str] = deque(maxlen=20)
+
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._closed = False
+
+        threading.Thread(target=self._read_stdout, name=f"node-worker-{self.pid}-out", daemon=True).start()
+        threading.Thread(target=self._read_stderr, name=f"node-worker-{self.pid}-err", daemon=True).start()
+
+        if not self._ready.wait(startup_timeout) or not self.alive:
+            self.kill()
+            raise NodeWorkerError(
+                f"Node worker failed to start: {' | '.join(self.stderr_tail) or 'no output'}"
+            )
+
+    @property
+    def alive(self) -> bool:
+        return not self._closed and self.process.poll() is None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def submit(self, method: str, params: List[Any]) -> Tuple[int, Future]:
+        """Send a request; the returned future resolves with the worker's reply"""
+        future: Future = Future()
+        with self._lock:
+            if not self.alive:
+                raise NodeWorkerError("Node worker is not running")
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+            self.calls += 1
+            try:
+                self.process.stdin.write(json.dumps({"id": request_id, "method": method, "params": params}) + "\n")
+                self.process.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                self._pending.pop(request_id, None)
+                raise NodeWorkerError(f"Node worker pipe closed: {e}")
+        return request_id, future
+
+    def forget(self, request_id: int):
+        """Stop waiting for a request (its late reply will be ignored)"""
+        with self._lock:
+            self._pending.pop(request_id, None)
+
+    def _read_stdout(self):
+        for line in self.process.stdout:
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Node worker {self.pid} wrote a non-protocol line: {line.strip()[:200]}")
+                continue
+
+            if message.get("ready"):
+                self._ready.set()
+                continue
+
+            self.last_reply_at = time.monotonic()
+            with self._lock:
+                future = self._pending.pop(message.get("id"), None)
+            if future is None:
+                continue
+            if message.get("ok"):
+                future.set_result(message.get("result"))
+            else:
+                future.set_exception(NodeWorkerError(message.get("error") or "Unknown worker error"))
+
+        # stdout closed: the process has exited
+        self._ready.set()
+        self._fail_pending(NodeWorkerError(
+            f"Node worker {self.pid} exited: {' | '.join(self.stderr_tail) or 'no output'}"
+        ))
+
+    def _read_stderr(self):
+        for line in self.process.stderr:
+            line = line.rstrip()
+            if line:
+                self.stderr_tail.append(line)
+                logger.debug(f"node[{self.pid}] {line}")
+
+    def _fail_pending(self, error: Exception):
+        """Close the worker to new calls and fail the ones still waiting"""
+        with self._lock:
+            self._closed = True
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def kill(self):
+        """Stop the process and fail whatever is still pending on it"""
+        self._closed = True
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self._fail_pending(NodeWorkerError(f"Node worker {self.pid} was stopped"))
+
+class NodeWorkerPool:
+    """A fixed number of Node workers sharing the load of one module"""
+
+    def __init__(self, module_path: str, size: int = 2, default_timeout: float = 30.0,
+                 node_binary: str = "node", startup_timeout: float = 10.0):
+        if size < 1:
+            raise ValueError("size must be positive")
+        self.module_path = module_path
+        self.size = size
+        self.default_timeout = default_timeout
+        self.node_binary = node_binary
+        self.startup_timeout = startup_timeout
+
+        self._workers: List[Optional[NodeWorker]] = [None] * size
+        self._lock = threading.Lock()
+        self._spawned = threading.Condition(self._lock)
+        self._spawning: Set[int] = set()  # slots being (re)started outside the lock
+        self._closed = False
+
+        # Metrics
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.spawns = 0
+        self.respawns = 0
+        self._latencies: Deque[float] = deque(maxlen=500)
+
+    def _install(self, slot: int, worker: NodeWorker):
+        """Put a started worker in its slot (callers hold the lock)"""
+        previous = self._workers[slot]
+        self._workers[slot] = worker
+        self.spawns += 1
+        if previous is not None:
+            self.respawns += 1
+            logger.warning(f"Respawned Node worker slot {slot}: pid {previous.pid} -> {worker.pid}")
+
+    def _respawn_dead(self):
+        """Restart workers that exited or were recycled
+
+        Starting Node takes a while, so it happens outside the lock; slots
+        being restarted are reserved so concurrent callers do not start them
+        twice.
+        """
+        with self._lock:
+            if self._closed:
+                raise NodeWorkerError("Node worker pool is closed")
+            slots = [
+                slot for slot, worker in enumerate(self._workers)
+                if (worker is None or not worker.alive) and slot not in self._spawning
+            ]
+            self._spawning.update(slots)
+            stale = [self._workers[slot] for slot in slots if self._workers[slot] is not None]
+
+        started: List[Tuple[int, NodeWorker]] = []
+        try:
+            for worker in stale:
+                worker.kill()
+            for slot in slots:
+                started.append((slot, NodeWorker(self.module_path, self.node_binary, self.startup_timeout)))
+        finally:
+            with self._lock:
+                self._spawning.difference_update(slots)
+                closed = self._closed
+                if not closed:
+                    for slot, worker in started:
+                        self._install(slot, worker)
+                self._spawned.notify_all()
+            if closed:
+                for _, worker in started:
+                    worker.kill()
+
+    def _acquire(self) -> NodeWorker:
+        """The live worker with the fewest pending calls, respawning dead ones"""
+        try:
+            self._respawn_dead()
+            spawn_error = None
+        except NodeWorkerError as e:
+            # A live worker can still take the call; otherwise this says why none is running
+            spawn_error = e
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise NodeWorkerError("Node worker pool is closed")
+                live = [worker for worker in self._workers if worker is not None and worker.alive]
+                if live:
+                    return min(live, key=lambda worker: worker.pending)
+                if not self._spawning:
+                    raise spawn_error or NodeWorkerError("No Node worker is running")
+                # Every slot is being restarted by another caller
+                if not self._spawned.wait(self.startup_timeout):
+                    raise NodeWorkerError("Timed out waiting for a Node worker to start")
+
+    def _recycle(self, worker: NodeWorker):
+        """Stop a worker that stopped answering; the next call starts its replacement"""
+        worker.kill()
+
+    def call(self, method: str, *params: Any, timeout: Optional[float] = None) -> Any:
+        """Run an exported function of the module in a worker and return its result"""
+        timeout = self.default_timeout if timeout is None else timeout
+        worker = self._acquire()
+        started = time.monotonic()
+        request_id, future = worker.submit(method, list(params))
+        self.calls += 1
+
+        try:
+            result = future.result(timeout)
+        except FutureTimeoutError:
+            worker.forget(request_id)
+            self.timeouts += 1
+            # A worker that has not answered anything since this call was sent is wedged
+            if worker.last_reply_at < started:
+                logger.warning(f"Node worker {worker.pid} unresponsive for {timeout}s; recycling")
+                self._recycle(worker)
+            raise NodeWorkerTimeout(f"{method} timed out after {timeout}s")
+        except NodeWorkerError:
+            self.failures += 1
+            raise
+
+        self._latencies.append(time.monotonic() - started)
+        return result
+
+    def close(self):
+        """Stop every worker"""
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, [None] * self.size
+        for worker in workers:
+            if worker is not None:
+                worker.kill()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def percentile(q: float) -> float:
+            return latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000 if latencies else 0.0
+
+        workers = [w for w in self._workers if w is not None]
+        return {
+            "size": self.size,
+            "alive": sum(1 for w in workers if w.alive),
+            "in_flight": sum(w.pending for w in workers),
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "spawns": self.spawns,
+            "respawns": self.respawns,
+            "latency_ms": {
+                "avg": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "max": latencies[-1] * 1000 if latencies else 0.0
+            },
+            "workers": [{
+                "pid": w.pid,
+                "alive": w.alive,
+                "pending": w.pending,
+                "calls": w.calls,
+                "uptime_seconds": round(time.monotonic() - w.started_at, 1)
+            } for w in workers]
+        }
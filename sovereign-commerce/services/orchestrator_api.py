@@ -3,15 +3,21 @@ AXIOM-FLAME Orchestrator API - Python Backend Integration
 Provides HTTP endpoints to access the TypeScript orchestrator from the Sovereign Commerce platform
 """
 
-import json
+import atexit
 import subprocess
-import tempfile
 import os
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from datetime import datetime
 
+from node_worker_pool import NodeWorkerPool, NodeWorkerError, NodeWorkerTimeout
+
+# Worker pool settings
+ORCHESTRATOR_WORKERS = int(os.getenv("AXIOM_ORCHESTRATOR_WORKERS", "2"))
+ORCHESTRATOR_TIMEOUT = float(os.getenv("AXIOM_ORCHESTRATOR_TIMEOUT", "30"))
+
 # Pydantic models for API
 class OrchestrationRequest(BaseModel):
     phrase: str
@@ -41,19 +47,22 @@ def get_auth_dependency():
     pass
 
 class AxiomOrchestrator:
-    """Python wrapper for the TypeScript AXIOM-FLAME Orchestrator"""
+    """Python wrapper for the TypeScript AXIOM-FLAME Orchestrator
     
-    def __init__(self):
-        self.orchestrator_path = os.path.join(
-            os.path.dirname(__file__), 
-            "..", "..", "axiom", "dist", "orchestrator.js"
-        )
+    Calls go to a pool of long-lived Node workers (see node_worker_pool.py)
+    that load the compiled orchestrator once, so an invocation costs a JSON
+    round trip over stdio rather than a Node process start. Workers are
+    started on first use.
+    """
+    
+    def __init__(self, workers: int = ORCHESTRATOR_WORKERS, timeout: float = ORCHESTRATOR_TIMEOUT):
+        self.axiom_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "axiom")
+        self.orchestrator_path = os.path.join(self.axiom_dir, "dist", "orchestrator.js")
         self._ensure_compiled()
+        self.pool = NodeWorkerPool(self.orchestrator_path, size=workers, default_timeout=timeout)
     
     def _ensure_compiled(self):
         """Ensure the TypeScript orchestrator is compiled"""
-        axiom_dir = os.path.join(os.path.dirname(__file__), "..", "..", "axiom")
-        
         # Check if compiled version exists
         if not os.path.exists(self.orchestrator_path):
             try:
@@ -65,7 +74,7 @@ class AxiomOrchestrator:
                     "--outDir", "dist",
                     "--skipLibCheck"
                 ], 
-                cwd=axiom_dir,
+                cwd=self.axiom_dir,
                 capture_output=True,
                 text=True
                 )
@@ -82,93 +91,45 @@ class AxiomOrchestrator:
         start_time = datetime.now()
         
         try:
-            # Create a temporary script to run the orchestrator
-            script_content = f"""
-const {{ invokeCodex }} = require('{self.orchestrator_path}');
-
-async function run() {{
-    try {{
-        const result = await invokeCodex("{phrase}");
-        console.log(JSON.stringify(result, null, 2));
-    }} catch (error) {{
-        console.error(JSON.stringify({{
-            status: "failed",
-            error: error.message,
-            intent: null,
-            engines: {{}}
-        }}, null, 2));
-    }}
-}}
-
-run();
-"""
-            
-            # Write and execute the script
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-                f.write(script_content)
-                script_path = f.name
-            
-            try:
-                result = subprocess.run([
-                    'node', script_path
-                ], capture_output=True, text=True, timeout=30)
-                
-                if result.returncode == 0:
-                    # Parse the JSON output
-                    orchestration_result = json.loads(result.stdout)
-                    
-                    # Add execution timing
-                    end_time = datetime.now()
-                    execution_time = int((end_time - start_time).total_seconds() * 1000)
-                    orchestration_result['execution_time_ms'] = execution_time
-                    
-                    return orchestration_result
-                else:
-                    raise Exception(f"Orchestrator failed: {result.stderr}")
-                    
-            finally:
-                # Cleanup
-                os.unlink(script_path)
-                
-        except subprocess.TimeoutExpired:
+            # The phrase travels as a JSON parameter, never as source code
+            orchestration_result = self.pool.call("invokeCodex", phrase)
+        except NodeWorkerTimeout:
             raise Exception("Orchestrator execution timed out")
-        except json.JSONDecodeError as e:
-            raise Exception(f"Failed to parse orchestrator output: {e}")
-        except Exception as e:
+        except NodeWorkerError as e:
             raise Exception(f"Orchestrator execution failed: {e}")
+        
+        if not isinstance(orchestration_result, dict):
+            raise Exception("Orchestrator returned an invalid result")
+        
+        # Add execution timing
+        end_time = datetime.now()
+        execution_time = int((end_time - start_time).total_seconds() * 1000)
+        orchestration_result['execution_time_ms'] = execution_time
+        
+        return orchestration_result
+    
+    def run_tests(self) -> list:
+        """Run the orchestrator's built-in test phrases"""
+        return self.pool.call("testOrchestrator", timeout=max(ORCHESTRATOR_TIMEOUT, 60))
     
-    def get_engine_status(self) -> Dict[str, str]:
-        """Get the status of all AXIOM-FLAME engines"""
+    def get_engine_status(self) -> Dict[str, Any]:
+        """Get the status of all AXIOM-FLAME engines and of the worker pool"""
         
         try:
-            script_content = f"""
-const {{ getEngineStatus }} = require('{self.orchestrator_path}');
-const status = getEngineStatus();
-console.log(JSON.stringify(status, null, 2));
-"""
-            
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-                f.write(script_content)
-                script_path = f.name
-            
-            try:
-                result = subprocess.run([
-                    'node', script_path
-                ], capture_output=True, text=True, timeout=10)
-                
-                if result.returncode == 0:
-                    return json.loads(result.stdout)
-                else:
-                    return {"error": f"Failed to get engine status: {result.stderr}"}
-                    
-            finally:
-                os.unlink(script_path)
-                
+            status = self.pool.call("getEngineStatus", timeout=10)
         except Exception as e:
-            return {"error": f"Engine status check failed: {e}"}
+            status = {"error": f"Engine status check failed: {e}"}
+        
+        status["worker_pool"] = self.pool.get_metrics()
+        return status
+    
+    def close(self):
+        """Stop the Node workers"""
+        self.pool.close()
 
 # Initialize the orchestrator
 orchestrator = AxiomOrchestrator()
+atexit.register(orchestrator.close)
 
 @orchestrator_router.post("/invoke", response_model=OrchestrationResponse)
 async def invoke_orchestrator(
@@ -182,7 +143,7 @@ async def invoke_orchestrator(
     """
     
     try:
-        result = orchestrator.invoke_codex(request.phrase)
+        result = await run_in_threadpool(orchestrator.invoke_codex, request.phrase)
         
         # Validate the response structure
         if not isinstance(result, dict) or 'status' not in result:
@@ -199,7 +160,7 @@ async def invoke_orchestrator(
             detail=f"Orchestration failed: {str(e)}"
         )
 
-@orchestrator_router.get("/engines", response_model=Dict[str, str])
+@orchestrator_router.get("/engines", response_model=Dict[str, Any])
 async def get_engine_status():
     """
     Get the operational status of all AXIOM-FLAME engines
@@ -210,9 +171,11 @@ async def get_engine_status():
     - ORACLE (Backend Generation)
     - LANTERN (Database Configuration)
     - FLAME (Deployment & Sealing)
+    
+    Also reports the Node worker pool under ``worker_pool``.
     """
     
-    status = orchestrator.get_engine_status()
+    status = await run_in_threadpool(orchestrator.get_engine_status)
     return status
 
 @orchestrator_router.get("/test")
@@ -224,49 +187,13 @@ async def test_orchestrator():
     """
     
     try:
-        script_content = f"""
-const {{ testOrchestrator }} = require('{orchestrator.orchestrator_path}');
-
-async function runTests() {{
-    try {{
-        const results = await testOrchestrator();
-        console.log(JSON.stringify({{
-            status: "test_completed",
-            results: results,
-            total_tests: results.length,
-            passed_tests: results.filter(r => r.success).length
-        }}, null, 2));
-    }} catch (error) {{
-        console.error(JSON.stringify({{
-            status: "test_failed",
-            error: error.message
-        }}, null, 2));
-    }}
-}}
-
-runTests();
-"""
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-            f.write(script_content)
-            script_path = f.name
-        
-        try:
-            result = subprocess.run([
-                'node', script_path
-            ], capture_output=True, text=True, timeout=60)
-            
-            if result.returncode == 0:
-                test_result = json.loads(result.stdout)
-                return test_result
-            else:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Orchestrator test failed: {result.stderr}"
-                )
-                
-        finally:
-            os.unlink(script_path)
+        results = await run_in_threadpool(orchestrator.run_tests)
+        return {
+            "status": "test_completed",
+            "results": results,
+            "total_tests": len(results),
+            "passed_tests": sum(1 for r in results if r.get("success"))
+        }
             
     except Exception as e:
         raise HTTPException(
@@ -282,19 +209,22 @@ async def orchestrator_health():
     
     try:
         # Quick status check
-        status = orchestrator.get_engine_status()
+        status = await run_in_threadpool(orchestrator.get_engine_status)
+        worker_pool = status.pop("worker_pool", None)
         
         if "error" in status:
             return {
                 "status": "unhealthy",
                 "message": "Orchestrator engines not available",
-                "details": status
+                "details": status,
+                "worker_pool": worker_pool
             }
         
         return {
             "status": "healthy",
             "message": "AXIOM-FLAME orchestrator operational",
             "engines": len(status),
+            "worker_pool": worker_pool,
             "timestamp": datetime.now().isoformat()
         }
         
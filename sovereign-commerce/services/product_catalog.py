@@ -7,8 +7,12 @@ Built with ceremonial dignity for the diaspora community.
 """
 
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from decimal import Decimal
 from pathlib import Path
 import json
@@ -16,7 +20,7 @@ import secrets
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import Column, String, DateTime, DECIMAL, Integer, Text, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, DECIMAL, Integer, Text, Boolean, ForeignKey, event, exists, func, or_
 from sqlalchemy.ext.declarative import declarative_base
 
 from sovereign_main import Base, User, Product, SessionLocal
@@ -24,6 +28,12 @@ from sovereign_main import Base, User, Product, SessionLocal
 # Logging setup
 logger = logging.getLogger(__name__)
 
+# Catalog pagination and response caching
+DEFAULT_CATALOG_PAGE_SIZE = 50
+MAX_CATALOG_PAGE_SIZE = 200
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "300"))
+CATALOG_CACHE_MAX_ENTRIES = int(os.getenv("CATALOG_CACHE_MAX_ENTRIES", "256"))
+
 # Enhanced Product Models
 class ProductCategory(Base):
     __tablename__ = "product_categories"
@@ -87,6 +97,89 @@ class ProductCollection(Base):
     cultural_notes = Column(Text)
     added_at = Column(DateTime, default=datetime.utcnow)
 
+# Catalog response cache
+class CatalogCache:
+    """LRU cache of catalog responses, cleared whenever a catalog table changes
+    
+    Each entry remembers the cache version it was computed under; a result
+    computed while a write landed is not stored, so readers never see data
+    older than the last invalidation.
+    """
+    
+    def __init__(self, ttl: float = CATALOG_CACHE_TTL, max_entries: int = CATALOG_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version = 0
+        self._entries: "OrderedDict[Tuple, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Tuple) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key: Tuple, value: Dict, version: int) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "ttl_seconds": self.ttl
+        }
+
+catalog_cache = CatalogCache()
+
+CATALOG_MODELS = (Product, ProductCategory, ProductAttribute, ProductReview,
+                  CulturalCollection, ProductCollection)
+
+CATALOG_CHANGED_KEY = "catalog_changed"
+
+@event.listens_for(Session, "after_flush")
+def _mark_catalog_changes(session, flush_context):
+    """Remember that this transaction wrote a catalog row"""
+    changed = session.new | session.dirty | session.deleted
+    if any(isinstance(instance, CATALOG_MODELS) for instance in changed):
+        session.info[CATALOG_CHANGED_KEY] = True
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_catalog_cache(session):
+    """Drop cached catalog responses once catalog writes are committed
+    
+    Invalidating at flush time would let another session re-cache the
+    pre-commit catalog under the new version before the commit lands.
+    """
+    if session.info.pop(CATALOG_CHANGED_KEY, False):
+        catalog_cache.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_changes(session):
+    session.info.pop(CATALOG_CHANGED_KEY, None)
+
 # Enhanced Product Catalog Service
 class DiasporaProductCatalog:
     """Enhanced product catalog service for diaspora funders"""
@@ -278,70 +371,106 @@ class DiasporaProductCatalog:
     
     def get_enhanced_product_catalog(self, category_filter: str = None, 
                                    diaspora_region: str = None, 
-                                   cultural_significance: str = None) -> Dict:
-        """Get enhanced product catalog with cultural context"""
-        query = self.db.query(Product).filter(Product.is_active == True)
-        
-        # Apply category filter
+                                   cultural_significance: str = None,
+                                   page: int = 1,
+                                   page_size: int = DEFAULT_CATALOG_PAGE_SIZE) -> Dict:
+        """Get enhanced product catalog with cultural context
+        
+        Filters, ratings and pagination run in SQL, and attributes and
+        collections are loaded for the whole page at once, so a page costs a
+        fixed number of queries. Responses are cached until a catalog table
+        changes.
+        """
+        page = max(page, 1)
+        page_size = min(max(page_size, 1), MAX_CATALOG_PAGE_SIZE)
+        cache_key = (category_filter, diaspora_region, cultural_significance, page, page_size)
+        cached = catalog_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        version = catalog_cache.version
+        
+        # Review aggregates per product
+        ratings = self.db.query(
+            ProductReview.product_id.label("product_id"),
+            func.avg(ProductReview.rating).label("average_rating"),
+            func.count(ProductReview.id).label("review_count")
+        ).group_by(ProductReview.product_id).subquery()
+        
+        query = self.db.query(
+            Product,
+            ratings.c.average_rating,
+            ratings.c.review_count,
+            func.count().over().label("total")
+        ).outerjoin(ratings, ratings.c.product_id == Product.id).filter(Product.is_active == True)
+        
+        # Apply category filter (unknown categories leave the catalog unfiltered)
         if category_filter:
-            category = self.db.query(ProductCategory).filter(
-                ProductCategory.name == category_filter
-            ).first()
-            if category:
-                query = query.filter(Product.category == category.name)
+            category_exists = exists().where(ProductCategory.name == category_filter)
+            query = query.filter(or_(Product.category == category_filter, ~category_exists))
+        
+        # Keep only products in a collection for the requested region
+        if diaspora_region:
+            in_region = exists().where(
+                ProductCollection.product_id == Product.id,
+                ProductCollection.collection_id == CulturalCollection.id,
+                CulturalCollection.diaspora_region == diaspora_region
+            )
+            query = query.filter(in_region)
         
-        products = query.all()
-        enhanced_products = []
+        rows = query.order_by(Product.created_at.desc(), Product.id).offset(
+            (page - 1) * page_size
+        ).limit(page_size).all()
         
-        for product in products:
-            # Get attributes
+        if rows:
+            total_products = rows[0].total
+        else:
+            total_products = query.with_entities(func.count(Product.id)).order_by(None).scalar() or 0
+        
+        product_ids = [row.Product.id for row in rows]
+        attributes_by_product: Dict[str, Dict] = {product_id: {} for product_id in product_ids}
+        collections_by_product: Dict[str, List[Dict]] = {product_id: [] for product_id in product_ids}
+        
+        if product_ids:
             attributes = self.db.query(ProductAttribute).filter(
-                ProductAttribute.product_id == product.id
+                ProductAttribute.product_id.in_(product_ids)
             ).all()
+            for attr in attributes:
+                attributes_by_product[attr.product_id][attr.attribute_name] = {
+                    "type": attr.attribute_type,
+                    "value": attr.attribute_value
+                }
             
-            # Get reviews and average rating
-            reviews = self.db.query(ProductReview).filter(
-                ProductReview.product_id == product.id
+            memberships = self.db.query(
+                ProductCollection.product_id,
+                CulturalCollection.name,
+                CulturalCollection.diaspora_region,
+                CulturalCollection.sigil
+            ).join(
+                CulturalCollection, CulturalCollection.id == ProductCollection.collection_id
+            ).filter(ProductCollection.product_id.in_(product_ids)).order_by(
+                ProductCollection.display_order, ProductCollection.added_at
             ).all()
-            
-            avg_rating = sum(r.rating for r in reviews) / len(reviews) if reviews else 0
-            
-            # Get cultural collections this product belongs to
-            collections = self.db.query(CulturalCollection).join(
-                ProductCollection, CulturalCollection.id == ProductCollection.collection_id
-            ).filter(ProductCollection.product_id == product.id).all()
-            
-            # Filter by diaspora region if specified
-            if diaspora_region:
-                region_collections = [c for c in collections if c.diaspora_region == diaspora_region]
-                if not region_collections:
-                    continue
-            
-            enhanced_product = {
-                "id": product.id,
-                "name": product.name,
-                "description": product.description,
-                "price": str(product.price),
-                "currency": product.currency,
-                "category": product.category,
-                "image_url": product.image_url,
-                "average_rating": round(avg_rating, 1),
-                "review_count": len(reviews),
-                "attributes": {
-                    attr.attribute_name: {
-                        "type": attr.attribute_type,
-                        "value": attr.attribute_value
-                    } for attr in attributes
-                },
-                "cultural_collections": [{
-                    "name": coll.name,
-                    "diaspora_region": coll.diaspora_region,
-                    "sigil": coll.sigil
-                } for coll in collections],
-                "created_at": product.created_at.isoformat()
-            }
-            
-            enhanced_products.append(enhanced_product)
+            for membership in memberships:
+                collections_by_product[membership.product_id].append({
+                    "name": membership.name,
+                    "diaspora_region": membership.diaspora_region,
+                    "sigil": membership.sigil
+                })
+        
+        enhanced_products = [{
+            "id": row.Product.id,
+            "name": row.Product.name,
+            "description": row.Product.description,
+            "price": str(row.Product.price),
+            "currency": row.Product.currency,
+            "category": row.Product.category,
+            "image_url": row.Product.image_url,
+            "average_rating": round(float(row.average_rating or 0), 1),
+            "review_count": row.review_count or 0,
+            "attributes": attributes_by_product[row.Product.id],
+            "cultural_collections": collections_by_product[row.Product.id],
+            "created_at": row.Product.created_at.isoformat()
+        } for row in rows]
         
         # Get featured collections
         featured_collections = self.db.query(CulturalCollection).filter(
@@ -353,9 +482,15 @@ class DiasporaProductCatalog:
             ProductCategory.is_active == True
         ).all()
         
-        return {
-            "total_products": len(enhanced_products),
+        result = {
+            "total_products": total_products,
             "products": enhanced_products,
+            "pagination": {
+                "page": page,
+                "page_size": page_size,
+                "total_pages": (total_products + page_size - 1) // page_size,
+                "has_next": page * page_size < total_products
+            },
             "featured_collections": [{
                 "id": coll.id,
                 "name": coll.name,
@@ -377,6 +512,9 @@ class DiasporaProductCatalog:
             },
             "message": "Enhanced catalog with cultural context"
         }
+        
+        catalog_cache.set(cache_key, result, version)
+        return result
     
     def get_product_with_cultural_context(self, product_id: str) -> Dict:
         """Get detailed product information with full cultural context"""
@@ -456,23 +594,23 @@ class DiasporaProductCatalog:
         
         collections = query.all()
         
-        enhanced_collections = []
-        for collection in collections:
-            # Get products in this collection
-            product_count = self.db.query(ProductCollection).filter(
-                ProductCollection.collection_id == collection.id
-            ).count()
-            
-            enhanced_collections.append({
-                "id": collection.id,
-                "name": collection.name,
-                "description": collection.description,
-                "diaspora_region": collection.diaspora_region,
-                "product_count": product_count,
-                "sigil": collection.sigil,
-                "is_featured": collection.is_featured,
-                "created_at": collection.created_at.isoformat()
-            })
+        # Product counts for all listed collections in one grouped query
+        product_counts = dict(self.db.query(
+            ProductCollection.collection_id, func.count(ProductCollection.id)
+        ).filter(
+            ProductCollection.collection_id.in_([collection.id for collection in collections])
+        ).group_by(ProductCollection.collection_id).all()) if collections else {}
+        
+        enhanced_collections = [{
+            "id": collection.id,
+            "name": collection.name,
+            "description": collection.description,
+            "diaspora_region": collection.diaspora_region,
+            "product_count": product_counts.get(collection.id, 0),
+            "sigil": collection.sigil,
+            "is_featured": collection.is_featured,
+            "created_at": collection.created_at.isoformat()
+        } for collection in collections]
         
         return {
             "total_collections": len(enhanced_collections),
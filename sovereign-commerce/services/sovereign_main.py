@@ -8,6 +8,7 @@ Built with mythic dignity and sovereign recognition.
 
 import asyncio
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Union
 from decimal import Decimal
@@ -37,13 +38,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Schedule leaderboard rebuilds; close the shared AXIOM-FLAME connection pool on shutdown"""
+    leaderboard_rebuilds = None
+    try:
+        from contributor_recognition import LEADERBOARD_REBUILD_SECONDS, run_scheduled_leaderboard_rebuilds
+        if LEADERBOARD_REBUILD_SECONDS > 0:
+            leaderboard_rebuilds = asyncio.create_task(run_scheduled_leaderboard_rebuilds())
+    except ImportError as e:
+        logger.warning(f"Leaderboard rebuilds not scheduled: {e}")
+    yield
+    if leaderboard_rebuilds is not None:
+        leaderboard_rebuilds.cancel()
+    if _axiom_flame_client is not None:
+        await _axiom_flame_client.aclose()
+
 # Initialize the Sovereign Commerce Platform
 app = FastAPI(
     title="Sovereign Commerce Platform",
     description="A ceremonial marketplace for Diaspora Funders",
     version="1.0.0",
     docs_url="/sacred/docs",
-    redoc_url="/sacred/redoc"
+    redoc_url="/sacred/redoc",
+    lifespan=lifespan
 )
 
 # CORS configuration for diaspora accessibility
@@ -75,6 +93,11 @@ security = HTTPBearer()
 # AXIOM-FLAME Configuration
 AXIOM_FLAME_BASE = "http://127.0.0.1:5000"  # AXIOM-FLAME API endpoint
 AXIOM_FLAME_TIMEOUT = 30
+AXIOM_FLAME_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+
+# One keep-alive pool for every AXIOM-FLAME call, plus identical GETs in flight
+_axiom_flame_client: Optional[httpx.AsyncClient] = None
+_axiom_flame_inflight: Dict[str, asyncio.Task] = {}
 
 # Templates and Static Files
 current_dir = Path(__file__).parent.parent  # Go up from services/ to sovereign-commerce/
@@ -199,7 +222,7 @@ try:
     from product_catalog import ProductCategory, ProductAttribute, ProductReview, CulturalCollection, ProductCollection
     from checkout_system import PaymentMethod, CheckoutSession, CommunityFund, FundContribution, OrderCeremony
     from funder_dashboard import FunderActivity, FunderMilestone, CommunityConnection, FunderRecommendation, FunderPreference
-    from contributor_recognition import ContributorProfile, ContributionRecord, CommunityHonor, HonorAwarded, ContributorEndorsement, CommunityRecognitionEvent
+    from contributor_recognition import ContributorProfile, ContributionRecord, CommunityHonor, HonorAwarded, ContributorEndorsement, CommunityRecognitionEvent, LeaderboardEntry
     logger.info("✅ Enhanced modules imported successfully")
 except Exception as e:
     logger.error(f"❌ Error importing enhanced modules: {e}")
@@ -308,22 +331,37 @@ def generate_dispatch_id():
     timestamp = datetime.utcnow().strftime("%Y-%m-%d")
     return f"AXF-{timestamp}-{str(uuid.uuid4())[:8]}"
 
+def get_axiom_flame_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for AXIOM-FLAME (closed by the app lifespan)"""
+    global _axiom_flame_client
+    if _axiom_flame_client is None or _axiom_flame_client.is_closed:
+        _axiom_flame_client = httpx.AsyncClient(timeout=AXIOM_FLAME_TIMEOUT, limits=AXIOM_FLAME_LIMITS)
+    return _axiom_flame_client
+
+async def _coalesced_get(url: str) -> httpx.Response:
+    """Share one upstream GET between concurrent callers asking for the same URL"""
+    task = _axiom_flame_inflight.get(url)
+    if task is None:
+        task = asyncio.ensure_future(get_axiom_flame_client().get(url))
+        _axiom_flame_inflight[url] = task
+        task.add_done_callback(lambda _: _axiom_flame_inflight.pop(url, None))
+    return await asyncio.shield(task)
+
 async def call_axiom_flame(endpoint: str, method: str = "POST", data: dict = None):
     """Call AXIOM-FLAME API with proper error handling"""
     url = f"{AXIOM_FLAME_BASE}/api/{endpoint}"
     
     try:
-        async with httpx.AsyncClient(timeout=AXIOM_FLAME_TIMEOUT) as client:
-            if method == "GET":
-                response = await client.get(url)
-            else:
-                response = await client.post(url, json=data)
-            
-            if response.status_code >= 400:
-                logger.error(f"AXIOM-FLAME error {response.status_code}: {response.text}")
-                return None, f"AXIOM-FLAME error: {response.status_code}"
-            
-            return response.json(), None
+        if method == "GET":
+            response = await _coalesced_get(url)
+        else:
+            response = await get_axiom_flame_client().post(url, json=data)
+        
+        if response.status_code >= 400:
+            logger.error(f"AXIOM-FLAME error {response.status_code}: {response.text}")
+            return None, f"AXIOM-FLAME error: {response.status_code}"
+        
+        return response.json(), None
             
     except httpx.ConnectError as e:
         logger.error(f"AXIOM-FLAME connection error: {e}")
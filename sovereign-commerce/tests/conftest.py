@@ -0,0 +1,33 @@
+"""
+Shared fixtures for the sovereign commerce service tests.
+
+The services import each other as top-level modules, so the services
+directory is put on the path, and each test gets its own SQLite database.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "services"))
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Session factory bound to a fresh database with every service table created"""
+    from sovereign_main import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'sovereign_test.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
@@ -0,0 +1,100 @@
+from contributor_recognition import (
+    ContributionCategory,
+    ContributorProfile,
+    ContributorRecognitionService,
+    LeaderboardEntry,
+    RecognitionLevel
+)
+from sovereign_main import User
+
+
+def ranking(service, **filters):
+    return [(entry["rank"], entry["display_name"]) for entry in
+            service.get_community_leaderboard(**filters)["leaderboard"]]
+
+
+def make_contributor(db, service, name, visibility="community"):
+    db.add(User(id=f"U-{name}", email=f"{name}@example.com", role="funder", sigil=f"SIGIL-{name}"))
+    db.commit()
+    profile_id = service.create_contributor_profile(f"U-{name}", name, "", {"region": "caribbean"}, [])["profile_id"]
+    if visibility != "community":
+        db.get(ContributorProfile, profile_id).visibility_setting = visibility
+        service.rebuild_leaderboard()
+    return profile_id
+
+
+def contribute(service, contributor_id, category, verifier=None):
+    record_id = service.record_contribution(contributor_id, category, "work", f"{category} work", "", "", "all")["record_id"]
+    if verifier:
+        service.verify_contribution(record_id, verifier)
+    return record_id
+
+
+def test_category_filter_applies_before_ranking(db):
+    db.add(User(id="KEEPER", email="keeper@example.com", role="custodian", sigil="SIGIL-KEEPER"))
+    service = ContributorRecognitionService(db)
+    ada = make_contributor(db, service, "Ada")
+    ben = make_contributor(db, service, "Ben")
+    cy = make_contributor(db, service, "Cy")
+
+    # Ada leads overall on innovation points, but only Ben and Cy have verified cultural work
+    for _ in range(3):
+        contribute(service, ada, ContributionCategory.INNOVATION.value, "KEEPER")
+    contribute(service, ben, ContributionCategory.CULTURAL.value, "KEEPER")
+    contribute(service, cy, ContributionCategory.CULTURAL.value, "KEEPER")
+    contribute(service, cy, ContributionCategory.CULTURAL.value)  # unverified: points count, category does not
+
+    assert ranking(service) == [(1, "Ada"), (2, "Cy"), (3, "Ben")]
+    assert ranking(service, category_filter=ContributionCategory.CULTURAL.value) == [(1, "Cy"), (2, "Ben")]
+    cultural = service.get_community_leaderboard(category_filter=ContributionCategory.CULTURAL.value)["leaderboard"]
+    assert [entry["category_contributions"] for entry in cultural] == [1, 1]
+
+
+def test_ranks_are_contiguous_across_pages(db):
+    service = ContributorRecognitionService(db)
+    names = ["Ada", "Ben", "Cy", "Dee", "Eve"]
+    for points, name in enumerate(names):
+        profile_id = make_contributor(db, service, name)
+        for _ in range(points):
+            contribute(service, profile_id, ContributionCategory.COMMUNITY.value)
+    make_contributor(db, service, "Hidden", visibility="private")
+
+    first = ranking(service, limit=2)
+    second = ranking(service, limit=2, offset=2)
+    last = ranking(service, limit=2, offset=4)
+    assert first + second + last == [(1, "Eve"), (2, "Dee"), (3, "Cy"), (4, "Ben"), (5, "Ada")]
+
+    # The total counts every listed contributor, not just the page
+    page = service.get_community_leaderboard(limit=2, offset=2)
+    assert len(page["leaderboard"]) == 2
+    assert page["total_contributors"] == 5
+    assert service.get_community_leaderboard(limit=2, offset=4)["total_contributors"] == 5
+    assert service.get_community_leaderboard(offset=10)["total_contributors"] == 5
+
+
+def test_writes_refresh_rows_and_reads_do_not(db):
+    db.add(User(id="KEEPER", email="keeper@example.com", role="custodian", sigil="SIGIL-KEEPER"))
+    service = ContributorRecognitionService(db)
+    ada = make_contributor(db, service, "Ada")
+
+    def overall():
+        return db.query(LeaderboardEntry).filter_by(contributor_id=ada, category="*").one()
+
+    record_id = contribute(service, ada, ContributionCategory.MENTORSHIP.value)
+    assert (overall().honor_points, overall().verified_contributions) == (35, 0)
+
+    service.verify_contribution(record_id, "KEEPER")
+    db.expire_all()
+    assert (overall().honor_points, overall().verified_contributions, overall().recent_contributions) == (52, 1, 1)
+
+    honor_id = service.create_community_honor("Mentor", "", "", [], 0, RecognitionLevel.EMERGING.value, {},
+                                              "custodian")["honor_id"]
+    service.award_honor(honor_id, ada, "KEEPER", {})
+    db.expire_all()
+    assert overall().honors_awarded == 1
+
+    # A read does not rewrite rows
+    refreshed_at = overall().refreshed_at
+    service.get_community_leaderboard()
+    db.expire_all()
+    assert overall().refreshed_at == refreshed_at
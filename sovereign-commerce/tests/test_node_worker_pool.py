@@ -0,0 +1,93 @@
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from node_worker_pool import NodeWorkerError, NodeWorkerPool, NodeWorkerTimeout
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+
+MODULE = """
+module.exports = {
+  echo: async (value) => value,
+  pid: () => process.pid,
+  sleep: (ms) => new Promise((resolve) => setTimeout(() => resolve(process.pid), ms)),
+  fail: () => { throw new Error('boom'); },
+  crash: () => process.exit(3),
+  hang: () => { const end = Date.now() + 60000; while (Date.now() < end) {} }
+};
+"""
+
+
+@pytest.fixture
+def make_pool(tmp_path):
+    module = tmp_path / "fixture_module.js"
+    module.write_text(MODULE)
+    pools = []
+
+    def make(size=1, **kwargs):
+        pool = NodeWorkerPool(str(module), size=size, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def test_calls_spread_across_workers(make_pool):
+    pool = make_pool(size=2)
+    assert pool.call("echo", {"phrase": "fire"}) == {"phrase": "fire"}
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(4) as executor:
+        pids = list(executor.map(lambda _: pool.call("sleep", 300), range(4)))
+    assert time.monotonic() - started < 1.0
+    assert len(set(pids)) == 2
+    assert pool.get_metrics()["alive"] == 2
+
+
+def test_wedged_worker_is_recycled(make_pool):
+    pool = make_pool()
+    first_pid = pool.call("pid")
+
+    with pytest.raises(NodeWorkerTimeout):
+        pool.call("hang", timeout=0.5)
+
+    assert pool.call("pid") != first_pid
+    metrics = pool.get_metrics()
+    assert (metrics["timeouts"], metrics["respawns"]) == (1, 1)
+
+
+def test_crashed_worker_is_respawned(make_pool):
+    pool = make_pool()
+    first_pid = pool.call("pid")
+
+    with pytest.raises(NodeWorkerError, match="exited"):
+        pool.call("crash")
+
+    assert pool.call("pid") != first_pid
+    assert pool.get_metrics()["respawns"] == 1
+
+
+def test_unknown_method_and_thrown_errors(make_pool):
+    pool = make_pool()
+    pid = pool.call("pid")
+
+    with pytest.raises(NodeWorkerError, match="Unknown method: missing"):
+        pool.call("missing")
+    with pytest.raises(NodeWorkerError, match="boom"):
+        pool.call("fail")
+
+    # Errors are per call; the worker keeps serving
+    assert pool.call("pid") == pid
+    assert pool.get_metrics()["failures"] == 2
+
+
+def test_closed_pool_rejects_calls(make_pool):
+    pool = make_pool()
+    pool.call("pid")
+    pool.close()
+    with pytest.raises(NodeWorkerError, match="closed"):
+        pool.call("pid")
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from product_catalog import (
+    CulturalCollection,
+    DiasporaProductCatalog,
+    ProductCollection,
+    ProductReview,
+    catalog_cache
+)
+from sovereign_main import Product, User
+
+BASE = datetime(2025, 1, 1)
+
+
+def add_product(db, number, category="textiles"):
+    db.add(Product(id=f"P{number:02d}", name=f"Offering {number}", description="", price=Decimal("10.00"),
+                   category=category, created_at=BASE + timedelta(days=number)))
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    catalog_cache.invalidate()
+    yield
+    catalog_cache.invalidate()
+
+
+@pytest.fixture
+def seeded(db):
+    db.add(User(id="U1", email="funder@example.com", role="funder", sigil="SIGIL-U1"))
+    for number in range(1, 6):
+        add_product(db, number, "textiles" if number % 2 else "carvings")
+    db.add(CulturalCollection(id="C1", name="West Coast", diaspora_region="west_africa", sigil="SIGIL-C1"))
+    db.add(CulturalCollection(id="C2", name="Islands", diaspora_region="caribbean", sigil="SIGIL-C2"))
+    db.add_all([
+        ProductCollection(id="PC1", product_id="P01", collection_id="C1"),
+        ProductCollection(id="PC2", product_id="P02", collection_id="C1"),
+        ProductCollection(id="PC3", product_id="P02", collection_id="C2"),
+        ProductReview(id="R1", product_id="P01", user_id="U1", rating=5),
+        ProductReview(id="R2", product_id="P01", user_id="U1", rating=2)
+    ])
+    db.commit()
+    return db
+
+
+def test_ratings_and_total(seeded):
+    catalog = DiasporaProductCatalog(seeded).get_enhanced_product_catalog()
+    assert catalog["total_products"] == 5
+    products = {product["id"]: product for product in catalog["products"]}
+    assert (products["P01"]["average_rating"], products["P01"]["review_count"]) == (3.5, 2)
+    assert (products["P03"]["average_rating"], products["P03"]["review_count"]) == (0.0, 0)
+
+
+def test_paging(seeded):
+    service = DiasporaProductCatalog(seeded)
+    first = service.get_enhanced_product_catalog(page=1, page_size=2)
+    last = service.get_enhanced_product_catalog(page=3, page_size=2)
+    beyond = service.get_enhanced_product_catalog(page=4, page_size=2)
+
+    assert [product["id"] for product in first["products"]] == ["P05", "P04"]
+    assert first["pagination"] == {"page": 1, "page_size": 2, "total_pages": 3, "has_next": True}
+    assert [product["id"] for product in last["products"]] == ["P01"]
+    assert last["pagination"]["has_next"] is False
+    # The total is still reported for a page past the end
+    assert (beyond["products"], beyond["total_products"]) == ([], 5)
+
+
+def test_region_filter(seeded):
+    service = DiasporaProductCatalog(seeded)
+    west = service.get_enhanced_product_catalog(diaspora_region="west_africa")
+    assert [product["id"] for product in west["products"]] == ["P02", "P01"]
+    assert west["total_products"] == 2
+    assert [c["name"] for c in west["products"][0]["cultural_collections"]] == ["West Coast", "Islands"]
+    assert service.get_enhanced_product_catalog(diaspora_region="nowhere")["total_products"] == 0
+
+
+def test_commit_invalidates_after_concurrent_read(seeded, session_factory):
+    reader = session_factory()
+    writer = session_factory()
+    try:
+        add_product(writer, 6)
+        writer.flush()
+
+        # A read between the writer's flush and commit caches the pre-commit catalog
+        assert DiasporaProductCatalog(reader).get_enhanced_product_catalog()["total_products"] == 5
+        reader.rollback()
+
+        writer.commit()
+        assert DiasporaProductCatalog(reader).get_enhanced_product_catalog()["total_products"] == 6
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_rollback_keeps_cache(seeded):
+    service = DiasporaProductCatalog(seeded)
+    service.get_enhanced_product_catalog()
+    version = catalog_cache.version
+
+    add_product(seeded, 7)
+    seeded.flush()
+    seeded.rollback()
+    seeded.commit()
+    assert catalog_cache.version == version
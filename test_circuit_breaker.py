@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Tests for the circuit breaker trip rules, half-open probe budget and bulkhead"""
+import asyncio
+
+import pytest
+
+from circuit_breaker import (
+    BulkheadFullError,
+    CircuitBreaker,
+    CircuitBreakerOpenError,
+    CircuitBreakerState
+)
+
+
+async def succeed():
+    return "ok"
+
+
+async def fail():
+    raise RuntimeError("upstream down")
+
+
+async def run(breaker, func, times=1):
+    for _ in range(times):
+        try:
+            await breaker.call(func)
+        except RuntimeError:
+            pass
+
+
+def test_consecutive_failures_trip_after_successes():
+    breaker = CircuitBreaker("db", failure_threshold=3)
+
+    async def scenario():
+        await run(breaker, succeed, 10)
+        await run(breaker, fail, 2)
+        assert breaker.state == CircuitBreakerState.CLOSED
+        await run(breaker, fail)
+        assert breaker.state == CircuitBreakerState.OPEN
+        with pytest.raises(CircuitBreakerOpenError):
+            await breaker.call(succeed)
+
+    asyncio.run(scenario())
+    assert breaker.rejections["open"] == 1
+
+
+def test_success_resets_consecutive_count():
+    breaker = CircuitBreaker("db", failure_threshold=3)
+
+    async def scenario():
+        for _ in range(5):
+            await run(breaker, fail, 2)
+            await run(breaker, succeed)
+
+    asyncio.run(scenario())
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_failure_rate_window_trips_on_intermittent_failures():
+    breaker = CircuitBreaker("db", failure_threshold=3, window_size=6, failure_rate_threshold=0.5)
+
+    async def scenario():
+        for _ in range(3):
+            await run(breaker, succeed)
+            await run(breaker, fail)
+
+    asyncio.run(scenario())
+    assert breaker.state == CircuitBreakerState.OPEN
+
+
+def test_window_must_hold_threshold():
+    with pytest.raises(ValueError):
+        CircuitBreaker("db", failure_threshold=5, window_size=4)
+
+
+def test_half_open_probe_budget():
+    breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout=0, half_open_max_calls=2)
+
+    async def scenario():
+        await run(breaker, fail)
+        assert breaker.state == CircuitBreakerState.OPEN
+
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "ok"
+
+        probes = [asyncio.create_task(breaker.call(slow)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert breaker.state == CircuitBreakerState.HALF_OPEN
+        with pytest.raises(CircuitBreakerOpenError):
+            await breaker.call(succeed)
+
+        release.set()
+        assert await asyncio.gather(*probes) == ["ok", "ok"]
+        assert breaker.state == CircuitBreakerState.CLOSED
+
+    asyncio.run(scenario())
+    assert breaker.rejections["half_open"] == 1
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout=0)
+
+    async def scenario():
+        await run(breaker, fail)
+        await run(breaker, fail)
+
+    asyncio.run(scenario())
+    assert breaker.state == CircuitBreakerState.OPEN
+    assert breaker.state_changes == 3  # open, half-open, open
+
+
+def test_bulkhead_rejects_after_queue_timeout():
+    breaker = CircuitBreaker("db", max_concurrent=1, queue_timeout=0.01)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "ok"
+
+        held = asyncio.create_task(breaker.call(slow))
+        await asyncio.sleep(0)
+        with pytest.raises(BulkheadFullError):
+            await breaker.call(succeed)
+
+        release.set()
+        assert await held == "ok"
+        assert await breaker.call(succeed) == "ok"
+
+    asyncio.run(scenario())
+    assert breaker.rejections["bulkhead"] == 1
+    assert breaker.state == CircuitBreakerState.CLOSED